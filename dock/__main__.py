@@ -1,6 +1,20 @@
-"""Entry point for python -m dock."""
+"""Entry point for the dock command and python -m dock."""
+
+import sys
+
+from dock.utils import profiling
+
+
+def main() -> None:
+    """Run the CLI, profiling from before it is imported if --profile-out is given."""
+    profiling.start_from_argv(sys.argv[1:])
+    try:
+        from dock.cli import cli
+
+        cli()
+    finally:
+        profiling.stop()
 
-from dock.cli import cli
 
 if __name__ == "__main__":
-    cli()
+    main()
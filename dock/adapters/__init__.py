@@ -1,7 +1,260 @@
 """Command execution abstractions for dock tool."""
 
+import os
+import random
+import shlex
+import signal
 import subprocess
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+# Per-kind timeouts in seconds. Reads are cheap and should answer quickly;
+# structural edits rewrite the plist and may take longer on a busy machine.
+DEFAULT_TIMEOUTS: dict[str, float] = {
+    "lookup": 5.0,
+    "version": 5.0,
+    "list": 10.0,
+    "add": 20.0,
+    "remove": 20.0,
+    "move": 20.0,
+    "default": 30.0,
+}
+
+# Command kinds that are safe to run again after a timeout or failure
+IDEMPOTENT_KINDS = frozenset({"lookup", "version", "list"})
+
+# Environment variables that replace a program with another command line,
+# e.g. DOCK_DOCKUTIL="python -m dock.testing.fake_dockutil"
+PROGRAM_OVERRIDES = {"dockutil": "DOCK_DOCKUTIL"}
+
+# Grace period between SIGTERM and SIGKILL when killing a process group
+KILL_GRACE_SECONDS = 0.5
+
+
+class CommandError(Exception):
+    """Base class for structured command execution errors."""
+
+    def __init__(
+        self,
+        message: str,
+        command: list[str],
+        kind: str,
+        attempts: int,
+        elapsed: float,
+    ):
+        """
+        Initialize CommandError.
+
+        Args:
+            message: Human readable description of the failure.
+            command: Command that failed.
+            kind: Command kind used to select timeout and retry policy.
+            attempts: Number of attempts made before giving up.
+            elapsed: Total seconds spent across all attempts.
+        """
+        super().__init__(message)
+        self.command = command
+        self.kind = kind
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert error to a dictionary for structured reporting.
+
+        Returns:
+            Dictionary describing the failure.
+        """
+        return {
+            "error": type(self).__name__,
+            "message": str(self),
+            "command": self.command,
+            "kind": self.kind,
+            "attempts": self.attempts,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+
+class CommandTimeoutError(CommandError):
+    """Raised when a command exceeds its timeout on every attempt."""
+
+    def __init__(
+        self,
+        command: list[str],
+        kind: str,
+        timeout: float,
+        attempts: int,
+        elapsed: float,
+    ):
+        """
+        Initialize CommandTimeoutError.
+
+        Args:
+            command: Command that timed out.
+            kind: Command kind used to select timeout and retry policy.
+            timeout: Timeout applied to the last attempt, in seconds.
+            attempts: Number of attempts made before giving up.
+            elapsed: Total seconds spent across all attempts.
+        """
+        super().__init__(
+            f"Command timed out after {timeout:g}s "
+            f"({attempts} attempt{'s' if attempts != 1 else ''}): {' '.join(command)}",
+            command,
+            kind,
+            attempts,
+            elapsed,
+        )
+        self.timeout = timeout
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert error to a dictionary for structured reporting.
+
+        Returns:
+            Dictionary describing the failure.
+        """
+        data = super().to_dict()
+        data["timeout"] = self.timeout
+        return data
+
+
+class CommandFailedError(CommandError):
+    """Raised when a retried command keeps exiting with a non-zero status."""
+
+    def __init__(
+        self,
+        command: list[str],
+        kind: str,
+        returncode: int,
+        stderr: str,
+        attempts: int,
+        elapsed: float,
+    ):
+        """
+        Initialize CommandFailedError.
+
+        Args:
+            command: Command that failed.
+            kind: Command kind used to select timeout and retry policy.
+            returncode: Exit status of the last attempt.
+            stderr: Standard error of the last attempt.
+            attempts: Number of attempts made before giving up.
+            elapsed: Total seconds spent across all attempts.
+        """
+        super().__init__(
+            f"Command failed with exit status {returncode} after {attempts} attempts: "
+            f"{' '.join(command)}",
+            command,
+            kind,
+            attempts,
+            elapsed,
+        )
+        self.returncode = returncode
+        self.stderr = stderr
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert error to a dictionary for structured reporting.
+
+        Returns:
+            Dictionary describing the failure.
+        """
+        data = super().to_dict()
+        data["returncode"] = self.returncode
+        data["stderr"] = self.stderr.strip()
+        return data
+
+
+class DeadlineExceededError(CommandError):
+    """Raised when the overall deadline expires before a command completes."""
+
+    def __init__(
+        self, command: list[str], kind: str, attempts: int, elapsed: float
+    ):
+        """
+        Initialize DeadlineExceededError.
+
+        Args:
+            command: Command that was running or about to run.
+            kind: Command kind used to select timeout and retry policy.
+            attempts: Number of attempts made before the deadline expired.
+            elapsed: Total seconds spent on this command.
+        """
+        super().__init__(
+            f"Deadline exceeded while running: {' '.join(command)}",
+            command,
+            kind,
+            attempts,
+            elapsed,
+        )
+
+
+def command_kind(command: list[str]) -> str:
+    """
+    Classify a command for timeout and retry policy.
+
+    Args:
+        command: List of command arguments.
+
+    Returns:
+        Command kind, e.g. "list", "add", "remove" or "default".
+    """
+    if not command:
+        return "default"
+
+    program = os.path.basename(command[0])
+    if program == "which":
+        return "lookup"
+    if program != "dockutil":
+        return "default"
+
+    for flag, kind in (
+        ("--list", "list"),
+        ("--version", "version"),
+        ("--add", "add"),
+        ("--remove", "remove"),
+        ("--move", "move"),
+    ):
+        if flag in command:
+            return kind
+    return "default"
+
+
+def resolve_command(
+    command: list[str], programs: Mapping[str, Sequence[str]] | None = None
+) -> list[str]:
+    """
+    Replace a program with the command line that runs it.
+
+    ``programs`` takes precedence over the environment overrides in
+    PROGRAM_OVERRIDES. ``which`` lookups of a replaced program look up the
+    first word of its replacement instead.
+
+    Args:
+        command: List of command arguments.
+        programs: Replacement command lines by program name.
+
+    Returns:
+        Command to run.
+    """
+    def replacement(program: str) -> list[str]:
+        if programs is not None and program in programs:
+            return list(programs[program])
+        return _program_override(program)
+
+    if len(command) == 2 and command[0] == "which":
+        found = replacement(command[1])
+        return ["which", found[0]] if found else command
+    found = replacement(command[0]) if command else []
+    return [*found, *command[1:]] if found else command
+
+
+def _program_override(program: str) -> list[str]:
+    """Get the replacement command line for a program, if one is set."""
+    variable = PROGRAM_OVERRIDES.get(program)
+    return shlex.split(os.environ.get(variable, "")) if variable else []
 
 
 class CommandExecutor(ABC):
@@ -28,10 +281,46 @@ class CommandExecutor(ABC):
 class SubprocessExecutor(CommandExecutor):
     """Real command executor using subprocess."""
 
+    def __init__(
+        self,
+        timeouts: dict[str, float] | None = None,
+        retries: int = 2,
+        backoff: float = 0.2,
+        deadline: float | None = None,
+        on_command: Callable[[str, float, bool], None] | None = None,
+        programs: Mapping[str, Sequence[str]] | None = None,
+    ):
+        """
+        Initialize SubprocessExecutor.
+
+        Args:
+            timeouts: Per-kind timeouts in seconds, merged over DEFAULT_TIMEOUTS.
+            retries: Extra attempts allowed for idempotent commands.
+            backoff: Base delay in seconds for jittered exponential backoff.
+            deadline: Absolute time.monotonic() value after which no command
+                     may run. None means no overall deadline.
+            on_command: Optional callback invoked after every attempt with
+                       the command kind, its wall time and whether it
+                       succeeded.
+            programs: Command lines that replace programs by name, e.g. the
+                     absolute path of a probed dockutil, so no PATH lookup
+                     happens per command.
+        """
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+        self.on_command = on_command
+        self.programs = programs
+
     def execute(self, command: list[str], check: bool = True) -> str:
         """
         Execute command using subprocess.
 
+        Idempotent commands (such as ``dockutil --list``) are retried with
+        jittered exponential backoff. Each attempt is bounded by the timeout
+        for its kind and by the overall deadline, whichever is sooner.
+
         Args:
             command: List of command arguments
             check: If True, raise CalledProcessError on non-zero exit
@@ -40,12 +329,162 @@ class SubprocessExecutor(CommandExecutor):
             Command stdout as string
 
         Raises:
-            CalledProcessError: If check=True and command fails
+            CalledProcessError: If check=True and a non-retried command fails
+            CommandFailedError: If a retried command fails on every attempt
+            CommandTimeoutError: If the command times out on every attempt
+            DeadlineExceededError: If the overall deadline expires
         """
-        result = subprocess.run(
-            command,
-            capture_output=True,
+        kind = command_kind(command)
+        max_attempts = 1 + (self.retries if kind in IDEMPOTENT_KINDS else 0)
+        started = time.monotonic()
+
+        for attempt in range(1, max_attempts + 1):
+            timeout, bounded_by_deadline = self._attempt_timeout(kind)
+            if timeout <= 0:
+                raise DeadlineExceededError(
+                    command, kind, attempt - 1, time.monotonic() - started
+                )
+
+            try:
+                return self._timed_run(command, kind, timeout, check)
+            except subprocess.TimeoutExpired:
+                elapsed = time.monotonic() - started
+                if bounded_by_deadline:
+                    raise DeadlineExceededError(command, kind, attempt, elapsed) from None
+                if attempt == max_attempts:
+                    raise CommandTimeoutError(
+                        command, kind, timeout, attempt, elapsed
+                    ) from None
+            except subprocess.CalledProcessError as e:
+                if max_attempts == 1:
+                    raise
+                if attempt == max_attempts:
+                    raise CommandFailedError(
+                        command,
+                        kind,
+                        e.returncode,
+                        e.stderr or "",
+                        attempt,
+                        time.monotonic() - started,
+                    ) from e
+
+            self._sleep_before_retry(attempt)
+
+        # Unreachable: the loop either returns or raises
+        raise AssertionError("retry loop exited without result")
+
+    def _attempt_timeout(self, kind: str) -> tuple[float, bool]:
+        """
+        Compute the timeout for the next attempt.
+
+        Args:
+            kind: Command kind.
+
+        Returns:
+            Tuple of (timeout in seconds, whether the deadline is the bound).
+        """
+        timeout = self.timeouts.get(kind, self.timeouts["default"])
+        if self.deadline is None:
+            return timeout, False
+
+        remaining = self.deadline - time.monotonic()
+        if remaining < timeout:
+            return remaining, True
+        return timeout, False
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        """
+        Sleep with jittered exponential backoff, never past the deadline.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-indexed).
+        """
+        delay = self.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        if self.deadline is not None:
+            delay = min(delay, max(0.0, self.deadline - time.monotonic()))
+        time.sleep(delay)
+
+    def _timed_run(self, command: list[str], kind: str, timeout: float, check: bool) -> str:
+        """
+        Run a single attempt and report it to the on_command callback.
+
+        Args:
+            command: List of command arguments.
+            kind: Command kind.
+            timeout: Timeout for this attempt in seconds.
+            check: If True, raise CalledProcessError on non-zero exit.
+
+        Returns:
+            Command stdout as string.
+        """
+        if self.on_command is None:
+            return self._run(command, timeout, check)
+        started = time.perf_counter()
+        ok = False
+        try:
+            stdout = self._run(command, timeout, check)
+            ok = True
+            return stdout
+        finally:
+            self.on_command(kind, time.perf_counter() - started, ok)
+
+    def _run(self, command: list[str], timeout: float, check: bool) -> str:
+        """
+        Run a single attempt in its own process group.
+
+        Program replacements are applied here, so error messages and
+        command kinds still refer to the requested program.
+
+        Args:
+            command: List of command arguments.
+            timeout: Timeout for this attempt in seconds.
+            check: If True, raise CalledProcessError on non-zero exit.
+
+        Returns:
+            Command stdout as string.
+
+        Raises:
+            TimeoutExpired: If the attempt exceeds its timeout.
+            CalledProcessError: If check=True and the command fails.
+        """
+        process = subprocess.Popen(
+            resolve_command(command, self.programs),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            check=check
+            start_new_session=True,
         )
-        return result.stdout
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except BaseException:
+            # Timeout or cancellation (e.g. Ctrl-C): take down the whole group
+            # so helpers spawned by the command cannot keep the pipes open
+            self._kill_process_group(process)
+            raise
+
+        if check and process.returncode != 0:
+            raise subprocess.CalledProcessError(
+                process.returncode, command, output=stdout, stderr=stderr
+            )
+        return stdout
+
+    @staticmethod
+    def _kill_process_group(process: subprocess.Popen[str]) -> None:
+        """
+        Terminate the process group of a running command.
+
+        Sends SIGTERM, waits a short grace period, then sends SIGKILL.
+
+        Args:
+            process: Process started with start_new_session=True.
+        """
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                break
+            try:
+                process.communicate(timeout=KILL_GRACE_SECONDS)
+                break
+            except subprocess.TimeoutExpired:
+                continue
@@ -0,0 +1,348 @@
+"""Index of installed applications with on-disk caching."""
+
+import json
+import os
+import plistlib
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+from xml.parsers.expat import ExpatError
+
+from dock.utils.files import atomic_write, cache_dir
+
+# Directories searched for application bundles, in priority order
+DEFAULT_APP_ROOTS: tuple[Path, ...] = (
+    Path("/Applications"),
+    Path("/System/Applications"),
+    Path.home() / "Applications",
+)
+
+# How deep to descend into plain folders such as /Applications/Utilities
+MAX_SCAN_DEPTH = 3
+
+CACHE_VERSION = 1
+
+
+def default_app_path(name: str) -> str:
+    """
+    Get the path dockutil has historically been given for an app name.
+
+    Args:
+        name: Application name.
+
+    Returns:
+        Path under /Applications.
+    """
+    return f"/Applications/{name}.app"
+
+
+@dataclass(frozen=True)
+class AppEntry:
+    """An installed application bundle."""
+
+    name: str
+    path: str
+    bundle_id: str | None = None
+    display_name: str | None = None
+
+
+@dataclass
+class _DirectoryScan:
+    """Cached scan result for a single directory."""
+
+    mtime_ns: int
+    apps: list[AppEntry] = field(default_factory=list)
+    subdirs: list[str] = field(default_factory=list)
+
+
+def read_app_entry(bundle: Path) -> AppEntry:
+    """
+    Build an AppEntry from an application bundle's Info.plist.
+
+    Args:
+        bundle: Path to the .app bundle.
+
+    Returns:
+        AppEntry; bundle id and display name are None if Info.plist is
+        missing or unreadable.
+    """
+    bundle_id = None
+    display_name = None
+    try:
+        with open(bundle / "Contents" / "Info.plist", "rb") as f:
+            info = plistlib.load(f)
+        if isinstance(info, dict):
+            raw_id = info.get("CFBundleIdentifier")
+            raw_name = info.get("CFBundleDisplayName") or info.get("CFBundleName")
+            bundle_id = raw_id if isinstance(raw_id, str) else None
+            display_name = raw_name if isinstance(raw_name, str) else None
+    except (OSError, plistlib.InvalidFileException, ValueError, ExpatError):
+        # Broken or unreadable bundles are still indexed by file name
+        pass
+
+    return AppEntry(
+        name=bundle.name[: -len(".app")],
+        path=str(bundle),
+        bundle_id=bundle_id,
+        display_name=display_name,
+    )
+
+
+class ApplicationIndex:
+    """Resolves app names and bundle ids to installed application bundles."""
+
+    def __init__(
+        self,
+        roots: Sequence[Path] = DEFAULT_APP_ROOTS,
+        cache_path: Path | None = None,
+    ):
+        """
+        Initialize ApplicationIndex.
+
+        The index is built lazily on first lookup.
+
+        Args:
+            roots: Directories to scan, in priority order.
+            cache_path: Path of the on-disk cache file. Defaults to
+                       apps.json in the dock cache directory.
+        """
+        self.roots = list(roots)
+        self.cache_path = cache_path or cache_dir() / "apps.json"
+        self._by_name: dict[str, AppEntry] | None = None
+        self._by_bundle_id: dict[str, AppEntry] = {}
+        self._fingerprint = ""
+
+    @classmethod
+    def from_entries(cls, entries: Sequence[AppEntry], fingerprint: str = "") -> ApplicationIndex:
+        """
+        Build an index from known entries without scanning the disk.
+
+        Used to plan against application lists captured on another machine.
+
+        Args:
+            entries: Entries in priority order.
+            fingerprint: Fingerprint to report for the entries.
+
+        Returns:
+            ApplicationIndex that never scans or writes its cache.
+        """
+        index = cls(roots=[])
+        index._set_entries(entries)
+        index._fingerprint = fingerprint
+        return index
+
+    def entries(self) -> list[AppEntry]:
+        """
+        Get all indexed applications.
+
+        Returns:
+            AppEntry list in priority order, without duplicates.
+        """
+        by_name = self._ensure_loaded()
+        return list(dict.fromkeys(by_name.values()))
+
+    def resolve(self, ref: str) -> AppEntry | None:
+        """
+        Resolve an app name, display name or bundle id.
+
+        Args:
+            ref: Reference from configuration.
+
+        Returns:
+            Matching AppEntry, or None if the app is not installed.
+        """
+        by_name = self._ensure_loaded()
+        key = ref.casefold()
+        return by_name.get(key) or self._by_bundle_id.get(key)
+
+    def path_for(self, ref: str) -> str:
+        """
+        Get the bundle path to pass to dockutil for a reference.
+
+        Args:
+            ref: App name, display name or bundle id.
+
+        Returns:
+            Resolved bundle path, or the /Applications fallback.
+        """
+        entry = self.resolve(ref)
+        return entry.path if entry else default_app_path(ref)
+
+    def canonical_name(self, ref: str) -> str:
+        """
+        Get the app name for a reference that may be a bundle id.
+
+        Args:
+            ref: App name, display name or bundle id.
+
+        Returns:
+            Bundle file name for resolvable references, otherwise ref.
+        """
+        entry = self.resolve(ref)
+        return entry.name if entry else ref
+
+    def fingerprint(self) -> str:
+        """
+        Get a value that changes whenever any scanned directory changes.
+
+        Returns:
+            Opaque fingerprint string.
+        """
+        self._ensure_loaded()
+        return self._fingerprint
+
+    def _ensure_loaded(self) -> dict[str, AppEntry]:
+        """
+        Build the lookup tables on first use.
+
+        Returns:
+            Mapping of casefolded names to entries.
+        """
+        if self._by_name is None:
+            self._build()
+        assert self._by_name is not None
+        return self._by_name
+
+    def _build(self) -> None:
+        """Scan all roots in parallel, reusing unchanged cached directories."""
+        cached = self._load_cache()
+        with ThreadPoolExecutor(max_workers=max(1, len(self.roots))) as pool:
+            results = list(pool.map(lambda root: self._scan_root(root, cached), self.roots))
+
+        scans: dict[str, _DirectoryScan] = {}
+        for root_scans in results:
+            scans.update(root_scans)
+
+        # Earlier roots and shallower folders win over later ones
+        self._set_entries(
+            entry
+            for root_scans in results
+            for scan in root_scans.values()
+            for entry in scan.apps
+        )
+        self._fingerprint = ",".join(
+            f"{path}:{scan.mtime_ns}" for path, scan in sorted(scans.items())
+        )
+
+        if scans != cached:
+            self._save_cache(scans)
+
+    def _set_entries(self, entries: Iterable[AppEntry]) -> None:
+        """
+        Build the lookup tables from entries in priority order.
+
+        Args:
+            entries: Entries; earlier ones win on name or bundle id clashes.
+        """
+        by_name: dict[str, AppEntry] = {}
+        by_bundle_id: dict[str, AppEntry] = {}
+        for entry in entries:
+            by_name.setdefault(entry.name.casefold(), entry)
+            if entry.bundle_id:
+                by_bundle_id.setdefault(entry.bundle_id.casefold(), entry)
+        for entry in list(by_name.values()):
+            if entry.display_name:
+                by_name.setdefault(entry.display_name.casefold(), entry)
+
+        self._by_name = by_name
+        self._by_bundle_id = by_bundle_id
+
+    def _scan_root(
+        self, root: Path, cached: dict[str, _DirectoryScan]
+    ) -> dict[str, _DirectoryScan]:
+        """
+        Scan a root directory and its plain subfolders.
+
+        Args:
+            root: Root directory.
+            cached: Previously cached scans keyed by directory path.
+
+        Returns:
+            Scans keyed by directory path, in breadth-first order.
+        """
+        scans: dict[str, _DirectoryScan] = {}
+        pending: list[tuple[str, int]] = [(str(root), 0)]
+        while pending:
+            directory, depth = pending.pop(0)
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+
+            scan = cached.get(directory)
+            if scan is None or scan.mtime_ns != mtime_ns:
+                scan = self._scan_directory(Path(directory), mtime_ns)
+            scans[directory] = scan
+
+            if depth < MAX_SCAN_DEPTH:
+                pending.extend((subdir, depth + 1) for subdir in scan.subdirs)
+        return scans
+
+    @staticmethod
+    def _scan_directory(directory: Path, mtime_ns: int) -> _DirectoryScan:
+        """
+        List one directory, reading Info.plist for each bundle.
+
+        Args:
+            directory: Directory to list.
+            mtime_ns: Modification time recorded for cache invalidation.
+
+        Returns:
+            Scan of the directory.
+        """
+        scan = _DirectoryScan(mtime_ns=mtime_ns)
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            return scan
+
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            if entry.name.endswith(".app"):
+                scan.apps.append(read_app_entry(Path(entry.path)))
+            elif entry.is_dir(follow_symlinks=False):
+                scan.subdirs.append(entry.path)
+        return scan
+
+    def _load_cache(self) -> dict[str, _DirectoryScan]:
+        """
+        Load cached directory scans.
+
+        Returns:
+            Scans keyed by directory path; empty if the cache is missing,
+            stale or unreadable.
+        """
+        try:
+            data = json.loads(self.cache_path.read_text())
+            if data.get("version") != CACHE_VERSION:
+                return {}
+            return {
+                path: _DirectoryScan(
+                    mtime_ns=scan["mtime_ns"],
+                    apps=[AppEntry(**app) for app in scan["apps"]],
+                    subdirs=scan["subdirs"],
+                )
+                for path, scan in data["directories"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _save_cache(self, scans: dict[str, _DirectoryScan]) -> None:
+        """
+        Write directory scans to the cache file.
+
+        Args:
+            scans: Scans keyed by directory path.
+        """
+        data: dict[str, Any] = {
+            "version": CACHE_VERSION,
+            "directories": {path: asdict(scan) for path, scan in scans.items()},
+        }
+        try:
+            atomic_write(self.cache_path, json.dumps(data).encode())
+        except OSError:
+            # The cache is an optimisation; failing to write it is harmless
+            pass
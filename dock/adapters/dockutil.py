@@ -1,38 +1,100 @@
 """Wrapper for dockutil commands."""
 
+from dataclasses import dataclass
 
 from dock.adapters import CommandExecutor, SubprocessExecutor
+from dock.adapters.apps import ApplicationIndex, default_app_path
+from dock.adapters.toolchain import DockutilToolchain
+
+
+def _is_stack_url(url: str) -> bool:
+    """Check if a dockutil --list URL is a folder or web link, not an app."""
+    if not url:
+        return False
+    if url.startswith("file://"):
+        return not url.rstrip("/").endswith(".app")
+    return "://" in url
+
+
+@dataclass(frozen=True)
+class DockTile:
+    """A tile as listed by dockutil --list."""
+
+    label: str
+    url: str
+    section: str
+    bundle_id: str | None = None
+
+    def is_app(self) -> bool:
+        """
+        Check if the tile is a permanently docked app.
+
+        Recent/active apps (recentApps), the persistentOthers section
+        (which includes the Downloads folder) and folder or URL stacks
+        pinned among the apps are excluded.
+
+        Returns:
+            True for app tiles in the persistentApps section.
+        """
+        return self.section == "persistentApps" and not _is_stack_url(self.url)
 
 
 class DockutilCommand:
     """Wrapper for dockutil commands."""
 
-    def __init__(self, executor: CommandExecutor | None = None):
+    def __init__(
+        self,
+        executor: CommandExecutor | None = None,
+        app_index: ApplicationIndex | None = None,
+        toolchain: DockutilToolchain | None = None,
+    ):
         """
         Initialize DockutilCommand.
 
         Args:
             executor: CommandExecutor instance for running commands.
                      Defaults to SubprocessExecutor if not provided.
+            app_index: ApplicationIndex used to resolve app bundle paths.
+                      Apps are assumed to live in /Applications if not provided.
+            toolchain: Probed dockutil, if known. Enables operations that
+                      depend on its version and options.
         """
         self.executor = executor or SubprocessExecutor()
+        self.app_index = app_index
+        self.toolchain = toolchain
 
     def check_installed(self) -> bool:
         """
         Check if dockutil is installed.
 
+        A probed toolchain answers without running ``which``.
+
         Returns:
             True if dockutil is available, False otherwise.
         """
+        if self.toolchain is not None:
+            return True
         result = self.executor.execute(["which", "dockutil"], check=False)
         return bool(result.strip())
 
-    def list_apps(self) -> list[str]:
+    def supports(self, flag: str) -> bool:
         """
-        List current dock apps.
+        Check if the probed dockutil accepts an option.
+
+        Args:
+            flag: Option name, e.g. "--move".
 
         Returns:
-            List of permanently docked app names (excludes recent/active apps and folders).
+            True if it does, False if it doesn't or dockutil wasn't probed.
+        """
+        return self.toolchain is not None and self.toolchain.supports(flag)
+
+    def list_tiles(self) -> list[DockTile]:
+        """
+        List every tile reported by dockutil.
+
+        Returns:
+            List of DockTile in Dock order, across all sections.
         """
         output = self.executor.execute(["dockutil", "--list"])
         if not output.strip():
@@ -40,30 +102,44 @@ class DockutilCommand:
 
         # Parse dockutil output - format is tab-separated:
         # AppName\tPath\tSection\tPlistPath\tBundleID
-        apps = []
+        tiles = []
         for line in output.strip().split("\n"):
             if line.strip():
-                # Split by tab and take the first field (app name)
                 parts = line.split("\t")
                 if len(parts) >= 3:
-                    app_name = parts[0].strip()
-                    section = parts[2].strip()
-                    # Only include apps from persistentApps section
-                    # Exclude recentApps (currently running but not permanent)
-                    # Exclude persistentOthers (which includes Downloads folder)
-                    if section == "persistentApps":
-                        apps.append(app_name)
-        return apps
+                    bundle_id = parts[4].strip() if len(parts) >= 5 else ""
+                    tiles.append(
+                        DockTile(
+                            label=parts[0].strip(),
+                            url=parts[1].strip(),
+                            section=parts[2].strip(),
+                            bundle_id=bundle_id or None,
+                        )
+                    )
+        return tiles
+
+    def list_apps(self) -> list[str]:
+        """
+        List current dock apps.
+
+        Returns:
+            List of permanently docked app names (excludes recent/active apps,
+            folders and URLs).
+        """
+        return [tile.label for tile in self.list_tiles() if tile.is_app()]
 
     def add_app(self, app_name: str, position: int | None = None) -> None:
         """
         Add app to dock.
 
         Args:
-            app_name: Name of the application to add.
+            app_name: Name or bundle id of the application to add.
             position: Optional position in dock (1-indexed).
         """
-        app_path = f"/Applications/{app_name}.app"
+        if self.app_index is not None:
+            app_path = self.app_index.path_for(app_name)
+        else:
+            app_path = default_app_path(app_name)
         command = ["dockutil", "--add", app_path]
 
         if position is not None:
@@ -82,6 +158,17 @@ class DockutilCommand:
         command = ["dockutil", "--remove", app_name, "--no-restart"]
         self.executor.execute(command)
 
+    def move_app(self, app_name: str, position: int) -> None:
+        """
+        Move a docked app to a new position.
+
+        Args:
+            app_name: Name of the application to move.
+            position: New position in dock (1-indexed).
+        """
+        command = ["dockutil", "--move", app_name, "--position", str(position), "--no-restart"]
+        self.executor.execute(command)
+
     def remove_all(self) -> None:
         """Remove all apps from dock."""
         command = ["dockutil", "--remove", "all", "--no-restart"]
@@ -0,0 +1,45 @@
+"""Wrapper for git commands."""
+
+from pathlib import Path
+
+from dock.adapters import CommandExecutor, SubprocessExecutor
+
+
+class GitCommand:
+    """Wrapper for git commands."""
+
+    def __init__(self, executor: CommandExecutor | None = None):
+        """
+        Initialize GitCommand.
+
+        Args:
+            executor: CommandExecutor instance for running commands.
+                     Defaults to SubprocessExecutor if not provided.
+        """
+        self.executor = executor or SubprocessExecutor()
+
+    def changed_files(self, root: Path, ref: str, patterns: list[str]) -> list[Path]:
+        """
+        List files under a directory that changed since a git ref.
+
+        Includes files modified, added or renamed relative to the ref
+        (staged or not) and untracked files that aren't ignored.
+
+        Args:
+            root: Directory inside a git work tree.
+            ref: Git ref to compare against (e.g. HEAD, origin/main).
+            patterns: Pathspecs to restrict the result (e.g. "*.yml").
+
+        Returns:
+            Sorted list of existing changed files.
+        """
+        changed = self.executor.execute(
+            ["git", "-C", str(root), "diff", "--name-only", "--relative",
+             "--diff-filter=ACMR", ref, "--", *patterns]
+        )
+        untracked = self.executor.execute(
+            ["git", "-C", str(root), "ls-files", "--others", "--exclude-standard",
+             "--", *patterns]
+        )
+        names = {line.strip() for line in (changed + "\n" + untracked).splitlines()}
+        return sorted(root / name for name in names if name and (root / name).is_file())
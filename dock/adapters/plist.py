@@ -4,6 +4,8 @@ import plistlib
 from pathlib import Path
 from typing import Any
 
+from dock.utils.files import atomic_write
+
 
 class PlistManager:
     """Manages dock plist file operations."""
@@ -33,8 +35,37 @@ class PlistManager:
         Args:
             data: Dictionary to write to plist file.
         """
-        with open(self.DOCK_PLIST, "wb") as f:
-            plistlib.dump(data, f)
+        atomic_write(self.DOCK_PLIST, plistlib.dumps(data))
+
+    def read_bytes(self) -> bytes:
+        """
+        Read the raw bytes of the dock plist file.
+
+        Returns:
+            Plist file contents, unparsed.
+
+        Raises:
+            FileNotFoundError: If plist file doesn't exist.
+        """
+        return self.DOCK_PLIST.read_bytes()
+
+    def write_bytes(self, data: bytes) -> None:
+        """
+        Replace the dock plist file with raw bytes in one atomic write.
+
+        Args:
+            data: Plist file contents.
+
+        Raises:
+            ValueError: If data is not a valid plist dictionary.
+        """
+        try:
+            parsed = plistlib.loads(data)
+        except Exception as e:  # plistlib raises several parser-specific errors
+            raise ValueError("Refusing to write invalid plist data") from e
+        if not isinstance(parsed, dict):
+            raise ValueError("Refusing to write plist without a top-level dictionary")
+        atomic_write(self.DOCK_PLIST, data)
 
     def read_value(self, key: str, default: Any = None) -> Any:
         """
@@ -62,6 +93,19 @@ class PlistManager:
         plist[key] = value
         self.write_plist(plist)
 
+    def write_values(self, values: dict[str, Any]) -> None:
+        """
+        Write several values to dock plist in one read-modify-write.
+
+        Args:
+            values: Mapping of plist key to value.
+        """
+        if not values:
+            return
+        plist = self.read_plist()
+        plist.update(values)
+        self.write_plist(plist)
+
     def read_autohide(self) -> bool:
         """
         Read autohide setting.
@@ -0,0 +1,172 @@
+"""Probe of the installed dockutil with on-disk caching."""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dock.adapters import CommandError, CommandExecutor, SubprocessExecutor, resolve_command
+from dock.utils.files import atomic_write, cache_dir
+
+CACHE_VERSION = 1
+
+# Option names in --help output, e.g. "--move" or "--no-restart"
+_FLAG = re.compile(r"(?<![\w-])--[a-z][a-z-]*")
+_VERSION = re.compile(r"\d+(?:\.\d+)*")
+
+
+@dataclass(frozen=True)
+class DockutilToolchain:
+    """
+    The dockutil that commands run: its command line, version and options.
+
+    Behaviour is gated on the options its --help lists, not on the version
+    number, which is only kept for reporting.
+    """
+
+    command: tuple[str, ...]
+    version: str
+    flags: frozenset[str] = frozenset()
+
+    def supports(self, flag: str) -> bool:
+        """
+        Check if dockutil accepts an option.
+
+        Args:
+            flag: Option name, e.g. "--move".
+
+        Returns:
+            True if its --help lists the option, False otherwise.
+        """
+        return flag in self.flags
+
+    def programs(self) -> dict[str, tuple[str, ...]]:
+        """
+        Get the program replacement for SubprocessExecutor.
+
+        Returns:
+            Mapping of "dockutil" to the absolute command line.
+        """
+        return {"dockutil": self.command}
+
+
+class ToolchainProbe:
+    """
+    Finds dockutil and asks it for its version and options.
+
+    The result is cached keyed by the binary's inode, modification time
+    and size, so a reset spawns no lookup or probe process until dockutil
+    is upgraded or replaced.
+    """
+
+    FILE_NAME = "toolchain.json"
+
+    def __init__(
+        self,
+        executor: CommandExecutor | None = None,
+        cache_path: Path | None = None,
+    ):
+        """
+        Initialize ToolchainProbe.
+
+        Args:
+            executor: CommandExecutor used to run the probe commands.
+                     Defaults to SubprocessExecutor if not provided.
+            cache_path: Path of the on-disk cache file. Defaults to
+                       toolchain.json in the dock cache directory.
+        """
+        self.executor = executor or SubprocessExecutor()
+        self.cache_path = cache_path or cache_dir() / self.FILE_NAME
+
+    def probe(self) -> DockutilToolchain | None:
+        """
+        Get the dockutil toolchain, from the cache when the binary is unchanged.
+
+        DOCK_DOCKUTIL is honoured, so a stand-in is probed like the real
+        dockutil.
+
+        Returns:
+            DockutilToolchain, or None if dockutil is not found or can't run.
+        """
+        command = resolve_command(["dockutil"])
+        binary = shutil.which(command[0])
+        if binary is None:
+            return None
+        command = [os.path.abspath(binary), *command[1:]]
+        try:
+            stat = os.stat(binary)
+        except OSError:
+            return None
+        key = {
+            "inode": stat.st_ino,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+        cache = self._load_cache()
+        name = " ".join(command)
+        cached = cache.get(name)
+        if cached is not None and cached.get("key") == key:
+            return DockutilToolchain(
+                command=tuple(command),
+                version=cached["version"],
+                flags=frozenset(cached["flags"]),
+            )
+
+        try:
+            toolchain = self._detect(command)
+        except (OSError, subprocess.SubprocessError, CommandError):
+            return None
+        cache[name] = {
+            "key": key,
+            "version": toolchain.version,
+            "flags": sorted(toolchain.flags),
+        }
+        self._save_cache(cache)
+        return toolchain
+
+    def _detect(self, command: list[str]) -> DockutilToolchain:
+        """Run dockutil --version and --help."""
+        version_output = self.executor.execute([*command, "--version"], check=False)
+        match = _VERSION.search(version_output)
+        help_output = self.executor.execute([*command, "--help"], check=False)
+        return DockutilToolchain(
+            command=tuple(command),
+            version=match.group() if match else "unknown",
+            flags=frozenset(_FLAG.findall(help_output)),
+        )
+
+    def _load_cache(self) -> dict[str, Any]:
+        """
+        Load cached probes.
+
+        Returns:
+            Probes keyed by command line; empty if the cache is missing,
+            from another version or unreadable.
+        """
+        try:
+            data = json.loads(self.cache_path.read_text())
+            if data.get("version") != CACHE_VERSION:
+                return {}
+            tools = data["tools"]
+            return tools if isinstance(tools, dict) else {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save_cache(self, tools: dict[str, Any]) -> None:
+        """
+        Write probes to the cache file.
+
+        Args:
+            tools: Probes keyed by command line.
+        """
+        data = {"version": CACHE_VERSION, "tools": tools}
+        try:
+            atomic_write(self.cache_path, json.dumps(data).encode())
+        except OSError:
+            # The cache is an optimisation; failing to write it is harmless
+            pass
@@ -1,57 +1,346 @@
 """CLI entry point for dock command."""
 
 import sys
+from pathlib import Path
+from typing import Literal
 
 import click
 
+from dock.adapters import CommandError
+from dock.dock.backups import RetentionPolicy
+from dock.dock.history import OUTCOMES
 from dock.services.backup_service import BackupService
+from dock.services.history_service import HistoryService
+from dock.services.profile_service import ProfileService
+from dock.services.report_service import ReportService
 from dock.services.reset_service import ResetService
+from dock.services.restore_service import RestoreService
+from dock.services.rollback_service import RollbackService
 from dock.services.show_service import ShowService
+from dock.services.snapshot_service import SnapshotService
 from dock.services.validate_service import ValidateService
-from dock.utils.output import print_error
+from dock.utils import events, memory, profiling
+from dock.utils.output import print_command_error, print_error, print_memory_report
 
 
 @click.group()
 @click.version_option(version="0.2.2")
-def cli() -> None:
+@click.option(
+    "--output",
+    type=click.Choice(["text", "ndjson"]),
+    default="text",
+    show_default=True,
+    help="Human-readable text, or one JSON event per line for scripts",
+)
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False),
+    help="Profile the whole command and write the profile to this file",
+)
+@click.option(
+    "--profile-format",
+    type=click.Choice(profiling.FORMATS),
+    default="pstats",
+    show_default=True,
+    help="Profile format: pstats, speedscope (speedscope.app) or chrome-trace (Perfetto)",
+)
+@click.option(
+    "--mem-report",
+    is_flag=True,
+    help="Trace allocations and report peak memory and top allocation sites per phase",
+)
+@click.pass_context
+def cli(
+    ctx: click.Context,
+    output: str,
+    profile_out: str | None,
+    profile_format: str,
+    mem_report: bool,
+) -> None:
     """Manage macOS Dock from YAML configuration."""
-    pass
+    if output == "ndjson":
+        events.enable(sys.stdout)
+        ctx.call_on_close(events.finish)
+    if mem_report:
+        memory.start()
+        ctx.call_on_close(lambda: print_memory_report(memory.stop()))
+    if profile_out is not None:
+        # Usually already started by the entry point, to include imports
+        profiling.start(Path(profile_out), profile_format)
+        ctx.call_on_close(profiling.stop)
 
 
 @cli.command()
 @click.option(
     "--file", "-f", type=click.Path(exists=True), help="Config file path"
 )
-@click.option("--profile", help="Profile name from ~/.config/dock/profiles/")
+@click.option(
+    "--profile",
+    multiple=True,
+    help="Profile name from ~/.config/dock/profiles/ (repeat with --dry-run to compare)",
+)
+@click.option(
+    "--all-profiles",
+    is_flag=True,
+    help="With --dry-run, plan every profile against the current Dock",
+)
 @click.option("--dry-run", is_flag=True, help="Show changes without applying")
-def reset(file: str | None, profile: str | None, dry_run: bool) -> None:
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Overall time limit in seconds for dockutil commands",
+)
+@click.option("--resume", is_flag=True, help="Continue an interrupted reset")
+@click.option(
+    "--missing-apps",
+    type=click.Choice(["skip", "fail"]),
+    default="skip",
+    show_default=True,
+    help="Skip apps that are not installed, or abort before changing anything",
+)
+@click.option(
+    "--state-from",
+    type=click.Path(exists=True, dir_okay=False),
+    help="With --dry-run, plan against a state file from 'dock snapshot'",
+)
+@click.option(
+    "--metrics-file",
+    type=click.Path(dir_okay=False),
+    help="Write run metrics to this .prom file for node_exporter's textfile collector",
+)
+def reset(
+    file: str | None,
+    profile: tuple[str, ...],
+    all_profiles: bool,
+    dry_run: bool,
+    deadline: float | None,
+    resume: bool,
+    missing_apps: Literal["skip", "fail"],
+    state_from: str | None,
+    metrics_file: str | None,
+) -> None:
     """Apply dock configuration from file."""
     try:
+        if state_from is not None and (not dry_run or resume):
+            raise click.UsageError("--state-from requires --dry-run and can't resume")
         service = ResetService()
-        service.execute(file_path=file, profile=profile, dry_run=dry_run)
+        if all_profiles or len(profile) > 1:
+            if not dry_run:
+                raise click.UsageError(
+                    "--all-profiles and repeated --profile require --dry-run"
+                )
+            if file is not None or resume:
+                raise click.UsageError(
+                    "--all-profiles and repeated --profile can't be combined "
+                    "with --file or --resume"
+                )
+            if deadline is not None or metrics_file is not None:
+                raise click.UsageError(
+                    "--all-profiles and repeated --profile can't be combined "
+                    "with --deadline or --metrics-file"
+                )
+            service.plan_profiles(
+                profiles=[] if all_profiles else list(profile),
+                missing_apps=missing_apps,
+                state_from=state_from,
+            )
+            return
+        service.execute(
+            file_path=file,
+            profile=profile[0] if profile else None,
+            dry_run=dry_run,
+            deadline=deadline,
+            resume=resume,
+            missing_apps=missing_apps,
+            state_from=state_from,
+            metrics_file=metrics_file,
+        )
+    except click.UsageError:
+        raise
+    except CommandError as e:
+        print_command_error(e)
+        sys.exit(1)
     except Exception as e:
         print_error(f"Error: {e}")
         sys.exit(1)
 
 
 @cli.command()
-@click.option("--file", "-f", required=True, type=click.Path(), help="Output file path")
-def backup(file: str) -> None:
-    """Export current dock configuration to file."""
+def rollback() -> None:
+    """Restore the Dock as it was before the last reset."""
+    try:
+        service = RollbackService()
+        service.execute()
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option("--file", "-f", type=click.Path(), help="Output file path")
+@click.option(
+    "--store",
+    type=click.Path(file_okay=False),
+    help="Back up into a deduplicated backup store directory",
+)
+@click.option(
+    "--raw",
+    is_flag=True,
+    help="Copy the Dock plist tiles and settings verbatim, for 'dock restore'",
+)
+@click.option("--list", "list_backups", is_flag=True, help="List the backups in --store")
+@click.option("--keep-last", type=click.IntRange(min=1), help="Keep the N newest backups")
+@click.option(
+    "--keep-daily", type=click.IntRange(min=1), help="Keep the newest backup of N days"
+)
+@click.option(
+    "--keep-weekly", type=click.IntRange(min=1), help="Keep the newest backup of N weeks"
+)
+def backup(
+    file: str | None,
+    store: str | None,
+    raw: bool,
+    list_backups: bool,
+    keep_last: int | None,
+    keep_daily: int | None,
+    keep_weekly: int | None,
+) -> None:
+    """Export current dock configuration to a file or backup store."""
+    if file is None and store is None:
+        raise click.UsageError("Missing option '--file' or '--store'")
+    if file is not None and store is not None:
+        raise click.UsageError("--file and --store can't be combined")
+    policy = RetentionPolicy(keep_last=keep_last, keep_daily=keep_daily, keep_weekly=keep_weekly)
+    if store is None and (list_backups or policy.is_set()):
+        raise click.UsageError("--list and --keep-* options require --store")
     try:
         service = BackupService()
-        service.execute(file_path=file)
+        if store is not None and list_backups:
+            service.list_store(store_dir=store)
+        elif store is not None:
+            service.execute_store(store_dir=store, policy=policy, raw=raw)
+        else:
+            service.execute(file_path=str(file), raw=raw)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("file", required=False, type=click.Path(dir_okay=False))
+@click.option(
+    "--store",
+    type=click.Path(exists=True, file_okay=False),
+    help="Restore from a backup store instead of a file",
+)
+@click.option(
+    "--ref",
+    help="Hash prefix of the backup in --store (default: newest raw backup of this host)",
+)
+@click.option("--dry-run", is_flag=True, help="Show which keys would change without restoring")
+def restore(file: str | None, store: str | None, ref: str | None, dry_run: bool) -> None:
+    """Restore a raw backup from 'dock backup --raw' in one write."""
+    if (file is None) == (store is None):
+        raise click.UsageError("Pass a backup FILE or --store")
+    if ref is not None and store is None:
+        raise click.UsageError("--ref requires --store")
+    try:
+        service = RestoreService()
+        service.execute(file_path=file, store_dir=store, ref=ref, dry_run=dry_run)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--baseline",
+    "-b",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Configuration the machines should match",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=10,
+    show_default=True,
+    help="Number of drifts and drifting groups to list",
+)
+def report(directory: str, baseline: str, top: int) -> None:
+    """Report how machines' 'dock backup' files drift from a baseline."""
+    try:
+        service = ReportService()
+        service.execute(directory=directory, baseline_path=baseline, top=top)
     except Exception as e:
         print_error(f"Error: {e}")
         sys.exit(1)
 
 
 @cli.command()
-def show() -> None:
+@click.option("--since", help="Runs since an ISO date/time or an age such as 12h or 7d")
+@click.option("--until", help="Runs before an ISO date/time or an age")
+@click.option("--profile", help="Only runs of this profile")
+@click.option(
+    "--outcome",
+    type=click.Choice(OUTCOMES),
+    help="Only runs with this outcome",
+)
+@click.option(
+    "--limit",
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True,
+    help="Number of runs to list",
+)
+def history(
+    since: str | None,
+    until: str | None,
+    profile: str | None,
+    outcome: str | None,
+    limit: int,
+) -> None:
+    """List past resets with their outcome and timings, newest first."""
+    try:
+        service = HistoryService()
+        service.execute(
+            since=since, until=until, profile=profile, outcome=outcome, limit=limit
+        )
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--state-from",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Show a state file from 'dock snapshot' instead of the live Dock",
+)
+def show(state_from: str | None) -> None:
     """Display current dock configuration as YAML."""
     try:
         service = ShowService()
-        service.execute()
+        service.execute(state_from=state_from)
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--output",
+    "-o",
+    default="-",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="State file to write (default: stdout)",
+)
+def snapshot(output: str) -> None:
+    """Capture the Dock state for planning elsewhere with --state-from."""
+    try:
+        service = SnapshotService()
+        service.execute(output=output)
     except Exception as e:
         print_error(f"Error: {e}")
         sys.exit(1)
@@ -60,11 +349,83 @@ def show() -> None:
 @cli.command()
 @click.option("--file", "-f", type=click.Path(exists=True), help="Config file path")
 @click.option("--profile", help="Profile name from ~/.config/dock/profiles/")
-def validate(file: str | None, profile: str | None) -> None:
-    """Validate configuration file."""
+@click.option(
+    "--all",
+    "validate_all",
+    is_flag=True,
+    help="Validate every profile under DIRECTORY (default: ~/.config/dock/profiles/)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    help="Worker processes for --all (default: CPU count)",
+)
+@click.option(
+    "--changed-since",
+    metavar="REF",
+    help="With --all, only validate files changed since a git ref",
+)
+@click.option("--no-cache", is_flag=True, help="Ignore and don't update the validation cache")
+@click.argument(
+    "directory", required=False, type=click.Path(exists=True, file_okay=False)
+)
+def validate(
+    file: str | None,
+    profile: str | None,
+    validate_all: bool,
+    jobs: int | None,
+    changed_since: str | None,
+    no_cache: bool,
+    directory: str | None,
+) -> None:
+    """Validate configuration file, or a whole profiles tree with --all."""
     try:
         service = ValidateService()
-        service.execute(file_path=file, profile=profile)
+        if validate_all or changed_since is not None:
+            service.execute_all(
+                directory=directory,
+                jobs=jobs,
+                changed_since=changed_since,
+                use_cache=not no_cache,
+            )
+        elif directory is not None:
+            raise click.UsageError("DIRECTORY can only be used with --all")
+        else:
+            service.execute(file_path=file, profile=profile, use_cache=not no_cache)
+    except click.UsageError:
+        raise
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@cli.group()
+def profile() -> None:
+    """Compile profiles and switch between them."""
+    pass
+
+
+@profile.command(name="compile")
+@click.argument("names", nargs=-1)
+def profile_compile(names: tuple[str, ...]) -> None:
+    """Pre-render profiles for fast switching (default: all profiles)."""
+    try:
+        service = ProfileService()
+        service.compile(names=list(names))
+    except Exception as e:
+        print_error(f"Error: {e}")
+        sys.exit(1)
+
+
+@profile.command(name="switch")
+@click.argument("name")
+@click.option("--dry-run", is_flag=True, help="Show what would change without applying")
+def profile_switch(name: str, dry_run: bool) -> None:
+    """Switch to a compiled profile with one plist write and one Dock restart."""
+    try:
+        service = ProfileService()
+        service.switch(name=name, dry_run=dry_run)
     except Exception as e:
         print_error(f"Error: {e}")
         sys.exit(1)
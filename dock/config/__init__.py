@@ -1,7 +1,7 @@
 """Configuration module for dock CLI tool."""
 
 from dock.config.loader import ConfigLoader
-from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
 from dock.config.validator import ConfigValidator
 
 __all__ = [
@@ -10,4 +10,5 @@ __all__ = [
     "DockConfig",
     "DownloadsConfig",
     "SettingsConfig",
+    "StackConfig",
 ]
@@ -5,7 +5,8 @@ from typing import Any, Literal
 import cattrs
 from cattrs.gen import make_dict_structure_fn, override
 
-from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
+from dock.config.settings import SETTINGS
 
 
 def create_converter() -> cattrs.Converter:
@@ -29,16 +30,37 @@ def create_converter() -> cattrs.Converter:
         ),
     )
 
-    # Configure SettingsConfig to handle dict input
-    converter.register_structure_hook(
-        SettingsConfig,
-        make_dict_structure_fn(
-            SettingsConfig,
-            converter,
-            autohide=override(omit_if_default=False),
-            autohide_delay=override(omit_if_default=False),
-        ),
+    # Configure SettingsConfig from the settings registry. Keys may use the
+    # plist spelling (show-recents) or the field name (show_recents).
+    settings_overrides: dict[str, Any] = {
+        spec.name: override(omit_if_default=False) for spec in SETTINGS
+    }
+    structure_settings_fields = make_dict_structure_fn(
+        SettingsConfig, converter, **settings_overrides
     )
+    plist_key_names = {spec.plist_key: spec.name for spec in SETTINGS}
+
+    def structure_settings(data: dict[str, Any], cls: type) -> SettingsConfig:
+        """Structure SettingsConfig, accepting plist key spellings."""
+        if not isinstance(data, dict):
+            raise TypeError(f"settings must be a mapping, got {type(data).__name__}")
+        renamed = {plist_key_names.get(key, key): value for key, value in data.items()}
+        return structure_settings_fields(renamed, cls)
+
+    converter.register_structure_hook(SettingsConfig, structure_settings)
+
+    # Configure StackConfig to accept a bare path as shorthand
+    structure_stack_fields = make_dict_structure_fn(StackConfig, converter)
+
+    def structure_stack(data: str | dict[str, Any], cls: type) -> StackConfig:
+        """Structure StackConfig from a path string or a mapping."""
+        if isinstance(data, str):
+            return StackConfig(path=data)
+        if not isinstance(data, dict):
+            raise TypeError(f"stack must be a path or mapping, got {type(data).__name__}")
+        return structure_stack_fields(data, cls)
+
+    converter.register_structure_hook(StackConfig, structure_stack)
 
     # Configure DockConfig to handle the union type for downloads
     def structure_dock_config(data: dict[str, Any], _: type) -> DockConfig:
@@ -46,6 +68,8 @@ def create_converter() -> cattrs.Converter:
         apps = data.get("apps", [])
         settings_data = data.get("settings", {})
         downloads_data = data.get("downloads")
+        stacks_data = data.get("stacks")
+        managed = data.get("managed", "owned")
 
         # Structure settings
         settings = converter.structure(settings_data, SettingsConfig)
@@ -63,7 +87,22 @@ def create_converter() -> cattrs.Converter:
         else:
             raise ValueError(f"Invalid downloads value: {downloads_data}")
 
-        return DockConfig(apps=apps, downloads=downloads, settings=settings)
+        # Handle stacks field; omitted means stacks are not managed
+        stacks: list[StackConfig] | None
+        if stacks_data is None:
+            stacks = None
+        elif isinstance(stacks_data, list):
+            stacks = [converter.structure(item, StackConfig) for item in stacks_data]
+        else:
+            raise ValueError(f"Invalid stacks value: {stacks_data}")
+
+        return DockConfig(
+            apps=apps,
+            downloads=downloads,
+            settings=settings,
+            stacks=stacks,
+            managed=managed,
+        )
 
     converter.register_structure_hook(DockConfig, structure_dock_config)
 
@@ -71,6 +71,27 @@ class ConfigLoader:
             f"  - {system_config}"
         )
 
+    @staticmethod
+    def list_profiles() -> list[str]:
+        """
+        List the profiles in ~/.config/dock/profiles/.
+
+        Returns:
+            Sorted profile names, i.e. .yml and .yaml file names
+            without their extension.
+        """
+        profiles_dir = Path.home() / ".config" / "dock" / "profiles"
+        if not profiles_dir.is_dir():
+            return []
+        return sorted(
+            {
+                path.stem
+                for pattern in ("*.yml", "*.yaml")
+                for path in profiles_dir.glob(pattern)
+                if path.is_file()
+            }
+        )
+
     @staticmethod
     def load_config(path: Path) -> dict[str, Any]:
         """Load and parse YAML config file."""
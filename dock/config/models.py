@@ -1,38 +1,78 @@
 """Configuration models for dock."""
 
-from typing import Literal
+from typing import Any, Literal
 
 import attrs
 
-
-def _validate_autohide(
-    instance: SettingsConfig, attribute: attrs.Attribute[bool], value: bool
-) -> None:
-    """Validate autohide is a boolean."""
-    if not isinstance(value, bool):
-        raise TypeError(f"autohide must be a boolean, got {type(value).__name__}")
+from dock.config.settings import SETTINGS, SETTINGS_BY_NAME, SettingValue
 
 
-def _validate_autohide_delay(
-    instance: SettingsConfig, attribute: attrs.Attribute[float], value: float
+def _validate_setting(
+    instance: SettingsConfig, attribute: attrs.Attribute[Any], value: Any
 ) -> None:
-    """Validate autohide_delay is non-negative."""
-    if not isinstance(value, (int, float)):
-        raise TypeError(f"autohide_delay must be a number, got {type(value).__name__}")
-    if value < 0:
-        raise ValueError("autohide_delay must be non-negative")
+    """Validate a setting against its registry entry; None means unmanaged."""
+    if value is None:
+        return
+    SETTINGS_BY_NAME[attribute.name].validate(value)
 
 
 @attrs.define
 class SettingsConfig:
-    """Dock settings configuration."""
-
-    autohide: bool = attrs.field(default=False, validator=_validate_autohide)
-    autohide_delay: float = attrs.field(default=0.0, validator=_validate_autohide_delay)
+    """
+    Dock settings configuration.
+
+    One field per entry in dock.config.settings.SETTINGS. Settings left as
+    None are not managed and keep whatever value the Dock already has.
+    """
+
+    autohide: bool = attrs.field(default=False, validator=_validate_setting)
+    autohide_delay: float = attrs.field(default=0.0, validator=_validate_setting)
+    autohide_time_modifier: float | None = attrs.field(
+        default=None, validator=_validate_setting
+    )
+    tilesize: int | None = attrs.field(default=None, validator=_validate_setting)
+    magnification: bool | None = attrs.field(default=None, validator=_validate_setting)
+    largesize: int | None = attrs.field(default=None, validator=_validate_setting)
+    orientation: Literal["left", "bottom", "right"] | None = attrs.field(
+        default=None, validator=_validate_setting
+    )
+    mineffect: Literal["genie", "scale", "suck"] | None = attrs.field(
+        default=None, validator=_validate_setting
+    )
+    minimize_to_application: bool | None = attrs.field(
+        default=None, validator=_validate_setting
+    )
+    show_recents: bool | None = attrs.field(default=None, validator=_validate_setting)
+    show_process_indicators: bool | None = attrs.field(
+        default=None, validator=_validate_setting
+    )
+    launchanim: bool | None = attrs.field(default=None, validator=_validate_setting)
+    static_only: bool | None = attrs.field(default=None, validator=_validate_setting)
+    showhidden: bool | None = attrs.field(default=None, validator=_validate_setting)
+    mru_spaces: bool | None = attrs.field(default=None, validator=_validate_setting)
+    scroll_to_open: bool | None = attrs.field(default=None, validator=_validate_setting)
+    expose_group_apps: bool | None = attrs.field(default=None, validator=_validate_setting)
 
     def __attrs_post_init__(self) -> None:
-        """Round autohide_delay to 2 decimals after initialization."""
-        object.__setattr__(self, "autohide_delay", round(self.autohide_delay, 2))
+        """Apply registry rounding (e.g. autohide_delay to 2 decimals)."""
+        for spec in SETTINGS:
+            value = getattr(self, spec.name)
+            if value is not None:
+                object.__setattr__(self, spec.name, spec.normalize(value))
+
+    def managed_values(self) -> dict[str, SettingValue]:
+        """
+        Get the settings this configuration manages.
+
+        Returns:
+            Mapping of setting name to value, skipping unmanaged settings.
+        """
+        values: dict[str, SettingValue] = {}
+        for spec in SETTINGS:
+            value = getattr(self, spec.name)
+            if value is not None:
+                values[spec.name] = value
+        return values
 
 
 @attrs.define
@@ -44,6 +84,42 @@ class DownloadsConfig:
     section: Literal["apps-left", "apps-right", "others"] = "others"
 
 
+def _validate_item_size(
+    instance: StackConfig, attribute: attrs.Attribute[int | None], value: int | None
+) -> None:
+    """Validate item_size is a positive integer when set."""
+    if value is None:
+        return
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError(f"item_size must be an integer, got {type(value).__name__}")
+    if value <= 0:
+        raise ValueError("item_size must be positive")
+
+
+@attrs.define
+class StackConfig:
+    """Folder or URL stack tile configuration."""
+
+    path: str
+    view: Literal["auto", "fan", "grid", "list"] = attrs.field(
+        default="auto", validator=attrs.validators.in_(("auto", "fan", "grid", "list"))
+    )
+    display: Literal["stack", "folder"] = attrs.field(
+        default="stack", validator=attrs.validators.in_(("stack", "folder"))
+    )
+    sort: Literal["name", "dateadded", "datemodified", "datecreated", "kind"] = attrs.field(
+        default="name",
+        validator=attrs.validators.in_(
+            ("name", "dateadded", "datemodified", "datecreated", "kind")
+        ),
+    )
+    section: Literal["apps", "others"] = attrs.field(
+        default="others", validator=attrs.validators.in_(("apps", "others"))
+    )
+    label: str | None = None
+    item_size: int | None = attrs.field(default=None, validator=_validate_item_size)
+
+
 def _validate_apps(
     instance: DockConfig, attribute: attrs.Attribute[list[str]], value: list[str]
 ) -> None:
@@ -59,3 +135,7 @@ class DockConfig:
     apps: list[str] = attrs.field(factory=list, validator=_validate_apps)
     downloads: Literal["off"] | DownloadsConfig | None = attrs.field(factory=DownloadsConfig)
     settings: SettingsConfig = attrs.field(factory=SettingsConfig)
+    stacks: list[StackConfig] | None = None
+    managed: Literal["owned", "strict"] = attrs.field(
+        default="owned", validator=attrs.validators.in_(("owned", "strict"))
+    )
@@ -0,0 +1,145 @@
+"""Registry of supported Dock preferences."""
+
+from dataclasses import dataclass
+from typing import Any
+
+SettingValue = bool | int | float | str
+
+
+@dataclass(frozen=True)
+class SettingSpec:
+    """Describes one Dock preference in com.apple.dock."""
+
+    name: str
+    plist_key: str
+    type: type[bool] | type[int] | type[float] | type[str]
+    default: SettingValue
+    minimum: float | None = None
+    maximum: float | None = None
+    choices: tuple[str, ...] | None = None
+    digits: int | None = None
+
+    def validate(self, value: Any) -> None:
+        """
+        Check a configured value against type, bounds and choices.
+
+        Args:
+            value: Value from configuration.
+
+        Raises:
+            TypeError: If the value has the wrong type.
+            ValueError: If the value is out of bounds or not a valid choice.
+        """
+        if self.type is bool:
+            if not isinstance(value, bool):
+                raise TypeError(f"{self.name} must be a boolean, got {type(value).__name__}")
+        elif self.type is str:
+            if not isinstance(value, str):
+                raise TypeError(f"{self.name} must be a string, got {type(value).__name__}")
+        elif self.type is int:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(f"{self.name} must be an integer, got {type(value).__name__}")
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(f"{self.name} must be a number, got {type(value).__name__}")
+
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"{self.name} must be one of {', '.join(self.choices)}")
+        if self.minimum is not None and value < self.minimum:
+            if self.minimum == 0:
+                raise ValueError(f"{self.name} must be non-negative")
+            raise ValueError(f"{self.name} must be at least {self.minimum:g}")
+        if self.maximum is not None and value > self.maximum:
+            raise ValueError(f"{self.name} must be at most {self.maximum:g}")
+
+    def normalize(self, value: SettingValue) -> SettingValue:
+        """
+        Apply rounding to a validated value.
+
+        Args:
+            value: Validated value.
+
+        Returns:
+            Value rounded to the registered number of digits, as a float
+            for float settings.
+        """
+        if self.type is float:
+            number = float(value)
+            return round(number, self.digits) if self.digits is not None else number
+        return value
+
+    def from_plist(self, raw: Any) -> SettingValue:
+        """
+        Convert a raw plist value to a setting value.
+
+        Args:
+            raw: Value read from the plist, or None if the key is absent.
+
+        Returns:
+            Normalized value, or the macOS default if raw is missing or invalid.
+        """
+        if raw is None:
+            return self.default
+        if self.type is bool:
+            return bool(raw) if isinstance(raw, (bool, int)) else self.default
+        if self.type is int:
+            if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+                return int(raw)
+            return self.default
+        if self.type is float:
+            if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+                return self.normalize(raw)
+            return self.default
+        if isinstance(raw, str) and (self.choices is None or raw in self.choices):
+            return raw
+        return self.default
+
+    def defaults_command(self, value: SettingValue) -> str:
+        """
+        Render the equivalent `defaults write` command.
+
+        Args:
+            value: Value to write.
+
+        Returns:
+            Shell command string.
+        """
+        if self.type is bool:
+            flag, rendered = "-bool", "true" if value else "false"
+        elif self.type is int:
+            flag, rendered = "-int", str(value)
+        elif self.type is float:
+            flag, rendered = "-float", str(value)
+        else:
+            flag, rendered = "-string", str(value)
+        return f"defaults write com.apple.dock {self.plist_key} {flag} {rendered}"
+
+
+# Every Dock preference dock can manage. SettingsConfig declares one field
+# per entry, typed and validated to match (tests/config/test_models.py
+# checks they agree); diffing, planning and writing are all driven by
+# this table.
+SETTINGS: tuple[SettingSpec, ...] = (
+    SettingSpec("autohide", "autohide", bool, False),
+    SettingSpec("autohide_delay", "autohide-delay", float, 0.0, minimum=0, digits=2),
+    SettingSpec(
+        "autohide_time_modifier", "autohide-time-modifier", float, 0.5, minimum=0, digits=2
+    ),
+    SettingSpec("tilesize", "tilesize", int, 48, minimum=16, maximum=128),
+    SettingSpec("magnification", "magnification", bool, False),
+    SettingSpec("largesize", "largesize", int, 64, minimum=16, maximum=128),
+    SettingSpec(
+        "orientation", "orientation", str, "bottom", choices=("left", "bottom", "right")
+    ),
+    SettingSpec("mineffect", "mineffect", str, "genie", choices=("genie", "scale", "suck")),
+    SettingSpec("minimize_to_application", "minimize-to-application", bool, False),
+    SettingSpec("show_recents", "show-recents", bool, True),
+    SettingSpec("show_process_indicators", "show-process-indicators", bool, True),
+    SettingSpec("launchanim", "launchanim", bool, True),
+    SettingSpec("static_only", "static-only", bool, False),
+    SettingSpec("showhidden", "showhidden", bool, False),
+    SettingSpec("mru_spaces", "mru-spaces", bool, True),
+    SettingSpec("scroll_to_open", "scroll-to-open", bool, False),
+    SettingSpec("expose_group_apps", "expose-group-apps", bool, False),
+)
+
+SETTINGS_BY_NAME: dict[str, SettingSpec] = {spec.name: spec for spec in SETTINGS}
@@ -0,0 +1,110 @@
+"""Cache of per-file validation results keyed on content hash."""
+
+import hashlib
+import json
+from pathlib import Path
+
+from dock import __version__
+from dock.utils.files import atomic_write, cache_dir
+
+
+def file_digest(path: Path) -> str:
+    """
+    Compute the content hash of a configuration file.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hex-encoded SHA-256 digest.
+
+    Raises:
+        OSError: If the file can't be read.
+    """
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ValidationCache:
+    """
+    Stores validation errors and warnings by file content hash.
+
+    Entries are only reused when the dock version and the environment
+    (e.g. the installed-application fingerprint, which decides "Application
+    not found" warnings) match the ones they were recorded with.
+    """
+
+    FORMAT_VERSION = 1
+    MAX_ENTRIES = 5000
+
+    def __init__(self, environment: str = "", path: Path | None = None):
+        """
+        Initialize ValidationCache.
+
+        Args:
+            environment: Opaque value that invalidates the cache when it changes.
+            path: Cache file. Defaults to validate.json in the dock cache directory.
+        """
+        self.path = path or cache_dir() / "validate.json"
+        self.environment = environment
+        self._entries: dict[str, dict[str, list[str]]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """Read the cache file, discarding it if stale or unreadable."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.FORMAT_VERSION
+            or data.get("dock_version") != __version__
+            or data.get("environment") != self.environment
+            or not isinstance(data.get("entries"), dict)
+        ):
+            return
+        self._entries = data["entries"]
+
+    def get(self, digest: str) -> tuple[list[str], list[str]] | None:
+        """
+        Look up the result for a file content hash.
+
+        Args:
+            digest: Content hash from file_digest.
+
+        Returns:
+            (errors, warnings), or None on a cache miss.
+        """
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+        return list(entry.get("errors", [])), list(entry.get("warnings", []))
+
+    def put(self, digest: str, errors: list[str], warnings: list[str]) -> None:
+        """
+        Record the result for a file content hash.
+
+        Args:
+            digest: Content hash from file_digest.
+            errors: Validation errors.
+            warnings: Validation warnings.
+        """
+        self._entries.pop(digest, None)
+        self._entries[digest] = {"errors": list(errors), "warnings": list(warnings)}
+        while len(self._entries) > self.MAX_ENTRIES:
+            del self._entries[next(iter(self._entries))]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk if anything changed."""
+        if not self._dirty:
+            return
+        data = {
+            "version": self.FORMAT_VERSION,
+            "dock_version": __version__,
+            "environment": self.environment,
+            "entries": self._entries,
+        }
+        atomic_write(self.path, json.dumps(data).encode())
+        self._dirty = False
@@ -1,19 +1,28 @@
 """Configuration validator for semantic checks."""
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dock.config.models import DockConfig, DownloadsConfig
+from dock.dock.stacks import is_url, stack_key
+
+if TYPE_CHECKING:
+    from dock.adapters.apps import ApplicationIndex
 
 
 class ConfigValidator:
     """Validates configuration semantics."""
 
     @staticmethod
-    def validate_config(config: DockConfig) -> list[str]:
+    def validate_config(
+        config: DockConfig, app_index: ApplicationIndex | None = None
+    ) -> list[str]:
         """
         Validate configuration and return list of warnings.
         - Check for duplicate app names
+        - Check apps are installed (when an application index is given)
         - Validate downloads path exists (when specified)
+        - Check stacks for duplicates and missing folders
         """
         warnings: list[str] = []
 
@@ -24,6 +33,12 @@ class ConfigValidator:
                 warnings.append(f"Duplicate app name found: {app}")
             seen_apps.add(app)
 
+        # Check apps resolve to installed bundles
+        if app_index is not None:
+            for app in config.apps:
+                if app_index.resolve(app) is None:
+                    warnings.append(f"Application not found: {app}")
+
         # Validate downloads path if specified
         if isinstance(config.downloads, DownloadsConfig):
             path_str = config.downloads.path
@@ -35,4 +50,24 @@ class ConfigValidator:
                     f"Downloads path does not exist: {path_str}"
                 )
 
+        # Validate stacks: duplicates, overlap with downloads, folder paths
+        if config.stacks is not None:
+            downloads_key = (
+                stack_key(config.downloads.path)
+                if isinstance(config.downloads, DownloadsConfig)
+                else None
+            )
+            seen_stacks = set()
+            for stack in config.stacks:
+                key = stack_key(stack.path)
+                if key in seen_stacks:
+                    warnings.append(f"Duplicate stack found: {stack.path}")
+                seen_stacks.add(key)
+                if key == downloads_key:
+                    warnings.append(
+                        f"Stack duplicates the downloads tile: {stack.path}"
+                    )
+                if not is_url(stack.path) and not Path(stack.path).expanduser().exists():
+                    warnings.append(f"Stack path does not exist: {stack.path}")
+
         return warnings
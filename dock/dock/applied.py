@@ -0,0 +1,52 @@
+"""Persistence of the last applied configuration for three-way diffs."""
+
+import json
+from pathlib import Path
+
+from dock.config.converter import converter
+from dock.config.models import DockConfig
+from dock.utils.files import atomic_write, state_dir
+
+
+class LastAppliedStore:
+    """Stores the configuration applied by the last successful reset."""
+
+    FILE_NAME = "last-applied.json"
+
+    def __init__(self, directory: Path | None = None):
+        """
+        Initialize LastAppliedStore.
+
+        Args:
+            directory: Directory holding the file.
+                      Defaults to the dock state directory.
+        """
+        self.path = (directory or state_dir()) / self.FILE_NAME
+
+    def load(self) -> DockConfig | None:
+        """
+        Load the last applied configuration.
+
+        Returns:
+            DockConfig, or None if nothing was applied yet or the file
+            can't be read (callers then fall back to a two-way diff).
+        """
+        try:
+            data = json.loads(self.path.read_text())
+            return converter.structure(data, DockConfig)
+        except Exception:
+            return None
+
+    def save(self, config: DockConfig) -> None:
+        """
+        Record a configuration as applied.
+
+        Args:
+            config: Configuration that is now in effect.
+        """
+        data = converter.unstructure(config)
+        atomic_write(self.path, json.dumps(data, indent=2).encode())
+
+    def clear(self) -> None:
+        """Forget the last applied configuration."""
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,315 @@
+"""Content-addressed store of Dock configuration backups."""
+
+import fcntl
+import gzip
+import hashlib
+import json
+from collections.abc import Hashable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+from dock.utils.files import atomic_write
+
+INDEX_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class BackupEntry:
+    """One backup recorded in the store index."""
+
+    timestamp: str
+    host: str
+    user: str
+    hash: str
+    size: int
+    kind: str = "yaml"
+
+    def taken_at(self) -> datetime:
+        """
+        Get when the backup was taken.
+
+        Returns:
+            Timestamp as a datetime.
+        """
+        return datetime.fromisoformat(self.timestamp)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Which backups to keep for each host, user and kind; the rest are pruned."""
+
+    keep_last: int | None = None
+    keep_daily: int | None = None
+    keep_weekly: int | None = None
+
+    def is_set(self) -> bool:
+        """
+        Check if any rule is configured.
+
+        Returns:
+            True if pruning would keep a limited set of backups.
+        """
+        return any(
+            value is not None for value in (self.keep_last, self.keep_daily, self.keep_weekly)
+        )
+
+    def select(self, entries: list[BackupEntry]) -> list[BackupEntry]:
+        """
+        Pick the backups to keep from one host and user's history.
+
+        The newest ``keep_last`` backups are kept, plus the newest backup
+        of each of the ``keep_daily`` most recent days and ``keep_weekly``
+        most recent ISO weeks that have backups.
+
+        Args:
+            entries: Backups of one host and user, oldest first.
+
+        Returns:
+            Backups to keep, oldest first.
+        """
+        newest_first = sorted(entries, key=lambda e: e.taken_at(), reverse=True)
+        keep: set[BackupEntry] = set(newest_first[: self.keep_last or 0])
+        daily = {entry: entry.taken_at().date() for entry in newest_first}
+        weekly = {entry: entry.taken_at().isocalendar()[:2] for entry in newest_first}
+        keep |= _newest_per_bucket(newest_first, daily, self.keep_daily)
+        keep |= _newest_per_bucket(newest_first, weekly, self.keep_weekly)
+        return [entry for entry in entries if entry in keep]
+
+
+def _newest_per_bucket(
+    newest_first: list[BackupEntry], buckets: Mapping[BackupEntry, Hashable], limit: int | None
+) -> set[BackupEntry]:
+    """Keep the newest entry of each of the ``limit`` most recent buckets."""
+    keep: set[BackupEntry] = set()
+    seen: set[Hashable] = set()
+    for entry in newest_first:
+        if not limit or (len(seen) == limit and buckets[entry] not in seen):
+            break
+        if buckets[entry] not in seen:
+            seen.add(buckets[entry])
+            keep.add(entry)
+    return keep
+
+
+class BackupStore:
+    """
+    Stores backups as gzip-compressed blobs named by their SHA-256.
+
+    An index file records (timestamp, host, user, hash) for every backup, so
+    listing and restoring read the index and a single blob. Identical
+    configurations share one blob, and a backup identical to the previous
+    one for the same host and user is not recorded again.
+    """
+
+    INDEX_NAME = "index.json"
+    LOCK_NAME = ".lock"
+
+    def __init__(self, root: Path):
+        """
+        Initialize BackupStore.
+
+        Args:
+            root: Store directory. Created on first write.
+        """
+        self.root = root
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the index file."""
+        return self.root / self.INDEX_NAME
+
+    def blob_path(self, digest: str) -> Path:
+        """
+        Get the path of a blob.
+
+        Args:
+            digest: Full hex SHA-256 of the uncompressed content.
+
+        Returns:
+            Path under objects/, fanned out by the first two hex digits.
+        """
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.gz"
+
+    def add(
+        self, content: bytes, timestamp: datetime, host: str, user: str, kind: str = "yaml"
+    ) -> tuple[BackupEntry, bool]:
+        """
+        Record a backup.
+
+        Args:
+            content: Serialized configuration.
+            timestamp: When the backup was taken (timezone-aware).
+            host: Host name.
+            user: User name.
+            kind: "yaml" for configuration backups, "raw" for raw plist backups.
+
+        Returns:
+            (entry, created): the recorded entry, or the previous entry if
+            the configuration is unchanged for this host, user and kind,
+            and whether a new entry was added.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        with self._locked():
+            entries = self._read_index()
+            previous = self._filter(entries, host, user, kind)
+            if previous and previous[-1].hash == digest:
+                return previous[-1], False
+
+            blob = self.blob_path(digest)
+            if not blob.exists():
+                atomic_write(blob, gzip.compress(content, mtime=0))
+            entry = BackupEntry(
+                timestamp=timestamp.isoformat(timespec="seconds"),
+                host=host,
+                user=user,
+                hash=digest,
+                size=len(content),
+                kind=kind,
+            )
+            entries.append(entry)
+            self._write_index(entries)
+        return entry, True
+
+    def entries(
+        self, host: str | None = None, user: str | None = None, kind: str | None = None
+    ) -> list[BackupEntry]:
+        """
+        List backups from the index.
+
+        Args:
+            host: Only list backups from this host.
+            user: Only list backups from this user.
+            kind: Only list backups of this kind.
+
+        Returns:
+            Entries, oldest first.
+        """
+        return self._filter(self._read_index(), host, user, kind)
+
+    def resolve(self, ref: str) -> BackupEntry:
+        """
+        Find the newest backup whose hash starts with a prefix.
+
+        Args:
+            ref: Full hash or unambiguous prefix.
+
+        Returns:
+            Matching entry.
+
+        Raises:
+            ValueError: If no backup or more than one blob matches.
+        """
+        matches = [entry for entry in self._read_index() if entry.hash.startswith(ref)]
+        if not ref or not matches:
+            raise ValueError(f"No backup matches {ref!r}")
+        if len({entry.hash for entry in matches}) > 1:
+            raise ValueError(f"Backup reference {ref!r} is ambiguous")
+        return matches[-1]
+
+    def read(self, digest: str) -> bytes:
+        """
+        Read the content of a blob.
+
+        Args:
+            digest: Full hex SHA-256.
+
+        Returns:
+            Uncompressed content.
+
+        Raises:
+            FileNotFoundError: If the blob is missing.
+            ValueError: If the blob does not match its hash.
+        """
+        content = gzip.decompress(self.blob_path(digest).read_bytes())
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise ValueError(f"Backup blob is corrupt: {digest}")
+        return content
+
+    def prune(self, policy: RetentionPolicy) -> list[BackupEntry]:
+        """
+        Apply a retention policy per host, user and kind and delete unused blobs.
+
+        Args:
+            policy: Which backups to keep.
+
+        Returns:
+            Entries that were removed.
+        """
+        if not policy.is_set():
+            return []
+        with self._locked():
+            entries = self._read_index()
+            groups: dict[tuple[str, str, str], list[BackupEntry]] = {}
+            for entry in entries:
+                groups.setdefault((entry.host, entry.user, entry.kind), []).append(entry)
+            keep = {kept for group in groups.values() for kept in policy.select(group)}
+
+            kept_entries = [entry for entry in entries if entry in keep]
+            removed = [entry for entry in entries if entry not in keep]
+            if not removed:
+                return []
+            self._write_index(kept_entries)
+
+            referenced = {entry.hash for entry in kept_entries}
+            for digest in {entry.hash for entry in removed} - referenced:
+                self.blob_path(digest).unlink(missing_ok=True)
+        return removed
+
+    @staticmethod
+    def _filter(
+        entries: list[BackupEntry], host: str | None, user: str | None, kind: str | None
+    ) -> list[BackupEntry]:
+        """Select entries matching every given host, user and kind."""
+        return [
+            entry
+            for entry in entries
+            if (host is None or entry.host == host)
+            and (user is None or entry.user == user)
+            and (kind is None or entry.kind == kind)
+        ]
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store while updating the index."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / self.LOCK_NAME, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read_index(self) -> list[BackupEntry]:
+        """
+        Read the index.
+
+        Returns:
+            Entries, oldest first; empty if the store has no index yet.
+
+        Raises:
+            ValueError: If the index is corrupt.
+        """
+        if not self.index_path.exists():
+            return []
+        try:
+            data = json.loads(self.index_path.read_text())
+            if data.get("version") != INDEX_FORMAT_VERSION:
+                raise ValueError(f"Unsupported backup index format: {self.index_path}")
+            return [BackupEntry(**entry) for entry in data["entries"]]
+        except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"Backup index is corrupt: {self.index_path}") from e
+
+    def _write_index(self, entries: list[BackupEntry]) -> None:
+        """
+        Write the index atomically.
+
+        Args:
+            entries: Entries, oldest first.
+        """
+        data = {
+            "version": INDEX_FORMAT_VERSION,
+            "entries": [asdict(entry) for entry in entries],
+        }
+        atomic_write(self.index_path, json.dumps(data, indent=2).encode())
@@ -0,0 +1,324 @@
+"""Precompiled Dock plist values for fast profile switching."""
+
+import copy
+import json
+import plistlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from dock import __version__
+from dock.adapters.apps import AppEntry, ApplicationIndex
+from dock.config.converter import converter
+from dock.config.models import DockConfig, DownloadsConfig, StackConfig
+from dock.config.settings import SETTINGS, SETTINGS_BY_NAME
+from dock.dock.identity import app_key
+from dock.dock.stacks import DOWNLOADS_PRESETS, arrange_stacks, build_tile, tile_key
+from dock.utils.files import atomic_write, cache_dir
+
+COMPILED_FORMAT_VERSION = 3
+
+TILE_ARRAYS = ("persistent-apps", "persistent-others")
+TILE_TYPES = ("file-tile", "directory-tile", "url-tile")
+SETTINGS_BY_PLIST_KEY = {spec.plist_key: spec for spec in SETTINGS}
+
+
+def build_app_tile(entry: AppEntry) -> dict[str, Any]:
+    """
+    Build a persistent-apps tile for an installed application.
+
+    Args:
+        entry: Resolved application bundle.
+
+    Returns:
+        Tile dictionary. The Dock assigns a GUID when it loads the tile.
+    """
+    tile_data: dict[str, Any] = {
+        "file-data": {
+            "_CFURLString": Path(entry.path).as_uri() + "/",
+            "_CFURLStringType": 15,
+        },
+        "file-label": entry.display_name or entry.name,
+        "file-type": 41,
+    }
+    if entry.bundle_id:
+        tile_data["bundle-identifier"] = entry.bundle_id
+    return {"tile-data": tile_data, "tile-type": "file-tile"}
+
+
+def owned_app_keys(apps: list[str], app_index: ApplicationIndex) -> list[str]:
+    """
+    Get the identity keys of the app tiles a configuration owns.
+
+    Args:
+        apps: App names or bundle ids.
+        app_index: ApplicationIndex used to locate each app bundle.
+
+    Returns:
+        Bundle id and bundle URL keys of every installed app, so tiles
+        are matched whether or not the Dock recorded a bundle id.
+    """
+    keys: list[str] = []
+    for app in apps:
+        entry = app_index.resolve(app)
+        if entry is None:
+            continue
+        for key in (app_key(entry.bundle_id, None), app_key(None, Path(entry.path).as_uri())):
+            if key is not None and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def _is_owned_app_tile(tile: dict[str, Any], owned: set[str]) -> bool:
+    """Check if a tile is an app tile owned by the configuration, or not an app at all."""
+    if tile.get("tile-type") != "file-tile":
+        return True
+    tile_data = tile.get("tile-data", {})
+    keys = (
+        app_key(tile_data.get("bundle-identifier"), None),
+        app_key(None, tile_data.get("file-data", {}).get("_CFURLString")),
+    )
+    return any(key in owned for key in keys if key is not None)
+
+
+def _is_downloads_tile(tile: dict[str, Any]) -> bool:
+    """Check if a tile is the Downloads folder tile."""
+    return (
+        tile.get("tile-type") == "directory-tile"
+        and tile.get("tile-data", {}).get("file-label") == "Downloads"
+    )
+
+
+def render_profile(
+    config: DockConfig, app_index: ApplicationIndex
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Render the plist values a configuration describes.
+
+    The apps section holds the configured apps in order followed by
+    apps-section stacks; the others section starts with the Downloads tile
+    and is followed by the other stacks. Managed settings are included
+    under their plist keys.
+
+    Args:
+        config: Configuration with app references resolved to names.
+        app_index: ApplicationIndex used to locate each app bundle.
+
+    Returns:
+        (values, missing_apps): plist key to value, and the configured
+        apps that are not installed and were left out.
+    """
+    app_tiles: list[dict[str, Any]] = []
+    missing: list[str] = []
+    for app in config.apps:
+        entry = app_index.resolve(app)
+        if entry is None:
+            missing.append(app)
+        else:
+            app_tiles.append(build_app_tile(entry))
+
+    arrays = arrange_stacks(
+        {"persistent-apps": app_tiles, "persistent-others": []}, config.stacks or [], []
+    )
+    if isinstance(config.downloads, DownloadsConfig):
+        view, display = DOWNLOADS_PRESETS[config.downloads.preset]
+        downloads = build_tile(
+            StackConfig(
+                path=config.downloads.path,
+                view=cast(Literal["auto", "fan", "grid", "list"], view),
+                display=cast(Literal["stack", "folder"], display),
+                label="Downloads",
+            )
+        )
+        if config.downloads.section == "apps-left":
+            arrays["persistent-apps"].insert(0, downloads)
+        elif config.downloads.section == "apps-right":
+            arrays["persistent-apps"].append(downloads)
+        else:
+            arrays["persistent-others"].insert(0, downloads)
+
+    values: dict[str, Any] = dict(arrays)
+    for name, value in config.settings.managed_values().items():
+        values[SETTINGS_BY_NAME[name].plist_key] = value
+    return values, missing
+
+
+def validate_values(values: dict[str, Any]) -> None:
+    """
+    Check compiled values before they are swapped into the live plist.
+
+    Args:
+        values: Compiled plist values.
+
+    Raises:
+        ValueError: If a key is not a tile array or a registered setting,
+                   a tile is malformed, or a setting value is invalid.
+    """
+    for key, value in values.items():
+        if key in TILE_ARRAYS:
+            if not isinstance(value, list):
+                raise ValueError(f"Compiled {key} must be a list of tiles")
+            for tile in value:
+                if not isinstance(tile, dict) or tile.get("tile-type") not in TILE_TYPES:
+                    raise ValueError(f"Compiled {key} contains an invalid tile")
+                if not isinstance(tile.get("tile-data"), dict):
+                    raise ValueError(f"Compiled {key} contains a tile without tile-data")
+        elif key in SETTINGS_BY_PLIST_KEY:
+            try:
+                SETTINGS_BY_PLIST_KEY[key].validate(value)
+            except TypeError as e:
+                raise ValueError(f"Compiled setting is invalid: {e}") from e
+        else:
+            raise ValueError(f"Compiled profile contains unexpected key: {key}")
+
+
+def swap_values(
+    plist: dict[str, Any],
+    values: dict[str, Any],
+    keep_stacks: bool,
+    owned: list[str] | None = None,
+) -> dict[str, Any]:
+    """
+    Merge compiled values with the tiles a profile doesn't manage.
+
+    The Downloads tile is always replaced: like a reset, a profile without
+    a downloads section gets the default tile. When the profile leaves
+    stacks unmanaged, the current folder, URL and other-section tiles are
+    carried over from the live plist. With ``managed: owned``, app tiles
+    outside the owned set were pinned by hand and keep their position. The
+    result only depends on the arguments, so the swap can be re-run safely
+    on resume.
+
+    Args:
+        plist: Current Dock plist dictionary.
+        values: Compiled plist values.
+        keep_stacks: Keep the current stack and other-section tiles.
+        owned: Identity keys of the apps the profile owns, or None to
+              replace every app tile as with ``managed: strict``.
+
+    Returns:
+        Plist values to write.
+    """
+    merged = copy.deepcopy(values)
+    kept_apps: list[dict[str, Any]] = []
+    kept_others: list[dict[str, Any]] = []
+    if keep_stacks:
+        for tile in plist.get("persistent-apps", []):
+            if tile_key(tile) is not None and not _is_downloads_tile(tile):
+                kept_apps.append(tile)
+        for tile in plist.get("persistent-others", []):
+            if not _is_downloads_tile(tile):
+                kept_others.append(tile)
+
+    apps = merged.get("persistent-apps", []) + kept_apps
+    if owned is not None:
+        owned_keys = set(owned)
+        for index, tile in enumerate(plist.get("persistent-apps", [])):
+            if not _is_owned_app_tile(tile, owned_keys):
+                apps.insert(min(index, len(apps)), tile)
+    merged["persistent-apps"] = apps
+    merged["persistent-others"] = merged.get("persistent-others", []) + kept_others
+    return merged
+
+
+@dataclass
+class CompiledProfile:
+    """Plist values pre-rendered from a profile."""
+
+    name: str
+    source: str
+    source_digest: str
+    app_fingerprint: str
+    config_hash: str
+    config_json: str
+    values: dict[str, Any]
+    keep_stacks: bool = False
+    managed: str = "owned"
+    owned_apps: list[str] = field(default_factory=list)
+    missing_apps: list[str] = field(default_factory=list)
+    dock_version: str = __version__
+
+    def is_current(self, source_digest: str, app_fingerprint: str) -> bool:
+        """
+        Check if the compiled values still describe the profile.
+
+        Args:
+            source_digest: Content hash of the profile file now.
+            app_fingerprint: ApplicationIndex fingerprint now.
+
+        Returns:
+            True if neither the profile, the installed apps nor the dock
+            version changed since compiling, False otherwise.
+        """
+        return (
+            self.source_digest == source_digest
+            and self.app_fingerprint == app_fingerprint
+            and self.dock_version == __version__
+        )
+
+    def config(self) -> DockConfig:
+        """
+        Get the configuration the profile was compiled from.
+
+        Returns:
+            DockConfig.
+        """
+        return converter.structure(json.loads(self.config_json), DockConfig)
+
+
+class CompiledProfileStore:
+    """Stores compiled profiles as binary plists."""
+
+    def __init__(self, directory: Path | None = None):
+        """
+        Initialize CompiledProfileStore.
+
+        Args:
+            directory: Directory holding compiled profiles.
+                      Defaults to compiled/ in the dock cache directory.
+        """
+        self.directory = directory or cache_dir() / "compiled"
+
+    def path_for(self, name: str) -> Path:
+        """
+        Get the file a profile is compiled to.
+
+        Args:
+            name: Profile name.
+
+        Returns:
+            Path of the compiled profile.
+        """
+        return self.directory / f"{name}.plist"
+
+    def save(self, compiled: CompiledProfile) -> None:
+        """
+        Write a compiled profile atomically.
+
+        Args:
+            compiled: Compiled profile.
+        """
+        data = {"version": COMPILED_FORMAT_VERSION, **asdict(compiled)}
+        atomic_write(
+            self.path_for(compiled.name), plistlib.dumps(data, fmt=plistlib.FMT_BINARY)
+        )
+
+    def load(self, name: str) -> CompiledProfile | None:
+        """
+        Load a compiled profile.
+
+        Args:
+            name: Profile name.
+
+        Returns:
+            CompiledProfile, or None if it was never compiled, was written
+            by another format version or can't be read (callers then
+            compile it again).
+        """
+        try:
+            data = plistlib.loads(self.path_for(name).read_bytes())
+            if data.pop("version") != COMPILED_FORMAT_VERSION:
+                return None
+            return CompiledProfile(**data)
+        except Exception:
+            return None
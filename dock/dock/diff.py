@@ -1,9 +1,13 @@
 """Dock diff calculator for comparing desired vs current state."""
 
-from dataclasses import dataclass
+import bisect
+from dataclasses import dataclass, field
 from typing import Any, Literal
 
-from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
+from dock.config.settings import SETTINGS
+from dock.dock.identity import AppIdentity
+from dock.dock.stacks import stack_attributes, stack_key
 
 
 @dataclass
@@ -15,6 +19,10 @@ class AppChange:
     position: int | None = None
 
 
+# dockutil operation reordering apps: (action, app name, 1-indexed position)
+AppMove = tuple[Literal["remove", "move", "add"], str, int | None]
+
+
 @dataclass
 class SettingChange:
     """Represents a change to dock settings."""
@@ -24,6 +32,16 @@ class SettingChange:
     new_value: Any
 
 
+@dataclass
+class StackChange:
+    """Represents a change to a folder or URL stack, keyed by resolved URL."""
+
+    action: Literal["add", "remove", "update", "move"]
+    key: str
+    stack: StackConfig
+    position: int | None = None
+
+
 @dataclass
 class DockDiff:
     """Complete set of changes needed."""
@@ -31,6 +49,10 @@ class DockDiff:
     app_changes: list[AppChange]
     setting_changes: list[SettingChange]
     downloads_change: Literal["off"] | DownloadsConfig | None
+    stack_changes: list[StackChange] = field(default_factory=list)
+    stacks: list[StackConfig] | None = None
+    downloads_in_place: bool = False
+    app_moves: list[AppMove] | None = None
 
     def has_changes(self) -> bool:
         """
@@ -43,6 +65,7 @@ class DockDiff:
             self.app_changes
             or self.setting_changes
             or self.downloads_change is not None
+            or self.stack_changes
         )
 
 
@@ -50,31 +73,99 @@ class DiffCalculator:
     """Calculates differences between desired and current state."""
 
     @staticmethod
-    def calculate_diff(desired: DockConfig, current: DockConfig) -> DockDiff:
+    def calculate_diff(
+        desired: DockConfig,
+        current: DockConfig,
+        base: DockConfig | None = None,
+        identity: AppIdentity | None = None,
+    ) -> DockDiff:
         """
         Calculate what changes are needed.
 
+        With a base (the last applied configuration) and ``managed: owned``,
+        this is a three-way diff: only tiles this tool owns - apps in the
+        base or the desired configuration - are added, removed or moved,
+        and apps pinned by hand are left where they are. Without a base, or
+        with ``managed: strict``, the desired configuration is the whole
+        truth and every other app is removed.
+
+        With an identity, apps are compared by bundle id or bundle URL
+        rather than by label, so localized or renamed labels don't show up
+        as changes. Changes still carry the configured name for apps being
+        added and the Dock label for apps being removed.
+
+        A reorder also gets the dockutil --move operations that would
+        apply it, if they take fewer calls than removing all apps.
+
         Args:
             desired: Desired dock configuration.
             current: Current dock configuration.
+            base: Configuration applied by the previous reset, if known.
+            identity: AppIdentity mapping apps to stable keys, if available.
 
         Returns:
             DockDiff containing all necessary changes.
         """
-        app_changes = DiffCalculator._calculate_app_changes(
-            desired.apps, current.apps
-        )
+        desired_apps = list(desired.apps)
+        current_apps = list(current.apps)
+        base_apps = list(base.apps) if base is not None else []
+        added_names: dict[str, str] = {}
+        removed_names: dict[str, str] = {}
+        if identity is not None:
+            desired_apps = [identity.desired_key(app) for app in desired.apps]
+            current_apps = [identity.current_key(app) for app in current.apps]
+            base_apps = [identity.desired_key(app) for app in base_apps]
+            added_names = dict(reversed(list(zip(desired_apps, desired.apps, strict=True))))
+            removed_names = dict(reversed(list(zip(current_apps, current.apps, strict=True))))
+
+        if base is None or desired.managed == "strict":
+            app_changes = DiffCalculator._calculate_app_changes(desired_apps, current_apps)
+        else:
+            app_changes = DiffCalculator._calculate_owned_app_changes(
+                desired_apps, current_apps, set(base_apps) | set(desired_apps)
+            )
+        app_moves = None
+        if any(change.action == "reorder" for change in app_changes):
+            # Computed on identity keys, so a relabelled app is moved, not re-added
+            app_moves = app_move_operations(current_apps, desired_apps)
+        for change in app_changes:
+            names = added_names if change.action == "add" else removed_names
+            change.app_name = names.get(change.app_name, change.app_name)
+        if app_moves is not None:
+            app_moves = [
+                (
+                    action,
+                    (added_names if action == "add" else removed_names).get(app, app),
+                    position,
+                )
+                for action, app, position in app_moves
+            ]
+
         setting_changes = DiffCalculator._calculate_setting_changes(
             desired.settings, current.settings
         )
         downloads_change = DiffCalculator._calculate_downloads_change(
             desired.downloads, current.downloads
         )
+        stack_changes = DiffCalculator._calculate_stack_changes(
+            desired.stacks, current.stacks or [], desired.downloads
+        )
+        # Only the preset differs: the existing tile can be patched in place
+        downloads_in_place = (
+            isinstance(downloads_change, DownloadsConfig)
+            and isinstance(current.downloads, DownloadsConfig)
+            and stack_key(downloads_change.path) == stack_key(current.downloads.path)
+            and downloads_change.section == current.downloads.section
+        )
 
         return DockDiff(
             app_changes=app_changes,
             setting_changes=setting_changes,
             downloads_change=downloads_change,
+            stack_changes=stack_changes,
+            stacks=desired.stacks,
+            downloads_in_place=downloads_in_place,
+            app_moves=app_moves,
         )
 
     @staticmethod
@@ -132,12 +223,92 @@ class DiffCalculator:
 
         return changes
 
+    @staticmethod
+    def _calculate_owned_app_changes(
+        desired_apps: list[str], current_apps: list[str], owned: set[str]
+    ) -> list[AppChange]:
+        """
+        Determine app changes touching only owned tiles.
+
+        Unowned apps are never touched. When owned apps are out of order,
+        the longest run already in the desired order stays put and only the
+        remaining apps are removed and re-added, so drift never leads to
+        removing the whole Dock.
+
+        Args:
+            desired_apps: List of desired app names.
+            current_apps: List of current app names.
+            owned: Apps managed by this tool.
+
+        Returns:
+            List of AppChange objects, removals first, then additions in
+            the order they must be applied.
+        """
+        desired_index = {app: index for index, app in enumerate(desired_apps)}
+        common = [app for app in current_apps if app in desired_index]
+        stay = set(
+            DiffCalculator._longest_ordered_run(common, [desired_index[a] for a in common])
+        )
+
+        changes: list[AppChange] = []
+        for app in current_apps:
+            if app in owned and app not in stay:
+                changes.append(AppChange(action="remove", app_name=app))
+
+        # Simulate the additions on the remaining tiles to get positions
+        layout = [app for app in current_apps if app not in owned or app in stay]
+        previous: str | None = None
+        for index, app in enumerate(desired_apps):
+            if app not in stay:
+                if previous is not None:
+                    slot = layout.index(previous) + 1
+                else:
+                    following = [a for a in desired_apps[index + 1:] if a in stay]
+                    slot = layout.index(following[0]) if following else min(index, len(layout))
+                layout.insert(slot, app)
+                changes.append(AppChange(action="add", app_name=app, position=slot + 1))
+            previous = app
+
+        return changes
+
+    @staticmethod
+    def _longest_ordered_run(items: list[str], ranks: list[int]) -> list[str]:
+        """
+        Find the longest subsequence of items whose ranks increase.
+
+        Args:
+            items: Items in current order.
+            ranks: Desired index of each item.
+
+        Returns:
+            Items forming the longest increasing subsequence of ranks.
+        """
+        tails: list[int] = []  # rank of the smallest tail for each length
+        tail_index: list[int] = []  # position in items of that tail
+        parent: list[int] = [-1] * len(items)
+        for i, rank in enumerate(ranks):
+            length = bisect.bisect_left(tails, rank)
+            if length == len(tails):
+                tails.append(rank)
+                tail_index.append(i)
+            else:
+                tails[length] = rank
+                tail_index[length] = i
+            parent[i] = tail_index[length - 1] if length > 0 else -1
+
+        run: list[str] = []
+        i = tail_index[-1] if tail_index else -1
+        while i != -1:
+            run.append(items[i])
+            i = parent[i]
+        return run[::-1]
+
     @staticmethod
     def _calculate_setting_changes(
         desired_settings: SettingsConfig, current_settings: SettingsConfig
     ) -> list[SettingChange]:
         """
-        Calculate setting changes.
+        Calculate setting changes for every registered setting.
 
         Args:
             desired_settings: Desired SettingsConfig.
@@ -148,25 +319,20 @@ class DiffCalculator:
         """
         changes: list[SettingChange] = []
 
-        # Check autohide
-        if desired_settings.autohide != current_settings.autohide:
-            changes.append(
-                SettingChange(
-                    setting_name="autohide",
-                    old_value=current_settings.autohide,
-                    new_value=desired_settings.autohide,
-                )
-            )
-
-        # Check autohide_delay
-        if desired_settings.autohide_delay != current_settings.autohide_delay:
-            changes.append(
-                SettingChange(
-                    setting_name="autohide_delay",
-                    old_value=current_settings.autohide_delay,
-                    new_value=desired_settings.autohide_delay,
+        for spec in SETTINGS:
+            new_value = getattr(desired_settings, spec.name)
+            if new_value is None:
+                # Unmanaged setting - keep whatever the Dock has
+                continue
+            old_value = getattr(current_settings, spec.name)
+            if new_value != old_value:
+                changes.append(
+                    SettingChange(
+                        setting_name=spec.name,
+                        old_value=old_value,
+                        new_value=new_value,
+                    )
                 )
-            )
 
         return changes
 
@@ -215,3 +381,124 @@ class DiffCalculator:
                 return desired_downloads
 
         return None
+
+    @staticmethod
+    def _calculate_stack_changes(
+        desired_stacks: list[StackConfig] | None,
+        current_stacks: list[StackConfig],
+        downloads: Literal["off"] | DownloadsConfig | None,
+    ) -> list[StackChange]:
+        """
+        Calculate folder and URL stack changes.
+
+        Stacks are matched by resolved URL through dictionaries, so the
+        diff is linear in the number of tiles. The Downloads tile belongs
+        to the ``downloads`` section and is ignored unless it is also
+        listed as a stack. Adds and moves are emitted in desired order with
+        1-indexed positions among the stacks of the same section, after any
+        removals.
+
+        Args:
+            desired_stacks: Desired stacks in order, or None if unmanaged.
+            current_stacks: Stacks currently in the Dock, in order.
+            downloads: Desired downloads configuration.
+
+        Returns:
+            List of StackChange objects.
+        """
+        if desired_stacks is None:
+            return []
+
+        desired_by_key = {stack_key(stack.path): stack for stack in desired_stacks}
+        downloads_key = stack_key(
+            downloads.path if isinstance(downloads, DownloadsConfig) else "~/Downloads"
+        )
+        current_by_key = {
+            key: stack
+            for key, stack in ((stack_key(s.path), s) for s in current_stacks)
+            if key != downloads_key or key in desired_by_key
+        }
+
+        changes = [
+            StackChange(action="remove", key=key, stack=stack)
+            for key, stack in current_by_key.items()
+            if key not in desired_by_key
+        ]
+
+        for key, stack in desired_by_key.items():
+            current = current_by_key.get(key)
+            if current is not None and (
+                stack_attributes(stack) != stack_attributes(current)
+                or (stack.label is not None and stack.label != current.label)
+                or (stack.item_size is not None and stack.item_size != current.item_size)
+            ):
+                changes.append(StackChange(action="update", key=key, stack=stack))
+
+        # Walk each section's desired order against the surviving current
+        # order; anything out of step is added or moved into place.
+        for section in ("apps", "others"):
+            desired_keys = [
+                key for key, stack in desired_by_key.items() if stack.section == section
+            ]
+            kept = [
+                key
+                for key in current_by_key
+                if key in desired_by_key and current_by_key[key].section == section
+            ]
+            placed: set[str] = set()
+            cursor = 0
+            for position, key in enumerate(desired_keys, start=1):
+                while cursor < len(kept) and kept[cursor] in placed:
+                    cursor += 1
+                if cursor < len(kept) and kept[cursor] == key:
+                    cursor += 1
+                    continue
+                action: Literal["add", "move"] = "move" if key in current_by_key else "add"
+                changes.append(
+                    StackChange(
+                        action=action, key=key, stack=desired_by_key[key], position=position
+                    )
+                )
+                placed.add(key)
+
+        return changes
+
+
+def app_move_operations(current_apps: list[str], desired_apps: list[str]) -> list[AppMove] | None:
+    """
+    Reorder apps with dockutil --move instead of removing and re-adding all.
+
+    Apps that aren't wanted are removed. The longest run of current apps
+    already in the desired order stays put; every other app is moved, or
+    added, right after the app that precedes it in the desired order, so
+    only apps out of place cost a dockutil call.
+
+    Args:
+        current_apps: Current apps in Dock order, as names or identity keys.
+        desired_apps: Desired apps in order, named the same way.
+
+    Returns:
+        Operations as (action, app name, 1-indexed position) in the order
+        to run them, or None if they would take as many dockutil calls as
+        removing every app and adding the desired ones back.
+    """
+    desired_index = {app: index for index, app in enumerate(desired_apps)}
+    operations: list[AppMove] = [
+        ("remove", app, None) for app in current_apps if app not in desired_index
+    ]
+    order = [app for app in current_apps if app in desired_index]
+    kept = set(
+        DiffCalculator._longest_ordered_run(order, [desired_index[app] for app in order])
+    )
+    for index, app in enumerate(desired_apps):
+        if app in kept:
+            continue
+        action: Literal["move", "add"] = "move" if app in order else "add"
+        if action == "move":
+            order.remove(app)
+        position = order.index(desired_apps[index - 1]) + 1 if index > 0 else 0
+        order.insert(position, app)
+        operations.append((action, app, position + 1))
+    if len(operations) >= len(desired_apps) + 1:
+        return None
+    return operations
@@ -1,14 +1,30 @@
 """Dock executor for applying changes."""
 
 import subprocess
-from typing import TYPE_CHECKING
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any
 
 from dock.adapters.dockutil import DockutilCommand
 from dock.adapters.plist import PlistManager
-from dock.dock.diff import AppChange, DockDiff, SettingChange
-
-if TYPE_CHECKING:
-    from dock.config.models import DownloadsConfig
+from dock.config.converter import converter
+from dock.config.models import DownloadsConfig, StackConfig
+from dock.config.settings import SETTINGS_BY_NAME
+from dock.dock.compiled import swap_values
+from dock.dock.diff import AppChange, AppMove, DockDiff, SettingChange, StackChange
+from dock.dock.journal import ApplyJournal, ApplyStep, JournalStore
+from dock.dock.metrics import ApplyMetrics
+from dock.dock.raw_backup import RawBackup
+from dock.dock.stacks import (
+    DOWNLOADS_PRESETS,
+    arrange_stacks,
+    downloads_attributes,
+    patch_tiles,
+    stack_key,
+    stack_tile_attributes,
+)
+from dock.utils import events, profiling
 
 
 class DockExecutor:
@@ -18,7 +34,9 @@ class DockExecutor:
         self,
         dockutil_cmd: DockutilCommand,
         plist_mgr: PlistManager,
-        dry_run: bool = False
+        dry_run: bool = False,
+        journal: JournalStore | None = None,
+        metrics: ApplyMetrics | None = None,
     ):
         """
         Initialize DockExecutor.
@@ -27,17 +45,27 @@ class DockExecutor:
             dockutil_cmd: DockutilCommand instance for managing dock apps.
             plist_mgr: PlistManager instance for managing dock settings.
             dry_run: If True, display changes without executing them.
+            journal: Optional JournalStore recording progress of each apply.
+            metrics: Optional ApplyMetrics timing the steps, apply and restart.
         """
         self.dockutil = dockutil_cmd
         self.plist = plist_mgr
         self.dry_run = dry_run
+        self.journal = journal
+        self.metrics = metrics
 
-    def apply_diff(self, diff: DockDiff) -> bool:
+    def apply_diff(self, diff: DockDiff, config_hash: str = "") -> bool:
         """
         Apply changes from diff.
 
+        When a journal store is configured, the pre-apply plist is
+        snapshotted and progress is recorded after every step so that an
+        interrupted apply can be resumed or rolled back.
+
         Args:
             diff: DockDiff containing changes to apply.
+            config_hash: Hash of the configuration being applied,
+                        recorded in the journal.
 
         Returns:
             True if changes were made (or would be made in dry-run),
@@ -50,94 +78,383 @@ class DockExecutor:
             # In dry-run mode, just indicate changes would be made
             return True
 
-        # Apply app changes
-        if diff.app_changes:
-            self._apply_app_changes(diff.app_changes)
+        steps = self.build_steps(diff)
+        journal = None
+        if self.journal is not None:
+            journal = self.journal.begin(steps, config_hash, self.plist.read_bytes())
 
-        # Apply setting changes
-        if diff.setting_changes:
-            self._apply_setting_changes(diff.setting_changes)
-
-        # Apply downloads changes
-        if diff.downloads_change is not None:
-            self._apply_downloads_change(diff.downloads_change)
+        self._run_steps(steps, journal=journal)
 
         # Restart dock to apply changes
         self._restart_dock()
 
         return True
 
-    def _apply_app_changes(self, changes: list[AppChange]) -> None:
+    def swap_profile(
+        self,
+        values: dict[str, Any],
+        keep_stacks: bool = False,
+        owned: list[str] | None = None,
+        config_hash: str = "",
+    ) -> None:
+        """
+        Swap compiled profile values into the plist and restart the Dock.
+
+        The apps, others and settings keys are replaced in one plist write,
+        recorded in the journal like any other apply so it can be resumed
+        or rolled back.
+
+        Args:
+            values: Compiled plist values.
+            keep_stacks: Keep the current stack and other-section tiles.
+            owned: Identity keys of the apps the profile owns; other app
+                  tiles are kept. None replaces every app tile.
+            config_hash: Hash of the profile configuration, recorded in
+                        the journal.
+        """
+        steps = [
+            ApplyStep(
+                action="swap_profile",
+                args={"values": values, "keep_stacks": keep_stacks, "owned": owned},
+            )
+        ]
+        journal = None
+        if self.journal is not None:
+            journal = self.journal.begin(steps, config_hash, self.plist.read_bytes())
+
+        self._run_steps(steps, journal=journal)
+        self._restart_dock()
+
+    def resume(self, journal: ApplyJournal) -> bool:
+        """
+        Continue an interrupted apply from its first incomplete step.
+
+        Args:
+            journal: Journal loaded from the journal store.
+
+        Returns:
+            True if steps were executed, False if nothing was left to do.
+        """
+        if not journal.is_resumable():
+            return False
+
+        self._run_steps(journal.steps, start=journal.completed, journal=journal)
+        self._restart_dock()
+        return True
+
+    def restore_snapshot(self, snapshot: bytes) -> None:
+        """
+        Restore a raw plist snapshot in one write and restart the Dock.
+
+        Args:
+            snapshot: Raw bytes of a previously captured Dock plist.
+        """
+        self.plist.write_bytes(snapshot)
+        self._restart_dock()
+
+    def restore_backup(self, backup: RawBackup) -> None:
+        """
+        Put raw backup values back into the plist in one write and restart the Dock.
+
+        Args:
+            backup: RawBackup to restore.
+        """
+        self.plist.write_plist(backup.apply_to(self.plist.read_plist()))
+        self._restart_dock()
+
+    def build_steps(self, diff: DockDiff) -> list[ApplyStep]:
+        """
+        Convert a diff into an ordered list of executor steps.
+
+        Args:
+            diff: DockDiff containing changes.
+
+        Returns:
+            Steps in the order they must be executed.
+        """
+        steps: list[ApplyStep] = []
+        if diff.app_changes:
+            steps.extend(self._app_steps(diff.app_changes, diff.app_moves))
+        removes_all = any(step.action == "remove_all" for step in steps)
+
+        # Attribute-only changes patch existing tiles in one plist write;
+        # adds, removes and moves need the structural steps. dockutil
+        # --remove all also clears stacks, so they are rewritten whenever
+        # the apps are rebuilt.
+        patches: list[dict[str, Any]] = []
+        structural = removes_all or any(c.action != "update" for c in diff.stack_changes)
+        if diff.stacks is not None and structural:
+            steps.extend(self._stack_steps(diff.stacks, diff.stack_changes))
+        else:
+            patches.extend(self._stack_patches(diff.stack_changes))
+
+        downloads_change = diff.downloads_change
+        if (
+            isinstance(downloads_change, DownloadsConfig)
+            and diff.downloads_in_place
+            and not removes_all
+        ):
+            patches.append(
+                {
+                    "key": stack_key(downloads_change.path),
+                    "label": "Downloads",
+                    "attributes": downloads_attributes(downloads_change.preset),
+                }
+            )
+            downloads_change = None
+        if patches:
+            steps.append(ApplyStep(action="patch_tiles", args={"patches": patches}))
+
+        if diff.setting_changes:
+            steps.extend(self._setting_steps(diff.setting_changes))
+        if downloads_change is not None:
+            steps.extend(self._downloads_steps(downloads_change))
+        return steps
+
+    def _run_steps(
+        self,
+        steps: list[ApplyStep],
+        start: int = 0,
+        journal: ApplyJournal | None = None,
+    ) -> None:
+        """
+        Execute steps in order, recording progress in the journal.
+
+        Args:
+            steps: Steps to execute.
+            start: Index of the first step to execute.
+            journal: Journal to update after each step, if any.
         """
-        Apply app additions, removals, and reordering.
+        with self._phase("apply"):
+            for index in range(start, len(steps)):
+                started = time.perf_counter()
+                self._run_step(steps[index])
+                duration = time.perf_counter() - started
+                if self.metrics is not None:
+                    self.metrics.record_step(steps[index].action, duration)
+                events.emit(
+                    "step_done",
+                    index=index,
+                    action=steps[index].action,
+                    duration=round(duration, 4),
+                )
+                if journal is not None and self.journal is not None:
+                    self.journal.mark_completed(journal, index + 1)
 
-        When reordering is needed, dockutil requires removing all apps
-        and re-adding them in the correct order.
+    def _run_step(self, step: ApplyStep) -> None:
+        """
+        Execute a single step.
 
         Args:
-            changes: List of AppChange objects to apply.
+            step: Step to execute.
+        """
+        args = step.args
+        if step.action == "remove_all":
+            self.dockutil.remove_all()
+        elif step.action == "remove_app":
+            self.dockutil.remove_app(args["app_name"])
+        elif step.action == "add_app":
+            self.dockutil.add_app(args["app_name"], args["position"])
+        elif step.action == "move_app":
+            self.dockutil.move_app(args["app_name"], args["position"])
+        elif step.action == "set_stacks":
+            stacks = [converter.structure(data, StackConfig) for data in args["stacks"]]
+            tiles = arrange_stacks(self.plist.read_plist(), stacks, args["remove"])
+            self.plist.write_values(dict(tiles))
+        elif step.action == "patch_tiles":
+            tiles = patch_tiles(self.plist.read_plist(), args["patches"])
+            if tiles:
+                self.plist.write_values(dict(tiles))
+        elif step.action == "set_settings":
+            self.plist.write_values(args["values"])
+        elif step.action == "remove_folder":
+            self.dockutil.remove_app(args["label"])
+        elif step.action == "add_folder":
+            self.dockutil.add_folder(
+                path=args["path"],
+                view=args["view"],
+                display=args["display"],
+                section=args["section"],
+            )
+        elif step.action == "swap_profile":
+            self.plist.write_values(
+                swap_values(
+                    self.plist.read_plist(),
+                    args["values"],
+                    args["keep_stacks"],
+                    args.get("owned"),
+                )
+            )
+
+    def _app_steps(
+        self, changes: list[AppChange], app_moves: list[AppMove] | None = None
+    ) -> list[ApplyStep]:
         """
+        Build steps for app additions, removals, and reordering.
+
+        When reordering is needed, apps out of place are moved if the
+        probed dockutil supports --move and that takes fewer calls;
+        otherwise all apps are removed and re-added in the correct order.
+
+        Args:
+            changes: List of AppChange objects.
+            app_moves: dockutil --move operations for a reorder, from the diff.
+
+        Returns:
+            Steps for the app changes.
+        """
+        steps: list[ApplyStep] = []
+
         # Check if there are any reorder operations
         has_reorder = any(change.action == "reorder" for change in changes)
+        moves = self._move_steps(app_moves) if has_reorder and app_moves else None
 
-        # If reordering is needed, remove all apps first
-        if has_reorder:
-            self.dockutil.remove_all()
+        if moves is not None:
+            steps.extend(moves)
+        elif has_reorder:
+            # If reordering is needed, remove all apps first
+            steps.append(ApplyStep(action="remove_all"))
             # Then add all apps back in the correct order
             # Get all "add" changes sorted by position
             add_changes = [c for c in changes if c.action == "add"]
             add_changes.sort(key=lambda c: c.position or 0)
             for change in add_changes:
-                self.dockutil.add_app(change.app_name, change.position)
+                steps.append(
+                    ApplyStep(
+                        action="add_app",
+                        args={"app_name": change.app_name, "position": change.position},
+                    )
+                )
         else:
             # No reordering - process removals first, then additions
             for change in changes:
                 if change.action == "remove":
-                    self.dockutil.remove_app(change.app_name)
+                    steps.append(
+                        ApplyStep(action="remove_app", args={"app_name": change.app_name})
+                    )
 
             for change in changes:
                 if change.action == "add":
-                    self.dockutil.add_app(change.app_name, change.position)
+                    steps.append(
+                        ApplyStep(
+                            action="add_app",
+                            args={"app_name": change.app_name, "position": change.position},
+                        )
+                    )
+
+        return steps
+
+    def _move_steps(self, app_moves: list[AppMove]) -> list[ApplyStep] | None:
+        """
+        Build steps that reorder apps with dockutil --move.
+
+        Args:
+            app_moves: Remove, move and add operations from the diff.
+
+        Returns:
+            Remove, move and add steps, or None if dockutil can't move apps.
+        """
+        if not self.dockutil.supports("--move"):
+            return None
+        steps: list[ApplyStep] = []
+        for action, app_name, position in app_moves:
+            if action == "remove":
+                steps.append(ApplyStep(action="remove_app", args={"app_name": app_name}))
+            elif action == "move":
+                steps.append(
+                    ApplyStep(
+                        action="move_app", args={"app_name": app_name, "position": position}
+                    )
+                )
+            else:
+                steps.append(
+                    ApplyStep(
+                        action="add_app", args={"app_name": app_name, "position": position}
+                    )
+                )
+        return steps
 
-    def _apply_setting_changes(self, changes: list[SettingChange]) -> None:
+    def _stack_steps(
+        self, stacks: list[StackConfig], changes: list[StackChange]
+    ) -> list[ApplyStep]:
         """
-        Apply settings changes via plist.
+        Build the step for folder and URL stack changes.
+
+        The step records the desired stacks rather than individual edits,
+        so every add, remove, update and move is applied in one plist write
+        and the step can be re-run safely on resume.
+
+        Args:
+            stacks: Desired stacks in order.
+            changes: StackChange objects from the diff.
+
+        Returns:
+            A single set_stacks step.
+        """
+        return [
+            ApplyStep(
+                action="set_stacks",
+                args={
+                    "stacks": [converter.unstructure(stack) for stack in stacks],
+                    "remove": [c.key for c in changes if c.action == "remove"],
+                },
+            )
+        ]
+
+    @staticmethod
+    def _stack_patches(changes: list[StackChange]) -> list[dict[str, Any]]:
+        """
+        Build tile patches for attribute-only stack changes.
 
         Args:
-            changes: List of SettingChange objects to apply.
+            changes: StackChange objects, all of them updates.
+
+        Returns:
+            Patches for patch_tiles.
         """
-        for change in changes:
-            if change.setting_name == "autohide":
-                self.plist.write_autohide(change.new_value)
-            elif change.setting_name == "autohide_delay":
-                self.plist.write_autohide_delay(change.new_value)
+        return [
+            {"key": change.key, "attributes": stack_tile_attributes(change.stack)}
+            for change in changes
+            if change.action == "update"
+        ]
+
+    def _setting_steps(self, changes: list[SettingChange]) -> list[ApplyStep]:
+        """
+        Build the step for settings changes.
+
+        All settings are batched into one step so the plist is read and
+        written once, however many settings change.
 
-    def _apply_downloads_change(
+        Args:
+            changes: List of SettingChange objects.
+
+        Returns:
+            A single set_settings step keyed by plist key.
+        """
+        values = {
+            SETTINGS_BY_NAME[change.setting_name].plist_key: change.new_value
+            for change in changes
+        }
+        return [ApplyStep(action="set_settings", args={"values": values})]
+
+    def _downloads_steps(
         self, downloads_change: str | DownloadsConfig
-    ) -> None:
+    ) -> list[ApplyStep]:
         """
-        Apply downloads tile changes.
+        Build steps for downloads tile changes.
 
         Args:
             downloads_change: Either "off" to remove downloads,
                             or DownloadsConfig to add/modify downloads tile.
-        """
-        from dock.config.models import DownloadsConfig
 
+        Returns:
+            Steps for the downloads change.
+        """
         if downloads_change == "off":
             # Remove Downloads folder
-            self.dockutil.remove_app("Downloads")
-        elif isinstance(downloads_change, DownloadsConfig):
-            # Map preset to dockutil view and display options
-            if downloads_change.preset == "classic":
-                view = "auto"
-                display = "stack"
-            elif downloads_change.preset == "fan":
-                view = "fan"
-                display = "stack"
-            else:  # list
-                view = "grid"
-                display = "folder"
+            return [ApplyStep(action="remove_folder", args={"label": "Downloads"})]
+        if isinstance(downloads_change, DownloadsConfig):
+            view, display = DOWNLOADS_PRESETS[downloads_change.preset]
 
             # Map section
             section_map = {
@@ -148,21 +465,38 @@ class DockExecutor:
             section = section_map.get(downloads_change.section, "others")
 
             # Add Downloads folder
-            self.dockutil.add_folder(
-                path=downloads_change.path,
-                view=view,
-                display=display,
-                section=section,
-            )
+            return [
+                ApplyStep(
+                    action="add_folder",
+                    args={
+                        "path": downloads_change.path,
+                        "view": view,
+                        "display": display,
+                        "section": section,
+                    },
+                )
+            ]
+        return []
 
     def _restart_dock(self) -> None:
         """Restart Dock process using killall."""
-        try:
-            subprocess.run(
-                ['killall', 'Dock'],
-                check=True,
-                capture_output=True
-            )
-        except subprocess.CalledProcessError:
-            # Ignore errors - dock might already be restarting
-            pass
+        events.emit("restart")
+        if self.metrics is not None:
+            self.metrics.restarts += 1
+        with self._phase("restart"):
+            try:
+                subprocess.run(
+                    ['killall', 'Dock'],
+                    check=True,
+                    capture_output=True
+                )
+            except subprocess.CalledProcessError:
+                # Ignore errors - dock might already be restarting
+                pass
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Mark a phase in the profile and time it in the metrics, if either is recorded."""
+        metrics = self.metrics
+        with profiling.phase(name), metrics.phase(name) if metrics is not None else nullcontext():
+            yield
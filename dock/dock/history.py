@@ -0,0 +1,276 @@
+"""SQLite history of reset runs."""
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dock.dock.metrics import ApplyMetrics
+from dock.utils.files import state_dir
+
+SCHEMA_VERSION = 1
+
+OUTCOMES = ("applied", "unchanged", "dry_run", "failed")
+
+# Runs beyond either limit are deleted whenever a run is recorded
+DEFAULT_MAX_RUNS = 5000
+DEFAULT_MAX_AGE_DAYS = 180
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    profile TEXT,
+    config_hash TEXT NOT NULL,
+    state_fingerprint TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    changes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_profile ON runs (profile, started_at);
+CREATE INDEX IF NOT EXISTS runs_outcome ON runs (outcome, started_at);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    duration REAL NOT NULL,
+    PRIMARY KEY (run_id, position)
+);
+"""
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    """How long one executed step took."""
+
+    action: str
+    duration: float
+
+
+@dataclass(frozen=True)
+class RunRecord:
+    """One reset run in the history."""
+
+    started_at: float
+    duration: float
+    profile: str | None
+    config_hash: str
+    state_fingerprint: str
+    outcome: str
+    changes: dict[str, int] = field(default_factory=dict)
+    steps: tuple[StepTiming, ...] = ()
+
+    @classmethod
+    def from_metrics(
+        cls, metrics: ApplyMetrics, profile: str | None, finished_at: float
+    ) -> RunRecord:
+        """
+        Build the record of a finished reset.
+
+        Args:
+            metrics: Measurements taken during the reset.
+            profile: Profile name, if the reset used one.
+            finished_at: Unix time the reset finished.
+
+        Returns:
+            RunRecord.
+        """
+        if metrics.failed:
+            outcome = "failed"
+        elif metrics.dry_run:
+            outcome = "dry_run"
+        else:
+            outcome = "applied" if metrics.applied else "unchanged"
+        return cls(
+            started_at=metrics.started_at,
+            duration=finished_at - metrics.started_at,
+            profile=profile,
+            config_hash=metrics.config_hash,
+            state_fingerprint=metrics.state_fingerprint,
+            outcome=outcome,
+            changes={kind: count for kind, count in metrics.changes.items() if count},
+            steps=tuple(StepTiming(action, seconds) for action, seconds in metrics.steps),
+        )
+
+    def apply_duration(self) -> float:
+        """
+        Get the time spent executing steps.
+
+        Returns:
+            Sum of the step durations in seconds.
+        """
+        return sum(step.duration for step in self.steps)
+
+
+class HistoryStore:
+    """
+    Appends reset runs to an SQLite database and queries them.
+
+    Runs are indexed by start time, profile and outcome, and old runs are
+    pruned on every insert so the database stays small.
+    """
+
+    FILE_NAME = "history.sqlite3"
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ):
+        """
+        Initialize HistoryStore.
+
+        Args:
+            path: Database file. Defaults to history.sqlite3 in the dock
+                 state directory.
+            max_runs: Number of most recent runs to keep.
+            max_age_days: Age in days after which runs are deleted.
+        """
+        self.path = path or state_dir() / self.FILE_NAME
+        self.max_runs = max_runs
+        self.max_age_days = max_age_days
+
+    def add(self, record: RunRecord) -> None:
+        """
+        Record a run and prune runs beyond the retention limits.
+
+        Args:
+            record: Run to record.
+
+        Raises:
+            sqlite3.Error: If the database can't be written.
+        """
+        with self._connect() as db, db:
+            cursor = db.execute(
+                "INSERT INTO runs (started_at, duration, profile, config_hash,"
+                " state_fingerprint, outcome, changes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.started_at,
+                    record.duration,
+                    record.profile,
+                    record.config_hash,
+                    record.state_fingerprint,
+                    record.outcome,
+                    json.dumps(record.changes, sort_keys=True),
+                ),
+            )
+            db.executemany(
+                "INSERT INTO steps (run_id, position, action, duration) VALUES (?, ?, ?, ?)",
+                [
+                    (cursor.lastrowid, position, step.action, step.duration)
+                    for position, step in enumerate(record.steps)
+                ],
+            )
+            cutoff = record.started_at - self.max_age_days * 86400
+            db.execute(
+                "DELETE FROM runs WHERE started_at < ? OR id <= ("
+                "SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (cutoff, self.max_runs),
+            )
+
+    def runs(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        profile: str | None = None,
+        outcome: str | None = None,
+        limit: int | None = None,
+    ) -> list[RunRecord]:
+        """
+        Query runs, newest first.
+
+        Args:
+            since: Only runs started at or after this Unix time.
+            until: Only runs started before this Unix time.
+            profile: Only runs of this profile.
+            outcome: Only runs with this outcome, one of OUTCOMES.
+            limit: Maximum number of runs to return.
+
+        Returns:
+            Matching runs with their step timings; empty if nothing was
+            recorded yet.
+        """
+        if not self.path.exists():
+            return []
+        clauses: list[str] = []
+        params: list[object] = []
+        for clause, value in (
+            ("started_at >= ?", since),
+            ("started_at < ?", until),
+            ("profile = ?", profile),
+            ("outcome = ?", outcome),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(-1 if limit is None else limit)
+
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT id, started_at, duration, profile, config_hash, state_fingerprint,"
+                f" outcome, changes FROM runs{where} ORDER BY started_at DESC, id DESC LIMIT ?",
+                params,
+            ).fetchall()
+            steps = self._steps(db, [row[0] for row in rows])
+
+        return [
+            RunRecord(
+                started_at=started_at,
+                duration=duration,
+                profile=run_profile,
+                config_hash=config_hash,
+                state_fingerprint=fingerprint,
+                outcome=run_outcome,
+                changes=json.loads(changes),
+                steps=tuple(steps.get(run_id, [])),
+            )
+            for (
+                run_id,
+                started_at,
+                duration,
+                run_profile,
+                config_hash,
+                fingerprint,
+                run_outcome,
+                changes,
+            ) in rows
+        ]
+
+    @staticmethod
+    def _steps(db: sqlite3.Connection, run_ids: list[int]) -> dict[int, list[StepTiming]]:
+        """Load the step timings of some runs, in execution order."""
+        steps: dict[int, list[StepTiming]] = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(run_ids), 500):
+            chunk = run_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for run_id, action, duration in db.execute(
+                f"SELECT run_id, action, duration FROM steps WHERE run_id IN ({placeholders})"
+                " ORDER BY run_id, position",
+                chunk,
+            ):
+                steps.setdefault(run_id, []).append(StepTiming(action, duration))
+        return steps
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database, creating or upgrading the schema as needed."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path, timeout=5.0)) as db:
+            db.execute("PRAGMA foreign_keys = ON")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(
+                    f"History database {self.path} is from a newer version of dock"
+                )
+            if version < SCHEMA_VERSION:
+                with db:
+                    db.executescript(_SCHEMA)
+                    db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            yield db
+
@@ -0,0 +1,94 @@
+"""Stable identity keys for Dock app tiles."""
+
+from pathlib import Path
+
+from dock.adapters.apps import ApplicationIndex
+from dock.adapters.dockutil import DockTile
+from dock.dock.stacks import stack_key
+
+
+def app_key(bundle_id: str | None, url: str | None) -> str | None:
+    """
+    Build the identity key of an app tile.
+
+    Args:
+        bundle_id: Bundle identifier, if known.
+        url: File URL or path of the app bundle, if known.
+
+    Returns:
+        "bundle:<id>" when a bundle id is known, otherwise the canonical
+        file URL, or None if neither is available.
+    """
+    if bundle_id:
+        return f"bundle:{bundle_id.casefold()}"
+    if url:
+        return stack_key(url)
+    return None
+
+
+def _name_key(name: str) -> str:
+    """Fallback key for apps that can't be resolved to a bundle."""
+    return f"name:{name.casefold()}"
+
+
+class AppIdentity:
+    """
+    Maps configured app references and Dock labels to stable keys.
+
+    Dock labels are localized and change when apps are renamed ("System
+    Preferences" became "System Settings"), so the diff compares apps by
+    bundle id, or by bundle URL when there is no bundle id. Labels are only
+    used for display and for dockutil --remove.
+    """
+
+    def __init__(self, tiles: list[DockTile], app_index: ApplicationIndex | None = None):
+        """
+        Initialize AppIdentity.
+
+        Args:
+            tiles: Current Dock tiles from dockutil --list.
+            app_index: ApplicationIndex used to resolve configured apps.
+                      Configured apps are matched by label only if not provided.
+        """
+        self.app_index = app_index
+        self._by_label: dict[str, str] = {}
+        for tile in tiles:
+            if tile.is_app():
+                key = app_key(tile.bundle_id, tile.url) or _name_key(tile.label)
+                self._by_label.setdefault(tile.label, key)
+        self._current_keys = set(self._by_label.values())
+
+    def current_key(self, label: str) -> str:
+        """
+        Get the key of an app currently in the Dock.
+
+        Args:
+            label: Label reported by dockutil.
+
+        Returns:
+            Identity key.
+        """
+        return self._by_label.get(label) or _name_key(label)
+
+    def desired_key(self, ref: str) -> str:
+        """
+        Get the key of an app referenced in configuration.
+
+        Args:
+            ref: App name, display name or bundle id.
+
+        Returns:
+            Identity key. Apps that are not installed fall back to the
+            key of a Dock tile with the same label, then to the name.
+        """
+        entry = self.app_index.resolve(ref) if self.app_index is not None else None
+        if entry is None:
+            return self._by_label.get(ref) or _name_key(ref)
+
+        by_bundle = app_key(entry.bundle_id, None)
+        by_url = app_key(None, Path(entry.path).as_uri())
+        # Older dockutil versions omit the bundle id; match on URL then
+        if by_bundle is not None and by_bundle not in self._current_keys:
+            if by_url in self._current_keys:
+                return str(by_url)
+        return by_bundle or str(by_url)
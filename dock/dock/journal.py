@@ -0,0 +1,211 @@
+"""Apply journal for resuming and rolling back interrupted resets."""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from dock.utils.files import atomic_write, state_dir
+
+
+@dataclass
+class ApplyStep:
+    """A single executor operation recorded in the journal."""
+
+    action: Literal[
+        "remove_all",
+        "remove_app",
+        "add_app",
+        "move_app",
+        "set_stacks",
+        "patch_tiles",
+        "set_settings",
+        "remove_folder",
+        "add_folder",
+        "swap_profile",
+    ]
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ApplyJournal:
+    """Progress record for one apply run."""
+
+    plan_hash: str
+    config_hash: str
+    steps: list[ApplyStep]
+    completed: int = 0
+    status: Literal["in_progress", "complete"] = "in_progress"
+    created_at: str = field(
+        default_factory=lambda: datetime.now(UTC).isoformat(timespec="seconds")
+    )
+
+    def is_resumable(self) -> bool:
+        """
+        Check if the journal describes an interrupted apply.
+
+        Returns:
+            True if some steps were not completed, False otherwise.
+        """
+        return self.status == "in_progress" and self.completed < len(self.steps)
+
+
+def compute_plan_hash(steps: list[ApplyStep]) -> str:
+    """
+    Compute a stable hash of a list of steps.
+
+    Args:
+        steps: Steps in execution order.
+
+    Returns:
+        Hex-encoded SHA-256 digest.
+    """
+    payload = json.dumps([asdict(step) for step in steps], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def compute_config_hash(config_data: dict[str, Any]) -> str:
+    """
+    Compute a stable hash of raw configuration data.
+
+    Args:
+        config_data: Configuration dictionary as loaded from YAML.
+
+    Returns:
+        Hex-encoded SHA-256 digest.
+    """
+    payload = json.dumps(config_data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class JournalStore:
+    """Persists the apply journal and pre-apply plist snapshot."""
+
+    JOURNAL_NAME = "journal.json"
+    SNAPSHOT_NAME = "journal-snapshot.plist"
+
+    def __init__(self, directory: Path | None = None):
+        """
+        Initialize JournalStore.
+
+        Args:
+            directory: Directory holding journal files.
+                      Defaults to the dock state directory.
+        """
+        self.directory = directory or state_dir()
+
+    @property
+    def journal_path(self) -> Path:
+        """Path of the journal file."""
+        return self.directory / self.JOURNAL_NAME
+
+    @property
+    def snapshot_path(self) -> Path:
+        """Path of the pre-apply plist snapshot."""
+        return self.directory / self.SNAPSHOT_NAME
+
+    def begin(
+        self, steps: list[ApplyStep], config_hash: str, snapshot: bytes
+    ) -> ApplyJournal:
+        """
+        Start a new journal, replacing any previous one.
+
+        The snapshot is written before the journal so that a journal on
+        disk always has a matching snapshot.
+
+        Args:
+            steps: Steps that will be executed.
+            config_hash: Hash of the configuration being applied.
+            snapshot: Raw bytes of the Dock plist before any change.
+
+        Returns:
+            The new ApplyJournal.
+        """
+        atomic_write(self.snapshot_path, snapshot)
+        journal = ApplyJournal(
+            plan_hash=compute_plan_hash(steps),
+            config_hash=config_hash,
+            steps=steps,
+        )
+        self.save(journal)
+        return journal
+
+    def save_snapshot(self, snapshot: bytes) -> None:
+        """
+        Record a rollback snapshot for a change made outside the step executor.
+
+        Any previous journal is removed: it no longer describes the Dock,
+        so it must not be resumed.
+
+        Args:
+            snapshot: Raw bytes of the Dock plist before the change.
+        """
+        self.journal_path.unlink(missing_ok=True)
+        atomic_write(self.snapshot_path, snapshot)
+
+    def save(self, journal: ApplyJournal) -> None:
+        """
+        Write the journal to disk atomically.
+
+        Args:
+            journal: Journal to persist.
+        """
+        atomic_write(self.journal_path, json.dumps(asdict(journal), indent=2).encode())
+
+    def mark_completed(self, journal: ApplyJournal, completed: int) -> None:
+        """
+        Record that the first ``completed`` steps have finished.
+
+        Args:
+            journal: Journal to update.
+            completed: Number of steps completed so far.
+        """
+        journal.completed = completed
+        if completed >= len(journal.steps):
+            journal.status = "complete"
+        self.save(journal)
+
+    def load(self) -> ApplyJournal | None:
+        """
+        Load the journal from disk.
+
+        Returns:
+            ApplyJournal, or None if no journal exists.
+
+        Raises:
+            ValueError: If the journal is corrupt or its steps do not
+                       match the recorded plan hash.
+        """
+        if not self.journal_path.exists():
+            return None
+
+        try:
+            data = json.loads(self.journal_path.read_text())
+            steps = [ApplyStep(**step) for step in data.pop("steps")]
+            journal = ApplyJournal(steps=steps, **data)
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            raise ValueError(f"Apply journal is corrupt: {self.journal_path}") from e
+
+        if compute_plan_hash(journal.steps) != journal.plan_hash:
+            raise ValueError(
+                f"Apply journal steps do not match plan hash: {self.journal_path}"
+            )
+        return journal
+
+    def read_snapshot(self) -> bytes | None:
+        """
+        Read the pre-apply plist snapshot.
+
+        Returns:
+            Snapshot bytes, or None if no snapshot exists.
+        """
+        if not self.snapshot_path.exists():
+            return None
+        return self.snapshot_path.read_bytes()
+
+    def clear(self) -> None:
+        """Remove the journal and snapshot."""
+        self.journal_path.unlink(missing_ok=True)
+        self.snapshot_path.unlink(missing_ok=True)
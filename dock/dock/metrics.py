@@ -0,0 +1,259 @@
+"""Prometheus textfile metrics for reset runs."""
+
+import re
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from dock.dock.diff import DockDiff
+from dock.utils.files import atomic_write
+
+# Upper bounds in seconds for the dockutil latency histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ("load_config", "read_state", "diff", "plan", "apply", "restart")
+
+CHANGE_TYPES = (
+    "app_add",
+    "app_remove",
+    "app_reorder",
+    "setting",
+    "downloads",
+    "stack_add",
+    "stack_remove",
+    "stack_update",
+    "stack_move",
+)
+
+
+@dataclass
+class CommandStats:
+    """Latency histogram and failure count for one dockutil command kind."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+    failures: int = 0
+
+    def observe(self, seconds: float, ok: bool) -> None:
+        """
+        Record one command invocation.
+
+        Args:
+            seconds: Wall time of the invocation.
+            ok: Whether it succeeded.
+        """
+        self.count += 1
+        self.total += seconds
+        if not ok:
+            self.failures += 1
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+
+
+@dataclass
+class ApplyMetrics:
+    """
+    Measurements of one reset, for node_exporter's textfile collector and the run history.
+
+    The metrics file describes the last run, so every value is a gauge
+    except the dockutil latency histogram, which covers that run's
+    invocations.
+    """
+
+    started_at: float = field(default_factory=time.time)
+    phases: dict[str, float] = field(default_factory=dict)
+    commands: dict[str, CommandStats] = field(default_factory=dict)
+    changes: dict[str, int] = field(default_factory=dict)
+    steps: list[tuple[str, float]] = field(default_factory=list)
+    config_hash: str = ""
+    state_fingerprint: str = ""
+    drift: bool = False
+    dry_run: bool = False
+    restarts: int = 0
+    failed: bool = False
+    applied: bool = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a phase of the run; repeated phases add up.
+
+        Args:
+            name: Phase name, one of PHASES.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def record_command(self, kind: str, seconds: float, ok: bool) -> None:
+        """
+        Record one command invocation.
+
+        Matches the SubprocessExecutor ``on_command`` callback.
+
+        Args:
+            kind: Command kind from command_kind().
+            seconds: Wall time of the invocation.
+            ok: Whether it succeeded.
+        """
+        self.commands.setdefault(kind, CommandStats()).observe(seconds, ok)
+
+    def record_step(self, action: str, seconds: float) -> None:
+        """
+        Record one executed apply step.
+
+        Args:
+            action: Step action, e.g. "add_app".
+            seconds: Wall time of the step.
+        """
+        self.steps.append((action, seconds))
+
+    def record_diff(self, diff: DockDiff) -> None:
+        """
+        Record the size of a diff by change type.
+
+        Args:
+            diff: DockDiff between the configuration and the Dock.
+        """
+        changes = dict.fromkeys(CHANGE_TYPES, 0)
+        for app_change in diff.app_changes:
+            changes[f"app_{app_change.action}"] += 1
+        changes["setting"] = len(diff.setting_changes)
+        changes["downloads"] = int(diff.downloads_change is not None)
+        for stack_change in diff.stack_changes:
+            changes[f"stack_{stack_change.action}"] += 1
+        self.changes = changes
+        self.drift = diff.has_changes()
+
+    def render(self, now: float, last_apply: float | None) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            now: Unix time the run finished.
+            last_apply: Unix time changes were last applied, if ever.
+
+        Returns:
+            Exposition text.
+        """
+        out = _Exposition()
+        out.gauge("dock_last_run_timestamp_seconds", "Unix time the last reset finished.", now)
+        if last_apply is not None:
+            out.gauge(
+                "dock_last_apply_timestamp_seconds",
+                "Unix time a reset last changed the Dock.",
+                last_apply,
+            )
+        out.gauge("dock_last_run_failed", "Whether the last reset failed.", int(self.failed))
+        out.gauge(
+            "dock_last_run_dry_run", "Whether the last reset was a dry run.", int(self.dry_run)
+        )
+        out.gauge(
+            "dock_drift_detected",
+            "Whether the Dock differed from its configuration.",
+            int(self.drift),
+        )
+        out.gauge("dock_restarts", "Dock restarts during the last reset.", self.restarts)
+        out.labelled_gauge(
+            "dock_phase_duration_seconds",
+            "Seconds the last reset spent in each phase.",
+            "phase",
+            {name: self.phases.get(name, 0.0) for name in PHASES},
+        )
+        out.labelled_gauge(
+            "dock_diff_changes",
+            "Changes found by the last reset, by type.",
+            "type",
+            {name: self.changes.get(name, 0) for name in CHANGE_TYPES},
+        )
+        if self.commands:
+            kinds = sorted(self.commands)
+            out.histogram(
+                "dock_command_duration_seconds",
+                "Latency of command invocations during the last reset, by kind.",
+                {kind: self.commands[kind] for kind in kinds},
+            )
+            out.labelled_gauge(
+                "dock_command_failures",
+                "Failed command invocations during the last reset, by kind.",
+                "kind",
+                {kind: self.commands[kind].failures for kind in kinds},
+            )
+        return out.text()
+
+    def write(self, path: Path) -> None:
+        """
+        Write the metrics file atomically so the collector never reads a partial file.
+
+        The last apply time is carried over from the previous file when
+        this run didn't change the Dock.
+
+        Args:
+            path: Destination, usually ``<textfile dir>/dock.prom``.
+        """
+        now = time.time()
+        last_apply = (
+            now if self.applied else _read_gauge(path, "dock_last_apply_timestamp_seconds")
+        )
+        atomic_write(path, self.render(now, last_apply).encode())
+
+
+class _Exposition:
+    """Builds Prometheus exposition text."""
+
+    def __init__(self) -> None:
+        """Initialize an empty exposition."""
+        self.lines: list[str] = []
+
+    def _header(self, name: str, help_text: str, kind: str) -> None:
+        """Add the HELP and TYPE lines of a metric."""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def gauge(self, name: str, help_text: str, value: float) -> None:
+        """Add an unlabelled gauge."""
+        self._header(name, help_text, "gauge")
+        self.lines.append(f"{name} {_format(value)}")
+
+    def labelled_gauge(
+        self, name: str, help_text: str, label: str, values: Mapping[str, float]
+    ) -> None:
+        """Add a gauge with one sample per label value."""
+        self._header(name, help_text, "gauge")
+        for key, value in values.items():
+            self.lines.append(f'{name}{{{label}="{key}"}} {_format(value)}')
+
+    def histogram(self, name: str, help_text: str, stats: dict[str, CommandStats]) -> None:
+        """Add a histogram with one series per command kind."""
+        self._header(name, help_text, "histogram")
+        for kind, kind_stats in stats.items():
+            for bound, count in zip(LATENCY_BUCKETS, kind_stats.buckets, strict=True):
+                self.lines.append(f'{name}_bucket{{kind="{kind}",le="{bound}"}} {count}')
+            self.lines.append(f'{name}_bucket{{kind="{kind}",le="+Inf"}} {kind_stats.count}')
+            self.lines.append(f'{name}_sum{{kind="{kind}"}} {_format(kind_stats.total)}')
+            self.lines.append(f'{name}_count{{kind="{kind}"}} {kind_stats.count}')
+
+    def text(self) -> str:
+        """Get the exposition text."""
+        return "\n".join(self.lines) + "\n"
+
+
+def _format(value: float) -> str:
+    """Format a sample value; integers stay integers."""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _read_gauge(path: Path, name: str) -> float | None:
+    """Read an unlabelled sample from a previously written metrics file."""
+    try:
+        text = path.read_text()
+    except OSError:
+        return None
+    match = re.search(rf"^{re.escape(name)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
@@ -1,17 +1,99 @@
 """Execution plan generator for dock changes."""
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Any, Literal
 
-from dock.config.models import DownloadsConfig
-from dock.dock.diff import DockDiff
+from dock.adapters.apps import ApplicationIndex, default_app_path
+from dock.config.models import DownloadsConfig, StackConfig
+from dock.config.settings import SETTINGS_BY_NAME
+from dock.dock.diff import DockDiff, StackChange
+from dock.dock.journal import ApplyStep
+from dock.dock.stacks import (
+    DOWNLOADS_PRESETS,
+    downloads_attributes,
+    stack_tile_attributes,
+)
+
+# Rough wall-clock cost of each executor step, for dry-run estimates. Every
+# dockutil call starts a process that rewrites the plist; the batched plist
+# steps are a single read-modify-write.
+DOCKUTIL_STEP_SECONDS = 0.4
+PLIST_STEP_SECONDS = 0.02
+RESTART_SECONDS = 1.0
+DOCKUTIL_ACTIONS = (
+    "remove_all",
+    "remove_app",
+    "add_app",
+    "move_app",
+    "remove_folder",
+    "add_folder",
+)
+
+
+@dataclass
+class PlanSummary:
+    """Operation counts and estimated cost of applying one profile."""
+
+    profile: str
+    apps_added: int = 0
+    apps_removed: int = 0
+    reorder: bool = False
+    settings: int = 0
+    stacks: int = 0
+    downloads: bool = False
+    dockutil_calls: int = 0
+    plist_writes: int = 0
+    estimated_seconds: float = 0.0
+    error: str | None = None
+
+    def has_changes(self) -> bool:
+        """
+        Check if applying the profile would change the Dock.
+
+        Returns:
+            True if any step would run, False otherwise.
+        """
+        return self.dockutil_calls + self.plist_writes > 0
+
+    @classmethod
+    def from_steps(cls, profile: str, diff: DockDiff, steps: list[ApplyStep]) -> PlanSummary:
+        """
+        Summarize a diff and the executor steps that would apply it.
+
+        Args:
+            profile: Profile name.
+            diff: DockDiff for the profile.
+            steps: Steps from DockExecutor.build_steps.
+
+        Returns:
+            PlanSummary with counts and an estimated duration.
+        """
+        dockutil_calls = sum(1 for step in steps if step.action in DOCKUTIL_ACTIONS)
+        plist_writes = len(steps) - dockutil_calls
+        estimated = dockutil_calls * DOCKUTIL_STEP_SECONDS + plist_writes * PLIST_STEP_SECONDS
+        if steps:
+            estimated += RESTART_SECONDS
+        return cls(
+            profile=profile,
+            apps_added=sum(1 for c in diff.app_changes if c.action == "add"),
+            apps_removed=sum(1 for c in diff.app_changes if c.action == "remove"),
+            reorder=any(c.action == "reorder" for c in diff.app_changes),
+            settings=len(diff.setting_changes),
+            stacks=len(diff.stack_changes),
+            downloads=diff.downloads_change is not None,
+            dockutil_calls=dockutil_calls,
+            plist_writes=plist_writes,
+            estimated_seconds=estimated,
+        )
 
 
 @dataclass
 class ExecutionStep:
     """Represents a single execution step."""
 
-    action: Literal["remove_all", "add_app", "set_plist", "restart"]
+    action: Literal[
+        "remove_all", "remove_app", "move_app", "add_app", "set_plist", "restart"
+    ]
     description: str
     command: str
 
@@ -20,24 +102,69 @@ class ExecutionPlan:
     """Generates execution plan from diff."""
 
     @staticmethod
-    def generate_plan(diff: DockDiff, desired_apps: list[str]) -> list[ExecutionStep]:
+    def generate_plan(
+        diff: DockDiff,
+        desired_apps: list[str],
+        app_index: ApplicationIndex | None = None,
+        moves: bool = False,
+    ) -> list[ExecutionStep]:
         """
         Generate execution plan from diff.
 
         Args:
             diff: DockDiff containing changes.
             desired_apps: List of desired apps in order.
+            app_index: Optional ApplicationIndex used to resolve app paths.
+            moves: Whether dockutil supports --move, so a reorder can move
+                  apps out of place instead of removing and re-adding all.
 
         Returns:
             List of ExecutionStep objects representing the plan.
         """
         steps: list[ExecutionStep] = []
 
+        def app_path(app: str) -> str:
+            if app_index is not None:
+                return app_index.path_for(app)
+            return default_app_path(app)
+
         # Check if we need to modify apps
         has_reorder = any(change.action == "reorder" for change in diff.app_changes)
         has_app_changes = bool(diff.app_changes)
+        operations = diff.app_moves if has_reorder and moves else None
 
-        if has_reorder:
+        if operations is not None:
+            for action, app, position in operations:
+                if action == "remove":
+                    steps.append(
+                        ExecutionStep(
+                            action="remove_app",
+                            description=f"Remove {app}",
+                            command=f"dockutil --remove '{app}' --no-restart",
+                        )
+                    )
+                elif action == "move":
+                    steps.append(
+                        ExecutionStep(
+                            action="move_app",
+                            description=f"Move {app} to position {position}",
+                            command=(
+                                f"dockutil --move '{app}' --position {position} --no-restart"
+                            ),
+                        )
+                    )
+                else:
+                    steps.append(
+                        ExecutionStep(
+                            action="add_app",
+                            description=f"Add {app} at position {position}",
+                            command=(
+                                f"dockutil --add '{app_path(app)}' "
+                                f"--position {position} --no-restart"
+                            ),
+                        )
+                    )
+        elif has_reorder:
             # Step 1: Remove all apps
             steps.append(
                 ExecutionStep(
@@ -54,7 +181,7 @@ class ExecutionPlan:
                         action="add_app",
                         description=f"Add {app} at position {position}",
                         command=(
-                            f"dockutil --add /Applications/{app}.app "
+                            f"dockutil --add '{app_path(app)}' "
                             f"--position {position} --no-restart"
                         ),
                     )
@@ -65,7 +192,7 @@ class ExecutionPlan:
                 if change.action == "remove":
                     steps.append(
                         ExecutionStep(
-                            action="add_app",
+                            action="remove_app",
                             description=f"Remove {change.app_name}",
                             command=f"dockutil --remove '{change.app_name}' --no-restart",
                         )
@@ -81,79 +208,89 @@ class ExecutionPlan:
                             action="add_app",
                             description=f"Add {change.app_name}",
                             command=(
-                                f"dockutil --add /Applications/{change.app_name}.app"
+                                f"dockutil --add '{app_path(change.app_name)}'"
                                 f"{position_arg} --no-restart"
                             ),
                         )
                     )
 
-        # Handle downloads changes
-        if diff.downloads_change is not None:
-            if diff.downloads_change == "off":
-                steps.append(
-                    ExecutionStep(
-                        action="add_app",
-                        description="Remove Downloads folder",
-                        command="dockutil --remove Downloads --no-restart",
-                    )
-                )
-            elif isinstance(diff.downloads_change, DownloadsConfig):
-                # Map preset to dockutil view and display options
-                # classic = stack view, fan = fan view, list = list/grid view
-                if diff.downloads_change.preset == "classic":
-                    view = "auto"
-                    display = "stack"
-                elif diff.downloads_change.preset == "fan":
-                    view = "fan"
-                    display = "stack"
-                else:  # list
-                    view = "grid"
-                    display = "folder"
-
-                # Map section to dockutil section
-                section_map = {
-                    "apps-left": "left",
-                    "apps-right": "right",
-                    "others": "others",
-                }
-                section = section_map.get(diff.downloads_change.section, "others")
+        # The rest follows DockExecutor.build_steps: stacks, one batch of
+        # in-place tile patches, settings, then the Downloads tile. Adds,
+        # removes and moves of stacks (and rebuilding all apps, which clears
+        # stacks) rewrite the stacks in one plist write.
+        removes_all = has_reorder and operations is None
+        structural = removes_all or any(c.action != "update" for c in diff.stack_changes)
+        patches: list[tuple[str, dict[str, Any]]] = []
+        if diff.stacks is not None and structural:
+            steps.append(ExecutionPlan._stacks_step(diff.stacks, diff.stack_changes))
+        else:
+            patches.extend(
+                (change.stack.path, stack_tile_attributes(change.stack))
+                for change in diff.stack_changes
+                if change.action == "update"
+            )
 
-                steps.append(
-                    ExecutionStep(
-                        action="add_app",
-                        description=(
-                            f"Add Downloads folder (preset: {diff.downloads_change.preset})"
-                        ),
-                        command=(
-                            f"dockutil --add '{diff.downloads_change.path}' "
-                            f"--view {view} --display {display} "
-                            f"--section {section} --no-restart"
-                        ),
-                    )
+        downloads_change = diff.downloads_change
+        if (
+            isinstance(downloads_change, DownloadsConfig)
+            and diff.downloads_in_place
+            and not removes_all
+        ):
+            patches.append((downloads_change.path, downloads_attributes(downloads_change.preset)))
+            downloads_change = None
+        if patches:
+            steps.append(
+                ExecutionStep(
+                    action="set_plist",
+                    description=f"Patch {len(patches)} tiles in place",
+                    command=ExecutionPlan._patch_command(patches),
                 )
+            )
 
-        # Handle settings changes
+        # Handle settings changes (applied together in one plist write)
         for setting_change in diff.setting_changes:
-            if setting_change.setting_name == "autohide":
-                value = "true" if setting_change.new_value else "false"
-                steps.append(
-                    ExecutionStep(
-                        action="set_plist",
-                        description=f"Set autohide to {value}",
-                        command=f"defaults write com.apple.dock autohide -bool {value}",
-                    )
+            spec = SETTINGS_BY_NAME[setting_change.setting_name]
+            steps.append(
+                ExecutionStep(
+                    action="set_plist",
+                    description=f"Set {spec.plist_key} to {setting_change.new_value}",
+                    command=spec.defaults_command(setting_change.new_value),
                 )
-            elif setting_change.setting_name == "autohide_delay":
-                steps.append(
-                    ExecutionStep(
-                        action="set_plist",
-                        description=f"Set autohide delay to {setting_change.new_value}s",
-                        command=(
-                            f"defaults write com.apple.dock autohide-delay "
-                            f"-float {setting_change.new_value}"
-                        ),
-                    )
+            )
+
+        # Handle downloads changes
+        if downloads_change == "off":
+            steps.append(
+                ExecutionStep(
+                    action="remove_app",
+                    description="Remove Downloads folder",
+                    command="dockutil --remove Downloads --no-restart",
+                )
+            )
+        elif isinstance(downloads_change, DownloadsConfig):
+            # Map preset to dockutil view and display options
+            # classic = stack view, fan = fan view, list = list/grid view
+            view, display = DOWNLOADS_PRESETS[downloads_change.preset]
+
+            # Map section to dockutil section
+            section_map = {
+                "apps-left": "left",
+                "apps-right": "right",
+                "others": "others",
+            }
+            section = section_map.get(downloads_change.section, "others")
+
+            steps.append(
+                ExecutionStep(
+                    action="add_app",
+                    description=f"Add Downloads folder (preset: {downloads_change.preset})",
+                    command=(
+                        f"dockutil --add '{downloads_change.path}' "
+                        f"--view {view} --display {display} "
+                        f"--section {section} --no-restart"
+                    ),
                 )
+            )
 
         # Final step: Restart dock
         if steps:
@@ -166,3 +303,49 @@ class ExecutionPlan:
             )
 
         return steps
+
+    @staticmethod
+    def _stacks_step(stacks: list[StackConfig], changes: list[StackChange]) -> ExecutionStep:
+        """
+        Describe the single plist write that arranges folder and URL stacks.
+
+        Args:
+            stacks: Desired stacks in order.
+            changes: StackChange objects from the diff.
+
+        Returns:
+            ExecutionStep for the plan output.
+        """
+        sections = {stack.section for stack in stacks} | {c.stack.section for c in changes}
+        arrays = ", ".join(f"persistent-{section}" for section in sorted(sections))
+        if changes:
+            edits = ", ".join(
+                f"{change.action} {change.stack.label or change.stack.path}"
+                for change in changes
+            )
+            description = "Arrange folder and URL stacks"
+        else:
+            edits = "restore stacks cleared by removing all apps"
+            description = "Restore folder and URL stacks"
+        return ExecutionStep(
+            action="set_plist",
+            description=description,
+            command=f"write {arrays or 'persistent-others'}: {edits}",
+        )
+
+    @staticmethod
+    def _patch_command(patches: list[tuple[str, dict[str, Any]]]) -> str:
+        """
+        Describe the plist write that patches tiles in place.
+
+        Args:
+            patches: Path of each patched tile and the tile-data attributes set.
+
+        Returns:
+            One-line description of the plist edit.
+        """
+        tiles = ", ".join(
+            f"'{path}' " + " ".join(f"{key}={value}" for key, value in attributes.items())
+            for path, attributes in patches
+        )
+        return f"patch tiles {tiles}"
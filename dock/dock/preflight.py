@@ -0,0 +1,55 @@
+"""Preflight checks run before any destructive dock change."""
+
+from dataclasses import dataclass, field
+
+from dock.adapters.apps import ApplicationIndex
+from dock.dock.diff import DockDiff
+
+
+@dataclass
+class PreflightResult:
+    """Outcome of a preflight check."""
+
+    missing_apps: list[str] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        """
+        Check if the plan can run as-is.
+
+        Returns:
+            True if nothing is missing, False otherwise.
+        """
+        return not self.missing_apps
+
+
+class Preflight:
+    """Checks that every app a diff will add is installed."""
+
+    def __init__(self, app_index: ApplicationIndex):
+        """
+        Initialize Preflight.
+
+        Args:
+            app_index: ApplicationIndex of installed applications. The index
+                      lists each search root once rather than stat-ing each app.
+        """
+        self.app_index = app_index
+
+    def check(self, diff: DockDiff) -> PreflightResult:
+        """
+        Check every app the diff will add.
+
+        Args:
+            diff: DockDiff about to be applied.
+
+        Returns:
+            PreflightResult listing apps that are not installed, in diff order.
+        """
+        to_add = [change.app_name for change in diff.app_changes if change.action == "add"]
+        if not to_add:
+            return PreflightResult()
+
+        missing = list(
+            dict.fromkeys(app for app in to_add if self.app_index.resolve(app) is None)
+        )
+        return PreflightResult(missing_apps=missing)
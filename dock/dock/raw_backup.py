@@ -0,0 +1,134 @@
+"""Lossless backups of the Dock plist keys dock manages."""
+
+import plistlib
+from dataclasses import dataclass
+from typing import Any
+
+from dock import __version__
+from dock.config.settings import SETTINGS
+
+RAW_FORMAT_VERSION = 1
+RAW_BACKUP_KIND = "dock-raw-backup"
+
+# Tile arrays and every registered setting. Tiles are kept as the Dock wrote
+# them, including GUIDs and file bookmarks, so a restore is exact.
+RAW_BACKUP_KEYS: tuple[str, ...] = (
+    "persistent-apps",
+    "persistent-others",
+    "recent-apps",
+    *(spec.plist_key for spec in SETTINGS),
+)
+
+
+def is_raw_backup(data: bytes) -> bool:
+    """
+    Check if file contents look like a raw backup rather than YAML.
+
+    Args:
+        data: File contents.
+
+    Returns:
+        True if the contents are a plist, False otherwise.
+    """
+    return data.startswith((b"bplist00", b"<?xml"))
+
+
+@dataclass
+class RawBackup:
+    """Dock plist values copied verbatim from the live plist."""
+
+    values: dict[str, Any]
+    dock_version: str = __version__
+
+    @classmethod
+    def capture(cls, plist: dict[str, Any]) -> RawBackup:
+        """
+        Copy the backed-up keys out of a Dock plist.
+
+        Args:
+            plist: Dock plist dictionary.
+
+        Returns:
+            RawBackup. Keys absent from the plist are absent here too.
+        """
+        return cls(values={key: plist[key] for key in RAW_BACKUP_KEYS if key in plist})
+
+    def apply_to(self, plist: dict[str, Any]) -> dict[str, Any]:
+        """
+        Build the plist a restore writes.
+
+        Backed-up keys replace the current ones, and keys that were absent
+        when the backup was taken are removed so the Dock falls back to
+        its defaults. Keys dock doesn't manage are left alone.
+
+        Args:
+            plist: Current Dock plist dictionary.
+
+        Returns:
+            New plist dictionary.
+        """
+        restored = {key: value for key, value in plist.items() if key not in RAW_BACKUP_KEYS}
+        restored.update(self.values)
+        return restored
+
+    def changed_keys(self, plist: dict[str, Any]) -> list[str]:
+        """
+        List the keys a restore would change.
+
+        Args:
+            plist: Current Dock plist dictionary.
+
+        Returns:
+            Changed keys, in RAW_BACKUP_KEYS order.
+        """
+        return [key for key in RAW_BACKUP_KEYS if plist.get(key) != self.values.get(key)]
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the backup as a binary plist.
+
+        Keys are sorted and no timestamp is included, so an unchanged Dock
+        serializes to the same bytes and deduplicates in a backup store.
+
+        Returns:
+            Binary plist.
+        """
+        data = {
+            "kind": RAW_BACKUP_KIND,
+            "version": RAW_FORMAT_VERSION,
+            "dock_version": self.dock_version,
+            "values": self.values,
+        }
+        return plistlib.dumps(data, fmt=plistlib.FMT_BINARY, sort_keys=True)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> RawBackup:
+        """
+        Read a backup written by to_bytes.
+
+        Args:
+            data: Backup contents.
+
+        Returns:
+            RawBackup.
+
+        Raises:
+            ValueError: If the data is not a raw backup or contains keys
+                       dock doesn't restore.
+        """
+        try:
+            parsed = plistlib.loads(data)
+        except Exception as e:  # plistlib raises several parser-specific errors
+            raise ValueError("Not a raw Dock backup") from e
+        if not isinstance(parsed, dict) or parsed.get("kind") != RAW_BACKUP_KIND:
+            raise ValueError("Not a raw Dock backup")
+        if parsed.get("version") != RAW_FORMAT_VERSION:
+            raise ValueError(f"Unsupported raw backup format: {parsed.get('version')}")
+
+        values = parsed.get("values")
+        if not isinstance(values, dict):
+            raise ValueError("Raw backup has no values")
+        unexpected = sorted(set(values) - set(RAW_BACKUP_KEYS))
+        if unexpected:
+            raise ValueError(f"Raw backup contains unexpected keys: {', '.join(unexpected)}")
+        return cls(values=values, dock_version=str(parsed.get("dock_version", "")))
@@ -0,0 +1,474 @@
+"""Drift of many machines' Dock backups from a baseline configuration."""
+
+import hashlib
+import json
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Literal
+
+import yaml
+
+from dock.config.converter import converter
+from dock.config.models import DockConfig, DownloadsConfig
+from dock.config.settings import SETTINGS
+from dock.dock.stacks import portable_path
+
+try:
+    import numpy as np  # type: ignore[import-not-found, unused-ignore]
+
+    HAVE_NUMPY = True
+except ImportError:  # numpy is optional; the pure-Python path gives the same report
+    HAVE_NUMPY = False
+
+# libyaml's loader is several times faster on large fleets when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SNAPSHOT_PATTERNS = ("*.yml", "*.yaml")
+
+
+class AppInterner:
+    """Maps app names to small integer ids so states compare as int tuples."""
+
+    def __init__(self) -> None:
+        """Initialize an empty AppInterner."""
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+
+    def intern(self, names: list[str]) -> tuple[int, ...]:
+        """
+        Get the ids of app names, assigning new ids as needed.
+
+        Args:
+            names: App names in Dock order.
+
+        Returns:
+            Ids in the same order.
+        """
+        ids = []
+        for name in names:
+            app_id = self.ids.get(name)
+            if app_id is None:
+                app_id = self.ids[name] = len(self.names)
+                self.names.append(name)
+            ids.append(app_id)
+        return tuple(ids)
+
+    def __len__(self) -> int:
+        """Number of distinct apps seen."""
+        return len(self.names)
+
+
+@dataclass(frozen=True)
+class MachineState:
+    """The parts of a backup that drift is reported on, in comparable form."""
+
+    apps: tuple[int, ...]
+    settings: tuple[tuple[str, Any], ...]
+    downloads: str
+    stacks: tuple[str, ...]
+
+    @classmethod
+    def from_backup(cls, data: dict[str, Any], interner: AppInterner) -> MachineState:
+        """
+        Reduce a parsed 'dock backup' file to a MachineState.
+
+        Backups omit settings that have their default value, so missing
+        settings are filled in from the settings registry.
+
+        Args:
+            data: Parsed backup YAML.
+            interner: AppInterner shared across the fleet.
+
+        Returns:
+            MachineState.
+
+        Raises:
+            ValueError: If the backup doesn't have the expected shape.
+        """
+        apps = data.get("apps") or []
+        settings = data.get("settings") or {}
+        stacks = data.get("stacks") or []
+        if not isinstance(apps, list) or not isinstance(settings, dict):
+            raise ValueError("apps must be a list and settings a mapping")
+        if not isinstance(stacks, list):
+            raise ValueError("stacks must be a list")
+
+        values = {spec.name: settings.get(spec.name, spec.default) for spec in SETTINGS}
+        if not all(isinstance(value, bool | int | float | str) for value in values.values()):
+            raise ValueError("settings must have scalar values")
+        return cls(
+            apps=interner.intern([str(app) for app in apps]),
+            settings=tuple(values.items()),
+            downloads=_downloads_key(data.get("downloads")),
+            stacks=tuple(sorted(portable_path(str(_stack_path(stack))) for stack in stacks)),
+        )
+
+    def state_hash(self, interner: AppInterner) -> str:
+        """
+        Hash the state independently of interning order.
+
+        Args:
+            interner: AppInterner the app ids came from.
+
+        Returns:
+            Short hex digest shared by machines in an identical state.
+        """
+        payload = [
+            [interner.names[app] for app in self.apps],
+            self.settings,
+            self.downloads,
+            self.stacks,
+        ]
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:12]
+
+
+def _canonical(value: Any) -> str:
+    """Serialize a value so equal values compare equal as strings."""
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _downloads_key(value: Any) -> str:
+    """
+    Normalize a Downloads tile from a backup or configuration.
+
+    A backup without a Downloads tile and a configuration with
+    ``downloads: off`` both mean there is no tile. Tile settings are
+    filled in with defaults so partial and full settings compare equal.
+    """
+    if value is None or value is False or value == "off":
+        return "off"
+    if isinstance(value, DownloadsConfig):
+        return _canonical(converter.unstructure(value))
+    if not isinstance(value, dict):
+        raise ValueError(f"Invalid downloads value: {value}")
+    try:
+        return _canonical(converter.unstructure(converter.structure(value, DownloadsConfig)))
+    except Exception as e:  # cattrs raises several validation errors
+        raise ValueError(f"Invalid downloads value: {value}") from e
+
+
+def _stack_path(stack: Any) -> Any:
+    """Get the path of a stack entry from a backup or configuration."""
+    return stack.get("path") if isinstance(stack, dict) else stack
+
+
+@dataclass(frozen=True)
+class Drift:
+    """One way a machine differs from the baseline."""
+
+    kind: Literal[
+        "missing_app", "extra_app", "app_order", "setting", "downloads",
+        "missing_stack", "extra_stack",
+    ]
+    subject: str = ""
+    value: str = ""
+
+    def describe(self) -> str:
+        """
+        Describe the drift for display.
+
+        Returns:
+            Short human-readable description.
+        """
+        if self.kind == "missing_app":
+            return f"missing app {self.subject}"
+        if self.kind == "extra_app":
+            return f"extra app {self.subject}"
+        if self.kind == "app_order":
+            return "apps in a different order"
+        if self.kind == "setting":
+            return f"{self.subject} is {self.value}"
+        if self.kind == "downloads":
+            return "Downloads tile differs"
+        if self.kind == "missing_stack":
+            return f"missing stack {self.subject}"
+        return f"extra stack {self.subject}"
+
+
+@dataclass
+class StateGroup:
+    """Machines whose backups are in an identical state."""
+
+    state_hash: str
+    machines: list[str]
+    drifts: list[Drift]
+
+
+@dataclass
+class FleetReport:
+    """Drift of a fleet of machines from a baseline configuration."""
+
+    baseline: str
+    groups: list[StateGroup] = field(default_factory=list)
+    unreadable: list[tuple[str, str]] = field(default_factory=list)
+
+    def machine_count(self) -> int:
+        """
+        Count the machines whose backups were read.
+
+        Returns:
+            Number of machines.
+        """
+        return sum(len(group.machines) for group in self.groups)
+
+    def matching_count(self) -> int:
+        """
+        Count the machines in the baseline state.
+
+        Returns:
+            Number of machines without drift.
+        """
+        return sum(len(group.machines) for group in self.groups if not group.drifts)
+
+    def drifting_groups(self) -> list[StateGroup]:
+        """
+        Get the groups that differ from the baseline.
+
+        Returns:
+            Groups with drift, largest first.
+        """
+        return [group for group in self.groups if group.drifts]
+
+    def drift_counts(self) -> list[tuple[Drift, int]]:
+        """
+        Count machines per drift.
+
+        Returns:
+            (drift, machines) pairs, most common first.
+        """
+        counts: Counter[Drift] = Counter()
+        for group in self.groups:
+            for drift in group.drifts:
+                counts[drift] += len(group.machines)
+        return counts.most_common()
+
+
+class Baseline:
+    """The baseline configuration in the same comparable form as machine states."""
+
+    def __init__(self, config: DockConfig, interner: AppInterner):
+        """
+        Initialize Baseline.
+
+        Args:
+            config: Baseline configuration.
+            interner: AppInterner shared with the fleet.
+        """
+        self.apps = interner.intern(list(config.apps))
+        self.settings = config.settings.managed_values()
+        self.downloads = (
+            _downloads_key(config.downloads) if config.downloads is not None else None
+        )
+        self.stacks = (
+            {portable_path(stack.path) for stack in config.stacks}
+            if config.stacks is not None
+            else None
+        )
+
+    def other_drifts(self, state: MachineState) -> list[Drift]:
+        """
+        Compare everything but apps, which are compared for all states at once.
+
+        Only what the baseline manages is compared: unmanaged settings,
+        Downloads and stacks never count as drift.
+
+        Args:
+            state: Machine state.
+
+        Returns:
+            Setting, Downloads and stack drifts.
+        """
+        drifts: list[Drift] = []
+        values = dict(state.settings)
+        for name, expected in self.settings.items():
+            if values[name] != expected:
+                drifts.append(
+                    Drift("setting", name, f"{values[name]!r} (baseline {expected!r})")
+                )
+        if self.downloads is not None and state.downloads != self.downloads:
+            drifts.append(Drift("downloads"))
+        if self.stacks is not None:
+            present = set(state.stacks)
+            drifts += [Drift("missing_stack", path) for path in sorted(self.stacks - present)]
+            drifts += [Drift("extra_stack", path) for path in sorted(present - self.stacks)]
+        return drifts
+
+
+# Per state: ids missing from the Dock, extra ids, whether the order differs
+AppDrift = tuple[list[int], list[int], bool]
+
+
+def compare_apps(
+    states: list[tuple[int, ...]], baseline: tuple[int, ...], vocabulary: int
+) -> list[AppDrift]:
+    """
+    Compare the apps of many states against the baseline.
+
+    Uses NumPy when it is installed and a pure-Python loop otherwise; both
+    return the same result. Apps the baseline doesn't list are ignored
+    when comparing order.
+
+    Args:
+        states: App ids of each distinct state.
+        baseline: Baseline app ids in order.
+        vocabulary: Number of interned apps; every id is below it.
+
+    Returns:
+        (missing ids in baseline order, extra ids ascending, order differs)
+        for each state.
+    """
+    if HAVE_NUMPY and states:
+        return _compare_apps_numpy(states, baseline, vocabulary)
+    return _compare_apps_python(states, baseline)
+
+
+def _compare_apps_python(
+    states: list[tuple[int, ...]], baseline: tuple[int, ...]
+) -> list[AppDrift]:
+    """Compare apps one state at a time."""
+    ranks = {app: rank for rank, app in enumerate(baseline)}
+    results: list[AppDrift] = []
+    for apps in states:
+        present = set(apps)
+        missing = [app for app in baseline if app not in present]
+        extra = sorted(app for app in present if app not in ranks)
+        highest = -1
+        reordered = False
+        for app in apps:
+            rank = ranks.get(app)
+            if rank is None:
+                continue
+            if rank <= highest:
+                reordered = True
+                break
+            highest = rank
+        results.append((missing, extra, reordered))
+    return results
+
+
+def _compare_apps_numpy(
+    states: list[tuple[int, ...]], baseline: tuple[int, ...], vocabulary: int
+) -> list[AppDrift]:
+    """
+    Compare apps for all states at once with boolean and rank matrices.
+
+    States are packed into a padded (states x longest Dock) id matrix.
+    Membership comes from a (states x vocabulary) presence matrix, and the
+    order differs where a baseline rank doesn't exceed the running maximum
+    of the ranks before it.
+    """
+    count = len(states)
+    lengths = np.fromiter((len(apps) for apps in states), dtype=np.int64, count=count)
+    flat = np.fromiter(chain.from_iterable(states), dtype=np.int64, count=int(lengths.sum()))
+    width = max(int(lengths.max()), 1)
+    # Padding uses id `vocabulary`, an extra column that is never present
+    ids = np.full((count, width), vocabulary, dtype=np.int64)
+    ids[np.arange(width) < lengths[:, None]] = flat
+
+    base = np.asarray(baseline, dtype=np.int64)
+    in_baseline = np.zeros(vocabulary + 1, dtype=bool)
+    in_baseline[base] = True
+
+    presence = np.zeros((count, vocabulary + 1), dtype=bool)
+    presence[np.repeat(np.arange(count), lengths), flat] = True
+    missing = ~presence[:, base]
+    extra = presence & ~in_baseline
+
+    ranks = np.full(vocabulary + 1, -1, dtype=np.int64)
+    ranks[base] = np.arange(len(base))
+    state_ranks = ranks[ids]
+    highest_before = np.maximum.accumulate(state_ranks, axis=1)
+    highest_before = np.concatenate(
+        [np.full((count, 1), -1, dtype=np.int64), highest_before[:, :-1]], axis=1
+    )
+    reordered = ((state_ranks >= 0) & (state_ranks <= highest_before)).any(axis=1)
+
+    return [
+        (
+            base[missing[row]].tolist(),
+            np.flatnonzero(extra[row]).tolist(),
+            bool(reordered[row]),
+        )
+        for row in range(count)
+    ]
+
+
+def iter_backups(directory: Path) -> Iterator[tuple[str, dict[str, Any] | str]]:
+    """
+    Stream backups from a directory tree one file at a time.
+
+    Args:
+        directory: Directory of 'dock backup' YAML files.
+
+    Yields:
+        (machine name, parsed backup), or (machine name, error message)
+        for files that can't be read. The machine name is the path
+        relative to the directory, without its suffix.
+    """
+    paths = sorted(
+        {path for pattern in SNAPSHOT_PATTERNS for path in directory.rglob(pattern)}
+    )
+    for path in paths:
+        if not path.is_file():
+            continue
+        name = str(path.relative_to(directory).with_suffix(""))
+        try:
+            with open(path) as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
+        except (OSError, yaml.YAMLError) as e:
+            yield name, str(e).splitlines()[0]
+            continue
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            yield name, f"expected a mapping, got {type(data).__name__}"
+            continue
+        yield name, data
+
+
+def build_report(directory: Path, baseline_name: str, config: DockConfig) -> FleetReport:
+    """
+    Build a drift report for a directory of backups.
+
+    Backups are streamed and reduced to interned states as they are read;
+    identical states are compared once, however many machines share them.
+
+    Args:
+        directory: Directory of 'dock backup' YAML files.
+        baseline_name: Name of the baseline shown in the report.
+        config: Baseline configuration.
+
+    Returns:
+        FleetReport with groups largest first.
+    """
+    interner = AppInterner()
+    baseline = Baseline(config, interner)
+    report = FleetReport(baseline=baseline_name)
+
+    machines: dict[MachineState, list[str]] = {}
+    for name, data in iter_backups(directory):
+        if isinstance(data, str):
+            report.unreadable.append((name, data))
+            continue
+        try:
+            state = MachineState.from_backup(data, interner)
+        except ValueError as e:
+            report.unreadable.append((name, str(e)))
+            continue
+        machines.setdefault(state, []).append(name)
+
+    states = list(machines)
+    app_drifts = compare_apps([state.apps for state in states], baseline.apps, len(interner))
+    for state, (missing, extra, reordered) in zip(states, app_drifts, strict=True):
+        drifts = [Drift("missing_app", interner.names[app]) for app in missing]
+        drifts += [Drift("extra_app", interner.names[app]) for app in extra]
+        if reordered:
+            drifts.append(Drift("app_order"))
+        drifts += baseline.other_drifts(state)
+        report.groups.append(StateGroup(state.state_hash(interner), machines[state], drifts))
+
+    report.groups.sort(key=lambda group: (-len(group.machines), group.state_hash))
+    return report
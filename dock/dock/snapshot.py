@@ -0,0 +1,244 @@
+"""Captured Dock state for planning away from the machine it came from."""
+
+import base64
+import json
+import platform
+import plistlib
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from dock import __version__
+from dock.adapters import CommandExecutor
+from dock.adapters.apps import AppEntry, ApplicationIndex
+from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.plist import PlistManager
+from dock.config.converter import converter
+from dock.config.models import DockConfig
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class SnapshotExecutor(CommandExecutor):
+    """Answers the read-only dockutil commands from a captured listing."""
+
+    def __init__(self, dockutil_list: str):
+        """
+        Initialize SnapshotExecutor.
+
+        Args:
+            dockutil_list: Captured output of ``dockutil --list``.
+        """
+        self.dockutil_list = dockutil_list
+
+    def execute(self, command: list[str], check: bool = True) -> str:
+        """
+        Return the captured output for a read-only command.
+
+        Args:
+            command: List of command arguments.
+            check: Ignored; captured commands always succeed.
+
+        Returns:
+            Captured stdout.
+
+        Raises:
+            RuntimeError: For any command that would change the Dock.
+        """
+        if command == ["dockutil", "--list"]:
+            return self.dockutil_list
+        if command == ["which", "dockutil"]:
+            return "dockutil\n"
+        raise RuntimeError(f"Can't run commands against a captured state: {' '.join(command)}")
+
+
+class SnapshotPlistManager(PlistManager):
+    """Serves the Dock plist from captured bytes and refuses writes."""
+
+    def __init__(self, data: bytes):
+        """
+        Initialize SnapshotPlistManager.
+
+        Args:
+            data: Captured plist file contents.
+        """
+        self.data = data
+
+    def read_plist(self) -> dict[str, Any]:
+        """
+        Read the captured dock plist.
+
+        Returns:
+            Dictionary containing plist data.
+        """
+        parsed = plistlib.loads(self.data)
+        assert isinstance(parsed, dict)
+        return parsed
+
+    def read_bytes(self) -> bytes:
+        """
+        Read the captured plist bytes.
+
+        Returns:
+            Plist file contents, unparsed.
+        """
+        return self.data
+
+    def write_plist(self, data: dict[str, Any]) -> None:
+        """
+        Refuse to write a captured plist.
+
+        Raises:
+            RuntimeError: Always.
+        """
+        raise RuntimeError("Can't write to a captured Dock state")
+
+    def write_bytes(self, data: bytes) -> None:
+        """
+        Refuse to write a captured plist.
+
+        Raises:
+            RuntimeError: Always.
+        """
+        raise RuntimeError("Can't write to a captured Dock state")
+
+
+@dataclass
+class DockSnapshot:
+    """
+    Everything planning reads from a machine.
+
+    The raw ``dockutil --list`` output and plist bytes are kept as captured,
+    so the state reader parses them exactly as it would on the machine.
+    """
+
+    dockutil_list: str
+    plist: bytes
+    apps: list[AppEntry] = field(default_factory=list)
+    last_applied: dict[str, Any] | None = None
+    hostname: str = ""
+    captured_at: str = field(
+        default_factory=lambda: datetime.now(UTC).isoformat(timespec="seconds")
+    )
+    dock_version: str = __version__
+
+    @classmethod
+    def capture(
+        cls,
+        executor: CommandExecutor,
+        plist_mgr: PlistManager,
+        app_index: ApplicationIndex,
+        last_applied: DockConfig | None = None,
+    ) -> DockSnapshot:
+        """
+        Capture the live Dock state.
+
+        Args:
+            executor: CommandExecutor used to run ``dockutil --list``.
+            plist_mgr: PlistManager for the live Dock plist.
+            app_index: ApplicationIndex of the installed applications.
+            last_applied: Configuration applied by the last reset, if any.
+
+        Returns:
+            DockSnapshot.
+        """
+        return cls(
+            dockutil_list=executor.execute(["dockutil", "--list"]),
+            plist=plist_mgr.read_bytes(),
+            apps=app_index.entries(),
+            last_applied=converter.unstructure(last_applied) if last_applied else None,
+            hostname=platform.node(),
+        )
+
+    def dockutil(self) -> DockutilCommand:
+        """
+        Get a DockutilCommand that lists the captured tiles.
+
+        Returns:
+            DockutilCommand that fails on any command that changes the Dock.
+        """
+        return DockutilCommand(SnapshotExecutor(self.dockutil_list), app_index=self.app_index())
+
+    def plist_manager(self) -> PlistManager:
+        """
+        Get a PlistManager that reads the captured plist.
+
+        Returns:
+            Read-only PlistManager.
+        """
+        return SnapshotPlistManager(self.plist)
+
+    def app_index(self) -> ApplicationIndex:
+        """
+        Get an index of the applications installed when captured.
+
+        Returns:
+            ApplicationIndex that doesn't scan the local disk.
+        """
+        return ApplicationIndex.from_entries(self.apps, fingerprint=f"snapshot:{self.captured_at}")
+
+    def base(self) -> DockConfig | None:
+        """
+        Get the configuration applied on the captured machine.
+
+        Returns:
+            DockConfig, or None if nothing had been applied.
+        """
+        if self.last_applied is None:
+            return None
+        return converter.structure(self.last_applied, DockConfig)
+
+    def save(self, path: Path) -> None:
+        """
+        Write the snapshot as JSON.
+
+        Args:
+            path: Destination file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json())
+
+    def to_json(self) -> str:
+        """
+        Serialize the snapshot.
+
+        Returns:
+            JSON text, with the plist base64-encoded.
+        """
+        data = asdict(self)
+        data["plist"] = base64.b64encode(self.plist).decode()
+        return json.dumps({"version": SNAPSHOT_FORMAT_VERSION, **data}, indent=2) + "\n"
+
+    @classmethod
+    def load(cls, path: Path) -> DockSnapshot:
+        """
+        Read a snapshot written by save.
+
+        Args:
+            path: Snapshot file.
+
+        Returns:
+            DockSnapshot.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            ValueError: If the file is not a valid snapshot.
+        """
+        if not path.exists():
+            raise FileNotFoundError(f"State file not found: {path}")
+        try:
+            data = json.loads(path.read_text())
+        except ValueError as e:
+            raise ValueError(f"Invalid state file: {path}") from e
+        if not isinstance(data, dict) or data.pop("version", None) != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported state file format: {path}")
+
+        try:
+            data["plist"] = base64.b64decode(data["plist"])
+            data["apps"] = [AppEntry(**app) for app in data.get("apps", [])]
+            snapshot = cls(**data)
+            snapshot.plist_manager().read_plist()
+        except Exception as e:  # plistlib, base64 and the constructor raise various errors
+            raise ValueError(f"Invalid state file: {path}") from e
+        return snapshot
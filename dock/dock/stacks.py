@@ -0,0 +1,388 @@
+"""Folder and URL stack tiles in the Dock plist."""
+
+import copy
+import os
+from pathlib import Path
+from typing import Any, Literal, cast
+from urllib.parse import unquote, urlparse
+
+from dock.config.models import StackConfig
+
+# com.apple.dock tile-data codes for stack attributes
+VIEW_CODES = {"auto": 0, "fan": 1, "grid": 2, "list": 3}
+DISPLAY_CODES = {"stack": 0, "folder": 1}
+SORT_CODES = {"name": 1, "dateadded": 2, "datemodified": 3, "datecreated": 4, "kind": 5}
+
+SECTION_ARRAYS = {"apps": "persistent-apps", "others": "persistent-others"}
+
+# Downloads presets expressed as stack view and display
+DOWNLOADS_PRESETS = {
+    "classic": ("auto", "stack"),
+    "fan": ("fan", "stack"),
+    "list": ("grid", "folder"),
+}
+
+
+def is_url(path: str) -> bool:
+    """
+    Check if a stack path is a web URL rather than a folder.
+
+    Args:
+        path: Stack path from configuration.
+
+    Returns:
+        True for non-file URLs, False for folders and file URLs.
+    """
+    return "://" in path and not path.startswith("file://")
+
+
+def stack_key(path: str) -> str:
+    """
+    Resolve a stack path to the key tiles are matched on.
+
+    Folders resolve to a canonical file URL without a trailing slash, so
+    ``~/Downloads``, ``/Users/me/Downloads/`` and the plist's
+    ``file:///Users/me/Downloads/`` all share one key. Web URLs are used
+    as-is.
+
+    Args:
+        path: Folder path, file URL or web URL.
+
+    Returns:
+        Key identifying the tile.
+    """
+    if is_url(path):
+        return path
+    if path.startswith("file://"):
+        path = unquote(urlparse(path).path)
+    return Path(os.path.expanduser(path)).absolute().as_uri()
+
+
+def tile_key(tile: dict[str, Any]) -> str | None:
+    """
+    Get the key of a plist tile.
+
+    Args:
+        tile: Entry of persistent-apps or persistent-others.
+
+    Returns:
+        Key for folder and URL tiles, None for any other tile.
+    """
+    tile_type = tile.get("tile-type")
+    tile_data = tile.get("tile-data", {})
+    if tile_type == "directory-tile":
+        url = tile_data.get("file-data", {}).get("_CFURLString")
+    elif tile_type == "url-tile":
+        url = tile_data.get("url", {}).get("_CFURLString")
+    else:
+        return None
+    return stack_key(url) if url else None
+
+
+def _display_path(url: str) -> str:
+    """Convert a file URL to a path, abbreviating the home directory to ~."""
+    path = unquote(urlparse(url).path).rstrip("/") or "/"
+    home = str(Path.home())
+    if path == home or path.startswith(home + "/"):
+        return "~" + path[len(home):]
+    return path
+
+
+def portable_path(path: str) -> str:
+    """
+    Normalize a stack path to the form backups use, for comparing across machines.
+
+    Paths that share a stack_key share a portable path: file URLs are
+    unquoted, trailing slashes dropped and the home directory written as
+    ``~``. Web URLs are returned as-is.
+
+    Args:
+        path: Folder path, file URL or web URL.
+
+    Returns:
+        Portable path.
+    """
+    if is_url(path):
+        return path
+    return _display_path(stack_key(path))
+
+
+def _code_name(codes: dict[str, int], value: Any, default: str) -> str:
+    """Reverse-map a tile-data code to its configuration name."""
+    for name, code in codes.items():
+        if code == value:
+            return name
+    return default
+
+
+def read_stack(tile: dict[str, Any], section: str) -> StackConfig | None:
+    """
+    Build a StackConfig from a plist tile.
+
+    Args:
+        tile: Entry of persistent-apps or persistent-others.
+        section: Section the tile was found in ("apps" or "others").
+
+    Returns:
+        StackConfig, or None if the tile is not a folder or URL tile.
+    """
+    if tile_key(tile) is None:
+        return None
+    tile_data = tile.get("tile-data", {})
+    typed_section = cast(Literal["apps", "others"], section)
+
+    if tile.get("tile-type") == "url-tile":
+        return StackConfig(
+            path=tile_data["url"]["_CFURLString"],
+            section=typed_section,
+            label=tile_data.get("label"),
+        )
+
+    return StackConfig(
+        path=_display_path(tile_data["file-data"]["_CFURLString"]),
+        view=cast(
+            Literal["auto", "fan", "grid", "list"],
+            _code_name(VIEW_CODES, tile_data.get("showas"), "auto"),
+        ),
+        display=cast(
+            Literal["stack", "folder"],
+            _code_name(DISPLAY_CODES, tile_data.get("displayas"), "stack"),
+        ),
+        sort=cast(
+            Literal["name", "dateadded", "datemodified", "datecreated", "kind"],
+            _code_name(SORT_CODES, tile_data.get("arrangement"), "name"),
+        ),
+        section=typed_section,
+        label=tile_data.get("file-label"),
+        item_size=_item_size(tile_data.get("preferreditemsize")),
+    )
+
+
+def _item_size(value: Any) -> int | None:
+    """Read preferreditemsize, where -1 or a missing key means the default."""
+    if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+        return value
+    return None
+
+
+def downloads_preset(tile_data: dict[str, Any]) -> str:
+    """
+    Get the downloads preset of a Downloads tile.
+
+    Args:
+        tile_data: tile-data of the Downloads tile.
+
+    Returns:
+        "classic", "fan" or "list".
+    """
+    if "showas" not in tile_data:
+        # Older tiles without showas: displayas 0 = classic, 1 = fan, 2 = list
+        return {0: "classic", 1: "fan", 2: "list"}.get(tile_data.get("displayas", 1), "fan")
+    if tile_data.get("displayas") == DISPLAY_CODES["folder"]:
+        return "list"
+    if tile_data.get("showas") == VIEW_CODES["fan"]:
+        return "fan"
+    return "classic"
+
+
+def downloads_attributes(preset: str) -> dict[str, int]:
+    """
+    Get the tile-data attributes for a downloads preset.
+
+    Args:
+        preset: "classic", "fan" or "list".
+
+    Returns:
+        showas and displayas codes.
+    """
+    view, display = DOWNLOADS_PRESETS[preset]
+    return {"showas": VIEW_CODES[view], "displayas": DISPLAY_CODES[display]}
+
+
+def stack_tile_attributes(stack: StackConfig) -> dict[str, Any]:
+    """
+    Get the tile-data attributes a stack configures.
+
+    Args:
+        stack: Stack configuration.
+
+    Returns:
+        Mapping of tile-data key to value.
+    """
+    if is_url(stack.path):
+        return {"label": stack.label} if stack.label else {}
+    attributes: dict[str, Any] = {
+        "showas": VIEW_CODES[stack.view],
+        "displayas": DISPLAY_CODES[stack.display],
+        "arrangement": SORT_CODES[stack.sort],
+    }
+    if stack.item_size is not None:
+        attributes["preferreditemsize"] = stack.item_size
+    if stack.label:
+        attributes["file-label"] = stack.label
+    return attributes
+
+
+def stack_attributes(stack: StackConfig) -> tuple[Any, ...]:
+    """
+    Get the attributes a stack update compares, besides label and item size.
+
+    URL tiles have no view, display or sort.
+
+    Args:
+        stack: Stack configuration.
+
+    Returns:
+        Tuple of comparable attributes.
+    """
+    if is_url(stack.path):
+        return (stack.section,)
+    return (stack.view, stack.display, stack.sort, stack.section)
+
+
+def build_tile(stack: StackConfig) -> dict[str, Any]:
+    """
+    Build a new plist tile for a stack.
+
+    Args:
+        stack: Stack configuration.
+
+    Returns:
+        Tile dictionary for persistent-apps or persistent-others.
+    """
+    key = stack_key(stack.path)
+    if is_url(stack.path):
+        return {
+            "tile-data": {
+                "url": {"_CFURLString": key, "_CFURLStringType": 15},
+                "label": stack.label or key,
+            },
+            "tile-type": "url-tile",
+        }
+
+    tile = {
+        "tile-data": {
+            "file-data": {"_CFURLString": key + "/", "_CFURLStringType": 15},
+            "file-label": stack.label or Path(urlparse(key).path).name,
+            "file-type": 2,
+        },
+        "tile-type": "directory-tile",
+    }
+    return patch_tile(tile, stack)
+
+
+def patch_tile(tile: dict[str, Any], stack: StackConfig) -> dict[str, Any]:
+    """
+    Set a stack's attributes on an existing tile.
+
+    Everything else in the tile, including its GUID, is kept.
+
+    Args:
+        tile: Existing tile dictionary.
+        stack: Stack configuration.
+
+    Returns:
+        Patched copy of the tile.
+    """
+    patched = copy.deepcopy(tile)
+    patched.setdefault("tile-data", {}).update(stack_tile_attributes(stack))
+    return patched
+
+
+def patch_tiles(
+    plist: dict[str, Any], patches: list[dict[str, Any]]
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Set tile-data attributes on existing tiles without moving them.
+
+    Each patch names a tile by ``key`` (or, failing that, by a directory
+    tile ``label``) and carries the ``attributes`` to set. Patches whose
+    tile is no longer in the Dock are skipped; the next reset adds it.
+
+    Args:
+        plist: Current Dock plist dictionary.
+        patches: Patches with "key", "attributes" and optional "label".
+
+    Returns:
+        Mapping of each changed plist array name to its new contents.
+    """
+    arrays = {
+        array: list(plist.get(array, [])) for array in SECTION_ARRAYS.values()
+    }
+    changed: set[str] = set()
+    for patch in patches:
+        location = _find_tile(arrays, patch["key"], patch.get("label"))
+        if location is None:
+            continue
+        array, index = location
+        tile = copy.deepcopy(arrays[array][index])
+        tile.setdefault("tile-data", {}).update(patch["attributes"])
+        arrays[array][index] = tile
+        changed.add(array)
+    return {array: arrays[array] for array in changed}
+
+
+def _find_tile(
+    arrays: dict[str, list[dict[str, Any]]], key: str, label: str | None
+) -> tuple[str, int] | None:
+    """Locate a tile by key, falling back to a directory tile label."""
+    for array, tiles in arrays.items():
+        for index, tile in enumerate(tiles):
+            if tile_key(tile) == key:
+                return array, index
+    if label is not None:
+        for array, tiles in arrays.items():
+            for index, tile in enumerate(tiles):
+                if (
+                    tile.get("tile-type") == "directory-tile"
+                    and tile.get("tile-data", {}).get("file-label") == label
+                ):
+                    return array, index
+    return None
+
+
+def arrange_stacks(
+    plist: dict[str, Any], stacks: list[StackConfig], remove: list[str]
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Compute the tile arrays that realise the desired stacks.
+
+    Existing tiles are matched by key and patched in place; new stacks get
+    new tiles. Desired stacks are laid out in configuration order - at the
+    end of persistent-apps for the apps section and at the start of
+    persistent-others otherwise. Tiles listed in ``remove`` are dropped and
+    every other tile keeps its relative order. The result depends only on
+    the arguments, so re-running it after an interruption is safe.
+
+    Args:
+        plist: Current Dock plist dictionary.
+        stacks: Desired stacks in order.
+        remove: Keys of stack tiles to remove.
+
+    Returns:
+        Mapping of plist array name to its new contents.
+    """
+    wanted = {stack_key(stack.path) for stack in stacks}
+    dropped = set(remove)
+    existing: dict[str, dict[str, Any]] = {}
+    kept: dict[str, list[dict[str, Any]]] = {}
+
+    for array in SECTION_ARRAYS.values():
+        kept[array] = []
+        for tile in plist.get(array, []):
+            key = tile_key(tile)
+            if key is not None and key in wanted:
+                existing.setdefault(key, tile)
+            elif key is None or key not in dropped:
+                kept[array].append(tile)
+
+    placed: dict[str, list[dict[str, Any]]] = {array: [] for array in SECTION_ARRAYS.values()}
+    for stack in stacks:
+        current = existing.get(stack_key(stack.path))
+        tile = patch_tile(current, stack) if current is not None else build_tile(stack)
+        placed[SECTION_ARRAYS[stack.section]].append(tile)
+
+    return {
+        "persistent-apps": kept["persistent-apps"] + placed["persistent-apps"],
+        "persistent-others": placed["persistent-others"] + kept["persistent-others"],
+    }
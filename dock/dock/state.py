@@ -1,10 +1,13 @@
 """Dock state reader for reading current dock configuration."""
 
+from typing import Any
 from urllib.parse import urlparse
 
-from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.dockutil import DockTile, DockutilCommand
 from dock.adapters.plist import PlistManager
-from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
+from dock.config.settings import SETTINGS
+from dock.dock.stacks import SECTION_ARRAYS, downloads_preset, read_stack
 
 
 class DockStateReader:
@@ -20,30 +23,45 @@ class DockStateReader:
         """
         self.dockutil = dockutil_cmd
         self.plist = plist_mgr
+        self._tiles: list[DockTile] | None = None
+
+    def read_current_tiles(self) -> list[DockTile]:
+        """
+        Get every dock tile with its URL and bundle id.
+
+        dockutil is run once per reader; later calls reuse the listing.
+
+        Returns:
+            List of DockTile in Dock order.
+        """
+        if self._tiles is None:
+            self._tiles = self.dockutil.list_tiles()
+        return self._tiles
 
     def read_current_apps(self) -> list[str]:
         """
         Get list of current dock apps.
 
         Returns:
-            List of app names currently in the dock.
+            List of app labels currently in the dock.
         """
-        return self.dockutil.list_apps()
+        return [tile.label for tile in self.read_current_tiles() if tile.is_app()]
 
     def read_current_settings(self) -> SettingsConfig:
         """
         Get current dock settings from plist.
 
+        The plist is read once and every registered setting is extracted;
+        keys that are absent take the macOS default.
+
         Returns:
-            SettingsConfig with current autohide and autohide_delay values.
+            SettingsConfig with the current value of every setting.
         """
-        autohide = self.plist.read_autohide()
-        autohide_delay = self.plist.read_autohide_delay()
-
-        return SettingsConfig(
-            autohide=autohide,
-            autohide_delay=autohide_delay
-        )
+        plist = self.plist.read_plist()
+        values: dict[str, Any] = {
+            spec.name: spec.from_plist(plist.get(spec.plist_key)) for spec in SETTINGS
+        }
+        return SettingsConfig(**values)
 
     def read_current_downloads(self) -> DownloadsConfig | None:
         """
@@ -67,11 +85,8 @@ class DockStateReader:
         if not downloads_tile:
             return None
 
-        # Extract preset from displayas value
-        # 0 = classic (stack), 1 = fan, 2 = list
-        displayas = downloads_tile.get("displayas", 1)
-        preset_map = {0: "classic", 1: "fan", 2: "list"}
-        preset_str = preset_map.get(displayas, "fan")
+        # Extract preset from the showas/displayas codes
+        preset_str = downloads_preset(downloads_tile)
 
         # Extract path from file-data
         file_data = downloads_tile.get("file-data", {})
@@ -98,6 +113,31 @@ class DockStateReader:
             section=section
         )
 
+    def read_current_stacks(self) -> list[StackConfig]:
+        """
+        Get current folder and URL stacks.
+
+        The Downloads tile is reported by read_current_downloads and is
+        not included.
+
+        Returns:
+            List of StackConfig in Dock order, apps section first.
+        """
+        stacks = []
+        for section, array in SECTION_ARRAYS.items():
+            for tile in self.plist.read_value(array, []):
+                stack = read_stack(tile, section)
+                if stack is None:
+                    continue
+                if (
+                    section == "others"
+                    and tile.get("tile-type") == "directory-tile"
+                    and stack.label == "Downloads"
+                ):
+                    continue
+                stacks.append(stack)
+        return stacks
+
     def read_full_state(self) -> DockConfig:
         """
         Read complete current dock state.
@@ -108,9 +148,11 @@ class DockStateReader:
         apps = self.read_current_apps()
         settings = self.read_current_settings()
         downloads = self.read_current_downloads()
+        stacks = self.read_current_stacks()
 
         return DockConfig(
             apps=apps,
             settings=settings,
-            downloads=downloads
+            downloads=downloads,
+            stacks=stacks,
         )
@@ -1,5 +1,8 @@
 """Service for backup command business logic."""
 
+import getpass
+import platform
+from datetime import datetime
 from pathlib import Path
 
 import yaml
@@ -7,39 +10,135 @@ import yaml
 from dock.adapters.dockutil import DockutilCommand
 from dock.adapters.plist import PlistManager
 from dock.config.converter import converter
+from dock.dock.backups import BackupStore, RetentionPolicy
+from dock.dock.raw_backup import RawBackup
 from dock.dock.state import DockStateReader
-from dock.utils.output import print_success
+from dock.utils import profiling
+from dock.utils.output import (
+    print_backup_entries,
+    print_info,
+    print_success,
+    print_warning,
+)
 
 
 class BackupService:
     """Service for backing up dock configuration."""
 
-    def execute(self, file_path: str) -> None:
+    def execute(self, file_path: str, raw: bool = False) -> None:
         """
         Execute the backup command.
 
         Args:
             file_path: Path to output file.
+            raw: Whether to copy the Dock plist keys verbatim instead of
+                exporting configuration YAML.
 
         Raises:
             Exception: If backup fails.
         """
+        content = self._read_backup(raw)
+
+        # Write to file
+        output_path = Path(file_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(content)
+
+        print_success(f"Dock configuration backed up to: {output_path}")
+
+    def execute_store(
+        self, store_dir: str, policy: RetentionPolicy | None = None, raw: bool = False
+    ) -> None:
+        """
+        Back up into a content-addressed backup store.
+
+        Args:
+            store_dir: Backup store directory.
+            policy: Optional retention policy applied after the backup.
+            raw: Whether to copy the Dock plist keys verbatim instead of
+                exporting configuration YAML.
+
+        Raises:
+            Exception: If backup fails.
+        """
+        store = BackupStore(Path(store_dir))
+        content = self._read_backup(raw)
+
+        entry, created = store.add(
+            content,
+            timestamp=datetime.now().astimezone(),
+            host=platform.node(),
+            user=getpass.getuser(),
+            kind="raw" if raw else "yaml",
+        )
+        if created:
+            print_success(f"Dock configuration backed up to {store.root} as {entry.hash[:12]}")
+        else:
+            print_success(
+                f"Dock configuration unchanged since backup {entry.hash[:12]} "
+                f"({entry.timestamp})"
+            )
+
+        if policy is not None and policy.is_set():
+            removed = store.prune(policy)
+            if removed:
+                print_info(f"Pruned {len(removed)} backups by retention policy")
+
+    def list_store(
+        self, store_dir: str, host: str | None = None, user: str | None = None
+    ) -> None:
+        """
+        List backups in a backup store from its index.
+
+        Args:
+            store_dir: Backup store directory.
+            host: Only list backups from this host.
+            user: Only list backups from this user.
+        """
+        store = BackupStore(Path(store_dir))
+        entries = store.entries(host=host, user=user)
+        if not entries:
+            print_warning(f"No backups in {store.root}")
+            return
+
+        print_backup_entries(entries)
+
+    def _read_backup(self, raw: bool) -> bytes:
+        """
+        Read the current Dock state in the requested backup format.
+
+        Args:
+            raw: Whether to copy the Dock plist keys verbatim.
+
+        Returns:
+            Binary plist for raw backups, otherwise YAML.
+        """
+        if raw:
+            with profiling.phase("read_state"):
+                backup = RawBackup.capture(PlistManager().read_plist())
+            with profiling.phase("serialize"):
+                return backup.to_bytes()
+        return self._read_config_yaml().encode()
+
+    @staticmethod
+    def _read_config_yaml() -> str:
+        """
+        Read the current Dock state as configuration YAML.
+
+        Returns:
+            YAML document.
+        """
         # Initialize command wrappers
         dockutil = DockutilCommand()
         plist_mgr = PlistManager()
 
         # Read current state
-        state_reader = DockStateReader(dockutil, plist_mgr)
-        current_state = state_reader.read_full_state()
+        with profiling.phase("read_state"):
+            state_reader = DockStateReader(dockutil, plist_mgr)
+            current_state = state_reader.read_full_state()
 
         # Convert to dict
-        config_dict = converter.unstructure(current_state)
-
-        # Write to file
-        output_path = Path(file_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, "w") as f:
-            yaml.dump(config_dict, f, default_flow_style=False, sort_keys=False)
-
-        print_success(f"Dock configuration backed up to: {output_path}")
+        with profiling.phase("structure"):
+            config_dict = converter.unstructure(current_state)
+        with profiling.phase("serialize"):
+            return yaml.dump(config_dict, default_flow_style=False, sort_keys=False)
@@ -0,0 +1,74 @@
+"""Service for history command business logic."""
+
+import re
+import time
+from datetime import datetime
+
+from dock.dock.history import HistoryStore
+from dock.utils.output import print_history, print_info
+
+_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+class HistoryService:
+    """Service for querying the history of reset runs."""
+
+    def execute(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        profile: str | None = None,
+        outcome: str | None = None,
+        limit: int = 20,
+    ) -> None:
+        """
+        Execute the history command.
+
+        Args:
+            since: Only runs started at or after this time: an ISO date or
+                  datetime, or an age such as "30m", "12h", "7d" or "4w".
+            until: Only runs started before this time, in the same format.
+            profile: Only runs of this profile.
+            outcome: Only runs with this outcome.
+            limit: Maximum number of runs to list.
+
+        Raises:
+            ValueError: If a time can't be parsed.
+        """
+        now = time.time()
+        records = HistoryStore().runs(
+            since=parse_time(since, now) if since is not None else None,
+            until=parse_time(until, now) if until is not None else None,
+            profile=profile,
+            outcome=outcome,
+            limit=limit,
+        )
+        if not records:
+            print_info("No runs recorded.")
+            return
+        print_history(records)
+
+
+def parse_time(value: str, now: float) -> float:
+    """
+    Parse a point in time given as an ISO date or datetime, or an age.
+
+    Args:
+        value: e.g. "2026-01-31", "2026-01-31T09:00" or "7d".
+        now: Unix time ages are counted back from.
+
+    Returns:
+        Unix time.
+
+    Raises:
+        ValueError: If the value is neither.
+    """
+    match = re.fullmatch(r"(\d+)([mhdw])", value.strip())
+    if match:
+        return now - int(match.group(1)) * _UNITS[match.group(2)]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"Invalid time {value!r}: use an ISO date or an age like 12h or 7d"
+        ) from None
@@ -0,0 +1,216 @@
+"""Service for profile command business logic."""
+
+import json
+import sys
+
+import attrs
+from cattrs.errors import ClassValidationError
+
+from dock.adapters.apps import ApplicationIndex
+from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.plist import PlistManager
+from dock.config.converter import converter
+from dock.config.loader import ConfigLoader
+from dock.config.models import DockConfig
+from dock.config.validation_cache import file_digest
+from dock.config.validator import ConfigValidator
+from dock.dock.applied import LastAppliedStore
+from dock.dock.compiled import (
+    CompiledProfile,
+    CompiledProfileStore,
+    owned_app_keys,
+    render_profile,
+    swap_values,
+    validate_values,
+)
+from dock.dock.executor import DockExecutor
+from dock.dock.journal import JournalStore, compute_config_hash
+from dock.services.validate_service import PROFILES_DIR
+from dock.utils.output import print_error, print_info, print_success, print_summary, print_warning
+from dock.utils.platform import require_macos
+
+
+class ProfileService:
+    """Service for compiling profiles and switching between them."""
+
+    def __init__(self, store: CompiledProfileStore | None = None):
+        """
+        Initialize ProfileService.
+
+        Args:
+            store: CompiledProfileStore for compiled profiles.
+                  Defaults to the dock cache directory.
+        """
+        self.store = store or CompiledProfileStore()
+
+    def compile(self, names: list[str]) -> None:
+        """
+        Execute the profile compile command.
+
+        Args:
+            names: Profile names to compile. Every profile in
+                  ~/.config/dock/profiles/ is compiled if empty.
+
+        Raises:
+            RuntimeError: If not running on macOS.
+            FileNotFoundError: If a named profile does not exist.
+        """
+        # Check platform
+        require_macos()
+
+        if not names:
+            names = ConfigLoader.list_profiles()
+            if not names:
+                print_warning(f"No profiles found in {PROFILES_DIR}")
+                return
+
+        app_index = ApplicationIndex()
+        failed = 0
+        for name in names:
+            compiled = self._compile(name, app_index)
+            if compiled is None:
+                failed += 1
+                continue
+            apps = len(compiled.values.get("persistent-apps", []))
+            others = len(compiled.values.get("persistent-others", []))
+            print_success(f"Compiled {name}: {apps} apps section tiles, {others} others tiles")
+
+        if failed:
+            print_error(f"{failed} of {len(names)} profiles failed to compile")
+            sys.exit(1)
+
+    def switch(self, name: str, dry_run: bool = False) -> None:
+        """
+        Execute the profile switch command.
+
+        Swaps the profile's compiled values into the Dock plist in one
+        write and restarts the Dock. The profile is compiled first if it
+        was never compiled or its file or the installed apps changed.
+
+        Args:
+            name: Profile name.
+            dry_run: Whether to only report what would be swapped.
+
+        Raises:
+            RuntimeError: If not running on macOS.
+            FileNotFoundError: If the profile does not exist.
+            ValueError: If the compiled profile is invalid.
+        """
+        # Check platform
+        require_macos()
+
+        config_path = ConfigLoader.discover_config_path(None, name)
+        if not config_path.exists():
+            raise FileNotFoundError(f"Configuration file not found: {config_path}")
+
+        app_index = ApplicationIndex()
+        compiled = self.store.load(name)
+        if compiled is None or not compiled.is_current(
+            file_digest(config_path), app_index.fingerprint()
+        ):
+            print_info(f"Compiling profile {name} (missing or out of date)")
+            compiled = self._compile(name, app_index)
+            if compiled is None:
+                sys.exit(1)
+
+        validate_values(compiled.values)
+        owned = self._owned(compiled, app_index)
+
+        if dry_run:
+            plist_mgr = PlistManager()
+            values = swap_values(
+                plist_mgr.read_plist(), compiled.values, compiled.keep_stacks, owned
+            )
+            print_info(f"Would replace {', '.join(sorted(values))}")
+            print_summary("Dry run complete. No changes were made.")
+            return
+
+        executor = DockExecutor(DockutilCommand(), PlistManager(), journal=JournalStore())
+        executor.swap_profile(
+            compiled.values,
+            keep_stacks=compiled.keep_stacks,
+            owned=owned,
+            config_hash=compiled.config_hash,
+        )
+        LastAppliedStore().save(compiled.config())
+
+        print_success(f"Switched to profile {name}")
+
+    @staticmethod
+    def _owned(compiled: CompiledProfile, app_index: ApplicationIndex) -> list[str] | None:
+        """
+        Get the apps a switch may replace, as a reset of the profile would.
+
+        The last applied configuration changes with every switch, so its
+        apps are added here rather than compiled in.
+
+        Args:
+            compiled: Compiled profile being switched to.
+            app_index: ApplicationIndex used to resolve the applied apps.
+
+        Returns:
+            Identity keys of the owned apps, or None if every app tile is
+            replaced (``managed: strict``, or nothing was applied yet).
+        """
+        if compiled.managed == "strict":
+            return None
+        base = LastAppliedStore().load()
+        if base is None:
+            return None
+        return compiled.owned_apps + owned_app_keys(base.apps, app_index)
+
+    def _compile(self, name: str, app_index: ApplicationIndex) -> CompiledProfile | None:
+        """
+        Compile one profile and store the result.
+
+        Args:
+            name: Profile name.
+            app_index: ApplicationIndex used to resolve apps.
+
+        Returns:
+            CompiledProfile, or None if the profile is invalid.
+
+        Raises:
+            FileNotFoundError: If the profile does not exist.
+        """
+        loader = ConfigLoader()
+        config_path = loader.discover_config_path(None, name)
+        config_data = loader.load_config(config_path)
+
+        try:
+            config = converter.structure(config_data, DockConfig)
+        except (ClassValidationError, ValueError, TypeError) as e:
+            print_error(f"Profile {name} is invalid:")
+            if isinstance(e, ClassValidationError):
+                for exc in e.exceptions:
+                    print_info(f"  {exc}")
+            else:
+                print_info(f"  {e}")
+            return None
+
+        # Apps may be referenced by bundle id; store their app names
+        config = attrs.evolve(config, apps=[app_index.canonical_name(app) for app in config.apps])
+        for warning in ConfigValidator().validate_config(config, app_index=app_index):
+            print_warning(warning)
+
+        values, missing = render_profile(config, app_index)
+        if missing:
+            # Installed later, they change the fingerprint and trigger a recompile
+            config = attrs.evolve(config, apps=[app for app in config.apps if app not in missing])
+            print_info(f"Skipping applications that are not installed: {', '.join(missing)}")
+
+        compiled = CompiledProfile(
+            name=name,
+            source=str(config_path),
+            source_digest=file_digest(config_path),
+            app_fingerprint=app_index.fingerprint(),
+            config_hash=compute_config_hash(config_data),
+            config_json=json.dumps(converter.unstructure(config)),
+            values=values,
+            keep_stacks=config.stacks is None,
+            managed=config.managed,
+            owned_apps=owned_app_keys(config.apps, app_index),
+            missing_apps=missing,
+        )
+        self.store.save(compiled)
+        return compiled
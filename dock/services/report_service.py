@@ -0,0 +1,41 @@
+"""Service for report command business logic."""
+
+from pathlib import Path
+
+from cattrs.errors import ClassValidationError
+
+from dock.config.converter import converter
+from dock.config.loader import ConfigLoader
+from dock.config.models import DockConfig
+from dock.dock.report import build_report
+from dock.utils.output import print_fleet_report
+
+
+class ReportService:
+    """Service for reporting how a fleet of machines drifts from a baseline."""
+
+    def execute(self, directory: str, baseline_path: str, top: int = 10) -> None:
+        """
+        Execute the report command.
+
+        Args:
+            directory: Directory of YAML files collected with 'dock backup'.
+            baseline_path: Configuration file the fleet should match.
+            top: Number of drifts and drifting groups to list.
+
+        Raises:
+            FileNotFoundError: If the baseline does not exist.
+            ValueError: If the baseline is not a valid configuration.
+        """
+        path = Path(baseline_path)
+        config_data = ConfigLoader.load_config(path)
+        try:
+            config = converter.structure(config_data, DockConfig)
+        except ClassValidationError as e:
+            details = "; ".join(str(exc) for exc in e.exceptions)
+            raise ValueError(f"Baseline {path} is invalid: {details}") from e
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Baseline {path} is invalid: {e}") from e
+
+        report = build_report(Path(directory), path.name, config)
+        print_fleet_report(report, top=top)
@@ -1,25 +1,48 @@
 """Service for reset command business logic."""
 
+import sqlite3
 import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Literal
 
-import click
+import attrs
 from cattrs.errors import ClassValidationError
 
+from dock.adapters import SubprocessExecutor
+from dock.adapters.apps import ApplicationIndex
 from dock.adapters.dockutil import DockutilCommand
 from dock.adapters.plist import PlistManager
+from dock.adapters.toolchain import ToolchainProbe
 from dock.config.converter import converter
 from dock.config.loader import ConfigLoader
 from dock.config.models import DockConfig
 from dock.config.validator import ConfigValidator
+from dock.dock.applied import LastAppliedStore
 from dock.dock.diff import DiffCalculator
 from dock.dock.executor import DockExecutor
-from dock.dock.plan import ExecutionPlan
+from dock.dock.history import HistoryStore, RunRecord
+from dock.dock.identity import AppIdentity
+from dock.dock.journal import JournalStore, compute_config_hash
+from dock.dock.metrics import ApplyMetrics
+from dock.dock.plan import ExecutionPlan, PlanSummary
+from dock.dock.preflight import Preflight
+from dock.dock.snapshot import DockSnapshot
 from dock.dock.state import DockStateReader
+from dock.utils import events, profiling
 from dock.utils.output import (
+    print_config_loaded,
     print_error,
     print_execution_plan,
+    print_heading,
     print_info,
+    print_newline,
+    print_plan_summaries,
     print_success,
+    print_summary,
     print_warning,
 )
 from dock.utils.platform import require_macos
@@ -29,7 +52,15 @@ class ResetService:
     """Service for applying dock configuration."""
 
     def execute(
-        self, file_path: str | None, profile: str | None, dry_run: bool
+        self,
+        file_path: str | None,
+        profile: str | None,
+        dry_run: bool,
+        deadline: float | None = None,
+        resume: bool = False,
+        missing_apps: Literal["skip", "fail"] = "skip",
+        state_from: str | None = None,
+        metrics_file: str | None = None,
     ) -> None:
         """
         Execute the reset command.
@@ -38,19 +69,85 @@ class ResetService:
             file_path: Optional path to config file.
             profile: Optional profile name.
             dry_run: Whether to run in dry-run mode.
+            deadline: Optional overall time budget in seconds for all
+                     dockutil commands run by this reset.
+            resume: Whether to continue an interrupted reset from its
+                   journal instead of starting over.
+            missing_apps: What to do when an app to be added is not
+                         installed: "skip" drops it from the plan with a
+                         warning, "fail" aborts before any change is made.
+            state_from: Optional state file from ``dock snapshot`` to plan
+                       against instead of the live Dock. Requires dry_run;
+                       works on any OS.
+            metrics_file: Optional path of a Prometheus textfile-collector
+                         file to write when the reset ends, whether it
+                         succeeds or fails.
+
+        Every run that loads a configuration, except plans against a state
+        file, is recorded in the run history for ``dock history``.
 
         Raises:
-            RuntimeError: If not running on macOS.
+            RuntimeError: If not running on macOS without a state file.
             FileNotFoundError: If config file not found.
             yaml.YAMLError: If config file is invalid YAML.
             ValidationError: If config validation fails.
+            CommandError: If a dockutil command times out, keeps failing,
+                         or the deadline expires.
         """
-        # Check platform
-        require_macos()
+        # Plans against a state file say nothing about this Mac's Dock
+        record_history = state_from is None
+        metrics = (
+            ApplyMetrics(dry_run=dry_run) if record_history or metrics_file is not None else None
+        )
+        try:
+            self._execute(
+                file_path, profile, dry_run, deadline, resume, missing_apps, state_from, metrics
+            )
+        except BaseException as e:
+            # sys.exit(0) ends a reset that found nothing to change
+            if metrics is not None and not (isinstance(e, SystemExit) and not e.code):
+                metrics.failed = True
+            raise
+        finally:
+            if metrics is not None and metrics_file is not None:
+                metrics.write(Path(metrics_file))
+            # Runs that never loaded a configuration have nothing to compare
+            if metrics is not None and record_history and metrics.config_hash:
+                _record_history(metrics, profile)
+
+    def _execute(
+        self,
+        file_path: str | None,
+        profile: str | None,
+        dry_run: bool,
+        deadline: float | None,
+        resume: bool,
+        missing_apps: Literal["skip", "fail"],
+        state_from: str | None,
+        metrics: ApplyMetrics | None,
+    ) -> None:
+        """Run the reset; see execute. Phases are timed in metrics if given."""
+        snapshot = None
+        if state_from is not None:
+            if not dry_run:
+                raise ValueError("A captured state can only be used with --dry-run")
+            # Plan against the captured machine instead of this one
+            snapshot = DockSnapshot.load(Path(state_from))
+            app_index = snapshot.app_index()
+            dockutil = snapshot.dockutil()
+            plist_mgr = snapshot.plist_manager()
+        else:
+            # Check platform
+            require_macos()
 
-        # Initialize command wrappers
-        dockutil = DockutilCommand()
-        plist_mgr = PlistManager()
+            # Initialize command wrappers
+            app_index = ApplicationIndex()
+            dockutil = _live_dockutil(
+                app_index,
+                deadline=time.monotonic() + deadline if deadline is not None else None,
+                on_command=metrics.record_command if metrics is not None else None,
+            )
+            plist_mgr = PlistManager()
 
         # Check if dockutil is installed
         if not dockutil.check_installed():
@@ -58,61 +155,364 @@ class ResetService:
             print_info("Install with: brew install dockutil")
             sys.exit(1)
 
-        # Discover and load config
-        loader = ConfigLoader()
-        config_path = loader.discover_config_path(file_path, profile)
-        click.echo(f"Loading configuration from: {config_path}")
+        with _phase(metrics, "load_config"):
+            # Discover and load config
+            loader = ConfigLoader()
+            config_path = loader.discover_config_path(file_path, profile)
+            print_config_loaded(config_path)
 
-        config_data = loader.load_config(config_path)
+            config_data = loader.load_config(config_path)
 
-        # Parse and validate config
-        try:
-            config = converter.structure(config_data, DockConfig)
-        except (ClassValidationError, ValueError, TypeError) as e:
-            print_error("Configuration validation failed:")
-            if isinstance(e, ClassValidationError):
-                for exc in e.exceptions:
-                    print_info(f"  {exc}")
-            else:
-                print_info(f"  {e}")
-            sys.exit(1)
+            # Parse and validate config
+            try:
+                with profiling.phase("structure"):
+                    config = converter.structure(config_data, DockConfig)
+            except (ClassValidationError, ValueError, TypeError) as e:
+                print_error("Configuration validation failed:")
+                if isinstance(e, ClassValidationError):
+                    for exc in e.exceptions:
+                        print_info(f"  {exc}")
+                else:
+                    print_info(f"  {e}")
+                sys.exit(1)
 
-        # Run semantic validation
-        validator = ConfigValidator()
-        warnings = validator.validate_config(config)
-        if warnings:
-            for warning in warnings:
-                print_warning(warning)
+            # Apps may be referenced by bundle id; diff against their app names
+            config = attrs.evolve(
+                config, apps=[app_index.canonical_name(app) for app in config.apps]
+            )
 
-        # Read current state
-        state_reader = DockStateReader(dockutil, plist_mgr)
-        current_state = state_reader.read_full_state()
+            # Run semantic validation
+            validator = ConfigValidator()
+            warnings = validator.validate_config(config, app_index=app_index)
+            if warnings:
+                for warning in warnings:
+                    print_warning(warning)
 
-        # Calculate diff
-        diff_calc = DiffCalculator()
-        diff = diff_calc.calculate_diff(config, current_state)
+        config_hash = compute_config_hash(config_data)
+        if metrics is not None:
+            metrics.config_hash = config_hash
+        journal_store = JournalStore()
+
+        applied_store = LastAppliedStore()
+
+        # Continue an interrupted reset instead of rebuilding from scratch
+        resumable = resume and snapshot is None
+        if resumable and self._resume(
+            dockutil, plist_mgr, journal_store, config_hash, dry_run, metrics
+        ):
+            if not dry_run:
+                applied_store.save(config)
+                if metrics is not None:
+                    metrics.applied = True
+            return
+
+        with _phase(metrics, "read_state"):
+            # Read current state
+            state_reader = DockStateReader(dockutil, plist_mgr)
+            current_state = state_reader.read_full_state()
+            _emit_state_read(current_state, state_from)
+            if metrics is not None:
+                metrics.state_fingerprint = compute_config_hash(
+                    converter.unstructure(current_state)
+                )
+
+            # Compare apps by bundle id/URL so localized labels are not changes
+            identity = AppIdentity(state_reader.read_current_tiles(), app_index)
+
+        with _phase(metrics, "diff"):
+            # Calculate diff
+            diff_calc = DiffCalculator()
+            base = snapshot.base() if snapshot is not None else applied_store.load()
+            diff = diff_calc.calculate_diff(config, current_state, base=base, identity=identity)
+
+            # Check every app to be added is installed before anything destructive runs
+            preflight = Preflight(app_index).check(diff)
+            if not preflight.ok():
+                for app in preflight.missing_apps:
+                    print_warning(f"Application not found: {app}")
+                if missing_apps == "fail":
+                    print_error("Aborting before any change: some applications are not installed.")
+                    sys.exit(1)
+                missing = set(preflight.missing_apps)
+                config = attrs.evolve(
+                    config, apps=[app for app in config.apps if app not in missing]
+                )
+                print_info("Skipping applications that are not installed.")
+                diff = diff_calc.calculate_diff(
+                    config, current_state, base=base, identity=identity
+                )
+
+        if metrics is not None:
+            metrics.record_diff(diff)
 
         # Check if changes are needed
         if not diff.has_changes():
+            if not dry_run:
+                applied_store.save(config)
             print_success("Dock is already in desired state. No changes needed.")
             sys.exit(0)
 
-        # Generate and display execution plan
-        plan = ExecutionPlan.generate_plan(diff, config.apps)
-        print_execution_plan(plan, dry_run=dry_run)
+        with _phase(metrics, "plan"):
+            # Generate and display execution plan
+            plan = ExecutionPlan.generate_plan(
+                diff, config.apps, app_index=app_index, moves=dockutil.supports("--move")
+            )
+            print_execution_plan(plan, dry_run=dry_run)
 
         # Apply changes (unless dry-run)
         if not dry_run:
-            executor = DockExecutor(dockutil, plist_mgr, dry_run=False)
-            changes_made = executor.apply_diff(diff)
+            executor = DockExecutor(
+                dockutil, plist_mgr, dry_run=False, journal=journal_store, metrics=metrics
+            )
+            changes_made = executor.apply_diff(diff, config_hash=config_hash)
+            applied_store.save(config)
+            if metrics is not None:
+                metrics.applied = changes_made
         else:
             changes_made = True
 
         if dry_run:
-            click.echo()  # Add newline before message
-            click.echo("Dry run complete. No changes were made.")
+            print_summary("Dry run complete. No changes were made.")
         elif changes_made:
-            click.echo()  # Add newline before message
+            print_newline()  # Add newline before message
             print_success("Dock configuration applied successfully!")
         else:
             print_success("No changes were needed.")
+
+    def plan_profiles(
+        self,
+        profiles: list[str],
+        missing_apps: Literal["skip", "fail"] = "skip",
+        jobs: int | None = None,
+        state_from: str | None = None,
+    ) -> None:
+        """
+        Dry-run several profiles against one reading of the Dock.
+
+        The Dock is listed and the plist read once; every profile is then
+        diffed and planned against that state concurrently, and a table of
+        operation counts and estimated cost is printed. Nothing is changed.
+
+        Args:
+            profiles: Profile names. Every profile in
+                     ~/.config/dock/profiles/ is planned if empty.
+            missing_apps: "skip" plans without apps that are not installed,
+                         "fail" reports the profile as an error.
+            jobs: Number of worker threads. Defaults to one per profile.
+            state_from: Optional state file from ``dock snapshot`` to plan
+                       against instead of the live Dock.
+
+        Raises:
+            RuntimeError: If not running on macOS without a state file.
+        """
+        snapshot = DockSnapshot.load(Path(state_from)) if state_from is not None else None
+        if snapshot is None:
+            # Check platform
+            require_macos()
+
+        if not profiles:
+            profiles = ConfigLoader.list_profiles()
+            if not profiles:
+                print_warning("No profiles found in ~/.config/dock/profiles/")
+                return
+
+        if snapshot is not None:
+            app_index = snapshot.app_index()
+            dockutil = snapshot.dockutil()
+            plist_mgr = snapshot.plist_manager()
+        else:
+            app_index = ApplicationIndex()
+            dockutil = _live_dockutil(app_index)
+            plist_mgr = PlistManager()
+
+        # Check if dockutil is installed
+        if not dockutil.check_installed():
+            print_error("dockutil is not installed")
+            print_info("Install with: brew install dockutil")
+            sys.exit(1)
+
+        # Read the shared state once; the workers only compute
+        state_reader = DockStateReader(dockutil, plist_mgr)
+        current_state = state_reader.read_full_state()
+        _emit_state_read(current_state, state_from)
+        identity = AppIdentity(state_reader.read_current_tiles(), app_index)
+        base = snapshot.base() if snapshot is not None else LastAppliedStore().load()
+        app_index.entries()
+        executor = DockExecutor(dockutil, plist_mgr, dry_run=True)
+
+        def plan(profile: str) -> PlanSummary:
+            try:
+                return self._plan_profile(
+                    profile, current_state, base, identity, app_index, executor, missing_apps
+                )
+            except Exception as e:
+                return PlanSummary(profile=profile, error=str(e))
+
+        print_heading(f"Planning {len(profiles)} profiles against the current Dock")
+        with ThreadPoolExecutor(max_workers=jobs or len(profiles)) as pool:
+            summaries = list(pool.map(plan, profiles))
+
+        print_newline()  # Add newline before table
+        print_plan_summaries(summaries)
+        print_summary("Dry run complete. No changes were made.")
+
+    @staticmethod
+    def _plan_profile(
+        profile: str,
+        current_state: DockConfig,
+        base: DockConfig | None,
+        identity: AppIdentity,
+        app_index: ApplicationIndex,
+        executor: DockExecutor,
+        missing_apps: Literal["skip", "fail"],
+    ) -> PlanSummary:
+        """
+        Diff and plan one profile against a shared state snapshot.
+
+        Args:
+            profile: Profile name.
+            current_state: Current Dock state.
+            base: Last applied configuration, if any.
+            identity: AppIdentity for the current tiles.
+            app_index: ApplicationIndex, already loaded.
+            executor: Dry-run DockExecutor used to build steps.
+            missing_apps: What to do with apps that are not installed.
+
+        Returns:
+            PlanSummary for the profile.
+
+        Raises:
+            FileNotFoundError: If the profile does not exist.
+            ValueError: If the profile is invalid or, with "fail", has
+                       apps that are not installed.
+        """
+        loader = ConfigLoader()
+        config_data = loader.load_config(loader.discover_config_path(None, profile))
+        try:
+            config = converter.structure(config_data, DockConfig)
+        except ClassValidationError as e:
+            raise ValueError("; ".join(str(exc) for exc in e.exceptions)) from e
+        config = attrs.evolve(config, apps=[app_index.canonical_name(app) for app in config.apps])
+
+        diff_calc = DiffCalculator()
+        diff = diff_calc.calculate_diff(config, current_state, base=base, identity=identity)
+        preflight = Preflight(app_index).check(diff)
+        if not preflight.ok():
+            if missing_apps == "fail":
+                raise ValueError(f"not installed: {', '.join(preflight.missing_apps)}")
+            missing = set(preflight.missing_apps)
+            config = attrs.evolve(config, apps=[app for app in config.apps if app not in missing])
+            diff = diff_calc.calculate_diff(config, current_state, base=base, identity=identity)
+
+        return PlanSummary.from_steps(profile, diff, executor.build_steps(diff))
+
+    def _resume(
+        self,
+        dockutil: DockutilCommand,
+        plist_mgr: PlistManager,
+        journal_store: JournalStore,
+        config_hash: str,
+        dry_run: bool,
+        metrics: ApplyMetrics | None = None,
+    ) -> bool:
+        """
+        Resume an interrupted reset recorded in the journal.
+
+        Args:
+            dockutil: DockutilCommand instance.
+            plist_mgr: PlistManager instance.
+            journal_store: JournalStore holding the journal.
+            config_hash: Hash of the configuration being applied.
+            dry_run: Whether to run in dry-run mode.
+            metrics: Optional ApplyMetrics for the resumed steps.
+
+        Returns:
+            True if the interrupted reset was handled, False if there was
+            nothing to resume and a normal reset should run.
+        """
+        journal = journal_store.load()
+        if journal is None or not journal.is_resumable():
+            print_info("No interrupted reset to resume; running a full reset.")
+            return False
+
+        if journal.config_hash != config_hash:
+            print_error("The interrupted reset was started with a different configuration.")
+            print_info(
+                "Run 'dock rollback' to restore the previous Dock, "
+                "or reset without --resume."
+            )
+            sys.exit(1)
+
+        remaining = len(journal.steps) - journal.completed
+        print_info(
+            f"Resuming interrupted reset at step {journal.completed + 1} "
+            f"of {len(journal.steps)} ({remaining} remaining)"
+        )
+
+        if dry_run:
+            print_summary("Dry run complete. No changes were made.")
+            return True
+
+        executor = DockExecutor(
+            dockutil, plist_mgr, dry_run=False, journal=journal_store, metrics=metrics
+        )
+        executor.resume(journal)
+
+        print_newline()  # Add newline before message
+        print_success("Dock configuration applied successfully!")
+        return True
+
+
+def _live_dockutil(
+    app_index: ApplicationIndex,
+    deadline: float | None = None,
+    on_command: Callable[[str, float, bool], None] | None = None,
+) -> DockutilCommand:
+    """
+    Create a DockutilCommand for the live Dock that runs the probed dockutil.
+
+    Args:
+        app_index: ApplicationIndex used to resolve app bundle paths.
+        deadline: Absolute time.monotonic() value after which no command
+                 may run.
+        on_command: Optional callback invoked after every command attempt.
+
+    Returns:
+        DockutilCommand. Without a usable dockutil it falls back to looking
+        dockutil up on PATH, so check_installed() reports it missing.
+    """
+    toolchain = ToolchainProbe().probe()
+    executor = SubprocessExecutor(
+        deadline=deadline,
+        on_command=on_command,
+        programs=toolchain.programs() if toolchain is not None else None,
+    )
+    return DockutilCommand(executor, app_index=app_index, toolchain=toolchain)
+
+
+def _emit_state_read(state: DockConfig, state_from: str | None) -> None:
+    """Report the Dock state that was read to the event stream."""
+    if not events.enabled():
+        return
+    events.emit(
+        "state_read",
+        source=state_from or "live",
+        apps=len(state.apps),
+        stacks=len(state.stacks or []),
+        downloads=state.downloads is not None,
+    )
+
+
+@contextmanager
+def _phase(metrics: ApplyMetrics | None, name: str) -> Iterator[None]:
+    """Mark a phase in the profile and time it in the metrics, if either is recorded."""
+    with profiling.phase(name), metrics.phase(name) if metrics is not None else nullcontext():
+        yield
+
+
+def _record_history(metrics: ApplyMetrics, profile: str | None) -> None:
+    """Append a finished run to the history; a broken history never fails a reset."""
+    try:
+        HistoryStore().add(RunRecord.from_metrics(metrics, profile, time.time()))
+    except (sqlite3.Error, OSError) as e:
+        print_warning(f"Could not record run history: {e}")
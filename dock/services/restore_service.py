@@ -0,0 +1,113 @@
+"""Service for restore command business logic."""
+
+import getpass
+import platform
+import sys
+from pathlib import Path
+
+from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.plist import PlistManager
+from dock.dock.applied import LastAppliedStore
+from dock.dock.backups import BackupStore
+from dock.dock.executor import DockExecutor
+from dock.dock.journal import JournalStore
+from dock.dock.raw_backup import RawBackup, is_raw_backup
+from dock.utils.output import print_error, print_info, print_success, print_summary
+from dock.utils.platform import require_macos
+
+
+class RestoreService:
+    """Service for restoring raw Dock backups."""
+
+    def execute(
+        self,
+        file_path: str | None = None,
+        store_dir: str | None = None,
+        ref: str | None = None,
+        dry_run: bool = False,
+    ) -> None:
+        """
+        Execute the restore command.
+
+        Writes the backed-up plist keys in a single atomic write and
+        restarts the Dock once. The plist is snapshotted first, so
+        'dock rollback' undoes the restore.
+
+        Args:
+            file_path: Raw backup file written by 'dock backup --raw'.
+            store_dir: Backup store to restore from instead of a file.
+            ref: Hash prefix of the backup in the store. Defaults to the
+                newest raw backup of this host and user.
+            dry_run: Whether to only report which keys would change.
+
+        Raises:
+            RuntimeError: If not running on macOS.
+            FileNotFoundError: If the backup file does not exist.
+            ValueError: If the backup is not a raw backup.
+        """
+        # Check platform
+        require_macos()
+
+        data, source = self._read(file_path, store_dir, ref)
+        if not is_raw_backup(data):
+            raise ValueError(
+                f"{source} is a configuration backup; apply it with 'dock reset --file'"
+            )
+        backup = RawBackup.from_bytes(data)
+
+        plist_mgr = PlistManager()
+        changed = backup.changed_keys(plist_mgr.read_plist())
+        if not changed:
+            print_success("Dock already matches the backup. No changes needed.")
+            return
+
+        if dry_run:
+            print_info(f"Would restore {', '.join(changed)} from {source}")
+            print_summary("Dry run complete. No changes were made.")
+            return
+
+        # Snapshot the Dock so that dock rollback can undo the restore
+        JournalStore().save_snapshot(plist_mgr.read_bytes())
+        executor = DockExecutor(DockutilCommand(), plist_mgr)
+        executor.restore_backup(backup)
+        # The Dock no longer reflects the last applied configuration
+        LastAppliedStore().clear()
+
+        print_success(f"Dock restored from {source}")
+
+    @staticmethod
+    def _read(
+        file_path: str | None, store_dir: str | None, ref: str | None
+    ) -> tuple[bytes, str]:
+        """
+        Read backup contents from a file or a backup store.
+
+        Args:
+            file_path: Backup file, if restoring from a file.
+            store_dir: Backup store directory, if restoring from a store.
+            ref: Hash prefix of the backup in the store.
+
+        Returns:
+            (contents, description of where they came from).
+
+        Raises:
+            FileNotFoundError: If the backup file does not exist.
+            ValueError: If the reference matches no backup or several.
+        """
+        if store_dir is None:
+            path = Path(str(file_path))
+            if not path.exists():
+                raise FileNotFoundError(f"Backup file not found: {path}")
+            return path.read_bytes(), str(path)
+
+        store = BackupStore(Path(store_dir))
+        if ref is not None:
+            entry = store.resolve(ref)
+        else:
+            entries = store.entries(host=platform.node(), user=getpass.getuser(), kind="raw")
+            if not entries:
+                print_error(f"No raw backups of this host and user in {store.root}")
+                print_info("Take one with 'dock backup --raw --store DIR'.")
+                sys.exit(1)
+            entry = entries[-1]
+        return store.read(entry.hash), f"backup {entry.hash[:12]} ({entry.timestamp})"
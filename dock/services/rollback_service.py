@@ -0,0 +1,45 @@
+"""Service for rollback command business logic."""
+
+import sys
+
+from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.plist import PlistManager
+from dock.dock.applied import LastAppliedStore
+from dock.dock.executor import DockExecutor
+from dock.dock.journal import JournalStore
+from dock.utils.output import print_error, print_info, print_success
+from dock.utils.platform import require_macos
+
+
+class RollbackService:
+    """Service for restoring the Dock as it was before the last reset."""
+
+    def execute(self) -> None:
+        """
+        Execute the rollback command.
+
+        Restores the pre-apply plist snapshot recorded by the last reset
+        in a single write, then restarts the Dock. The last applied
+        configuration is forgotten, so the next reset doesn't treat apps
+        of the undone configuration as owned.
+
+        Raises:
+            RuntimeError: If not running on macOS.
+        """
+        # Check platform
+        require_macos()
+
+        journal_store = JournalStore()
+        snapshot = journal_store.read_snapshot()
+        if snapshot is None:
+            print_error("No reset snapshot found to roll back to.")
+            print_info("A snapshot is recorded each time 'dock reset' applies changes.")
+            sys.exit(1)
+
+        executor = DockExecutor(DockutilCommand(), PlistManager())
+        executor.restore_snapshot(snapshot)
+        journal_store.clear()
+        # The Dock no longer reflects the last applied configuration
+        LastAppliedStore().clear()
+
+        print_success("Dock restored to its state before the last reset.")
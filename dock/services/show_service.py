@@ -1,41 +1,47 @@
 """Service for show command business logic."""
 
-
-import click
-import yaml
+from pathlib import Path
 
 from dock.adapters.dockutil import DockutilCommand
 from dock.adapters.plist import PlistManager
 from dock.config.converter import converter
+from dock.dock.snapshot import DockSnapshot
 from dock.dock.state import DockStateReader
-from dock.utils.output import print_info
+from dock.utils import profiling
+from dock.utils.output import print_dock_config
 
 
 class ShowService:
     """Service for displaying current dock configuration."""
 
-    def execute(self) -> None:
+    def execute(self, state_from: str | None = None) -> None:
         """
         Execute the show command.
 
+        Args:
+            state_from: Optional state file from ``dock snapshot`` to show
+                       instead of the live Dock.
+
         Raises:
             Exception: If reading dock state fails.
         """
         # Initialize command wrappers
-        dockutil = DockutilCommand()
-        plist_mgr = PlistManager()
+        if state_from is not None:
+            snapshot = DockSnapshot.load(Path(state_from))
+            dockutil = snapshot.dockutil()
+            plist_mgr = snapshot.plist_manager()
+        else:
+            dockutil = DockutilCommand()
+            plist_mgr = PlistManager()
 
         # Read current state
-        state_reader = DockStateReader(dockutil, plist_mgr)
-        current_state = state_reader.read_full_state()
-
-        # Convert to dict
-        config_dict = converter.unstructure(current_state)
+        with profiling.phase("read_state"):
+            state_reader = DockStateReader(dockutil, plist_mgr)
+            current_state = state_reader.read_full_state()
 
-        # Print header
-        print_info("Current dock configuration:")
-        click.echo()
+        with profiling.phase("structure"):
+            config = converter.unstructure(current_state)
 
         # Output as YAML to stdout
-        yaml_output = yaml.dump(config_dict, default_flow_style=False, sort_keys=False)
-        click.echo(yaml_output)
+        with profiling.phase("serialize"):
+            print_dock_config(config)
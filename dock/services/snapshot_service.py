@@ -0,0 +1,54 @@
+"""Service for snapshot command business logic."""
+
+import json
+from pathlib import Path
+
+import click
+
+from dock.adapters import SubprocessExecutor
+from dock.adapters.apps import ApplicationIndex
+from dock.adapters.plist import PlistManager
+from dock.dock.applied import LastAppliedStore
+from dock.dock.snapshot import DockSnapshot
+from dock.utils import events
+from dock.utils.output import print_success
+from dock.utils.platform import require_macos
+
+
+class SnapshotService:
+    """Service for capturing the Dock state to a file."""
+
+    def execute(self, output: str) -> None:
+        """
+        Execute the snapshot command.
+
+        Captures the dockutil listing, the raw Dock plist, the installed
+        applications and the last applied configuration, so the state can
+        be planned against on another machine with ``--state-from``.
+
+        Args:
+            output: Path of the state file, or "-" for stdout.
+
+        Raises:
+            RuntimeError: If not running on macOS.
+        """
+        # Check platform
+        require_macos()
+
+        snapshot = DockSnapshot.capture(
+            SubprocessExecutor(),
+            PlistManager(),
+            ApplicationIndex(),
+            last_applied=LastAppliedStore().load(),
+        )
+
+        if output == "-":
+            if events.enabled():
+                events.emit("snapshot", state=json.loads(snapshot.to_json()))
+            else:
+                click.echo(snapshot.to_json(), nl=False)
+            return
+
+        output_path = Path(output)
+        snapshot.save(output_path)
+        print_success(f"Dock state captured to: {output_path}")
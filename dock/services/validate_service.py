@@ -1,26 +1,130 @@
 """Service for validate command business logic."""
 
+import os
 import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
 
+import yaml
 from cattrs.errors import ClassValidationError
 
+from dock.adapters.apps import ApplicationIndex
+from dock.adapters.git import GitCommand
 from dock.config.converter import converter
 from dock.config.loader import ConfigLoader
 from dock.config.models import DockConfig
+from dock.config.validation_cache import ValidationCache, file_digest
 from dock.config.validator import ConfigValidator
+from dock.utils import events
 from dock.utils.output import print_error, print_info, print_success, print_warning
+from dock.utils.platform import is_macos
+
+PROFILES_DIR = Path.home() / ".config" / "dock" / "profiles"
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating one configuration file."""
+
+    path: str
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    def ok(self) -> bool:
+        """
+        Check if the file is valid.
+
+        Returns:
+            True if there were no errors, False otherwise.
+        """
+        return not self.errors
+
+
+def discover_profiles(directory: Path) -> list[Path]:
+    """
+    Find every YAML configuration file under a directory.
+
+    Args:
+        directory: Root of the profiles tree.
+
+    Returns:
+        Sorted list of .yml and .yaml files.
+    """
+    return sorted(
+        path
+        for pattern in ("*.yml", "*.yaml")
+        for path in directory.rglob(pattern)
+        if path.is_file()
+    )
+
+
+def validate_file(path: str, app_index: ApplicationIndex | None = None) -> ValidationResult:
+    """
+    Load, structure and validate one configuration file.
+
+    Errors are collected rather than raised so that one bad file doesn't
+    stop a bulk run.
+
+    Args:
+        path: Path to the configuration file.
+        app_index: Optional ApplicationIndex used to check installed apps.
+
+    Returns:
+        ValidationResult for the file.
+    """
+    result = ValidationResult(path=path)
+    try:
+        config_data = ConfigLoader.load_config(Path(path))
+    except (OSError, yaml.YAMLError, ValueError) as e:
+        result.errors.append(str(e))
+        return result
+
+    try:
+        config = converter.structure(config_data, DockConfig)
+    except ClassValidationError as e:
+        result.errors.extend(str(exc) for exc in e.exceptions)
+        return result
+    except (ValueError, TypeError) as e:
+        result.errors.append(str(e))
+        return result
+
+    result.warnings = ConfigValidator.validate_config(config, app_index=app_index)
+    return result
+
+
+# Per-process application index for pool workers, built by _init_worker
+_worker_app_index: ApplicationIndex | None = None
+
+
+def _init_worker() -> None:
+    """Load the application index once per worker process."""
+    global _worker_app_index
+    _worker_app_index = ApplicationIndex() if is_macos() else None
+
+
+def _validate_in_worker(path: str) -> ValidationResult:
+    """Validate a file with the worker's application index."""
+    return validate_file(path, _worker_app_index)
 
 
 class ValidateService:
     """Service for validating dock configuration."""
 
-    def execute(self, file_path: str | None, profile: str | None) -> None:
+    def execute(
+        self, file_path: str | None, profile: str | None, use_cache: bool = True
+    ) -> None:
         """
         Execute the validate command.
 
+        Results are cached by file content; an unchanged file is reported
+        from the cache without being structured or validated again.
+
         Args:
             file_path: Optional path to config file.
             profile: Optional profile name.
+            use_cache: Whether to read and update the validation cache.
 
         Raises:
             FileNotFoundError: If config file not found.
@@ -34,24 +138,205 @@ class ValidateService:
 
         config_data = loader.load_config(config_path)
 
-        # Parse and validate config
-        try:
-            config = converter.structure(config_data, DockConfig)
-        except (ClassValidationError, ValueError, TypeError) as e:
-            print_error("Configuration validation failed:")
-            if isinstance(e, ClassValidationError):
-                for exc in e.exceptions:
-                    print_info(f"  {exc}")
+        # Installed apps can only be checked on macOS
+        app_index = ApplicationIndex() if is_macos() else None
+        cache = self._open_cache(app_index) if use_cache else None
+        digest = file_digest(config_path)
+        cached = cache.get(digest) if cache is not None else None
+
+        if cached is not None:
+            errors, warnings = cached
+        else:
+            errors, warnings = [], []
+            # Parse and validate config
+            try:
+                config = converter.structure(config_data, DockConfig)
+            except ClassValidationError as e:
+                errors = [str(exc) for exc in e.exceptions]
+            except (ValueError, TypeError) as e:
+                errors = [str(e)]
             else:
-                print_info(f"  {e}")
-            sys.exit(1)
+                # Run semantic validation
+                validator = ConfigValidator()
+                warnings = validator.validate_config(config, app_index=app_index)
+            if cache is not None:
+                cache.put(digest, errors, warnings)
+                cache.save()
 
-        # Run semantic validation
-        validator = ConfigValidator()
-        warnings = validator.validate_config(config)
+        if errors:
+            print_error("Configuration validation failed:")
+            for error in errors:
+                print_info(f"  {error}")
+            sys.exit(1)
 
         if warnings:
             for warning in warnings:
                 print_warning(warning)
 
         print_success("Configuration is valid!")
+
+    def execute_all(
+        self,
+        directory: str | None,
+        jobs: int | None = None,
+        changed_since: str | None = None,
+        use_cache: bool = True,
+    ) -> None:
+        """
+        Validate every profile in a directory tree.
+
+        Files whose content was validated before are reported from the
+        cache; the rest are validated across a process pool. Results are
+        printed as they complete, followed by a summary. Exits with
+        status 1 if any file is invalid.
+
+        Args:
+            directory: Root of the tree. Defaults to ~/.config/dock/profiles.
+            jobs: Number of worker processes. Defaults to the CPU count.
+            changed_since: Only validate files git reports as changed since
+                          this ref (plus untracked files).
+            use_cache: Whether to read and update the validation cache.
+
+        Raises:
+            FileNotFoundError: If the directory does not exist.
+        """
+        root = Path(directory) if directory else PROFILES_DIR
+        if not root.is_dir():
+            raise FileNotFoundError(f"Profiles directory not found: {root}")
+
+        if changed_since is not None:
+            paths = GitCommand().changed_files(root, changed_since, ["*.yml", "*.yaml"])
+        else:
+            paths = discover_profiles(root)
+        files = [str(path) for path in paths]
+        if not files:
+            print_warning(f"No configuration files to validate in {root}")
+            return
+        print_info(f"Validating {len(files)} configuration files in {root}")
+
+        app_index = ApplicationIndex() if is_macos() else None
+        cache = self._open_cache(app_index) if use_cache else None
+
+        failed = 0
+        try:
+            for result in self._validate_files(files, jobs, app_index, cache):
+                self._print_result(result)
+                if not result.ok():
+                    failed += 1
+        finally:
+            if cache is not None:
+                cache.save()
+
+        valid = len(files) - failed
+        if failed:
+            print_error(f"{failed} of {len(files)} files failed validation ({valid} valid)")
+            sys.exit(1)
+        print_success(f"All {len(files)} configuration files are valid!")
+
+    @staticmethod
+    def _open_cache(app_index: ApplicationIndex | None) -> ValidationCache:
+        """
+        Open the validation cache for the current environment.
+
+        Args:
+            app_index: ApplicationIndex whose fingerprint decides whether
+                      cached "Application not found" warnings still hold.
+
+        Returns:
+            ValidationCache instance.
+        """
+        return ValidationCache(environment=app_index.fingerprint() if app_index else "")
+
+    @staticmethod
+    def _validate_files(
+        files: list[str],
+        jobs: int | None,
+        app_index: ApplicationIndex | None = None,
+        cache: ValidationCache | None = None,
+    ) -> Iterator[ValidationResult]:
+        """
+        Validate files, in parallel when more than one worker is useful.
+
+        Args:
+            files: Paths to validate.
+            jobs: Number of worker processes, or None for the CPU count.
+            app_index: ApplicationIndex for in-process validation.
+            cache: Optional cache consulted before and updated after validating.
+
+        Yields:
+            ValidationResult for each file: cache hits first, then the rest
+            in completion order.
+        """
+        pending: list[str] = []
+        digests: dict[str, str] = {}
+        for path in files:
+            if cache is not None:
+                try:
+                    digests[path] = file_digest(Path(path))
+                except OSError:
+                    pass
+                else:
+                    cached = cache.get(digests[path])
+                    if cached is not None:
+                        yield ValidationResult(path, errors=cached[0], warnings=cached[1])
+                        continue
+            pending.append(path)
+
+        for result in ValidateService._run_validation(pending, jobs, app_index):
+            digest = digests.get(result.path)
+            if cache is not None and digest is not None:
+                cache.put(digest, result.errors, result.warnings)
+            yield result
+
+    @staticmethod
+    def _run_validation(
+        files: list[str], jobs: int | None, app_index: ApplicationIndex | None
+    ) -> Iterator[ValidationResult]:
+        """
+        Validate files in-process or across a process pool.
+
+        Args:
+            files: Paths to validate.
+            jobs: Number of worker processes, or None for the CPU count.
+            app_index: ApplicationIndex for in-process validation.
+
+        Yields:
+            ValidationResult for each file, in completion order.
+        """
+        if not files:
+            return
+        workers = min(jobs or os.cpu_count() or 1, len(files))
+        if workers <= 1:
+            for path in files:
+                yield validate_file(path, app_index)
+            return
+
+        if app_index is not None:
+            # Warm the on-disk index cache once so workers load it instead
+            # of each rescanning the application folders
+            app_index.entries()
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_validate_in_worker, path) for path in files]
+            for future in as_completed(futures):
+                yield future.result()
+
+    @staticmethod
+    def _print_result(result: ValidationResult) -> None:
+        """
+        Print the outcome for one file.
+
+        Args:
+            result: ValidationResult to print.
+        """
+        if events.enabled():
+            events.emit("validation", valid=result.ok(), **asdict(result))
+            return
+        if result.ok():
+            print_success(result.path)
+        else:
+            print_error(result.path)
+            for error in result.errors:
+                print_info(f"  {error}")
+        for warning in result.warnings:
+            print_warning(f"{result.path}: {warning}")
@@ -0,0 +1 @@
+"""Test and benchmark helpers for dock tool."""
@@ -0,0 +1,398 @@
+"""
+A pure-Python stand-in for dockutil that edits a Dock plist file.
+
+Implements the dockutil 3 commands dock runs (--list, --add, --remove and
+--move, with --position, --section, --view, --display, --sort, --label,
+--replacing and --no-restart) so resets can go through the real
+subprocess path on any OS. Point dock at it with DOCK_DOCKUTIL, or put a
+shim from write_shim() first on PATH::
+
+    DOCK_DOCKUTIL="python -m dock.testing.fake_dockutil" dock reset
+
+Its behaviour is set with environment variables:
+
+FAKE_DOCKUTIL_PLIST
+    Plist to edit. Defaults to ~/Library/Preferences/com.apple.dock.plist.
+FAKE_DOCKUTIL_LATENCY
+    Seconds each call takes, as one number or per command kind, e.g.
+    "list=0.05,add=0.4,default=0.2". Added to interpreter startup.
+FAKE_DOCKUTIL_FAILURES
+    Probability that a call exits with status 1 without changing
+    anything, in the same format.
+FAKE_DOCKUTIL_SEED
+    Makes failures reproducible. The n-th call logged to FAKE_DOCKUTIL_LOG
+    always succeeds or fails the same way for a seed.
+FAKE_DOCKUTIL_LOG
+    File that gets a JSON line per call with its arguments, command kind,
+    exit status and injected latency.
+"""
+
+import argparse
+import json
+import os
+import plistlib
+import random
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from dock.adapters import command_kind
+
+VERSION = "3.1.3"
+
+DEFAULT_PLIST = Path.home() / "Library/Preferences/com.apple.dock.plist"
+
+# Tile-data codes and section arrays as in dock.dock.stacks, which isn't
+# imported: it loads the config models, and every call is a new process
+VIEW_CODES = {"auto": 0, "fan": 1, "grid": 2, "list": 3}
+DISPLAY_CODES = {"stack": 0, "folder": 1}
+SORT_CODES = {"name": 1, "dateadded": 2, "datemodified": 3, "datecreated": 4, "kind": 5}
+SECTION_ARRAYS = {"apps": "persistent-apps", "others": "persistent-others"}
+
+# dockutil --list names of the plist arrays, in listing order
+LISTED_SECTIONS = {
+    "persistent-apps": "persistentApps",
+    "persistent-others": "persistentOthers",
+    "recent-apps": "recentApps",
+}
+
+
+class DockutilError(Exception):
+    """A call that dockutil would reject with exit status 1."""
+
+
+def parse_rates(value: str | None) -> dict[str, float]:
+    """
+    Parse a latency or failure setting.
+
+    Args:
+        value: One number for every command kind, or comma-separated
+              ``kind=number`` pairs where "default" covers other kinds.
+
+    Returns:
+        Numbers by command kind.
+
+    Raises:
+        ValueError: If the value is malformed.
+    """
+    if not value:
+        return {}
+    if "=" not in value:
+        return {"default": float(value)}
+    rates = {}
+    for part in value.split(","):
+        kind, sep, number = part.partition("=")
+        if not sep:
+            raise ValueError(f"Expected kind=number, got {part!r}")
+        rates[kind.strip()] = float(number)
+    return rates
+
+
+def _rate(rates: dict[str, float], kind: str) -> float:
+    """Get the setting for a command kind."""
+    return rates.get(kind, rates.get("default", 0.0))
+
+
+def write_shim(directory: Path) -> Path:
+    """
+    Write a ``dockutil`` executable that runs this module.
+
+    Put the directory first on PATH to use the stand-in without
+    DOCK_DOCKUTIL.
+
+    Args:
+        directory: Directory to write the shim into.
+
+    Returns:
+        Path of the shim.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    shim = directory / "dockutil"
+    package_root = Path(__file__).resolve().parents[2]
+    shim.write_text(
+        "#!/bin/sh\n"
+        f'PYTHONPATH="{package_root}${{PYTHONPATH:+:$PYTHONPATH}}" '
+        f'exec "{sys.executable}" -m dock.testing.fake_dockutil "$@"\n'
+    )
+    shim.chmod(0o755)
+    return shim
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Build the dockutil argument parser."""
+    parser = argparse.ArgumentParser(prog="dockutil", description="Fake dockutil")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true")
+    action.add_argument("--add", metavar="PATH_OR_URL")
+    action.add_argument("--remove", metavar="LABEL_URL_OR_BUNDLE")
+    action.add_argument("--move", metavar="LABEL")
+    action.add_argument("--version", action="store_true")
+    parser.add_argument("--position")
+    parser.add_argument("--section", choices=["apps", "others", "left", "right"])
+    parser.add_argument("--view", choices=sorted(VIEW_CODES))
+    parser.add_argument("--display", choices=sorted(DISPLAY_CODES))
+    parser.add_argument("--sort", choices=sorted(SORT_CODES))
+    parser.add_argument("--label")
+    parser.add_argument("--replacing", metavar="LABEL")
+    parser.add_argument("--no-restart", action="store_true")
+    parser.add_argument("plist", nargs="?", type=Path)
+    return parser
+
+
+def _item_url(item: str) -> str:
+    """Get the URL dockutil stores for a path or URL."""
+    if "://" in item:
+        return item
+    path = os.path.abspath(os.path.expanduser(item))
+    suffix = "/" if path.endswith(".app") or os.path.isdir(path) else ""
+    return f"file://{quote(path)}{suffix}"
+
+
+def _tile_url(tile: dict[str, Any]) -> str:
+    """Get the URL of a tile."""
+    data = tile.get("tile-data", {})
+    url_data = data.get("url") if tile.get("tile-type") == "url-tile" else data.get("file-data")
+    return str((url_data or {}).get("_CFURLString", ""))
+
+
+def _tile_label(tile: dict[str, Any]) -> str:
+    """Get the label of a tile."""
+    data = tile.get("tile-data", {})
+    return str(data.get("file-label") or data.get("label") or "")
+
+
+def _matches(tile: dict[str, Any], target: str) -> bool:
+    """Check if a tile is named by a label, URL, path or bundle id."""
+    if tile.get("tile-type", "").endswith("spacer-tile"):
+        return False
+    url = _tile_url(tile)
+    return target in (
+        _tile_label(tile),
+        url,
+        tile.get("tile-data", {}).get("bundle-identifier"),
+    ) or url.rstrip("/") == _item_url(target).rstrip("/")
+
+
+def _new_tile(item: str, url: str, args: argparse.Namespace, rng: random.Random) -> dict[str, Any]:
+    """Build the tile for --add."""
+    guid = rng.randrange(1 << 31, 1 << 32)
+    if not url.startswith("file://"):
+        return {
+            "GUID": guid,
+            "tile-data": {
+                "label": args.label or url,
+                "url": {"_CFURLString": url, "_CFURLStringType": 15},
+            },
+            "tile-type": "url-tile",
+        }
+    path = Path(os.path.expanduser(item))
+    file_data = {"_CFURLString": url, "_CFURLStringType": 15}
+    if path.suffix == ".app":
+        return {
+            "GUID": guid,
+            "tile-data": {
+                "bundle-identifier": _bundle_id(path),
+                "file-data": file_data,
+                "file-label": args.label or path.stem,
+                "file-type": 41,
+            },
+            "tile-type": "file-tile",
+        }
+    return {
+        "GUID": guid,
+        "tile-data": {
+            "arrangement": SORT_CODES[args.sort or "name"],
+            "displayas": DISPLAY_CODES[args.display or "stack"],
+            "file-data": file_data,
+            "file-label": args.label or path.name,
+            "file-type": 2,
+            "showas": VIEW_CODES[args.view or "auto"],
+        },
+        "tile-type": "directory-tile",
+    }
+
+
+def _bundle_id(app: Path) -> str:
+    """Read an app's bundle id from its Info.plist, if it has one."""
+    try:
+        with open(app / "Contents" / "Info.plist", "rb") as f:
+            return str(plistlib.load(f).get("CFBundleIdentifier", ""))
+    except (OSError, plistlib.InvalidFileException):
+        return ""
+
+
+def _insert_index(position: str | None, length: int) -> int:
+    """Convert --position to an index in a section of some length."""
+    if position is None or position == "end":
+        return length
+    if position == "beginning":
+        return 0
+    if position == "middle":
+        return length // 2
+    try:
+        return min(max(int(position) - 1, 0), length)
+    except ValueError:
+        raise DockutilError(f"Invalid position: {position}") from None
+
+
+def _persistent_tiles(plist: dict[str, Any]) -> list[list[dict[str, Any]]]:
+    """Get the tile arrays dockutil edits."""
+    return [plist.setdefault(array, []) for array in SECTION_ARRAYS.values()]
+
+
+def _list(plist: dict[str, Any], plist_path: Path) -> str:
+    """Format the --list output."""
+    lines = []
+    for array, section in LISTED_SECTIONS.items():
+        for tile in plist.get(array, []):
+            if tile.get("tile-type", "").endswith("spacer-tile"):
+                continue
+            bundle_id = tile.get("tile-data", {}).get("bundle-identifier", "")
+            lines.append(
+                f"{_tile_label(tile)}\t{_tile_url(tile)}\t{section}\t{plist_path}\t{bundle_id}\n"
+            )
+    return "".join(lines)
+
+
+def _add(plist: dict[str, Any], args: argparse.Namespace, rng: random.Random) -> bool:
+    """Add a tile; returns False when it is already in the Dock."""
+    url = _item_url(args.add)
+    if args.replacing is not None:
+        for tiles in _persistent_tiles(plist):
+            for index, tile in enumerate(tiles):
+                if _tile_label(tile) == args.replacing:
+                    tiles[index] = _new_tile(args.add, url, args, rng)
+                    return True
+    if any(_tile_url(tile) == url for tiles in _persistent_tiles(plist) for tile in tiles):
+        print(f"{args.add} already exists in dock. Use --replacing to update.", file=sys.stderr)
+        return False
+
+    section = args.section or ("apps" if url.rstrip("/").endswith(".app") else "others")
+    tiles = plist.setdefault(SECTION_ARRAYS["others" if section == "others" else "apps"], [])
+    tiles.insert(_insert_index(args.position, len(tiles)), _new_tile(args.add, url, args, rng))
+    return True
+
+
+def _remove(plist: dict[str, Any], target: str, plist_path: Path) -> None:
+    """Remove every tile a target names, or everything for "all"."""
+    removed = 0
+    for tiles in _persistent_tiles(plist):
+        kept = [tile for tile in tiles if target != "all" and not _matches(tile, target)]
+        removed += len(tiles) - len(kept)
+        tiles[:] = kept
+    if not removed and target != "all":
+        raise DockutilError(f"{target} was not found in {plist_path}")
+
+
+def _move(plist: dict[str, Any], target: str, position: str | None, plist_path: Path) -> None:
+    """Move a tile within its section."""
+    if position is None:
+        raise DockutilError("--move requires --position")
+    for tiles in _persistent_tiles(plist):
+        for index, tile in enumerate(tiles):
+            if _matches(tile, target):
+                tiles.pop(index)
+                tiles.insert(_insert_index(position, len(tiles)), tile)
+                return
+    raise DockutilError(f"{target} was not found in {plist_path}")
+
+
+def _read(path: Path) -> dict[str, Any]:
+    """Read the plist; a missing file is an empty Dock."""
+    try:
+        with open(path, "rb") as f:
+            data = plistlib.load(f)
+    except FileNotFoundError:
+        return {}
+    assert isinstance(data, dict)
+    return data
+
+
+def _write(path: Path, data: dict[str, Any]) -> None:
+    """Write the plist in binary format, atomically like cfprefsd."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp.write_bytes(plistlib.dumps(data, fmt=plistlib.FMT_BINARY))
+    os.replace(temp, path)
+
+
+def _count_calls(log: Path) -> int:
+    """Count the calls already in the log."""
+    try:
+        with log.open() as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def run(argv: Sequence[str], environ: dict[str, str] | None = None) -> int:
+    """
+    Run one dockutil call.
+
+    Args:
+        argv: Arguments without the program name.
+        environ: Environment to read settings from. Defaults to os.environ.
+
+    Returns:
+        Exit status.
+    """
+    env = os.environ if environ is None else environ
+    args = _parser().parse_args(argv)
+    kind = command_kind(["dockutil", *argv])
+    latency = _rate(parse_rates(env.get("FAKE_DOCKUTIL_LATENCY")), kind)
+    failure_rate = _rate(parse_rates(env.get("FAKE_DOCKUTIL_FAILURES")), kind)
+    log = Path(env["FAKE_DOCKUTIL_LOG"]) if env.get("FAKE_DOCKUTIL_LOG") else None
+    seed = env.get("FAKE_DOCKUTIL_SEED")
+    call = _count_calls(log) if log is not None else 0
+    rng = random.Random(f"{seed}:{call}") if seed is not None else random.Random()
+
+    time.sleep(latency)
+    if rng.random() < failure_rate:
+        print(f"Injected failure for: dockutil {' '.join(argv)}", file=sys.stderr)
+        status = 1
+    else:
+        status = _dispatch(args, Path(env.get("FAKE_DOCKUTIL_PLIST") or DEFAULT_PLIST), rng)
+
+    if log is not None:
+        entry = {"argv": list(argv), "kind": kind, "status": status, "latency": latency}
+        with log.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+    return status
+
+
+def _dispatch(args: argparse.Namespace, default_plist: Path, rng: random.Random) -> int:
+    """Carry out a parsed call and get its exit status."""
+    plist_path = args.plist or default_plist
+    try:
+        if args.version:
+            print(VERSION)
+        elif args.list:
+            sys.stdout.write(_list(_read(plist_path), plist_path))
+        else:
+            plist = _read(plist_path)
+            if args.add is not None:
+                changed = _add(plist, args, rng)
+            elif args.remove is not None:
+                _remove(plist, args.remove, plist_path)
+                changed = True
+            else:
+                _move(plist, args.move, args.position, plist_path)
+                changed = True
+            if changed:
+                _write(plist_path, plist)
+    except DockutilError as e:
+        print(e, file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> None:
+    """Run as dockutil from the command line."""
+    sys.exit(run(sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,507 @@
+"""
+Synthetic Dock plists and configurations for tests and benchmarks.
+
+Generates a realistic ``com.apple.dock.plist`` (tiles with GUIDs, bundle
+ids, file URLs and bookmark blobs of a chosen size), the ``dockutil
+--list`` output and installed applications that go with it, and YAML
+configurations a chosen number of edits away from it. Output is
+reproducible for a given seed, so large inputs can be regenerated on any
+OS instead of being checked in.
+
+Run ``python -m dock.testing.synth --help`` for the command-line interface.
+"""
+
+import copy
+import plistlib
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+from urllib.parse import quote
+
+import click
+import yaml
+
+from dock.adapters.apps import AppEntry
+from dock.config.converter import converter
+from dock.config.settings import SETTINGS, SETTINGS_BY_NAME, SettingSpec
+from dock.dock.snapshot import DockSnapshot
+from dock.dock.stacks import DISPLAY_CODES, SORT_CODES, VIEW_CODES
+from dock.dock.state import DockStateReader
+
+# Apps commonly found in a Dock: name, bundle id, and whether macOS ships it
+KNOWN_APPS: tuple[tuple[str, str, bool], ...] = (
+    ("Safari", "com.apple.Safari", True),
+    ("Mail", "com.apple.mail", True),
+    ("Calendar", "com.apple.iCal", True),
+    ("Notes", "com.apple.Notes", True),
+    ("Reminders", "com.apple.reminders", True),
+    ("Messages", "com.apple.MobileSMS", True),
+    ("FaceTime", "com.apple.FaceTime", True),
+    ("Maps", "com.apple.Maps", True),
+    ("Photos", "com.apple.Photos", True),
+    ("Music", "com.apple.Music", True),
+    ("Podcasts", "com.apple.podcasts", True),
+    ("Preview", "com.apple.Preview", True),
+    ("Terminal", "com.apple.Terminal", True),
+    ("App Store", "com.apple.AppStore", True),
+    ("System Settings", "com.apple.systempreferences", True),
+    ("Xcode", "com.apple.dt.Xcode", False),
+    ("Keynote", "com.apple.iWork.Keynote", False),
+    ("Pages", "com.apple.iWork.Pages", False),
+    ("Numbers", "com.apple.iWork.Numbers", False),
+    ("Google Chrome", "com.google.Chrome", False),
+    ("Firefox", "org.mozilla.firefox", False),
+    ("Visual Studio Code", "com.microsoft.VSCode", False),
+    ("Microsoft Word", "com.microsoft.Word", False),
+    ("Microsoft Excel", "com.microsoft.Excel", False),
+    ("Microsoft Outlook", "com.microsoft.Outlook", False),
+    ("Slack", "com.tinyspeck.slackmacgap", False),
+    ("zoom.us", "us.zoom.xos", False),
+    ("Figma", "com.figma.Desktop", False),
+    ("Notion", "notion.id", False),
+    ("Spotify", "com.spotify.client", False),
+    ("iTerm", "com.googlecode.iterm2", False),
+    ("1Password", "com.1password.1password", False),
+    ("Docker", "com.docker.docker", False),
+    ("Postman", "com.postmanlabs.mac", False),
+    ("Things3", "com.culturedcode.ThingsMac", False),
+)
+
+FOLDERS = ("Documents", "Projects", "Desktop", "Screenshots", "Archive", "Shared", "Scans")
+
+PLIST_PATH = "/Users/synth/Library/Preferences/com.apple.dock.plist"
+HOME = "/Users/synth"
+
+EditKind = Literal["add", "remove", "move", "setting"]
+EDIT_KINDS: tuple[EditKind, ...] = ("add", "remove", "move", "setting")
+
+
+@dataclass(frozen=True)
+class SynthSpec:
+    """What to generate."""
+
+    apps: int = 20
+    others: int = 3
+    recents: int = 3
+    spacers: int = 2
+    bookmark_size: int = 512
+    spare_apps: int = 20
+    seed: int = 0
+
+
+@dataclass
+class SynthDock:
+    """A generated Dock: its plist, dockutil listing and installed apps."""
+
+    plist: dict[str, Any]
+    dockutil_list: str
+    apps: list[AppEntry]
+    seed: int = 0
+    _state: dict[str, Any] | None = field(default=None, repr=False)
+
+    def plist_bytes(self, fmt: Literal["binary", "xml"] = "binary") -> bytes:
+        """
+        Serialize the plist.
+
+        Args:
+            fmt: "binary", as the Dock writes it, or "xml".
+
+        Returns:
+            Plist file contents.
+        """
+        plist_format = plistlib.FMT_BINARY if fmt == "binary" else plistlib.FMT_XML
+        return plistlib.dumps(self.plist, fmt=plist_format)
+
+    def snapshot(self) -> DockSnapshot:
+        """
+        Get the Dock as a state file for ``--state-from``.
+
+        Returns:
+            DockSnapshot of the generated Dock.
+        """
+        return DockSnapshot(
+            dockutil_list=self.dockutil_list,
+            plist=self.plist_bytes(),
+            apps=self.apps,
+            hostname=f"synth-{self.seed}",
+            captured_at="2026-01-01T00:00:00+00:00",
+        )
+
+    def state(self) -> dict[str, Any]:
+        """
+        Get the configuration that matches the Dock exactly.
+
+        The Dock is read back through the state reader, so the result is
+        what ``dock backup`` would write for it.
+
+        Returns:
+            Unstructured DockConfig.
+        """
+        if self._state is None:
+            snapshot = self.snapshot()
+            reader = DockStateReader(snapshot.dockutil(), snapshot.plist_manager())
+            self._state = converter.unstructure(reader.read_full_state())
+        return self._state
+
+    def config(self, edits: int, seed: int | None = None) -> dict[str, Any]:
+        """
+        Get a configuration a number of edits away from the Dock.
+
+        Each edit adds an installed app that isn't docked, removes or moves
+        a docked app, or changes a setting. No app or setting is edited
+        twice, so edits don't cancel out.
+
+        Args:
+            edits: Number of edits; 0 gives a configuration that matches.
+            seed: Seed for choosing the edits. Defaults to the Dock's seed
+                 plus the number of edits.
+
+        Returns:
+            Unstructured DockConfig.
+
+        Raises:
+            ValueError: If there are not enough apps or settings to make
+                       that many distinct edits.
+        """
+        rng = random.Random(self.seed + edits if seed is None else seed)
+        config = copy.deepcopy(self.state())
+        apps: list[str] = config["apps"]
+        docked = set(apps)
+        spare = [app.name for app in self.apps if app.name not in docked]
+        touched: set[str] = set()
+        settings = [spec for spec in SETTINGS if spec.name in config["settings"]]
+
+        for _ in range(edits):
+            kinds = [kind for kind in EDIT_KINDS if _can_edit(kind, apps, spare, touched, settings)]
+            if not kinds:
+                raise ValueError(f"Can't make {edits} distinct edits to this Dock")
+            kind = rng.choice(kinds)
+            if kind == "add":
+                app = spare.pop(rng.randrange(len(spare)))
+                apps.insert(rng.randint(0, len(apps)), app)
+                touched.add(app)
+            elif kind == "remove":
+                app = rng.choice([app for app in apps if app not in touched])
+                apps.remove(app)
+                touched.add(app)
+            elif kind == "move":
+                app = rng.choice([app for app in apps if app not in touched])
+                index = apps.index(app)
+                apps.pop(index)
+                apps.insert(rng.choice([i for i in range(len(apps) + 1) if i != index]), app)
+                touched.add(app)
+            else:
+                spec = settings.pop(rng.randrange(len(settings)))
+                config["settings"][spec.name] = _other_value(spec, config["settings"][spec.name])
+        return config
+
+
+def _can_edit(
+    kind: EditKind,
+    apps: list[str],
+    spare: list[str],
+    touched: set[str],
+    settings: list[SettingSpec],
+) -> bool:
+    """Check if an edit of a kind is still possible."""
+    if kind == "add":
+        return bool(spare)
+    if kind == "setting":
+        return bool(settings)
+    untouched = [app for app in apps if app not in touched]
+    return bool(untouched) and (kind == "remove" or len(apps) > 1)
+
+
+def _other_value(spec: SettingSpec, value: Any) -> Any:
+    """Get a valid setting value different from the current one."""
+    if spec.type is bool:
+        return not value
+    if spec.choices is not None:
+        return next(choice for choice in spec.choices if choice != value)
+    if spec.type is int:
+        maximum = spec.maximum if spec.maximum is not None else value + 1
+        return int(value) + 1 if value + 1 <= maximum else int(value) - 1
+    return round(float(value) + 0.25, spec.digits or 2)
+
+
+def generate(spec: SynthSpec) -> SynthDock:
+    """
+    Generate a Dock.
+
+    Args:
+        spec: Counts, sizes and seed.
+
+    Returns:
+        SynthDock.
+    """
+    rng = random.Random(spec.seed)
+    installed = _installed_apps(spec.apps + spec.recents + spec.spare_apps, rng)
+    docked = installed[: spec.apps]
+    recents = installed[spec.apps : spec.apps + spec.recents]
+    guids = rng.sample(range(1_000_000_000, 4_000_000_000), spec.apps + spec.recents + 64)
+    guids.extend(rng.sample(range(4_000_000_000, 4_200_000_000), spec.spacers + spec.others))
+    next_guid = iter(guids).__next__
+
+    persistent_apps = [_app_tile(app, next_guid(), spec.bookmark_size, rng) for app in docked]
+    for _ in range(spec.spacers):
+        spacer = {
+            "GUID": next_guid(),
+            "tile-data": {"file-label": ""},
+            "tile-type": rng.choice(("spacer-tile", "small-spacer-tile")),
+        }
+        persistent_apps.insert(rng.randint(1, len(persistent_apps)), spacer)
+
+    persistent_others = [_downloads_tile(next_guid(), spec.bookmark_size, rng)]
+    for index in range(spec.others):
+        persistent_others.append(_stack_tile(index, next_guid(), spec.bookmark_size, rng))
+
+    plist: dict[str, Any] = {
+        "persistent-apps": persistent_apps,
+        "persistent-others": persistent_others,
+        "recent-apps": [_app_tile(app, next_guid(), spec.bookmark_size, rng) for app in recents],
+        "version": 1,
+        "mod-count": rng.randint(10, 5000),
+        "trash-full": False,
+        "loc": "en_US:US",
+        "region": "US",
+    }
+    plist.update(_settings(rng, show_recents=spec.recents > 0))
+
+    lines = [
+        _listing_line(app.name, _app_url(app), "persistentApps", app.bundle_id) for app in docked
+    ]
+    for tile in persistent_others:
+        tile_data = tile["tile-data"]
+        if tile["tile-type"] == "url-tile":
+            lines.append(
+                _listing_line(
+                    tile_data["label"], tile_data["url"]["_CFURLString"], "persistentOthers"
+                )
+            )
+        else:
+            lines.append(
+                _listing_line(
+                    tile_data["file-label"],
+                    tile_data["file-data"]["_CFURLString"],
+                    "persistentOthers",
+                )
+            )
+    lines.extend(
+        _listing_line(app.name, _app_url(app), "recentApps", app.bundle_id) for app in recents
+    )
+    return SynthDock(
+        plist=plist,
+        dockutil_list="".join(lines),
+        apps=installed,
+        seed=spec.seed,
+    )
+
+
+def _installed_apps(count: int, rng: random.Random) -> list[AppEntry]:
+    """Pick installed apps: well-known ones first, then numbered ones, shuffled."""
+    apps = []
+    for index in range(count):
+        if index < len(KNOWN_APPS):
+            name, bundle_id, system = KNOWN_APPS[index]
+            root = "/System/Applications" if system else "/Applications"
+        else:
+            name = f"Synth App {index:05d}"
+            bundle_id = f"com.example.synth{index:05d}"
+            root = "/Applications"
+        apps.append(AppEntry(name=name, path=f"{root}/{name}.app", bundle_id=bundle_id))
+    rng.shuffle(apps)
+    return apps
+
+
+def _app_url(app: AppEntry) -> str:
+    """Get the file URL the Dock stores for an app."""
+    return f"file://{quote(app.path)}/"
+
+
+def _bookmark(size: int, rng: random.Random) -> bytes:
+    """Build a bookmark blob of a given size with the header macOS writes."""
+    return (b"book" + rng.randbytes(max(size - 4, 0)))[:size]
+
+
+def _app_tile(app: AppEntry, guid: int, bookmark_size: int, rng: random.Random) -> dict[str, Any]:
+    """Build a persistent-apps or recent-apps tile as the Dock writes it."""
+    modified = rng.randint(3_600_000_000, 3_800_000_000)
+    return {
+        "GUID": guid,
+        "tile-data": {
+            "book": _bookmark(bookmark_size, rng),
+            "bundle-identifier": app.bundle_id,
+            "dock-extra": False,
+            "file-data": {"_CFURLString": _app_url(app), "_CFURLStringType": 15},
+            "file-label": app.name,
+            "file-mod-date": modified,
+            "file-type": 41,
+            "is-beta": False,
+            "parent-mod-date": modified + rng.randint(0, 86_400),
+        },
+        "tile-type": "file-tile",
+    }
+
+
+def _downloads_tile(guid: int, bookmark_size: int, rng: random.Random) -> dict[str, Any]:
+    """Build the Downloads tile with the classic preset."""
+    return {
+        "GUID": guid,
+        "tile-data": {
+            "arrangement": SORT_CODES["dateadded"],
+            "book": _bookmark(bookmark_size, rng),
+            "displayas": DISPLAY_CODES["stack"],
+            "file-data": {"_CFURLString": f"file://{HOME}/Downloads/", "_CFURLStringType": 15},
+            "file-label": "Downloads",
+            "file-type": 2,
+            "preferreditemsize": -1,
+            "showas": VIEW_CODES["auto"],
+        },
+        "tile-type": "directory-tile",
+    }
+
+
+def _stack_tile(index: int, guid: int, bookmark_size: int, rng: random.Random) -> dict[str, Any]:
+    """Build a folder stack, or a web link for every fourth stack."""
+    if index % 4 == 3:
+        url = f"https://intranet.example.com/page-{index}"
+        return {
+            "GUID": guid,
+            "tile-data": {
+                "label": f"Link {index}",
+                "url": {"_CFURLString": url, "_CFURLStringType": 15},
+            },
+            "tile-type": "url-tile",
+        }
+    folder = FOLDERS[index % len(FOLDERS)]
+    name = folder if index < len(FOLDERS) else f"{folder} {index}"
+    return {
+        "GUID": guid,
+        "tile-data": {
+            "arrangement": rng.choice(list(SORT_CODES.values())),
+            "book": _bookmark(bookmark_size, rng),
+            "displayas": rng.choice(list(DISPLAY_CODES.values())),
+            "file-data": {
+                "_CFURLString": f"file://{HOME}/{quote(name)}/",
+                "_CFURLStringType": 15,
+            },
+            "file-label": name,
+            "file-type": 2,
+            "preferreditemsize": -1,
+            "showas": rng.choice(list(VIEW_CODES.values())),
+        },
+        "tile-type": "directory-tile",
+    }
+
+
+def _settings(rng: random.Random, show_recents: bool) -> dict[str, Any]:
+    """Pick plausible values for every registered setting."""
+    values: dict[str, Any] = {}
+    for spec in SETTINGS:
+        if spec.type is bool:
+            value: Any = rng.random() < 0.5
+        elif spec.choices is not None:
+            value = rng.choice(spec.choices)
+        elif spec.type is int:
+            value = rng.randint(int(spec.minimum or 0), int(spec.maximum or 100))
+        else:
+            value = round(rng.uniform(0, 1), spec.digits or 2)
+        values[spec.plist_key] = value
+    values[SETTINGS_BY_NAME["show_recents"].plist_key] = show_recents
+    return values
+
+
+def _listing_line(label: str, url: str, section: str, bundle_id: str | None = None) -> str:
+    """Format one line of ``dockutil --list`` output."""
+    return f"{label}\t{url}\t{section}\t{PLIST_PATH}\t{bundle_id or ''}\n"
+
+
+def _parse_distances(value: str) -> list[int]:
+    """Parse a comma-separated list of edit distances."""
+    if not re.fullmatch(r"\d+(,\d+)*", value):
+        raise click.BadParameter("expected comma-separated numbers, e.g. 0,1,10")
+    return [int(part) for part in value.split(",")]
+
+
+@click.command()
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--apps", type=click.IntRange(min=0), default=20, show_default=True)
+@click.option("--others", type=click.IntRange(min=0), default=3, show_default=True)
+@click.option("--recents", type=click.IntRange(min=0), default=3, show_default=True)
+@click.option("--spacers", type=click.IntRange(min=0), default=2, show_default=True)
+@click.option(
+    "--bookmark-size",
+    type=click.IntRange(min=0),
+    default=512,
+    show_default=True,
+    help="Bytes of bookmark data per tile",
+)
+@click.option(
+    "--spare-apps",
+    type=click.IntRange(min=0),
+    default=20,
+    show_default=True,
+    help="Installed apps that are not in the Dock, for configs to add",
+)
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["binary", "xml"]),
+    default="binary",
+    show_default=True,
+)
+@click.option(
+    "--distances",
+    default="0,1,5",
+    show_default=True,
+    help="Write a config this many edits away from the Dock, for each number",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+def main(
+    directory: Path,
+    apps: int,
+    others: int,
+    recents: int,
+    spacers: int,
+    bookmark_size: int,
+    spare_apps: int,
+    fmt: Literal["binary", "xml"],
+    distances: str,
+    seed: int,
+) -> None:
+    """
+    Write a synthetic Dock into DIRECTORY.
+
+    Writes com.apple.dock.plist, state.json for 'dock reset --dry-run
+    --state-from' and 'dock show --state-from', and config-dN.yml for
+    each edit distance N.
+    """
+    edit_distances = _parse_distances(distances)
+    spec = SynthSpec(
+        apps=apps,
+        others=others,
+        recents=recents,
+        spacers=spacers,
+        bookmark_size=bookmark_size,
+        spare_apps=spare_apps,
+        seed=seed,
+    )
+    dock = generate(spec)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "com.apple.dock.plist").write_bytes(dock.plist_bytes(fmt))
+    dock.snapshot().save(directory / "state.json")
+    for distance in edit_distances:
+        try:
+            config = dock.config(distance)
+        except ValueError as e:
+            raise click.ClickException(str(e)) from e
+        (directory / f"config-d{distance}.yml").write_text(
+            yaml.dump(config, default_flow_style=False, sort_keys=False)
+        )
+    click.echo(f"Wrote a Dock with {apps} apps to {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Machine-readable event stream for ``--output ndjson``."""
+
+import json
+import sys
+import time
+from typing import Any, TextIO
+
+# Flush when this much output is pending, or when this long has passed since
+# the last flush, so large plans take few writes and consumers still see
+# progress while a reset runs.
+BUFFER_SIZE = 64 * 1024
+FLUSH_INTERVAL = 0.25
+
+
+class EventWriter:
+    """Buffers events as newline-delimited JSON and writes them in blocks."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        buffer_size: int = BUFFER_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        """
+        Initialize EventWriter.
+
+        Args:
+            stream: Text stream the events are written to.
+            buffer_size: Pending characters that trigger a flush.
+            flush_interval: Seconds after which pending events are flushed
+                           by the next event.
+        """
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.errors = 0
+        self.started = time.monotonic()
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._last_flush = self.started
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """
+        Queue one event.
+
+        Args:
+            event: Event type, e.g. "plan_step".
+            **fields: Event payload. Values that aren't JSON types are
+                     written as strings.
+        """
+        if event == "error":
+            self.errors += 1
+        line = json.dumps(
+            {"event": event, "ts": round(time.time(), 3), **fields},
+            default=str,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self._pending.append(line + "\n")
+        self._pending_size += len(line) + 1
+
+        now = time.monotonic()
+        if self._pending_size >= self.buffer_size or now - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending events in a single write."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        self.stream.write("".join(self._pending))
+        self.stream.flush()
+        self._pending.clear()
+        self._pending_size = 0
+
+
+_writer: EventWriter | None = None
+
+
+def enable(stream: TextIO) -> EventWriter:
+    """
+    Send output as events to a stream instead of human-readable text.
+
+    Args:
+        stream: Text stream for the events, usually stdout.
+
+    Returns:
+        The active EventWriter.
+    """
+    global _writer
+    _writer = EventWriter(stream)
+    return _writer
+
+
+def enabled() -> bool:
+    """
+    Check if output is an event stream.
+
+    Returns:
+        True if ``--output ndjson`` is active, False otherwise.
+    """
+    return _writer is not None
+
+
+def emit(event: str, **fields: Any) -> None:
+    """
+    Emit an event if the event stream is enabled; otherwise do nothing.
+
+    Args:
+        event: Event type.
+        **fields: Event payload.
+    """
+    if _writer is not None:
+        _writer.emit(event, **fields)
+
+
+def finish() -> None:
+    """
+    Emit the closing result event, flush and disable the stream.
+
+    Called while the command's context closes, so an exception that is
+    ending the command (sys.exit, a usage error) is still visible and
+    sets the exit code reported in the result.
+    """
+    global _writer
+    if _writer is None:
+        return
+    writer, _writer = _writer, None
+    exit_code = _exit_code(sys.exc_info()[1])
+    writer.emit(
+        "result",
+        ok=exit_code == 0 and writer.errors == 0,
+        exit_code=exit_code,
+        errors=writer.errors,
+        duration=round(time.monotonic() - writer.started, 3),
+    )
+    writer.flush()
+
+
+def _exit_code(exc: BaseException | None) -> int:
+    """Get the exit code an in-flight exception will end the process with."""
+    if exc is None:
+        return 0
+    if isinstance(exc, SystemExit):
+        if exc.code is None or isinstance(exc.code, int):
+            return exc.code or 0
+        return 1
+    # click exceptions carry the exit code click will use
+    code = getattr(exc, "exit_code", 1)
+    return code if isinstance(code, int) else 1
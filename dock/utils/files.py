@@ -0,0 +1,60 @@
+"""Filesystem helpers for state and cache files."""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def state_dir() -> Path:
+    """
+    Get the directory for persistent tool state.
+
+    Uses $XDG_STATE_HOME/dock when set, otherwise ~/.local/state/dock.
+
+    Returns:
+        Path to the state directory (not created).
+    """
+    base = os.environ.get("XDG_STATE_HOME")
+    root = Path(base) if base else Path.home() / ".local" / "state"
+    return root / "dock"
+
+
+def cache_dir() -> Path:
+    """
+    Get the directory for disposable cache files.
+
+    Uses $XDG_CACHE_HOME/dock when set, otherwise ~/.cache/dock.
+
+    Returns:
+        Path to the cache directory (not created).
+    """
+    base = os.environ.get("XDG_CACHE_HOME")
+    root = Path(base) if base else Path.home() / ".cache"
+    return root / "dock"
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a file atomically.
+
+    Data is written to a temporary file in the same directory and renamed
+    over the target, so readers never observe a partially written file.
+
+    Args:
+        path: Destination file path. Parent directories are created.
+        data: Bytes to write.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,212 @@
+"""Memory accounting per phase for ``--mem-report``."""
+
+import os
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Allocation sites listed per phase
+TOP_SITES = 5
+
+# Allocations made by the accounting itself and by the import machinery
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """Memory allocated at one source line during a phase and still held at its end."""
+
+    location: str
+    size: int
+    count: int
+
+
+@dataclass(frozen=True)
+class PhaseMemory:
+    """Memory use of one phase, in bytes of traced memory."""
+
+    name: str
+    start: int
+    peak: int
+    net: int
+    sites: tuple[AllocationSite, ...] = ()
+
+
+@dataclass
+class _OpenPhase:
+    """A phase that has started and not ended yet."""
+
+    name: str
+    sites: dict[tracemalloc.Frame, tuple[int, int]]
+    current: int
+    peak: int = 0
+
+
+@dataclass
+class MemoryTracker:
+    """
+    Traces allocations and measures each marked phase.
+
+    For every phase the report has the peak of traced memory while it ran,
+    the change in traced memory from start to end, and the source lines
+    that allocated the most memory still held at its end. Phases may nest;
+    tracemalloc has one peak counter, so it is folded into every open
+    phase before it is reset.
+    """
+
+    top: int = TOP_SITES
+    phases: list[PhaseMemory] = field(default_factory=list)
+    _open: list[_OpenPhase] = field(default_factory=list)
+
+    def start(self) -> None:
+        """Start tracing allocations; the whole run is measured as "total"."""
+        tracemalloc.start()
+        self._begin("total")
+
+    def stop(self) -> list[PhaseMemory]:
+        """
+        Stop tracing.
+
+        Returns:
+            Measured phases in the order they ended, "total" last.
+        """
+        while self._open:
+            self._end()
+        tracemalloc.stop()
+        return self.phases
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure a phase.
+
+        Args:
+            name: Phase name.
+        """
+        self._begin(name)
+        try:
+            yield
+        finally:
+            self._end()
+
+    def _fold_peak(self) -> None:
+        """Record the peak so far in every open phase and restart the counter."""
+        peak = tracemalloc.get_traced_memory()[1]
+        for open_phase in self._open:
+            open_phase.peak = max(open_phase.peak, peak)
+        tracemalloc.reset_peak()
+
+    def _begin(self, name: str) -> None:
+        """Open a phase."""
+        self._fold_peak()
+        sites = _sites()
+        # Don't count the snapshot taken for the sites in any peak
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        self._open.append(_OpenPhase(name, sites, current, current))
+
+    def _end(self) -> None:
+        """Close the innermost phase."""
+        self._fold_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        open_phase = self._open.pop()
+        grown = []
+        for frame, (size, count) in _sites().items():
+            before_size, before_count = open_phase.sites.get(frame, (0, 0))
+            if size > before_size:
+                grown.append(
+                    AllocationSite(_location(frame), size - before_size, count - before_count)
+                )
+        grown.sort(key=lambda site: site.size, reverse=True)
+        tracemalloc.reset_peak()
+        self.phases.append(
+            PhaseMemory(
+                name=open_phase.name,
+                start=open_phase.current,
+                peak=open_phase.peak,
+                net=current - open_phase.current,
+                sites=tuple(grown[: self.top]),
+            )
+        )
+
+
+def _sites() -> dict[tracemalloc.Frame, tuple[int, int]]:
+    """Get the memory held per allocating source line, without keeping the snapshot."""
+    snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    return {
+        stat.traceback[0]: (stat.size, stat.count) for stat in snapshot.statistics("lineno")
+    }
+
+
+def _location(frame: tracemalloc.Frame) -> str:
+    """Format an allocation site relative to the import path it was loaded from."""
+    filename = frame.filename
+    for root in sorted((entry for entry in sys.path if entry), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            filename = filename[len(root) + 1 :]
+            break
+    return f"{filename}:{frame.lineno}"
+
+
+_tracker: MemoryTracker | None = None
+
+
+def start(top: int = TOP_SITES) -> None:
+    """
+    Start memory accounting, unless it is already running.
+
+    Args:
+        top: Allocation sites to list per phase.
+    """
+    global _tracker
+    if _tracker is not None:
+        return
+    _tracker = MemoryTracker(top=top)
+    _tracker.start()
+
+
+def active() -> bool:
+    """
+    Check if memory accounting is running.
+
+    Returns:
+        True if allocations are being traced, False otherwise.
+    """
+    return _tracker is not None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Measure a phase of the run; does nothing when memory accounting is off.
+
+    Args:
+        name: Phase name, e.g. "serialize".
+    """
+    if _tracker is None:
+        yield
+        return
+    with _tracker.phase(name):
+        yield
+
+
+def stop() -> list[PhaseMemory]:
+    """
+    Stop memory accounting.
+
+    Returns:
+        Measured phases, "total" last; empty if accounting wasn't running.
+    """
+    global _tracker
+    if _tracker is None:
+        return []
+    tracker, _tracker = _tracker, None
+    return tracker.stop()
@@ -1,14 +1,24 @@
 """Output formatting utilities."""
 
-from typing import TYPE_CHECKING
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import click
+import yaml
 
 from dock.config.models import DownloadsConfig
 from dock.dock.diff import DockDiff
+from dock.utils import events
 
 if TYPE_CHECKING:
-    from dock.dock.plan import ExecutionStep
+    from dock.adapters import CommandError
+    from dock.dock.backups import BackupEntry
+    from dock.dock.history import RunRecord
+    from dock.dock.plan import ExecutionStep, PlanSummary
+    from dock.dock.report import FleetReport
+    from dock.utils.memory import PhaseMemory
 
 
 def print_success(message: str) -> None:
@@ -18,6 +28,9 @@ def print_success(message: str) -> None:
     Args:
         message: Success message to display.
     """
+    if events.enabled():
+        events.emit("message", level="success", message=message)
+        return
     click.secho(f"✓ {message}", fg="green")
 
 
@@ -28,6 +41,9 @@ def print_error(message: str) -> None:
     Args:
         message: Error message to display.
     """
+    if events.enabled():
+        events.emit("error", message=message)
+        return
     click.secho(f"✗ {message}", fg="red", err=True)
 
 
@@ -38,6 +54,9 @@ def print_warning(message: str) -> None:
     Args:
         message: Warning message to display.
     """
+    if events.enabled():
+        events.emit("warning", message=message)
+        return
     click.secho(f"⚠ {message}", fg="yellow")
 
 
@@ -48,9 +67,92 @@ def print_info(message: str) -> None:
     Args:
         message: Info message to display.
     """
+    if events.enabled():
+        events.emit("message", level="info", message=message.strip())
+        return
     click.echo(f"  {message}")
 
 
+def print_heading(message: str) -> None:
+    """
+    Print an unindented line introducing the output that follows.
+
+    Args:
+        message: Heading to display.
+    """
+    if events.enabled():
+        events.emit("message", level="info", message=message)
+        return
+    click.echo(message)
+
+
+def print_newline() -> None:
+    """Print a blank line separating sections of human-readable output."""
+    if not events.enabled():
+        click.echo()
+
+
+def print_summary(message: str) -> None:
+    """
+    Print the closing message of a command after a blank line.
+
+    Args:
+        message: Message to display.
+    """
+    if events.enabled():
+        events.emit("message", level="summary", message=message)
+        return
+    click.echo()
+    click.echo(message)
+
+
+def print_config_loaded(path: Path) -> None:
+    """
+    Print which configuration file is being applied.
+
+    Args:
+        path: Configuration file path.
+    """
+    if events.enabled():
+        events.emit("config_loaded", path=str(path))
+        return
+    click.echo(f"Loading configuration from: {path}")
+
+
+def print_dock_config(config: dict[str, Any]) -> None:
+    """
+    Print a Dock configuration as YAML.
+
+    Args:
+        config: Unstructured DockConfig.
+    """
+    if events.enabled():
+        events.emit("dock_config", config=config)
+        return
+    print_info("Current dock configuration:")
+    click.echo()
+    click.echo(yaml.dump(config, default_flow_style=False, sort_keys=False))
+
+
+def print_command_error(error: CommandError) -> None:
+    """
+    Print a structured command error with its details.
+
+    Args:
+        error: CommandError raised by a command executor.
+    """
+    if events.enabled():
+        events.emit("error", **error.to_dict())
+        return
+    print_error(f"Error: {error}")
+    for key, value in error.to_dict().items():
+        if key in ("error", "message"):
+            continue
+        if isinstance(value, list):
+            value = " ".join(value)
+        print_info(f"{key}: {value}")
+
+
 def print_diff(diff: DockDiff, dry_run: bool = False) -> None:
     """
     Print formatted diff output.
@@ -91,6 +193,24 @@ def print_diff(diff: DockDiff, dry_run: bool = False) -> None:
             print_info(f"  Path: {diff.downloads_change.path}")
             print_info(f"  Section: {diff.downloads_change.section}")
 
+    # Print stack changes
+    if diff.stack_changes:
+        click.echo(f"\n{prefix}Stack changes:")
+        for stack_change in diff.stack_changes:
+            path = stack_change.stack.path
+            if stack_change.action == "add":
+                print_info(f"+ Add: {path}")
+            elif stack_change.action == "remove":
+                print_info(f"- Remove: {path}")
+            elif stack_change.action == "update":
+                stack = stack_change.stack
+                print_info(
+                    f"~ Update: {path} (view: {stack.view}, display: {stack.display}, "
+                    f"sort: {stack.sort}, section: {stack.section})"
+                )
+            elif stack_change.action == "move":
+                print_info(f"↻ Move: {path} to position {stack_change.position}")
+
 
 def print_execution_plan(steps: list[ExecutionStep], dry_run: bool = False) -> None:
     """
@@ -103,8 +223,222 @@ def print_execution_plan(steps: list[ExecutionStep], dry_run: bool = False) -> N
     if not steps:
         return
 
+    if events.enabled():
+        for index, step in enumerate(steps):
+            events.emit("plan_step", index=index, command=step.command, dry_run=dry_run)
+        return
+
     header = "Execution plan (dry-run):" if dry_run else "Executing commands:"
     click.echo(f"\n{header}")
 
     for step in steps:
         click.secho(f"$ {step.command}", fg="cyan")
+
+
+def print_plan_summaries(summaries: list[PlanSummary]) -> None:
+    """
+    Print a table of per-profile operation counts and estimated cost.
+
+    Args:
+        summaries: PlanSummary per profile, in display order.
+    """
+    if events.enabled():
+        for summary in summaries:
+            events.emit("plan_summary", **asdict(summary))
+        return
+
+    headers = (
+        "PROFILE", "ADD", "REMOVE", "REORDER", "SETTINGS", "STACKS",
+        "DOWNLOADS", "DOCKUTIL", "WRITES", "EST.",
+    )
+    rows: list[tuple[str, ...]] = []
+    for summary in summaries:
+        if summary.error is not None:
+            rows.append((summary.profile, f"error: {summary.error}"))
+            continue
+        rows.append(
+            (
+                summary.profile,
+                str(summary.apps_added),
+                str(summary.apps_removed),
+                "yes" if summary.reorder else "-",
+                str(summary.settings),
+                str(summary.stacks),
+                "yes" if summary.downloads else "-",
+                str(summary.dockutil_calls),
+                str(summary.plist_writes),
+                f"{summary.estimated_seconds:.1f}s",
+            )
+        )
+
+    # Error rows span the remaining columns and don't widen them
+    widths = [len(header) for header in headers]
+    for row in rows:
+        if len(row) == len(headers):
+            widths = [max(width, len(cell)) for width, cell in zip(widths, row, strict=True)]
+    widths[0] = max([widths[0], *(len(row[0]) for row in rows)])
+
+    click.echo("  ".join(h.ljust(w) for h, w in zip(headers, widths, strict=True)).rstrip())
+    for row in rows:
+        line = "  ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=False))
+        click.echo(line.rstrip())
+
+
+def print_fleet_report(report: FleetReport, top: int = 10) -> None:
+    """
+    Print how many machines match the baseline and the most common drifts.
+
+    Args:
+        report: FleetReport to print.
+        top: Number of drifts and drifting groups to list.
+    """
+    if events.enabled():
+        events.emit(
+            "fleet_report",
+            baseline=report.baseline,
+            machines=report.machine_count(),
+            matching=report.matching_count(),
+            drifts=[
+                {"drift": drift.describe(), "machines": machines}
+                for drift, machines in report.drift_counts()[:top]
+            ],
+            groups=[
+                {
+                    "state_hash": group.state_hash,
+                    "machines": group.machines,
+                    "drifts": [drift.describe() for drift in group.drifts],
+                }
+                for group in report.drifting_groups()[:top]
+            ],
+            unreadable=dict(report.unreadable),
+        )
+        return
+
+    total = report.machine_count()
+    matching = report.matching_count()
+    drifting = report.drifting_groups()
+    share = f" ({matching / total:.1%})" if total else ""
+    click.echo(f"Fleet report: {total} machines against {report.baseline}")
+    print_info(f"{matching} match the baseline{share}")
+    print_info(f"{total - matching} drift, in {len(drifting)} distinct states")
+    for name, error in report.unreadable:
+        print_warning(f"Skipped {name}: {error}")
+
+    counts = report.drift_counts()
+    if counts:
+        click.echo()
+        click.echo("Most common drifts:")
+        width = len(str(counts[0][1]))
+        for drift, machines in counts[:top]:
+            print_info(f"{str(machines).rjust(width)}  {drift.describe()}")
+
+    if drifting:
+        click.echo()
+        click.echo("Largest drifting groups:")
+        for group in drifting[:top]:
+            machines = len(group.machines)
+            label = "machine" if machines == 1 else "machines"
+            print_info(f"{group.state_hash}  {machines} {label}")
+            print_info(f"  {'; '.join(drift.describe() for drift in group.drifts)}")
+            examples = ", ".join(group.machines[:3])
+            more = f" and {machines - 3} more" if machines > 3 else ""
+            print_info(f"  e.g. {examples}{more}")
+
+
+def print_backup_entries(entries: list[BackupEntry]) -> None:
+    """
+    Print a table of backups from a backup store index.
+
+    Args:
+        entries: Index entries, oldest first.
+    """
+    if events.enabled():
+        for entry in entries:
+            events.emit("backup", **asdict(entry))
+        return
+
+    rows = [("TIMESTAMP", "HOST", "USER", "KIND", "HASH", "SIZE")] + [
+        (entry.timestamp, entry.host, entry.user, entry.kind, entry.hash[:12], str(entry.size))
+        for entry in entries
+    ]
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        line = "  ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=True))
+        click.echo(line.rstrip())
+
+
+def print_history(records: list[RunRecord]) -> None:
+    """
+    Print a table of reset runs from the run history.
+
+    Args:
+        records: Runs, newest first.
+    """
+    if events.enabled():
+        for record in records:
+            events.emit("run", **asdict(record))
+        return
+
+    rows = [("STARTED", "PROFILE", "OUTCOME", "CHANGES", "STEPS", "STEP AVG", "TOTAL")]
+    for record in records:
+        started = datetime.fromtimestamp(record.started_at).isoformat(sep=" ", timespec="seconds")
+        step_avg = (
+            f"{record.apply_duration() / len(record.steps) * 1000:.0f}ms"
+            if record.steps
+            else "-"
+        )
+        rows.append(
+            (
+                started,
+                record.profile or "-",
+                record.outcome,
+                str(sum(record.changes.values())),
+                str(len(record.steps)),
+                step_avg,
+                f"{record.duration:.2f}s",
+            )
+        )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    for row in rows:
+        line = "  ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=True))
+        click.echo(line.rstrip())
+
+
+def print_memory_report(phases: list[PhaseMemory]) -> None:
+    """
+    Print the traced memory of each phase and its top allocation sites.
+
+    Written to stderr so it doesn't mix with command output such as
+    ``dock show`` YAML.
+
+    Args:
+        phases: Measured phases in the order they ended, "total" last.
+    """
+    if events.enabled():
+        for phase in phases:
+            events.emit("memory_phase", **asdict(phase))
+        return
+
+    click.echo("Memory report (traced allocations):", err=True)
+    for phase in phases:
+        click.echo(
+            f"  {phase.name}: peak {_format_bytes(phase.peak)} "
+            f"(+{_format_bytes(phase.peak - phase.start)} over its start), "
+            f"net {'+' if phase.net >= 0 else '-'}{_format_bytes(abs(phase.net))}",
+            err=True,
+        )
+        for site in phase.sites:
+            click.echo(
+                f"    {_format_bytes(site.size):>10}  {site.count:>7} blocks  {site.location}",
+                err=True,
+            )
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count with a binary unit."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
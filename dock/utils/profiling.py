@@ -0,0 +1,295 @@
+"""Profiling of a whole dock invocation for ``--profile-out``."""
+
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from dock import __version__
+from dock.utils import memory
+
+FORMATS = ("pstats", "speedscope", "chrome-trace")
+
+# pstats has no notion of annotations, so phases are added as pseudo
+# functions of this file, listed with their cumulative time.
+PHASE_FILE = "<phase>"
+
+
+class Profiler:
+    """
+    Profiles the calling thread until stopped and writes one output file.
+
+    "pstats" uses cProfile. "speedscope" and "chrome-trace" record every
+    call and return as a timeline, which costs more but keeps the order of
+    calls. Phases marked with phase() are included in every format.
+    """
+
+    def __init__(self, path: Path, fmt: str):
+        """
+        Initialize Profiler.
+
+        Args:
+            path: Output file.
+            fmt: One of FORMATS.
+
+        Raises:
+            ValueError: If the format is unknown.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown profile format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.phases: list[tuple[str, float, float]] = []
+        self.frames: list[tuple[str, str, int]] = []
+        self.events: list[tuple[bool, int, float]] = []
+        self._frame_index: dict[Any, int] = {}
+        self._stack: list[int] = []
+        self._cprofile: cProfile.Profile | None = None
+        self.started = 0.0
+        self.stopped = 0.0
+
+    def start(self) -> None:
+        """Start profiling the calling thread."""
+        self.started = time.perf_counter()
+        if self.fmt == "pstats":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        else:
+            sys.setprofile(self._trace)
+
+    def stop(self) -> None:
+        """Stop profiling; frames still open are closed at this time."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        else:
+            sys.setprofile(None)
+        self.stopped = time.perf_counter()
+        while self._stack:
+            self.events.append((False, self._stack.pop(), self.stopped))
+
+    def _trace(self, frame: FrameType, event: str, arg: Any) -> None:
+        """Record a call or return from sys.setprofile."""
+        now = time.perf_counter()
+        if event == "call":
+            code = frame.f_code
+            key: Any = code
+            if key not in self._frame_index:
+                self._add_frame(key, code.co_qualname, code.co_filename, code.co_firstlineno)
+        elif event == "c_call":
+            key = ("c", getattr(arg, "__module__", None), getattr(arg, "__qualname__", repr(arg)))
+            if key not in self._frame_index:
+                module = key[1] or "builtins"
+                self._add_frame(key, f"{module}.{key[2]}", "<built-in>", 0)
+        else:
+            # Returns from frames entered before profiling started are skipped
+            if self._stack:
+                self.events.append((False, self._stack.pop(), now))
+            return
+        index = self._frame_index[key]
+        self._stack.append(index)
+        self.events.append((True, index, now))
+
+    def _add_frame(self, key: Any, name: str, file: str, line: int) -> None:
+        """Register a frame seen for the first time."""
+        self._frame_index[key] = len(self.frames)
+        self.frames.append((name, file, line))
+
+    def write(self) -> None:
+        """Write the profile in its format."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == "pstats":
+            self._write_pstats()
+        elif self.fmt == "speedscope":
+            self.path.write_text(json.dumps(self._speedscope(), separators=(",", ":")))
+        else:
+            self.path.write_text(json.dumps(self._chrome_trace(), separators=(",", ":")))
+
+    def _write_pstats(self) -> None:
+        """Write cProfile statistics with a pseudo function per phase."""
+        assert self._cprofile is not None
+        stats = pstats.Stats(self._cprofile)
+        entries: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+        for name, start, end in self.phases:
+            key = (PHASE_FILE, 0, name)
+            calls, _, _, cumulative, callers = entries.get(key, (0, 0, 0.0, 0.0, {}))
+            entries[key] = (calls + 1, calls + 1, 0.0, cumulative + end - start, callers)
+        stats.dump_stats(self.path)
+
+    def _speedscope(self) -> dict[str, Any]:
+        """Build a speedscope file with the call timeline and a phase timeline."""
+        frames = [{"name": name, "file": file, "line": line} for name, file, line in self.frames]
+        phase_frames: dict[str, int] = {}
+        phase_events: list[dict[str, Any]] = []
+        for name, start, end in self.phases:
+            if name not in phase_frames:
+                phase_frames[name] = len(frames)
+                frames.append({"name": f"phase: {name}"})
+            index = phase_frames[name]
+            phase_events.append({"type": "O", "frame": index, "at": start - self.started})
+            phase_events.append({"type": "C", "frame": index, "at": end - self.started})
+        phase_events.sort(key=lambda event: (event["at"], event["type"] == "O"))
+
+        duration = self.stopped - self.started
+        calls = [
+            {"type": "O" if opened else "C", "frame": index, "at": at - self.started}
+            for opened, index, at in self.events
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": " ".join(["dock", *sys.argv[1:]]),
+            "exporter": f"dock {__version__}",
+            "shared": {"frames": frames},
+            "profiles": [
+                _evented_profile("calls", duration, calls),
+                _evented_profile("phases", duration, phase_events),
+            ],
+        }
+
+    def _chrome_trace(self) -> dict[str, Any]:
+        """Build a Chrome trace with calls on one track and phases on another."""
+        pid = os.getpid()
+        trace: list[dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "calls"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "phases"}},
+        ]
+        for opened, index, at in self.events:
+            name, file, line = self.frames[index]
+            event: dict[str, Any] = {
+                "name": name,
+                "cat": "python",
+                "ph": "B" if opened else "E",
+                "ts": _micros(at - self.started),
+                "pid": pid,
+                "tid": 1,
+            }
+            if opened:
+                event["args"] = {"file": file, "line": line}
+            trace.append(event)
+        for name, start, end in self.phases:
+            trace.append(
+                {
+                    "name": name,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": _micros(start - self.started),
+                    "dur": _micros(end - start),
+                    "pid": pid,
+                    "tid": 2,
+                }
+            )
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def _evented_profile(name: str, duration: float, events: list[dict[str, Any]]) -> dict[str, Any]:
+    """Build one evented speedscope profile."""
+    return {
+        "type": "evented",
+        "name": name,
+        "unit": "seconds",
+        "startValue": 0,
+        "endValue": duration,
+        "events": events,
+    }
+
+
+def _micros(seconds: float) -> float:
+    """Convert seconds to the microseconds Chrome traces use."""
+    return round(seconds * 1_000_000, 3)
+
+
+_profiler: Profiler | None = None
+
+
+def start(path: Path, fmt: str = "pstats") -> None:
+    """
+    Start profiling the process, unless it is already being profiled.
+
+    Args:
+        path: Output file.
+        fmt: One of FORMATS.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    global _profiler
+    if _profiler is not None:
+        return
+    _profiler = Profiler(path, fmt)
+    _profiler.start()
+
+
+def start_from_argv(argv: Sequence[str]) -> None:
+    """
+    Start profiling if the group options in argv ask for it.
+
+    Lets the entry point profile from before the CLI modules are imported.
+    Only options before the command name are considered; anything the CLI
+    would reject is left for it to report.
+
+    Args:
+        argv: Command-line arguments without the program name.
+    """
+    values: dict[str, str] = {}
+    index = 0
+    while index < len(argv) and argv[index].startswith("--"):
+        name, sep, value = argv[index].partition("=")
+        if not sep and name in ("--output", "--profile-out", "--profile-format"):
+            index += 1
+            value = argv[index] if index < len(argv) else ""
+        values[name] = value
+        index += 1
+    path = values.get("--profile-out")
+    fmt = values.get("--profile-format", "pstats")
+    if path and fmt in FORMATS:
+        start(Path(path), fmt)
+
+
+def active() -> bool:
+    """
+    Check if the process is being profiled.
+
+    Returns:
+        True if a profile is being recorded, False otherwise.
+    """
+    return _profiler is not None
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Mark a phase of the run in the profile and the memory report, if either is on.
+
+    Args:
+        name: Phase name, e.g. "read_state".
+    """
+    with memory.phase(name):
+        if _profiler is None:
+            yield
+            return
+        profiler = _profiler
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.phases.append((name, started, time.perf_counter()))
+
+
+def stop() -> None:
+    """Stop profiling and write the profile; does nothing when not profiling."""
+    global _profiler
+    if _profiler is None:
+        return
+    profiler, _profiler = _profiler, None
+    profiler.stop()
+    try:
+        profiler.write()
+    except OSError as e:
+        # Not print_error: this module is imported before click so imports are profiled
+        print(f"Could not write profile to {profiler.path}: {e}", file=sys.stderr)
@@ -0,0 +1,166 @@
+"""Tests for the installed application index."""
+
+import os
+import plistlib
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dock.adapters import CommandExecutor
+from dock.adapters.apps import ApplicationIndex, read_app_entry
+from dock.adapters.dockutil import DockutilCommand
+
+
+def make_app(
+    parent: Path, name: str, bundle_id: str | None = None, display_name: str | None = None
+) -> Path:
+    """Create a minimal application bundle."""
+    bundle = parent / f"{name}.app"
+    contents = bundle / "Contents"
+    contents.mkdir(parents=True)
+    info: dict[str, str] = {}
+    if bundle_id:
+        info["CFBundleIdentifier"] = bundle_id
+    if display_name:
+        info["CFBundleDisplayName"] = display_name
+    with open(contents / "Info.plist", "wb") as f:
+        plistlib.dump(info, f)
+    return bundle
+
+
+class TestApplicationIndex:
+    """Tests for ApplicationIndex."""
+
+    @pytest.fixture
+    def roots(self, tmp_path: Path) -> list[Path]:
+        """Create /Applications, /System/Applications and ~/Applications lookalikes."""
+        applications = tmp_path / "Applications"
+        system = tmp_path / "System" / "Applications"
+        user = tmp_path / "home" / "Applications"
+        make_app(applications, "Safari", "com.apple.Safari")
+        make_app(applications / "Utilities", "Terminal", "com.apple.Terminal")
+        make_app(system, "System Settings", "com.apple.systempreferences")
+        make_app(user, "Tool", "com.example.tool", display_name="Handy Tool")
+        make_app(user, "Safari", "com.example.fake-safari")
+        return [applications, system, user]
+
+    @pytest.fixture
+    def index(self, roots: list[Path], tmp_path: Path) -> ApplicationIndex:
+        """Create an index over the test roots."""
+        return ApplicationIndex(roots, cache_path=tmp_path / "cache" / "apps.json")
+
+    def test_resolves_names_across_roots_and_nested_folders(
+        self, index: ApplicationIndex, roots: list[Path]
+    ) -> None:
+        """Test apps are found in every root and in plain subfolders."""
+        terminal = index.resolve("Terminal")
+        settings = index.resolve("system settings")
+
+        assert terminal is not None
+        assert terminal.path == str(roots[0] / "Utilities" / "Terminal.app")
+        assert settings is not None
+        assert settings.bundle_id == "com.apple.systempreferences"
+        assert index.resolve("Missing") is None
+
+    def test_resolves_bundle_ids_and_display_names(self, index: ApplicationIndex) -> None:
+        """Test bundle ids and display names resolve to the bundle."""
+        by_id = index.resolve("com.example.tool")
+        by_display = index.resolve("Handy Tool")
+
+        assert by_id is not None and by_id.name == "Tool"
+        assert by_display == by_id
+        assert index.canonical_name("com.apple.Terminal") == "Terminal"
+        assert index.canonical_name("Unknown") == "Unknown"
+
+    def test_earlier_roots_take_priority(
+        self, index: ApplicationIndex, roots: list[Path]
+    ) -> None:
+        """Test /Applications wins over ~/Applications for duplicate names."""
+        assert index.path_for("Safari") == str(roots[0] / "Safari.app")
+
+    def test_path_for_falls_back_to_applications(self, index: ApplicationIndex) -> None:
+        """Test unresolved apps keep the historic /Applications path."""
+        assert index.path_for("Missing") == "/Applications/Missing.app"
+
+    def test_unchanged_directories_are_served_from_cache(
+        self, roots: list[Path], tmp_path: Path
+    ) -> None:
+        """Test a second index reuses the cache without reading Info.plist."""
+        cache_path = tmp_path / "cache" / "apps.json"
+        ApplicationIndex(roots, cache_path=cache_path).entries()
+        assert cache_path.exists()
+
+        with patch("dock.adapters.apps.read_app_entry") as mock_read:
+            entries = ApplicationIndex(roots, cache_path=cache_path).entries()
+
+        mock_read.assert_not_called()
+        assert {entry.name for entry in entries} >= {"Safari", "Terminal", "Tool"}
+
+    def test_changed_directory_is_rescanned(
+        self, roots: list[Path], tmp_path: Path
+    ) -> None:
+        """Test only the directory whose mtime changed is rescanned."""
+        cache_path = tmp_path / "cache" / "apps.json"
+        first = ApplicationIndex(roots, cache_path=cache_path)
+        old_fingerprint = first.fingerprint()
+
+        make_app(roots[1], "Music", "com.apple.Music")
+        stat = os.stat(roots[1])
+        os.utime(roots[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        with patch("dock.adapters.apps.read_app_entry", wraps=read_app_entry) as mock_read:
+            second = ApplicationIndex(roots, cache_path=cache_path)
+            music = second.resolve("com.apple.Music")
+
+        assert music is not None
+        assert mock_read.call_count == 2  # System Settings and Music
+        assert second.fingerprint() != old_fingerprint
+
+    def test_corrupt_cache_is_ignored(self, roots: list[Path], tmp_path: Path) -> None:
+        """Test an unreadable cache triggers a full scan."""
+        cache_path = tmp_path / "apps.json"
+        cache_path.write_text("{broken")
+
+        index = ApplicationIndex(roots, cache_path=cache_path)
+
+        assert index.resolve("Safari") is not None
+
+    def test_bundle_without_info_plist_is_indexed_by_name(self, tmp_path: Path) -> None:
+        """Test broken bundles are still resolvable by file name."""
+        (tmp_path / "Broken.app").mkdir()
+
+        index = ApplicationIndex([tmp_path], cache_path=tmp_path / "cache.json")
+        entry = index.resolve("Broken")
+
+        assert entry is not None
+        assert entry.bundle_id is None
+
+    @pytest.mark.parametrize(
+        "content", [b"junk", b"bplist00junk", b"<?xml version='1.0'?><plist><dict>"]
+    )
+    def test_malformed_info_plist_is_indexed_by_name(
+        self, tmp_path: Path, content: bytes
+    ) -> None:
+        """Test bundles with a malformed Info.plist are indexed by file name."""
+        contents = tmp_path / "Broken.app" / "Contents"
+        contents.mkdir(parents=True)
+        (contents / "Info.plist").write_bytes(content)
+
+        entry = read_app_entry(tmp_path / "Broken.app")
+
+        assert entry.name == "Broken"
+        assert entry.bundle_id is None
+
+
+def test_dockutil_add_app_uses_index(tmp_path: Path) -> None:
+    """Test add_app passes the resolved bundle path to dockutil."""
+    make_app(tmp_path / "System", "Calculator", "com.apple.calculator")
+    index = ApplicationIndex([tmp_path / "System"], cache_path=tmp_path / "cache.json")
+    mock_executor = Mock(spec=CommandExecutor)
+
+    DockutilCommand(executor=mock_executor, app_index=index).add_app("com.apple.calculator")
+
+    mock_executor.execute.assert_called_once_with(
+        ["dockutil", "--add", str(tmp_path / "System" / "Calculator.app"), "--no-restart"]
+    )
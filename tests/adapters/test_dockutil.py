@@ -3,7 +3,8 @@
 from unittest.mock import Mock
 
 from dock.adapters import CommandExecutor
-from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.dockutil import DockTile, DockutilCommand
+from dock.adapters.toolchain import DockutilToolchain
 
 
 class TestDockutilCommand:
@@ -33,6 +34,33 @@ class TestDockutilCommand:
 
         assert result is False
 
+    def test_check_installed_uses_probed_toolchain(self) -> None:
+        """Test a probed toolchain answers without running which."""
+        mock_executor = Mock(spec=CommandExecutor)
+        toolchain = DockutilToolchain(("/opt/homebrew/bin/dockutil",), "3.1.3", frozenset())
+
+        dockutil = DockutilCommand(executor=mock_executor, toolchain=toolchain)
+
+        assert dockutil.check_installed() is True
+        mock_executor.execute.assert_not_called()
+
+    def test_supports_needs_probed_toolchain(self) -> None:
+        """Test options are only reported for a probed dockutil."""
+        toolchain = DockutilToolchain(("dockutil",), "3.1.3", frozenset({"--move"}))
+
+        assert DockutilCommand(Mock(spec=CommandExecutor), toolchain=toolchain).supports("--move")
+        assert not DockutilCommand(Mock(spec=CommandExecutor)).supports("--move")
+
+    def test_move_app(self) -> None:
+        """Test move_app runs dockutil --move with a position."""
+        mock_executor = Mock(spec=CommandExecutor)
+
+        DockutilCommand(executor=mock_executor).move_app("Safari", 2)
+
+        mock_executor.execute.assert_called_once_with(
+            ["dockutil", "--move", "Safari", "--position", "2", "--no-restart"]
+        )
+
     def test_list_apps_parses_dockutil_output(self) -> None:
         """Test list_apps correctly parses dockutil output."""
         mock_executor = Mock(spec=CommandExecutor)
@@ -50,6 +78,37 @@ class TestDockutilCommand:
             ["dockutil", "--list"]
         )
 
+    def test_list_apps_skips_stacks_in_apps_section(self) -> None:
+        """Test folders and URLs pinned among the apps are not listed as apps."""
+        mock_executor = Mock(spec=CommandExecutor)
+        mock_executor.execute.return_value = (
+            "Safari\tfile:///Applications/Safari.app/\tpersistentApps\t/p.plist\tcom.apple.Safari\n"
+            "Projects\tfile:///Users/test/Projects/\tpersistentApps\t/p.plist\t\n"
+            "Wiki\thttps://example.com/\tpersistentApps\t/p.plist\t\n"
+        )
+
+        dockutil = DockutilCommand(executor=mock_executor)
+
+        assert dockutil.list_apps() == ["Safari"]
+
+    def test_list_tiles_includes_url_and_bundle_id(self) -> None:
+        """Test list_tiles keeps every column that identifies a tile."""
+        mock_executor = Mock(spec=CommandExecutor)
+        mock_executor.execute.return_value = (
+            "Safari\tfile:///Applications/Safari.app/\tpersistentApps\t/p.plist\tcom.apple.Safari\n"
+            "Downloads\tfile:///Users/test/Downloads/\tpersistentOthers\t/p.plist\n"
+        )
+
+        tiles = DockutilCommand(executor=mock_executor).list_tiles()
+
+        assert tiles == [
+            DockTile(
+                "Safari", "file:///Applications/Safari.app/", "persistentApps", "com.apple.Safari"
+            ),
+            DockTile("Downloads", "file:///Users/test/Downloads/", "persistentOthers", None),
+        ]
+        assert [tile.is_app() for tile in tiles] == [True, False]
+
     def test_list_apps_handles_empty_dock(self) -> None:
         """Test list_apps returns empty list for empty dock."""
         mock_executor = Mock(spec=CommandExecutor)
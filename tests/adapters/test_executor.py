@@ -1,11 +1,20 @@
 """Tests for command executor interface."""
 
 import subprocess
-from unittest.mock import Mock, patch
+import time
+from unittest.mock import patch
 
 import pytest
 
-from dock.adapters import CommandExecutor, SubprocessExecutor
+from dock.adapters import (
+    CommandExecutor,
+    CommandFailedError,
+    CommandTimeoutError,
+    DeadlineExceededError,
+    SubprocessExecutor,
+    command_kind,
+    resolve_command,
+)
 
 
 class TestSubprocessExecutor:
@@ -15,93 +24,196 @@ class TestSubprocessExecutor:
         """Test executing a successful command returns stdout."""
         executor = SubprocessExecutor()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout="command output\n",
-                stderr="",
-                returncode=0
-            )
+        result = executor.execute(["echo", "command output"])
 
-            result = executor.execute(["echo", "test"])
-
-            assert result == "command output\n"
-            mock_run.assert_called_once_with(
-                ["echo", "test"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+        assert result == "command output\n"
 
     def test_execute_command_with_output_capture(self) -> None:
         """Test that command output is properly captured."""
         executor = SubprocessExecutor()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout="line1\nline2\nline3\n",
-                stderr="",
-                returncode=0
-            )
-
-            result = executor.execute(["ls", "-la"])
+        result = executor.execute(["printf", "line1\\nline2\\nline3\\n"])
 
-            assert result == "line1\nline2\nline3\n"
-            assert mock_run.call_count == 1
+        assert result == "line1\nline2\nline3\n"
 
     def test_execute_command_with_error_raises_exception(self) -> None:
         """Test that command errors raise CalledProcessError."""
         executor = SubprocessExecutor()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.side_effect = subprocess.CalledProcessError(
-                returncode=1,
-                cmd=["false"],
-                output="",
-                stderr="command failed"
-            )
-
-            with pytest.raises(subprocess.CalledProcessError) as exc_info:
-                executor.execute(["false"])
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            executor.execute(["false"])
 
-            assert exc_info.value.returncode == 1
+        assert exc_info.value.returncode == 1
 
     def test_execute_command_without_check(self) -> None:
         """Test executing command without check flag doesn't raise on error."""
         executor = SubprocessExecutor()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout="",
-                stderr="error message",
-                returncode=1
-            )
+        result = executor.execute(["false"], check=False)
 
-            result = executor.execute(["false"], check=False)
-
-            assert result == ""
-            mock_run.assert_called_once_with(
-                ["false"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+        assert result == ""
 
     def test_execute_handles_empty_output(self) -> None:
         """Test executing command with no output."""
         executor = SubprocessExecutor()
 
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value = Mock(
-                stdout="",
-                stderr="",
-                returncode=0
-            )
+        result = executor.execute(["true"])
+
+        assert result == ""
+
+    def test_execute_starts_command_in_new_session(self) -> None:
+        """Test commands run in their own process group so they can be killed."""
+        executor = SubprocessExecutor()
+
+        with patch("subprocess.Popen") as mock_popen:
+            mock_popen.return_value.communicate.return_value = ("out", "")
+            mock_popen.return_value.returncode = 0
+
+            executor.execute(["dockutil", "--list"])
+
+            assert mock_popen.call_args.kwargs["start_new_session"] is True
+            mock_popen.return_value.communicate.assert_called_once_with(timeout=10.0)
+
+    def test_execute_timeout_kills_process_group(self) -> None:
+        """Test a timed out command and its children are killed."""
+        executor = SubprocessExecutor(timeouts={"default": 0.2})
+
+        started = time.monotonic()
+        with pytest.raises(CommandTimeoutError) as exc_info:
+            executor.execute(["sh", "-c", "sleep 5 & sleep 5"])
+
+        assert time.monotonic() - started < 3
+        assert exc_info.value.attempts == 1
+        assert exc_info.value.timeout == 0.2
+        assert exc_info.value.to_dict()["error"] == "CommandTimeoutError"
+
+    def test_execute_retries_idempotent_command(self) -> None:
+        """Test idempotent reads are retried after a failure."""
+        executor = SubprocessExecutor(backoff=0)
+        calls = [
+            subprocess.CalledProcessError(1, ["dockutil", "--list"], stderr="busy"),
+            "Safari\n",
+        ]
+
+        with patch.object(executor, "_run", side_effect=calls) as mock_run:
+            result = executor.execute(["dockutil", "--list"])
+
+        assert result == "Safari\n"
+        assert mock_run.call_count == 2
+
+    def test_execute_reports_exhausted_retries(self) -> None:
+        """Test a retried command that keeps failing raises CommandFailedError."""
+        executor = SubprocessExecutor(retries=2, backoff=0)
+        error = subprocess.CalledProcessError(1, ["dockutil", "--list"], stderr="busy")
+
+        with patch.object(executor, "_run", side_effect=error) as mock_run:
+            with pytest.raises(CommandFailedError) as exc_info:
+                executor.execute(["dockutil", "--list"])
+
+        assert mock_run.call_count == 3
+        assert exc_info.value.attempts == 3
+        assert exc_info.value.to_dict()["stderr"] == "busy"
+
+    def test_execute_does_not_retry_mutating_command(self) -> None:
+        """Test structural dockutil commands are never retried."""
+        executor = SubprocessExecutor(backoff=0)
+        timeout = subprocess.TimeoutExpired(["dockutil", "--add"], 20.0)
+
+        with patch.object(executor, "_run", side_effect=timeout) as mock_run:
+            with pytest.raises(CommandTimeoutError):
+                executor.execute(["dockutil", "--add", "/Applications/Safari.app"])
 
-            result = executor.execute(["true"])
+        assert mock_run.call_count == 1
 
-            assert result == ""
+    def test_execute_reports_each_attempt(self) -> None:
+        """Test on_command sees every attempt with its kind and outcome."""
+        attempts: list[tuple[str, float, bool]] = []
+        executor = SubprocessExecutor(
+            backoff=0, on_command=lambda *attempt: attempts.append(attempt)
+        )
+        calls = [
+            subprocess.CalledProcessError(1, ["dockutil", "--list"], stderr="busy"),
+            "Safari\n",
+        ]
+
+        with patch.object(executor, "_run", side_effect=calls):
+            executor.execute(["dockutil", "--list"])
+
+        assert [(kind, ok) for kind, _, ok in attempts] == [("list", False), ("list", True)]
+        assert all(seconds >= 0 for _, seconds, _ in attempts)
+
+    def test_execute_raises_when_deadline_passed(self) -> None:
+        """Test no command runs once the deadline has expired."""
+        executor = SubprocessExecutor(deadline=time.monotonic() - 1)
+
+        with patch.object(executor, "_run") as mock_run:
+            with pytest.raises(DeadlineExceededError):
+                executor.execute(["dockutil", "--list"])
+
+        mock_run.assert_not_called()
+
+    def test_execute_clips_timeout_to_deadline(self) -> None:
+        """Test a command is cut short by the overall deadline."""
+        executor = SubprocessExecutor(deadline=time.monotonic() + 0.2)
+
+        with pytest.raises(DeadlineExceededError):
+            executor.execute(["sleep", "5"])
 
     def test_command_executor_is_abstract(self) -> None:
         """Test that CommandExecutor cannot be instantiated directly."""
         with pytest.raises(TypeError):
             CommandExecutor()  # type: ignore
+
+
+class TestResolveCommand:
+    """Tests for program overrides."""
+
+    def test_no_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test commands run as given without an override."""
+        monkeypatch.delenv("DOCK_DOCKUTIL", raising=False)
+
+        assert resolve_command(["dockutil", "--list"]) == ["dockutil", "--list"]
+
+    def test_override_replaces_program(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test DOCK_DOCKUTIL replaces dockutil with a command line."""
+        monkeypatch.setenv("DOCK_DOCKUTIL", "python3 -m dock.testing.fake_dockutil")
+
+        assert resolve_command(["dockutil", "--list"]) == [
+            "python3",
+            "-m",
+            "dock.testing.fake_dockutil",
+            "--list",
+        ]
+        assert resolve_command(["which", "dockutil"]) == ["which", "python3"]
+        assert resolve_command(["killall", "Dock"]) == ["killall", "Dock"]
+
+    def test_executor_runs_override(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test SubprocessExecutor runs the replacement program."""
+        monkeypatch.setenv("DOCK_DOCKUTIL", "echo fake")
+
+        assert SubprocessExecutor().execute(["dockutil", "--list"]) == "fake --list\n"
+
+
+class TestCommandKind:
+    """Tests for command classification."""
+
+    @pytest.mark.parametrize(
+        ("command", "kind"),
+        [
+            (["dockutil", "--list"], "list"),
+            (["/opt/homebrew/bin/dockutil", "--add", "/Applications/Mail.app"], "add"),
+            (["dockutil", "--remove", "all", "--no-restart"], "remove"),
+            (["which", "dockutil"], "lookup"),
+            (["killall", "Dock"], "default"),
+            ([], "default"),
+        ],
+    )
+    def test_command_kind(self, command: list[str], kind: str) -> None:
+        """Test commands are classified by program and flag."""
+        assert command_kind(command) == kind
+
+    def test_unknown_kind_uses_default_timeout(self) -> None:
+        """Test commands without a specific kind use the default timeout."""
+        executor = SubprocessExecutor(timeouts={"default": 3.0})
+
+        assert executor._attempt_timeout("default") == (3.0, False)
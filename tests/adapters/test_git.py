@@ -0,0 +1,32 @@
+"""Tests for git command wrapper."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+from dock.adapters import CommandExecutor
+from dock.adapters.git import GitCommand
+
+
+class TestGitCommand:
+    """Tests for GitCommand wrapper."""
+
+    def test_changed_files_combines_diff_and_untracked(self, tmp_path: Path) -> None:
+        """Test changed and untracked files are listed once, if they exist."""
+        (tmp_path / "team").mkdir()
+        (tmp_path / "home.yml").write_text("")
+        (tmp_path / "team" / "dev.yaml").write_text("")
+        mock_executor = Mock(spec=CommandExecutor)
+        mock_executor.execute.side_effect = [
+            "team/dev.yaml\nhome.yml\ndeleted.yml\n",
+            "home.yml\n",
+        ]
+
+        files = GitCommand(executor=mock_executor).changed_files(
+            tmp_path, "main", ["*.yml", "*.yaml"]
+        )
+
+        assert files == [tmp_path / "home.yml", tmp_path / "team" / "dev.yaml"]
+        diff_args = mock_executor.execute.call_args_list[0].args[0]
+        assert diff_args[:3] == ["git", "-C", str(tmp_path)]
+        assert "main" in diff_args
+        assert diff_args[-2:] == ["*.yml", "*.yaml"]
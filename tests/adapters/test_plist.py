@@ -171,6 +171,18 @@ class TestPlistManager:
         result = manager.read_autohide_delay()
         assert result == 1.5
 
+    def test_write_values_updates_several_keys(self, temp_plist: Path) -> None:
+        """Test write_values writes every key and keeps the rest of the plist."""
+        manager = PlistManager()
+        manager.DOCK_PLIST = temp_plist
+
+        manager.write_values({"tilesize": 36, "show-recents": False})
+
+        data = manager.read_plist()
+        assert data["tilesize"] == 36
+        assert data["show-recents"] is False
+        assert data["autohide"] is True
+
     def test_read_plist_raises_error_for_nonexistent_file(self, tmp_path: Path) -> None:
         """Test read_plist raises FileNotFoundError for missing file."""
         manager = PlistManager()
@@ -198,3 +210,25 @@ class TestPlistManager:
         # Read back and verify
         result = manager.read_plist()
         assert result == test_data
+
+    def test_write_bytes_round_trips_raw_data(self, temp_plist: Path, tmp_path: Path) -> None:
+        """Test raw bytes are restored exactly."""
+        manager = PlistManager()
+        manager.DOCK_PLIST = temp_plist
+        original = manager.read_bytes()
+
+        manager.write_plist({"autohide": False})
+        manager.write_bytes(original)
+
+        assert temp_plist.read_bytes() == original
+
+    def test_write_bytes_rejects_invalid_data(self, temp_plist: Path) -> None:
+        """Test write_bytes refuses data that is not a plist dictionary."""
+        manager = PlistManager()
+        manager.DOCK_PLIST = temp_plist
+        original = temp_plist.read_bytes()
+
+        with pytest.raises(ValueError):
+            manager.write_bytes(b"not a plist")
+
+        assert temp_plist.read_bytes() == original
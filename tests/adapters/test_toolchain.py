@@ -0,0 +1,122 @@
+"""Tests for the dockutil toolchain probe."""
+
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from dock.adapters import CommandExecutor, SubprocessExecutor
+from dock.adapters.toolchain import DockutilToolchain, ToolchainProbe
+from dock.testing.fake_dockutil import write_shim
+
+HELP = """USAGE: dockutil <options>
+  --add <path|url>   Add an item
+  --remove <label>   Remove an item
+  --move <label>     Move an item
+  --position <n>     Position for --add or --move
+  --no-restart       Don't restart the Dock
+"""
+
+
+@pytest.fixture
+def binary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Put an executable dockutil first on PATH."""
+    path = tmp_path / "bin" / "dockutil"
+    path.parent.mkdir()
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755)
+    monkeypatch.delenv("DOCK_DOCKUTIL", raising=False)
+    monkeypatch.setenv("PATH", str(path.parent))
+    return path
+
+
+def _executor() -> Mock:
+    """Create an executor answering --version and --help like dockutil 3."""
+    executor = Mock(spec=CommandExecutor)
+    executor.execute.side_effect = lambda command, check=True: (
+        "3.1.3\n" if command[-1] == "--version" else HELP
+    )
+    return executor
+
+
+class TestDockutilToolchain:
+    """Tests for DockutilToolchain."""
+
+    def test_programs(self) -> None:
+        """Test the toolchain replaces dockutil with its absolute command."""
+        toolchain = DockutilToolchain(("/opt/homebrew/bin/dockutil",), "3.1.3")
+
+        assert toolchain.programs() == {"dockutil": ("/opt/homebrew/bin/dockutil",)}
+
+
+class TestToolchainProbe:
+    """Tests for ToolchainProbe."""
+
+    def test_probe_reads_version_and_flags(self, binary: Path, tmp_path: Path) -> None:
+        """Test the probe resolves the absolute path and parses --version and --help."""
+        executor = _executor()
+
+        toolchain = ToolchainProbe(executor, tmp_path / "toolchain.json").probe()
+
+        assert toolchain is not None
+        assert toolchain.command == (str(binary),)
+        assert toolchain.version == "3.1.3"
+        assert toolchain.supports("--move")
+        assert not toolchain.supports("--allhomes")
+        executor.execute.assert_any_call([str(binary), "--version"], check=False)
+
+    def test_cached_until_binary_changes(self, binary: Path, tmp_path: Path) -> None:
+        """Test a second probe runs nothing until the binary is replaced."""
+        cache = tmp_path / "toolchain.json"
+        ToolchainProbe(_executor(), cache).probe()
+
+        executor = _executor()
+        cached = ToolchainProbe(executor, cache).probe()
+
+        assert cached is not None
+        assert cached.supports("--move")
+        executor.execute.assert_not_called()
+
+        stat = binary.stat()
+        os.utime(binary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        ToolchainProbe(executor, cache).probe()
+
+        assert executor.execute.call_count == 2
+
+    def test_not_found(self, binary: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test a missing dockutil probes as None without running anything."""
+        monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+        executor = _executor()
+
+        assert ToolchainProbe(executor, tmp_path / "toolchain.json").probe() is None
+        executor.execute.assert_not_called()
+
+    def test_corrupt_cache_is_ignored(self, binary: Path, tmp_path: Path) -> None:
+        """Test an unreadable cache file is probed over."""
+        cache = tmp_path / "toolchain.json"
+        cache.write_text("{not json")
+
+        toolchain = ToolchainProbe(_executor(), cache).probe()
+
+        assert toolchain is not None
+        assert toolchain.version == "3.1.3"
+
+    def test_probes_dockutil_override(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test DOCK_DOCKUTIL is probed and run directly by SubprocessExecutor."""
+        shim = write_shim(tmp_path / "bin")
+        plist = tmp_path / "com.apple.dock.plist"
+        monkeypatch.setenv("DOCK_DOCKUTIL", str(shim))
+        monkeypatch.setenv("FAKE_DOCKUTIL_PLIST", str(plist))
+
+        toolchain = ToolchainProbe(cache_path=tmp_path / "toolchain.json").probe()
+
+        assert toolchain is not None
+        assert toolchain.command == (str(shim),)
+        assert toolchain.supports("--move")
+        monkeypatch.delenv("DOCK_DOCKUTIL")
+        executor = SubprocessExecutor(programs=toolchain.programs())
+        executor.execute(["dockutil", "--add", "/Applications/Zed.app", "--no-restart"])
+        assert "Zed" in executor.execute(["dockutil", "--list"])
@@ -46,6 +46,62 @@ class TestSettingsConfig:
         with pytest.raises(TypeError):
             SettingsConfig(autohide="not a boolean")
 
+    def test_fields_match_registry(self):
+        """Test SettingsConfig declares one field per registered setting."""
+        import attrs
+
+        from dock.config.models import SettingsConfig
+        from dock.config.settings import SETTINGS
+
+        assert [a.name for a in attrs.fields(SettingsConfig)] == [s.name for s in SETTINGS]
+
+    def test_fields_agree_with_registry_specs(self):
+        """Test each field is validated by, and typed like, its registry entry."""
+        import typing
+
+        import attrs
+
+        from dock.config.models import SettingsConfig, _validate_setting
+        from dock.config.settings import SETTINGS_BY_NAME
+
+        hints = typing.get_type_hints(SettingsConfig)
+        for field in attrs.fields(SettingsConfig):
+            spec = SETTINGS_BY_NAME[field.name]
+            assert field.validator is _validate_setting, field.name
+            args = {arg for arg in typing.get_args(hints[field.name]) if arg is not type(None)}
+            if spec.choices is not None:
+                assert args == {typing.Literal[spec.choices]}, field.name
+            else:
+                assert spec.type in args or hints[field.name] is spec.type, field.name
+
+    def test_extended_settings_bounds_and_choices(self):
+        """Test registry bounds and choices are enforced."""
+        from dock.config.models import SettingsConfig
+
+        config = SettingsConfig(tilesize=36, orientation="left", show_recents=False)
+        assert config.tilesize == 36
+        assert config.managed_values()["orientation"] == "left"
+        assert "magnification" not in config.managed_values()
+
+        with pytest.raises(ValueError):
+            SettingsConfig(tilesize=512)
+        with pytest.raises(ValueError):
+            SettingsConfig(orientation="top")
+        with pytest.raises(TypeError):
+            SettingsConfig(tilesize=36.5)
+
+    def test_converter_accepts_plist_key_spelling(self):
+        """Test settings can be written with their com.apple.dock key names."""
+        from dock.config.converter import converter
+        from dock.config.models import SettingsConfig
+
+        config = converter.structure(
+            {"show-recents": False, "autohide-time-modifier": 0.25}, SettingsConfig
+        )
+
+        assert config.show_recents is False
+        assert config.autohide_time_modifier == 0.25
+
 
 class TestDownloadsConfig:
     """Tests for DownloadsConfig model."""
@@ -200,3 +256,33 @@ class TestDockConfig:
 
         with pytest.raises(Exception):
             converter.structure({"downloads": 123}, DockConfig)
+
+    def test_dock_config_with_stacks(self):
+        """Test stacks accept paths and mappings, and default to unmanaged."""
+        from dock.config.converter import converter
+        from dock.config.models import DockConfig, StackConfig
+
+        assert converter.structure({}, DockConfig).stacks is None
+
+        config = converter.structure(
+            {"stacks": ["~/Documents", {"path": "~/Projects", "view": "grid", "sort": "kind"}]},
+            DockConfig,
+        )
+        assert config.stacks == [
+            StackConfig(path="~/Documents"),
+            StackConfig(path="~/Projects", view="grid", sort="kind"),
+        ]
+
+        with pytest.raises(Exception):
+            converter.structure({"stacks": [{"path": "~/x", "view": "tiles"}]}, DockConfig)
+
+    def test_dock_config_managed_mode(self):
+        """Test managed defaults to owned and accepts strict."""
+        from dock.config.converter import converter
+        from dock.config.models import DockConfig
+
+        assert DockConfig().managed == "owned"
+        assert converter.structure({"managed": "strict"}, DockConfig).managed == "strict"
+
+        with pytest.raises(ValueError):
+            converter.structure({"managed": "everything"}, DockConfig)
@@ -0,0 +1,68 @@
+"""Tests for the validation result cache."""
+
+from pathlib import Path
+
+from dock.config.validation_cache import ValidationCache, file_digest
+
+
+class TestValidationCache:
+    """Tests for ValidationCache."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test saved results are returned by a new cache instance."""
+        path = tmp_path / "validate.json"
+        cache = ValidationCache(path=path)
+        cache.put("abc", ["bad"], ["careful"])
+        cache.save()
+
+        assert ValidationCache(path=path).get("abc") == (["bad"], ["careful"])
+        assert ValidationCache(path=path).get("def") is None
+
+    def test_environment_change_discards_entries(self, tmp_path: Path) -> None:
+        """Test entries recorded in another environment are not reused."""
+        path = tmp_path / "validate.json"
+        cache = ValidationCache(environment="apps-1", path=path)
+        cache.put("abc", [], [])
+        cache.save()
+
+        assert ValidationCache(environment="apps-2", path=path).get("abc") is None
+
+    def test_dock_version_change_discards_entries(self, tmp_path: Path) -> None:
+        """Test entries recorded by another dock version are not reused."""
+        path = tmp_path / "validate.json"
+        cache = ValidationCache(path=path)
+        cache.put("abc", [], [])
+        cache.save()
+
+        with_other_version = path.read_text().replace('"dock_version": "', '"dock_version": "0.')
+        path.write_text(with_other_version)
+
+        assert ValidationCache(path=path).get("abc") is None
+
+    def test_corrupt_file_is_ignored(self, tmp_path: Path) -> None:
+        """Test an unreadable cache file behaves like an empty cache."""
+        path = tmp_path / "validate.json"
+        path.write_text("{not json")
+
+        assert ValidationCache(path=path).get("abc") is None
+
+    def test_oldest_entries_are_evicted(self, tmp_path: Path) -> None:
+        """Test the cache keeps at most MAX_ENTRIES results."""
+        cache = ValidationCache(path=tmp_path / "validate.json")
+        cache.MAX_ENTRIES = 2
+        for digest in ("a", "b", "c"):
+            cache.put(digest, [], [])
+
+        assert cache.get("a") is None
+        assert cache.get("c") == ([], [])
+
+    def test_file_digest_tracks_content(self, tmp_path: Path) -> None:
+        """Test the digest changes with file content only."""
+        first = tmp_path / "a.yml"
+        second = tmp_path / "b.yml"
+        first.write_text("apps: [Safari]\n")
+        second.write_text("apps: [Safari]\n")
+
+        assert file_digest(first) == file_digest(second)
+        second.write_text("apps: [Mail]\n")
+        assert file_digest(first) != file_digest(second)
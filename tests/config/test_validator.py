@@ -167,3 +167,21 @@ class TestConfigValidator:
 
         # Check for path warning
         assert any("path" in w.lower() or "exist" in w.lower() for w in warnings)
+
+    def test_validate_config_missing_apps_with_index(self):
+        """Test apps the application index can't resolve generate warnings."""
+        from unittest.mock import Mock
+
+        from dock.adapters.apps import AppEntry, ApplicationIndex
+        from dock.config.models import DockConfig
+        from dock.config.validator import ConfigValidator
+
+        index = Mock(spec=ApplicationIndex)
+        index.resolve.side_effect = lambda app: (
+            AppEntry(name=app, path=f"/Applications/{app}.app") if app == "Safari" else None
+        )
+
+        config = DockConfig(apps=["Safari", "Nonexistent"], downloads=None)
+
+        warnings = ConfigValidator.validate_config(config, app_index=index)
+        assert warnings == ["Application not found: Nonexistent"]
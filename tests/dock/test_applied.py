@@ -0,0 +1,31 @@
+"""Tests for the last applied configuration store."""
+
+from pathlib import Path
+
+from dock.config.models import DockConfig, SettingsConfig
+from dock.dock.applied import LastAppliedStore
+
+
+class TestLastAppliedStore:
+    """Tests for LastAppliedStore."""
+
+    def test_save_and_load_round_trip(self, tmp_path: Path) -> None:
+        """Test a saved config loads back unchanged."""
+        store = LastAppliedStore(tmp_path)
+        config = DockConfig(
+            apps=["Safari", "Mail"],
+            downloads="off",
+            settings=SettingsConfig(autohide=True, autohide_delay=0.25),
+        )
+
+        store.save(config)
+
+        assert store.load() == config
+
+    def test_load_returns_none_when_missing_or_corrupt(self, tmp_path: Path) -> None:
+        """Test unreadable state falls back to None."""
+        store = LastAppliedStore(tmp_path)
+        assert store.load() is None
+
+        store.path.write_text("not json")
+        assert store.load() is None
@@ -0,0 +1,129 @@
+"""Tests for the backup store."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from dock.dock.backups import BackupEntry, BackupStore, RetentionPolicy
+
+START = datetime(2026, 3, 2, 3, 0, tzinfo=UTC)  # a Monday
+
+
+def _entry(when: datetime, digest: str = "a" * 64) -> BackupEntry:
+    return BackupEntry(
+        timestamp=when.isoformat(timespec="seconds"), host="mac", user="me", hash=digest, size=1
+    )
+
+
+class TestBackupStore:
+    """Tests for BackupStore."""
+
+    def test_identical_content_is_stored_once(self, tmp_path: Path) -> None:
+        """Test blobs are shared and unchanged backups aren't re-recorded."""
+        store = BackupStore(tmp_path)
+
+        first, created = store.add(b"apps: [Safari]\n", START, "mac", "me")
+        again, created_again = store.add(b"apps: [Safari]\n", START, "mac", "me")
+        other, _ = store.add(b"apps: [Safari]\n", START, "mac-2", "you")
+
+        assert created is True
+        assert created_again is False
+        assert again == first
+        assert other.hash == first.hash
+        assert len(store.entries()) == 2
+        assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+
+    def test_kinds_are_deduplicated_separately(self, tmp_path: Path) -> None:
+        """Test a raw backup between YAML backups doesn't defeat deduplication."""
+        store = BackupStore(tmp_path)
+        store.add(b"apps: []\n", START, "mac", "me")
+        store.add(b"bplist00", START, "mac", "me", kind="raw")
+        _, created = store.add(b"apps: []\n", START, "mac", "me")
+
+        assert created is False
+        assert [e.kind for e in store.entries(kind="raw")] == ["raw"]
+
+    def test_read_round_trips_and_resolves_prefix(self, tmp_path: Path) -> None:
+        """Test a backup can be read back by a hash prefix."""
+        store = BackupStore(tmp_path)
+        entry, _ = store.add(b"apps: [Mail]\n", START, "mac", "me")
+
+        resolved = store.resolve(entry.hash[:8])
+
+        assert resolved == entry
+        assert store.read(resolved.hash) == b"apps: [Mail]\n"
+        with pytest.raises(ValueError, match="No backup matches"):
+            store.resolve("zzz")
+
+    def test_corrupt_blob_is_detected(self, tmp_path: Path) -> None:
+        """Test a blob whose content doesn't match its hash is rejected."""
+        import gzip
+
+        store = BackupStore(tmp_path)
+        entry, _ = store.add(b"apps: [Mail]\n", START, "mac", "me")
+        store.blob_path(entry.hash).write_bytes(gzip.compress(b"tampered"))
+
+        with pytest.raises(ValueError, match="corrupt"):
+            store.read(entry.hash)
+
+    def test_entries_filter_by_host_and_user(self, tmp_path: Path) -> None:
+        """Test listing can be limited to one host or user."""
+        store = BackupStore(tmp_path)
+        store.add(b"a", START, "mac", "me")
+        store.add(b"b", START, "mac-2", "me")
+
+        assert [e.host for e in store.entries(host="mac-2")] == ["mac-2"]
+        assert len(store.entries(user="me")) == 2
+
+    def test_prune_keeps_last_and_deletes_unreferenced_blobs(self, tmp_path: Path) -> None:
+        """Test pruning rewrites the index and removes orphaned blobs."""
+        store = BackupStore(tmp_path)
+        for day in range(4):
+            store.add(f"state {day}".encode(), START + timedelta(days=day), "mac", "me")
+
+        removed = store.prune(RetentionPolicy(keep_last=2))
+
+        assert len(removed) == 2
+        assert len(store.entries()) == 2
+        for entry in removed:
+            assert not store.blob_path(entry.hash).exists()
+        for entry in store.entries():
+            assert store.blob_path(entry.hash).exists()
+
+    def test_prune_without_policy_keeps_everything(self, tmp_path: Path) -> None:
+        """Test an empty policy never deletes backups."""
+        store = BackupStore(tmp_path)
+        store.add(b"a", START, "mac", "me")
+
+        assert store.prune(RetentionPolicy()) == []
+        assert len(store.entries()) == 1
+
+
+class TestRetentionPolicy:
+    """Tests for RetentionPolicy.select."""
+
+    def test_keep_daily_keeps_newest_per_day(self) -> None:
+        """Test one backup per day is kept for the most recent days."""
+        entries = [
+            _entry(START + timedelta(days=day, hours=hour))
+            for day in range(5)
+            for hour in (0, 6)
+        ]
+
+        kept = RetentionPolicy(keep_daily=3).select(entries)
+
+        assert kept == [
+            _entry(START + timedelta(days=2, hours=6)),
+            _entry(START + timedelta(days=3, hours=6)),
+            _entry(START + timedelta(days=4, hours=6)),
+        ]
+
+    def test_keep_weekly_and_last_combine(self) -> None:
+        """Test weekly and keep-last rules are unioned."""
+        entries = [_entry(START + timedelta(days=day)) for day in range(21)]
+
+        kept = RetentionPolicy(keep_last=1, keep_weekly=2).select(entries)
+
+        # Newest of week 2 (Sunday, day 13) and of week 3 (day 20, also the newest)
+        assert kept == [_entry(START + timedelta(days=13)), _entry(START + timedelta(days=20))]
@@ -0,0 +1,231 @@
+"""Tests for precompiled profile values."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from dock.adapters.apps import AppEntry, ApplicationIndex
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
+from dock.dock.compiled import (
+    CompiledProfile,
+    CompiledProfileStore,
+    build_app_tile,
+    owned_app_keys,
+    render_profile,
+    swap_values,
+    validate_values,
+)
+
+SAFARI = AppEntry(
+    name="Safari", path="/Applications/Safari.app", bundle_id="com.apple.Safari"
+)
+NOTES = AppEntry(name="Notes", path="/System/Applications/Notes.app")
+XCODE = AppEntry(name="Xcode", path="/Applications/Xcode.app", bundle_id="com.apple.dt.Xcode")
+
+
+@pytest.fixture
+def app_index() -> Mock:
+    """Create an ApplicationIndex that only knows Safari."""
+    index = Mock(spec=ApplicationIndex)
+    index.resolve.side_effect = lambda ref: SAFARI if ref == "Safari" else None
+    return index
+
+
+def _labels(tiles: list[dict]) -> list[str]:
+    return [tile["tile-data"].get("file-label") for tile in tiles]
+
+
+class TestRenderProfile:
+    """Tests for render_profile."""
+
+    def test_renders_apps_stacks_downloads_and_settings(self, app_index: Mock) -> None:
+        """Test every managed part of the profile becomes plist values."""
+        config = DockConfig(
+            apps=["Safari", "Missing"],
+            downloads=DownloadsConfig(preset="list"),
+            settings=SettingsConfig(autohide=True, tilesize=40),
+            stacks=[StackConfig(path="/Applications", label="Apps")],
+        )
+
+        values, missing = render_profile(config, app_index)
+
+        assert missing == ["Missing"]
+        assert _labels(values["persistent-apps"]) == ["Safari"]
+        assert values["persistent-apps"][0]["tile-data"]["bundle-identifier"] == (
+            "com.apple.Safari"
+        )
+        assert _labels(values["persistent-others"]) == ["Downloads", "Apps"]
+        assert values["persistent-others"][0]["tile-data"]["displayas"] == 1
+        assert values["autohide"] is True
+        assert values["autohide-delay"] == 0.0
+        assert values["tilesize"] == 40
+        assert "magnification" not in values
+        validate_values(values)
+
+    def test_downloads_in_apps_section(self, app_index: Mock) -> None:
+        """Test apps-left puts Downloads before the apps."""
+        config = DockConfig(apps=["Safari"], downloads=DownloadsConfig(section="apps-left"))
+
+        values, _ = render_profile(config, app_index)
+
+        assert _labels(values["persistent-apps"]) == ["Downloads", "Safari"]
+        assert values["persistent-others"] == []
+
+    def test_build_app_tile_uses_bundle_url(self) -> None:
+        """Test app tiles point at the bundle with a trailing slash."""
+        tile = build_app_tile(SAFARI)
+
+        assert tile["tile-type"] == "file-tile"
+        assert tile["tile-data"]["file-data"]["_CFURLString"] == (
+            "file:///Applications/Safari.app/"
+        )
+
+
+class TestValidateValues:
+    """Tests for validate_values."""
+
+    def test_rejects_unknown_keys(self) -> None:
+        """Test only tile arrays and registered settings may be swapped."""
+        with pytest.raises(ValueError, match="unexpected key"):
+            validate_values({"wvous-tl-corner": 1})
+
+    def test_rejects_malformed_tiles(self) -> None:
+        """Test tiles need a known tile-type and tile-data."""
+        with pytest.raises(ValueError, match="invalid tile"):
+            validate_values({"persistent-apps": [{"tile-type": "spacer"}]})
+
+    def test_rejects_invalid_settings(self) -> None:
+        """Test setting values are checked against the registry."""
+        with pytest.raises(ValueError):
+            validate_values({"tilesize": 500})
+
+
+class TestSwapValues:
+    """Tests for swap_values."""
+
+    @pytest.fixture
+    def live_plist(self) -> dict:
+        """Create a live plist with Downloads and a folder stack."""
+        return {
+            "persistent-apps": [build_app_tile(SAFARI)],
+            "persistent-others": [
+                {
+                    "tile-type": "directory-tile",
+                    "tile-data": {
+                        "file-label": "Downloads",
+                        "file-data": {"_CFURLString": "file:///Users/me/Downloads/"},
+                    },
+                },
+                {
+                    "tile-type": "directory-tile",
+                    "tile-data": {
+                        "file-label": "Projects",
+                        "file-data": {"_CFURLString": "file:///Users/me/Projects/"},
+                    },
+                },
+            ],
+        }
+
+    def test_replaces_everything_when_fully_managed(self, live_plist: dict) -> None:
+        """Test a fully managed profile replaces both tile arrays."""
+        values = swap_values(
+            live_plist, {"persistent-apps": [], "persistent-others": []}, False
+        )
+
+        assert values == {"persistent-apps": [], "persistent-others": []}
+
+    def test_keeps_unmanaged_stacks_but_not_downloads(self, live_plist: dict) -> None:
+        """Test unmanaged stacks are carried over and Downloads comes from the profile."""
+        downloads = live_plist["persistent-others"][0]
+        values = swap_values(
+            live_plist, {"persistent-apps": [], "persistent-others": [downloads]}, True
+        )
+
+        assert _labels(values["persistent-others"]) == ["Downloads", "Projects"]
+
+    def test_profile_without_downloads_tile_drops_it(self, live_plist: dict) -> None:
+        """Test a profile with downloads off removes the live Downloads tile."""
+        values = swap_values(
+            live_plist, {"persistent-apps": [], "persistent-others": []}, True
+        )
+
+        assert _labels(values["persistent-others"]) == ["Projects"]
+
+
+    def test_owned_mode_keeps_hand_pinned_apps_in_place(self) -> None:
+        """Test unowned app tiles keep their position and owned ones are replaced."""
+        plist = {
+            "persistent-apps": [
+                build_app_tile(XCODE),
+                build_app_tile(NOTES),
+                build_app_tile(SAFARI),
+            ],
+            "persistent-others": [],
+        }
+        # The profile only has Safari; Notes was applied before, Xcode pinned by hand
+        index = Mock(spec=ApplicationIndex)
+        index.resolve.side_effect = {"Safari": SAFARI, "Notes": NOTES}.get
+        owned = owned_app_keys(["Safari", "Notes"], index)
+        compiled = {"persistent-apps": [build_app_tile(SAFARI)], "persistent-others": []}
+
+        values = swap_values(plist, compiled, False, owned)
+
+        assert _labels(values["persistent-apps"]) == ["Xcode", "Safari"]
+        assert swap_values(values, compiled, False, owned) == values
+
+    def test_strict_mode_replaces_hand_pinned_apps(self) -> None:
+        """Test without an owned set every app tile is replaced."""
+        plist = {"persistent-apps": [build_app_tile(XCODE)], "persistent-others": []}
+        compiled = {"persistent-apps": [build_app_tile(SAFARI)], "persistent-others": []}
+
+        values = swap_values(plist, compiled, False)
+
+        assert _labels(values["persistent-apps"]) == ["Safari"]
+
+    def test_owned_app_keys_match_tiles_by_bundle_id_or_url(self, app_index: Mock) -> None:
+        """Test owned keys cover bundle id and bundle URL; missing apps are skipped."""
+        keys = owned_app_keys(["Safari", "Missing"], app_index)
+
+        assert keys == ["bundle:com.apple.safari", "file:///Applications/Safari.app"]
+
+
+class TestCompiledProfileStore:
+    """Tests for CompiledProfileStore."""
+
+    def _compiled(self) -> CompiledProfile:
+        return CompiledProfile(
+            name="work",
+            source="/profiles/work.yml",
+            source_digest="abc",
+            app_fingerprint="apps-1",
+            config_hash="cfg",
+            config_json='{"apps": ["Safari"]}',
+            values={"persistent-apps": [build_app_tile(SAFARI)], "autohide": True},
+        )
+
+    def test_round_trip_as_binary_plist(self, tmp_path: Path) -> None:
+        """Test a compiled profile is stored as a binary plist and reloaded."""
+        store = CompiledProfileStore(tmp_path)
+        store.save(self._compiled())
+
+        assert store.path_for("work").read_bytes().startswith(b"bplist00")
+        loaded = store.load("work")
+        assert loaded == self._compiled()
+        assert loaded.config().apps == ["Safari"]
+
+    def test_missing_or_corrupt_profile_loads_as_none(self, tmp_path: Path) -> None:
+        """Test unreadable compiled profiles are treated as not compiled."""
+        store = CompiledProfileStore(tmp_path)
+        assert store.load("work") is None
+
+        store.path_for("work").write_bytes(b"garbage")
+        assert store.load("work") is None
+
+    def test_is_current_tracks_profile_and_apps(self) -> None:
+        """Test a changed profile file or app index invalidates the result."""
+        compiled = self._compiled()
+
+        assert compiled.is_current("abc", "apps-1") is True
+        assert compiled.is_current("def", "apps-1") is False
+        assert compiled.is_current("abc", "apps-2") is False
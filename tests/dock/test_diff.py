@@ -1,8 +1,14 @@
 """Tests for dock diff calculator."""
 
 
-from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig
-from dock.dock.diff import AppChange, DiffCalculator, DockDiff, SettingChange
+from dock.config.models import DockConfig, DownloadsConfig, SettingsConfig, StackConfig
+from dock.dock.diff import (
+    AppChange,
+    DiffCalculator,
+    DockDiff,
+    SettingChange,
+    app_move_operations,
+)
 
 
 class TestDiffCalculator:
@@ -100,6 +106,29 @@ class TestDiffCalculator:
 
         assert len(diff.setting_changes) == 0
 
+    def test_calculate_diff_skips_unmanaged_settings(self) -> None:
+        """Test settings left unset in the desired config are not changed."""
+        current = DockConfig(
+            apps=[],
+            settings=SettingsConfig(tilesize=64, orientation="left", show_recents=True)
+        )
+        desired = DockConfig(apps=[], settings=SettingsConfig(tilesize=36))
+
+        diff = DiffCalculator.calculate_diff(desired, current)
+
+        assert [(c.setting_name, c.old_value, c.new_value) for c in diff.setting_changes] == [
+            ("tilesize", 64, 36)
+        ]
+
+    def test_downloads_preset_only_change_is_in_place(self) -> None:
+        """Test a preset change on the same tile is marked for an in-place patch."""
+        current = DockConfig(apps=[], downloads=DownloadsConfig(preset="classic"))
+        desired = DockConfig(apps=[], downloads=DownloadsConfig(preset="fan"))
+        moved = DockConfig(apps=[], downloads=DownloadsConfig(preset="fan", path="/tmp/dl"))
+
+        assert DiffCalculator.calculate_diff(desired, current).downloads_in_place is True
+        assert DiffCalculator.calculate_diff(moved, current).downloads_in_place is False
+
     def test_calculate_diff_with_downloads_tile_addition(self) -> None:
         """Test calculate_diff detects downloads tile addition."""
         current = DockConfig(apps=[], downloads=None)
@@ -273,3 +302,168 @@ class TestDiffCalculator:
 
         removals = [c for c in changes if c.action == "remove"]
         assert len(removals) == 2
+
+
+class TestThreeWayDiff:
+    """Tests for diffs against the last applied configuration."""
+
+    def test_unowned_apps_are_left_alone(self) -> None:
+        """Test apps pinned by hand are not removed."""
+        base = DockConfig(apps=["Safari", "Mail"])
+        current = DockConfig(apps=["Safari", "Slack", "Mail"])
+        desired = DockConfig(apps=["Safari", "Mail"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        assert diff.app_changes == []
+
+    def test_owned_apps_dropped_from_config_are_removed(self) -> None:
+        """Test apps that were applied before but are no longer desired are removed."""
+        base = DockConfig(apps=["Safari", "Mail", "Notes"])
+        current = DockConfig(apps=["Safari", "Slack", "Mail", "Notes"])
+        desired = DockConfig(apps=["Safari", "Mail"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        assert diff.app_changes == [AppChange(action="remove", app_name="Notes")]
+
+    def test_additions_account_for_unowned_tiles(self) -> None:
+        """Test new apps are positioned after their predecessor, past unowned tiles."""
+        base = DockConfig(apps=["Safari", "Mail"])
+        current = DockConfig(apps=["Safari", "Slack", "Mail"])
+        desired = DockConfig(apps=["Safari", "Mail", "Notes"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        assert diff.app_changes == [AppChange(action="add", app_name="Notes", position=4)]
+
+    def test_drift_moves_only_out_of_order_apps(self) -> None:
+        """Test reordering re-adds only the apps out of order, never remove-all."""
+        base = DockConfig(apps=["Safari", "Mail", "Calendar", "Notes"])
+        current = DockConfig(apps=["Mail", "Calendar", "Slack", "Notes", "Safari"])
+        desired = DockConfig(apps=["Safari", "Mail", "Calendar", "Notes"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        assert diff.app_changes == [
+            AppChange(action="remove", app_name="Safari"),
+            AppChange(action="add", app_name="Safari", position=1),
+        ]
+        assert all(change.action != "reorder" for change in diff.app_changes)
+
+    def test_simulated_result_matches_desired_order(self) -> None:
+        """Test applying the changes yields the desired order with unowned tiles kept."""
+        base = DockConfig(apps=["A", "B", "C", "D"])
+        current = DockConfig(apps=["D", "X", "C", "B", "Y", "A"])
+        desired = DockConfig(apps=["A", "E", "B", "C", "D"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        dock = list(current.apps)
+        for change in diff.app_changes:
+            if change.action == "remove":
+                dock.remove(change.app_name)
+        for change in diff.app_changes:
+            if change.action == "add":
+                assert change.position is not None
+                dock.insert(change.position - 1, change.app_name)
+
+        assert [app for app in dock if app not in ("X", "Y")] == desired.apps
+        assert {"X", "Y"} <= set(dock)
+
+    def test_strict_mode_keeps_two_way_behavior(self) -> None:
+        """Test managed: strict removes every app not in the config."""
+        base = DockConfig(apps=["Safari", "Mail"])
+        current = DockConfig(apps=["Safari", "Slack", "Mail"])
+        desired = DockConfig(apps=["Safari", "Mail"], managed="strict")
+
+        diff = DiffCalculator.calculate_diff(desired, current, base=base)
+
+        assert diff.app_changes == [AppChange(action="remove", app_name="Slack")]
+
+
+class TestStackDiff:
+    """Tests for the keyed stacks diff."""
+
+    def test_unmanaged_stacks_produce_no_changes(self) -> None:
+        """Test stacks are left alone when the config has no stacks section."""
+        current = DockConfig(stacks=[StackConfig(path="/tmp/a")])
+
+        diff = DiffCalculator.calculate_diff(DockConfig(), current)
+
+        assert diff.stack_changes == []
+
+    def test_add_remove_update_and_move(self) -> None:
+        """Test each kind of stack change is detected by key."""
+        current = DockConfig(
+            stacks=[
+                StackConfig(path="/tmp/a"),
+                StackConfig(path="/tmp/b"),
+                StackConfig(path="/tmp/c/"),
+                StackConfig(path="/tmp/old"),
+            ]
+        )
+        desired = DockConfig(
+            stacks=[
+                StackConfig(path="/tmp/c", view="grid"),
+                StackConfig(path="/tmp/a"),
+                StackConfig(path="https://example.com/"),
+                StackConfig(path="/tmp/b"),
+            ]
+        )
+
+        diff = DiffCalculator.calculate_diff(desired, current)
+
+        summary = [(c.action, c.stack.path, c.position) for c in diff.stack_changes]
+        assert summary == [
+            ("remove", "/tmp/old", None),
+            ("update", "/tmp/c", None),
+            ("move", "/tmp/c", 1),
+            ("add", "https://example.com/", 3),
+        ]
+        assert diff.stacks == desired.stacks
+        assert diff.has_changes()
+
+    def test_matching_stacks_produce_no_changes(self) -> None:
+        """Test equal stacks in the same order give an empty diff."""
+        stacks = [StackConfig(path="/tmp/a", label="A"), StackConfig(path="/tmp/b")]
+        current = DockConfig(stacks=[StackConfig(path="/tmp/a/", label="A"), stacks[1]])
+
+        diff = DiffCalculator.calculate_diff(DockConfig(stacks=stacks), current)
+
+        assert diff.stack_changes == []
+
+    def test_downloads_tile_is_not_removed(self) -> None:
+        """Test the Downloads tile is owned by the downloads section."""
+        current = DockConfig(stacks=[StackConfig(path="~/Downloads")])
+
+        diff = DiffCalculator.calculate_diff(DockConfig(stacks=[]), current)
+
+        assert diff.stack_changes == []
+
+
+class TestAppMoveOperations:
+    """Tests for app_move_operations."""
+
+    def test_moves_only_apps_out_of_place(self) -> None:
+        """Test one app moved to the front is a single move."""
+        operations = app_move_operations(["Mail", "Notes", "Safari"], ["Safari", "Mail", "Notes"])
+
+        assert operations == [("move", "Safari", 1)]
+
+    def test_removes_moves_and_adds(self) -> None:
+        """Test unwanted apps go first and missing apps are added in place."""
+        operations = app_move_operations(
+            ["Mail", "Notes", "Safari", "Music", "Maps"], ["Safari", "Mail", "Xcode", "Maps"]
+        )
+
+        assert operations == [
+            ("remove", "Notes", None),
+            ("remove", "Music", None),
+            ("move", "Mail", 2),
+            ("add", "Xcode", 3),
+        ]
+
+    def test_none_when_rebuilding_is_as_cheap(self) -> None:
+        """Test a reorder needing as many calls as a rebuild is left to remove all."""
+        assert app_move_operations(["A", "B", "C", "D"], ["D", "C"]) is None
@@ -7,8 +7,12 @@ import pytest
 
 from dock.adapters.dockutil import DockutilCommand
 from dock.adapters.plist import PlistManager
-from dock.dock.diff import AppChange, DockDiff, SettingChange
+from dock.config.models import DockConfig, DownloadsConfig, StackConfig
+from dock.dock.diff import AppChange, DiffCalculator, DockDiff, SettingChange, StackChange
 from dock.dock.executor import DockExecutor
+from dock.dock.journal import ApplyStep, JournalStore
+from dock.dock.metrics import ApplyMetrics
+from dock.dock.raw_backup import RawBackup
 
 
 class TestDockExecutor:
@@ -16,8 +20,10 @@ class TestDockExecutor:
 
     @pytest.fixture
     def mock_dockutil(self) -> Mock:
-        """Create mock DockutilCommand."""
-        return Mock(spec=DockutilCommand)
+        """Create mock DockutilCommand for a dockutil that wasn't probed."""
+        dockutil = Mock(spec=DockutilCommand)
+        dockutil.supports.return_value = False
+        return dockutil
 
     @pytest.fixture
     def mock_plist(self) -> Mock:
@@ -49,8 +55,7 @@ class TestDockExecutor:
         assert result is False
         mock_dockutil.remove_app.assert_not_called()
         mock_dockutil.add_app.assert_not_called()
-        mock_plist.write_autohide.assert_not_called()
-        mock_plist.write_autohide_delay.assert_not_called()
+        mock_plist.write_values.assert_not_called()
 
     def test_apply_diff_with_app_additions(
         self, executor: DockExecutor, mock_dockutil: Mock
@@ -127,8 +132,9 @@ class TestDockExecutor:
         result = executor.apply_diff(diff)
 
         assert result is True
-        mock_plist.write_autohide.assert_called_once_with(True)
-        mock_plist.write_autohide_delay.assert_called_once_with(0.5)
+        mock_plist.write_values.assert_called_once_with(
+            {"autohide": True, "autohide-delay": 0.5}
+        )
 
     def test_apply_diff_with_mixed_changes(
         self, executor: DockExecutor, mock_dockutil: Mock, mock_plist: Mock, mocker
@@ -150,7 +156,7 @@ class TestDockExecutor:
 
         assert result is True
         mock_dockutil.add_app.assert_called_once_with("Safari", 1)
-        mock_plist.write_autohide.assert_called_once_with(True)
+        mock_plist.write_values.assert_called_once_with({"autohide": True})
         mock_restart.assert_called_once()
 
     def test_apply_diff_restarts_dock_when_changes_made(
@@ -212,20 +218,147 @@ class TestDockExecutor:
         # But should not execute any commands
         mock_dockutil.add_app.assert_not_called()
         mock_dockutil.remove_app.assert_not_called()
-        mock_plist.write_autohide.assert_not_called()
+        mock_plist.write_values.assert_not_called()
         mock_restart.assert_not_called()
 
-    def test_apply_app_changes_processes_removals_before_additions(
+    def test_apply_diff_records_journal(
+        self, mock_dockutil: Mock, mock_plist: Mock, tmp_path, mocker
+    ) -> None:
+        """Test apply_diff snapshots the plist and records every step."""
+        store = JournalStore(tmp_path)
+        executor = DockExecutor(mock_dockutil, mock_plist, journal=store)
+        mocker.patch.object(executor, '_restart_dock')
+        mock_plist.read_bytes.return_value = b"before"
+
+        diff = DockDiff(
+            app_changes=[
+                AppChange(action="reorder", app_name="Mail"),
+                AppChange(action="add", app_name="Safari", position=1),
+                AppChange(action="add", app_name="Mail", position=2),
+            ],
+            setting_changes=[],
+            downloads_change=None
+        )
+
+        executor.apply_diff(diff, config_hash="cfg")
+
+        journal = store.load()
+        assert journal is not None
+        assert journal.config_hash == "cfg"
+        assert journal.completed == 3
+        assert journal.status == "complete"
+        assert store.read_snapshot() == b"before"
+
+    def test_apply_diff_failure_leaves_resumable_journal(
+        self, mock_dockutil: Mock, mock_plist: Mock, tmp_path, mocker
+    ) -> None:
+        """Test a failed add leaves the journal at the failed step."""
+        store = JournalStore(tmp_path)
+        executor = DockExecutor(mock_dockutil, mock_plist, journal=store)
+        mocker.patch.object(executor, '_restart_dock')
+        mock_plist.read_bytes.return_value = b"before"
+        mock_dockutil.add_app.side_effect = [None, subprocess.CalledProcessError(1, "dockutil")]
+
+        diff = DockDiff(
+            app_changes=[
+                AppChange(action="reorder", app_name="Mail"),
+                AppChange(action="add", app_name="Safari", position=1),
+                AppChange(action="add", app_name="Mail", position=2),
+            ],
+            setting_changes=[],
+            downloads_change=None
+        )
+
+        with pytest.raises(subprocess.CalledProcessError):
+            executor.apply_diff(diff)
+
+        journal = store.load()
+        assert journal is not None
+        assert journal.completed == 2
+        assert journal.is_resumable() is True
+
+    def test_resume_continues_from_first_incomplete_step(
+        self, mock_dockutil: Mock, mock_plist: Mock, tmp_path, mocker
+    ) -> None:
+        """Test resume skips completed steps and finishes the journal."""
+        store = JournalStore(tmp_path)
+        executor = DockExecutor(mock_dockutil, mock_plist, journal=store)
+        mock_restart = mocker.patch.object(executor, '_restart_dock')
+        steps = [
+            ApplyStep(action="remove_all"),
+            ApplyStep(action="add_app", args={"app_name": "Safari", "position": 1}),
+            ApplyStep(action="add_app", args={"app_name": "Mail", "position": 2}),
+        ]
+        journal = store.begin(steps, "cfg", b"before")
+        store.mark_completed(journal, 2)
+
+        result = executor.resume(journal)
+
+        assert result is True
+        mock_dockutil.remove_all.assert_not_called()
+        mock_dockutil.add_app.assert_called_once_with("Mail", 2)
+        mock_restart.assert_called_once()
+        assert store.load().status == "complete"
+
+    def test_restore_snapshot_writes_once_and_restarts(
+        self, executor: DockExecutor, mock_plist: Mock, mocker
+    ) -> None:
+        """Test restore_snapshot writes raw bytes and restarts the Dock."""
+        mock_restart = mocker.patch.object(executor, '_restart_dock')
+
+        executor.restore_snapshot(b"before")
+
+        mock_plist.write_bytes.assert_called_once_with(b"before")
+        mock_restart.assert_called_once()
+
+    def test_restore_backup_writes_once_and_restarts(
+        self, executor: DockExecutor, mock_plist: Mock, mocker
+    ) -> None:
+        """Test restore_backup replaces the backed-up keys in one write."""
+        mock_restart = mocker.patch.object(executor, '_restart_dock')
+        mock_plist.read_plist.return_value = {"persistent-apps": [], "tilesize": 64, "x": 1}
+
+        executor.restore_backup(RawBackup(values={"persistent-apps": [{"GUID": 1}]}))
+
+        mock_plist.write_plist.assert_called_once_with(
+            {"persistent-apps": [{"GUID": 1}], "x": 1}
+        )
+        mock_restart.assert_called_once()
+
+    def test_swap_profile_writes_once_with_journal(
+        self, mock_dockutil: Mock, mock_plist: Mock, tmp_path, mocker
+    ) -> None:
+        """Test swap_profile replaces the plist keys in one write and restarts."""
+        store = JournalStore(tmp_path)
+        executor = DockExecutor(mock_dockutil, mock_plist, journal=store)
+        mock_restart = mocker.patch.object(executor, '_restart_dock')
+        mock_plist.read_bytes.return_value = b"before"
+        mock_plist.read_plist.return_value = {"persistent-apps": [], "persistent-others": []}
+
+        executor.swap_profile(
+            {"persistent-apps": [], "autohide": True}, config_hash="cfg"
+        )
+
+        mock_plist.write_values.assert_called_once_with(
+            {"persistent-apps": [], "persistent-others": [], "autohide": True}
+        )
+        mock_dockutil.remove_all.assert_not_called()
+        mock_restart.assert_called_once()
+        assert store.load().status == "complete"
+        assert store.read_snapshot() == b"before"
+
+    def test_app_steps_process_removals_before_additions(
         self, executor: DockExecutor, mock_dockutil: Mock
     ) -> None:
-        """Test _apply_app_changes processes removals before additions."""
+        """Test app steps process removals before additions."""
         changes = [
             AppChange(action="add", app_name="Safari", position=1),
             AppChange(action="remove", app_name="Mail"),
             AppChange(action="add", app_name="Calendar", position=2),
         ]
+        diff = DockDiff(app_changes=changes, setting_changes=[], downloads_change=None)
 
-        executor._apply_app_changes(changes)
+        executor._run_steps(executor.build_steps(diff))
 
         # Verify removals happen before additions
         calls = mock_dockutil.method_calls
@@ -235,43 +368,209 @@ class TestDockExecutor:
         if remove_indices and add_indices:
             assert max(remove_indices) < min(add_indices)
 
-    def test_apply_setting_changes_handles_autohide(
+    def test_apply_diff_writes_stacks_in_one_plist_write(
+        self, executor: DockExecutor, mock_plist: Mock, mocker
+    ) -> None:
+        """Test stack changes are applied through a single write_values call."""
+        mocker.patch.object(executor, '_restart_dock')
+        old_tile = {
+            "tile-data": {"file-data": {"_CFURLString": "file:///tmp/old/"}},
+            "tile-type": "directory-tile",
+        }
+        mock_plist.read_plist.return_value = {
+            "persistent-apps": [],
+            "persistent-others": [old_tile],
+        }
+        stacks = [StackConfig(path="/tmp/new", view="list"), StackConfig(path="/tmp/b")]
+        diff = DockDiff(
+            app_changes=[],
+            setting_changes=[],
+            downloads_change=None,
+            stack_changes=[
+                StackChange(
+                    action="remove", key="file:///tmp/old", stack=StackConfig(path="/tmp/old")
+                ),
+                StackChange(action="add", key="file:///tmp/new", stack=stacks[0], position=1),
+                StackChange(action="add", key="file:///tmp/b", stack=stacks[1], position=2),
+            ],
+            stacks=stacks,
+        )
+
+        executor.apply_diff(diff)
+
+        mock_plist.write_values.assert_called_once()
+        written = mock_plist.write_values.call_args.args[0]
+        others = written["persistent-others"]
+        assert [t["tile-data"]["file-data"]["_CFURLString"] for t in others] == [
+            "file:///tmp/new/",
+            "file:///tmp/b/",
+        ]
+        assert others[0]["tile-data"]["showas"] == 3
+
+    def test_build_steps_rewrites_stacks_after_remove_all(
+        self, executor: DockExecutor
+    ) -> None:
+        """Test managed stacks are rewritten when all dock items are removed."""
+        diff = DockDiff(
+            app_changes=[AppChange(action="reorder", app_name="Safari")],
+            setting_changes=[],
+            downloads_change=None,
+            stacks=[StackConfig(path="/tmp/a")],
+        )
+
+        steps = executor.build_steps(diff)
+
+        assert [step.action for step in steps] == ["remove_all", "set_stacks"]
+
+    def test_reorder_moves_apps_when_supported(
+        self, executor: DockExecutor, mock_dockutil: Mock, mocker
+    ) -> None:
+        """Test a reorder moves only the app out of place when dockutil has --move."""
+        mocker.patch.object(executor, '_restart_dock')
+        mock_dockutil.supports.return_value = True
+        diff = DiffCalculator.calculate_diff(
+            DockConfig(apps=["Safari", "Mail", "Notes"], downloads=None),
+            DockConfig(apps=["Mail", "Safari", "Notes"], downloads=None),
+        )
+
+        steps = executor.build_steps(diff)
+        executor.apply_diff(diff)
+
+        assert [step.action for step in steps] == ["move_app"]
+        mock_dockutil.supports.assert_called_with("--move")
+        mock_dockutil.move_app.assert_called_once_with("Mail", 2)
+        mock_dockutil.remove_all.assert_not_called()
+        mock_dockutil.add_app.assert_not_called()
+
+    def test_reorder_removes_all_when_moves_cost_more(
+        self, executor: DockExecutor, mock_dockutil: Mock
+    ) -> None:
+        """Test most apps going away still removes all and re-adds the rest."""
+        mock_dockutil.supports.return_value = True
+        diff = DiffCalculator.calculate_diff(
+            DockConfig(apps=["B", "A"], downloads=None),
+            DockConfig(apps=list("ABCDEF"), downloads=None),
+        )
+
+        steps = executor.build_steps(diff)
+
+        assert [step.action for step in steps] == ["remove_all", "add_app", "add_app"]
+
+    def test_downloads_preset_change_patches_tile_in_place(
+        self, executor: DockExecutor, mock_dockutil: Mock, mock_plist: Mock, mocker
+    ) -> None:
+        """Test a preset-only change is one plist write that keeps GUID and position."""
+        mocker.patch.object(executor, '_restart_dock')
+        downloads_tile = {
+            "GUID": 42,
+            "tile-data": {
+                "file-data": {"_CFURLString": "file:///Users/test/Downloads/"},
+                "file-label": "Downloads",
+                "displayas": 0,
+                "showas": 0,
+            },
+            "tile-type": "directory-tile",
+        }
+        other_tile = {"tile-data": {}, "tile-type": "spacer-tile"}
+        mock_plist.read_plist.return_value = {
+            "persistent-others": [downloads_tile, other_tile],
+        }
+        diff = DockDiff(
+            app_changes=[],
+            setting_changes=[],
+            downloads_change=DownloadsConfig(preset="fan"),
+            downloads_in_place=True,
+        )
+
+        executor.apply_diff(diff)
+
+        mock_dockutil.add_folder.assert_not_called()
+        mock_dockutil.remove_app.assert_not_called()
+        mock_plist.write_values.assert_called_once()
+        others = mock_plist.write_values.call_args.args[0]["persistent-others"]
+        assert others[0]["GUID"] == 42
+        assert others[0]["tile-data"]["showas"] == 1
+        assert others[1] == other_tile
+
+    def test_downloads_change_readds_tile_after_remove_all(
+        self, executor: DockExecutor
+    ) -> None:
+        """Test the tile is re-added when all dock items are removed first."""
+        diff = DockDiff(
+            app_changes=[AppChange(action="reorder", app_name="Safari")],
+            setting_changes=[],
+            downloads_change=DownloadsConfig(preset="list"),
+            downloads_in_place=True,
+        )
+
+        steps = executor.build_steps(diff)
+
+        assert [step.action for step in steps] == ["remove_all", "add_folder"]
+        assert steps[1].args["view"] == "grid"
+
+    def test_stack_attribute_updates_use_patch_step(self, executor: DockExecutor) -> None:
+        """Test attribute-only stack changes do not rewrite the stack layout."""
+        stack = StackConfig(path="/tmp/a", sort="kind", item_size=64)
+        diff = DockDiff(
+            app_changes=[],
+            setting_changes=[],
+            downloads_change=None,
+            stack_changes=[StackChange(action="update", key="file:///tmp/a", stack=stack)],
+            stacks=[stack],
+        )
+
+        steps = executor.build_steps(diff)
+
+        assert [step.action for step in steps] == ["patch_tiles"]
+        attributes = steps[0].args["patches"][0]["attributes"]
+        assert attributes["arrangement"] == 5
+        assert attributes["preferreditemsize"] == 64
+
+    def test_setting_steps_handle_autohide(
         self, executor: DockExecutor, mock_plist: Mock
     ) -> None:
-        """Test _apply_setting_changes handles autohide setting."""
+        """Test setting steps handle autohide setting."""
         changes = [
             SettingChange(setting_name="autohide", old_value=False, new_value=True),
         ]
 
-        executor._apply_setting_changes(changes)
+        executor._run_steps(executor._setting_steps(changes))
 
-        mock_plist.write_autohide.assert_called_once_with(True)
+        mock_plist.write_values.assert_called_once_with({"autohide": True})
 
-    def test_apply_setting_changes_handles_autohide_delay(
+    def test_setting_steps_handle_autohide_delay(
         self, executor: DockExecutor, mock_plist: Mock
     ) -> None:
-        """Test _apply_setting_changes handles autohide_delay setting."""
+        """Test setting steps handle autohide_delay setting."""
         changes = [
             SettingChange(setting_name="autohide_delay", old_value=0.0, new_value=0.5),
         ]
 
-        executor._apply_setting_changes(changes)
+        executor._run_steps(executor._setting_steps(changes))
 
-        mock_plist.write_autohide_delay.assert_called_once_with(0.5)
+        mock_plist.write_values.assert_called_once_with({"autohide-delay": 0.5})
 
-    def test_apply_setting_changes_handles_multiple_settings(
+    def test_setting_steps_batch_multiple_settings(
         self, executor: DockExecutor, mock_plist: Mock
     ) -> None:
-        """Test _apply_setting_changes handles multiple settings."""
+        """Test setting steps write multiple settings in one batch."""
         changes = [
             SettingChange(setting_name="autohide", old_value=False, new_value=True),
             SettingChange(setting_name="autohide_delay", old_value=0.0, new_value=0.5),
+            SettingChange(setting_name="tilesize", old_value=48, new_value=36),
+            SettingChange(setting_name="show_recents", old_value=True, new_value=False),
         ]
 
-        executor._apply_setting_changes(changes)
+        executor._run_steps(executor._setting_steps(changes))
 
-        mock_plist.write_autohide.assert_called_once_with(True)
-        mock_plist.write_autohide_delay.assert_called_once_with(0.5)
+        mock_plist.write_values.assert_called_once_with(
+            {
+                "autohide": True,
+                "autohide-delay": 0.5,
+                "tilesize": 36,
+                "show-recents": False,
+            }
+        )
 
     def test_restart_dock_calls_killall(self, executor: DockExecutor, mocker) -> None:
         """Test _restart_dock calls killall Dock."""
@@ -285,6 +584,24 @@ class TestDockExecutor:
             capture_output=True
         )
 
+    def test_apply_diff_records_metrics(
+        self, mock_dockutil: Mock, mock_plist: Mock, mocker
+    ) -> None:
+        """Test apply and restart phases and the restart count are recorded."""
+        mocker.patch('subprocess.run')
+        metrics = ApplyMetrics()
+        executor = DockExecutor(mock_dockutil, mock_plist, dry_run=False, metrics=metrics)
+        diff = DockDiff(
+            app_changes=[AppChange(action="add", app_name="Safari")],
+            setting_changes=[],
+            downloads_change=None
+        )
+
+        executor.apply_diff(diff)
+
+        assert metrics.restarts == 1
+        assert set(metrics.phases) == {"apply", "restart"}
+
     def test_restart_dock_handles_errors(self, executor: DockExecutor, mocker) -> None:
         """Test _restart_dock handles subprocess errors gracefully."""
         mock_run = mocker.patch(
@@ -0,0 +1,112 @@
+"""Tests for the reset run history."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from dock.dock.history import HistoryStore, RunRecord, StepTiming
+from dock.dock.metrics import ApplyMetrics
+
+
+def _record(started_at: float, profile: str | None = "work", outcome: str = "applied"):
+    """Build a run record."""
+    return RunRecord(
+        started_at=started_at,
+        duration=1.5,
+        profile=profile,
+        config_hash="c" * 64,
+        state_fingerprint="s" * 64,
+        outcome=outcome,
+        changes={"app_add": 2},
+        steps=(StepTiming("add_app", 0.4), StepTiming("add_app", 0.6)),
+    )
+
+
+class TestRunRecord:
+    """Tests for RunRecord."""
+
+    @pytest.mark.parametrize(
+        ("metrics", "outcome"),
+        [
+            (ApplyMetrics(applied=True), "applied"),
+            (ApplyMetrics(), "unchanged"),
+            (ApplyMetrics(dry_run=True), "dry_run"),
+            (ApplyMetrics(applied=True, failed=True), "failed"),
+        ],
+    )
+    def test_from_metrics_outcome(self, metrics: ApplyMetrics, outcome: str) -> None:
+        """Test the outcome is derived from the run's metrics."""
+        record = RunRecord.from_metrics(metrics, None, metrics.started_at + 2)
+
+        assert record.outcome == outcome
+        assert record.duration == 2
+
+    def test_from_metrics_keeps_nonzero_changes_and_steps(self) -> None:
+        """Test only change types that occurred are recorded, with step timings."""
+        metrics = ApplyMetrics(changes={"app_add": 1, "setting": 0})
+        metrics.record_step("add_app", 0.3)
+
+        record = RunRecord.from_metrics(metrics, "work", metrics.started_at)
+
+        assert record.changes == {"app_add": 1}
+        assert record.steps == (StepTiming("add_app", 0.3),)
+        assert record.apply_duration() == 0.3
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore."""
+
+    def test_runs_empty_without_database(self, tmp_path: Path) -> None:
+        """Test querying before anything was recorded doesn't create the database."""
+        store = HistoryStore(tmp_path / "history.sqlite3")
+
+        assert store.runs() == []
+        assert not store.path.exists()
+
+    def test_add_and_query_round_trip(self, tmp_path: Path) -> None:
+        """Test a recorded run is read back with its steps."""
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        store.add(_record(1000.0))
+
+        assert store.runs() == [_record(1000.0)]
+
+    def test_runs_filters_newest_first(self, tmp_path: Path) -> None:
+        """Test filtering by time range, profile and outcome."""
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        for started_at, profile, outcome in [
+            (100.0, "work", "applied"),
+            (200.0, "home", "applied"),
+            (300.0, "work", "failed"),
+            (400.0, "work", "applied"),
+        ]:
+            store.add(_record(started_at, profile, outcome))
+
+        assert [r.started_at for r in store.runs()] == [400.0, 300.0, 200.0, 100.0]
+        assert [r.started_at for r in store.runs(since=200, until=400)] == [300.0, 200.0]
+        assert [r.started_at for r in store.runs(profile="work", outcome="applied")] == [
+            400.0,
+            100.0,
+        ]
+        assert [r.started_at for r in store.runs(limit=1)] == [400.0]
+
+    def test_add_prunes_beyond_retention(self, tmp_path: Path) -> None:
+        """Test old runs and runs beyond max_runs are deleted with their steps."""
+        store = HistoryStore(tmp_path / "history.sqlite3", max_runs=2, max_age_days=1)
+        store.add(_record(0.0))
+        store.add(_record(100_000.0))
+        store.add(_record(100_100.0))
+        store.add(_record(100_200.0))
+
+        assert [r.started_at for r in store.runs()] == [100_200.0, 100_100.0]
+        with sqlite3.connect(store.path) as db:
+            assert db.execute("SELECT COUNT(*) FROM steps").fetchone()[0] == 4
+
+    def test_rejects_newer_schema(self, tmp_path: Path) -> None:
+        """Test a database written by a newer dock is not modified."""
+        path = tmp_path / "history.sqlite3"
+        with sqlite3.connect(path) as db:
+            db.execute("PRAGMA user_version = 99")
+
+        with pytest.raises(sqlite3.DatabaseError, match="newer version"):
+            HistoryStore(path).add(_record(1.0))
@@ -0,0 +1,109 @@
+"""Tests for stable app identity keys."""
+
+import plistlib
+from pathlib import Path
+
+import pytest
+
+from dock.adapters.apps import ApplicationIndex
+from dock.adapters.dockutil import DockTile
+from dock.config.models import DockConfig
+from dock.dock.diff import DiffCalculator
+from dock.dock.identity import AppIdentity
+
+
+def make_app(parent: Path, name: str, bundle_id: str | None) -> Path:
+    """Create a minimal application bundle."""
+    contents = parent / f"{name}.app" / "Contents"
+    contents.mkdir(parents=True)
+    info = {"CFBundleIdentifier": bundle_id} if bundle_id else {}
+    with open(contents / "Info.plist", "wb") as f:
+        plistlib.dump(info, f)
+    return parent / f"{name}.app"
+
+
+class TestAppIdentity:
+    """Tests for AppIdentity and identity-keyed diffs."""
+
+    @pytest.fixture
+    def index(self, tmp_path: Path) -> ApplicationIndex:
+        """Create an index with a renamed and an unidentified app."""
+        make_app(tmp_path, "System Settings", "com.apple.systempreferences")
+        make_app(tmp_path, "Safari", "com.apple.Safari")
+        make_app(tmp_path, "Legacy", None)
+        return ApplicationIndex([tmp_path], cache_path=tmp_path / "cache.json")
+
+    @pytest.fixture
+    def tiles(self, tmp_path: Path) -> list[DockTile]:
+        """Create dockutil tiles with localized labels."""
+        return [
+            DockTile(
+                "Systemeinstellungen",
+                (tmp_path / "System Settings.app").as_uri() + "/",
+                "persistentApps",
+                "com.apple.systempreferences",
+            ),
+            DockTile("Safari", (tmp_path / "Safari.app").as_uri() + "/", "persistentApps",
+                     "com.apple.Safari"),
+            DockTile("Legacy", (tmp_path / "Legacy.app").as_uri() + "/", "persistentApps"),
+            DockTile("Downloads", "file:///Users/test/Downloads/", "persistentOthers"),
+        ]
+
+    def test_localized_labels_share_keys_with_config_names(
+        self, tiles: list[DockTile], index: ApplicationIndex
+    ) -> None:
+        """Test bundle ids and bundle URLs identify the same app."""
+        identity = AppIdentity(tiles, index)
+
+        assert identity.current_key("Systemeinstellungen") == identity.desired_key(
+            "System Settings"
+        )
+        assert identity.desired_key("com.apple.Safari") == identity.current_key("Safari")
+        assert identity.desired_key("Legacy") == identity.current_key("Legacy")
+        assert identity.desired_key("Legacy").startswith("file://")
+
+    def test_steady_state_diff_is_empty(
+        self, tiles: list[DockTile], index: ApplicationIndex
+    ) -> None:
+        """Test a localized Dock matching the config produces no app changes."""
+        identity = AppIdentity(tiles, index)
+        desired = DockConfig(apps=["System Settings", "Safari", "Legacy"])
+        current = DockConfig(apps=["Systemeinstellungen", "Safari", "Legacy"])
+
+        assert DiffCalculator.calculate_diff(desired, current).app_changes != []
+        diff = DiffCalculator.calculate_diff(desired, current, identity=identity)
+        assert diff.app_changes == []
+
+    def test_changes_use_config_names_and_dock_labels(
+        self, tiles: list[DockTile], index: ApplicationIndex
+    ) -> None:
+        """Test adds carry the configured name and removals the Dock label."""
+        identity = AppIdentity(tiles, index)
+        desired = DockConfig(apps=["Safari", "Mail"])
+        current = DockConfig(apps=["Systemeinstellungen", "Safari"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, identity=identity)
+
+        summary = [(c.action, c.app_name) for c in diff.app_changes]
+        assert summary == [("remove", "Systemeinstellungen"), ("add", "Mail")]
+
+    def test_uninstalled_app_matches_tile_by_label(self, index: ApplicationIndex) -> None:
+        """Test a configured app that isn't installed still matches its tile."""
+        tiles = [DockTile("Old App", "file:///Applications/Old%20App.app/", "persistentApps",
+                          "com.example.old")]
+        identity = AppIdentity(tiles, index)
+
+        assert identity.desired_key("Old App") == "bundle:com.example.old"
+        assert identity.desired_key("Unknown") == "name:unknown"
+
+    def test_reorder_moves_relabelled_app(
+        self, tiles: list[DockTile], index: ApplicationIndex
+    ) -> None:
+        """Test a localized label and its config name are moved as one app, not re-added."""
+        identity = AppIdentity(tiles, index)
+        desired = DockConfig(apps=["Safari", "Legacy", "System Settings"])
+        current = DockConfig(apps=["Systemeinstellungen", "Safari", "Legacy"])
+
+        diff = DiffCalculator.calculate_diff(desired, current, identity=identity)
+
+        assert diff.app_moves == [("move", "Systemeinstellungen", 3)]
@@ -0,0 +1,114 @@
+"""Tests for the apply journal."""
+
+from pathlib import Path
+
+import pytest
+
+from dock.dock.journal import (
+    ApplyStep,
+    JournalStore,
+    compute_config_hash,
+    compute_plan_hash,
+)
+
+
+class TestJournalStore:
+    """Tests for JournalStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> JournalStore:
+        """Create a JournalStore in a temporary directory."""
+        return JournalStore(tmp_path / "state")
+
+    @pytest.fixture
+    def steps(self) -> list[ApplyStep]:
+        """Create a typical rebuild plan."""
+        return [
+            ApplyStep(action="remove_all"),
+            ApplyStep(action="add_app", args={"app_name": "Safari", "position": 1}),
+            ApplyStep(action="add_app", args={"app_name": "Mail", "position": 2}),
+        ]
+
+    def test_begin_writes_journal_and_snapshot(
+        self, store: JournalStore, steps: list[ApplyStep]
+    ) -> None:
+        """Test begin persists the plan and the pre-apply snapshot."""
+        journal = store.begin(steps, "cfg", b"snapshot-bytes")
+
+        assert journal.completed == 0
+        assert journal.plan_hash == compute_plan_hash(steps)
+        assert store.read_snapshot() == b"snapshot-bytes"
+        assert store.load() == journal
+
+    def test_mark_completed_tracks_progress(
+        self, store: JournalStore, steps: list[ApplyStep]
+    ) -> None:
+        """Test progress survives a reload and completes on the last step."""
+        journal = store.begin(steps, "cfg", b"")
+
+        store.mark_completed(journal, 2)
+        loaded = store.load()
+        assert loaded is not None
+        assert loaded.completed == 2
+        assert loaded.is_resumable() is True
+
+        store.mark_completed(journal, 3)
+        loaded = store.load()
+        assert loaded is not None
+        assert loaded.status == "complete"
+        assert loaded.is_resumable() is False
+
+    def test_load_returns_none_without_journal(self, store: JournalStore) -> None:
+        """Test load returns None when no reset has been journaled."""
+        assert store.load() is None
+        assert store.read_snapshot() is None
+
+    def test_load_rejects_tampered_steps(
+        self, store: JournalStore, steps: list[ApplyStep]
+    ) -> None:
+        """Test load refuses a journal whose steps don't match the plan hash."""
+        store.begin(steps, "cfg", b"")
+        store.journal_path.write_text(
+            store.journal_path.read_text().replace("Safari", "Music")
+        )
+
+        with pytest.raises(ValueError, match="plan hash"):
+            store.load()
+
+    def test_load_rejects_corrupt_journal(self, store: JournalStore) -> None:
+        """Test load raises ValueError for unreadable journals."""
+        store.journal_path.parent.mkdir(parents=True)
+        store.journal_path.write_text("{not json")
+
+        with pytest.raises(ValueError, match="corrupt"):
+            store.load()
+
+    def test_save_snapshot_replaces_journal(
+        self, store: JournalStore, steps: list[ApplyStep]
+    ) -> None:
+        """Test a standalone snapshot is kept for rollback and drops the old journal."""
+        store.begin(steps, "cfg", b"old")
+
+        store.save_snapshot(b"before-restore")
+
+        assert store.read_snapshot() == b"before-restore"
+        assert store.load() is None
+
+    def test_clear_removes_files(
+        self, store: JournalStore, steps: list[ApplyStep]
+    ) -> None:
+        """Test clear removes journal and snapshot."""
+        store.begin(steps, "cfg", b"data")
+
+        store.clear()
+
+        assert not store.journal_path.exists()
+        assert not store.snapshot_path.exists()
+
+
+def test_config_hash_ignores_key_order() -> None:
+    """Test config hash is stable across dictionary ordering."""
+    first = compute_config_hash({"apps": ["Safari"], "settings": {"autohide": True}})
+    second = compute_config_hash({"settings": {"autohide": True}, "apps": ["Safari"]})
+
+    assert first == second
@@ -0,0 +1,109 @@
+"""Tests for Prometheus textfile metrics."""
+
+from pathlib import Path
+
+import pytest
+
+from dock.config.models import DownloadsConfig
+from dock.dock.diff import AppChange, DockDiff, SettingChange
+from dock.dock.metrics import ApplyMetrics, CommandStats
+
+
+class TestCommandStats:
+    """Tests for CommandStats."""
+
+    def test_observe_fills_cumulative_buckets(self) -> None:
+        """Test an observation counts in every bucket at or above it."""
+        stats = CommandStats()
+
+        stats.observe(0.3, ok=True)
+        stats.observe(20.0, ok=False)
+
+        assert stats.buckets == [0, 0, 0, 1, 1, 1, 1, 1]
+        assert stats.count == 2
+        assert stats.total == pytest.approx(20.3)
+        assert stats.failures == 1
+
+
+class TestApplyMetrics:
+    """Tests for ApplyMetrics."""
+
+    def test_record_diff_counts_changes_by_type(self) -> None:
+        """Test the diff is counted per change type."""
+        metrics = ApplyMetrics()
+        diff = DockDiff(
+            app_changes=[
+                AppChange(action="add", app_name="Safari"),
+                AppChange(action="add", app_name="Mail"),
+                AppChange(action="remove", app_name="Notes"),
+            ],
+            setting_changes=[SettingChange("tilesize", 48, 36)],
+            downloads_change=DownloadsConfig(),
+        )
+
+        metrics.record_diff(diff)
+
+        assert metrics.drift is True
+        assert metrics.changes["app_add"] == 2
+        assert metrics.changes["app_remove"] == 1
+        assert metrics.changes["setting"] == 1
+        assert metrics.changes["downloads"] == 1
+        assert metrics.changes["stack_add"] == 0
+
+    def test_phase_durations_add_up(self) -> None:
+        """Test a phase entered twice accumulates its time."""
+        metrics = ApplyMetrics()
+
+        with metrics.phase("apply"):
+            pass
+        first = metrics.phases["apply"]
+        with metrics.phase("apply"):
+            pass
+
+        assert metrics.phases["apply"] >= first
+
+    def test_render_exposition(self) -> None:
+        """Test rendering gauges, labelled gauges and the latency histogram."""
+        metrics = ApplyMetrics(restarts=1, drift=True)
+        metrics.record_command("add", 0.07, ok=True)
+        metrics.record_command("add", 3.0, ok=False)
+
+        text = metrics.render(now=1700000000.5, last_apply=1699999000.0)
+
+        assert "# TYPE dock_last_run_timestamp_seconds gauge" in text
+        assert "dock_last_run_timestamp_seconds 1700000000.5\n" in text
+        assert "dock_last_apply_timestamp_seconds 1699999000.0\n" in text
+        assert "dock_drift_detected 1\n" in text
+        assert "dock_restarts 1\n" in text
+        assert 'dock_phase_duration_seconds{phase="restart"} 0.0\n' in text
+        assert 'dock_diff_changes{type="app_add"} 0\n' in text
+        assert "# TYPE dock_command_duration_seconds histogram" in text
+        assert 'dock_command_duration_seconds_bucket{kind="add",le="0.05"} 0\n' in text
+        assert 'dock_command_duration_seconds_bucket{kind="add",le="0.1"} 1\n' in text
+        assert 'dock_command_duration_seconds_bucket{kind="add",le="+Inf"} 2\n' in text
+        assert 'dock_command_duration_seconds_count{kind="add"} 2\n' in text
+        assert 'dock_command_failures{kind="add"} 1\n' in text
+
+    def test_render_omits_unknown_last_apply(self) -> None:
+        """Test no apply timestamp is written before the first apply."""
+        text = ApplyMetrics().render(now=1.0, last_apply=None)
+
+        assert "dock_last_apply_timestamp_seconds" not in text
+        assert "dock_command_duration_seconds" not in text
+
+    def test_write_carries_over_last_apply(self, tmp_path: Path) -> None:
+        """Test a run without changes keeps the previous apply timestamp."""
+        path = tmp_path / "dock.prom"
+        ApplyMetrics(applied=True).write(path)
+        first = path.read_text()
+        applied_line = next(
+            line for line in first.splitlines()
+            if line.startswith("dock_last_apply_timestamp_seconds ")
+        )
+
+        ApplyMetrics(dry_run=True).write(path)
+
+        second = path.read_text()
+        assert applied_line in second.splitlines()
+        assert "dock_last_run_dry_run 1\n" in second
+        assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,137 @@
+"""Tests for the execution plan generator."""
+
+from unittest.mock import Mock
+
+from dock.adapters.dockutil import DockutilCommand
+from dock.adapters.plist import PlistManager
+from dock.config.models import DownloadsConfig, StackConfig
+from dock.dock.diff import AppChange, DockDiff, SettingChange, StackChange
+from dock.dock.executor import DockExecutor
+from dock.dock.plan import ExecutionPlan
+
+
+def make_diff(**kwargs) -> DockDiff:
+    """Create a DockDiff with no changes unless given."""
+    return DockDiff(
+        app_changes=kwargs.pop("app_changes", []),
+        setting_changes=[],
+        downloads_change=None,
+        **kwargs,
+    )
+
+
+class TestStackSteps:
+    """Tests for how stack changes are planned."""
+
+    def test_structural_stack_changes_are_one_plist_write(self) -> None:
+        """Test adds, removes and moves are planned as the single write that applies them."""
+        projects = StackConfig(path="~/Projects", label="Projects")
+        docs = StackConfig(path="~/Documents")
+        diff = make_diff(
+            stack_changes=[
+                StackChange("add", "file:///Users/me/Projects/", projects, position=1),
+                StackChange("remove", "file:///Users/me/Old/", StackConfig(path="~/Old")),
+                StackChange("move", "file:///Users/me/Documents/", docs, position=2),
+            ],
+            stacks=[projects, docs],
+        )
+
+        steps = ExecutionPlan.generate_plan(diff, [])
+
+        assert [step.action for step in steps] == ["set_plist", "restart"]
+        assert steps[0].command == (
+            "write persistent-others: add Projects, remove ~/Old, move ~/Documents"
+        )
+        assert not any("dockutil" in step.command for step in steps)
+
+    def test_update_only_patches_tiles(self) -> None:
+        """Test attribute-only changes are planned as tile patches."""
+        docs = StackConfig(path="~/Documents", view="grid")
+        diff = make_diff(
+            stack_changes=[StackChange("update", "file:///Users/me/Documents/", docs)],
+            stacks=[docs],
+        )
+
+        steps = ExecutionPlan.generate_plan(diff, [])
+
+        assert steps[0].command.startswith("patch tiles '~/Documents'")
+
+    def test_stack_update_and_downloads_preset_are_one_patch(self) -> None:
+        """Test in-place patches are one step, ordered like the executor's steps."""
+        docs = StackConfig(path="~/Documents", view="grid")
+        diff = DockDiff(
+            app_changes=[],
+            setting_changes=[SettingChange("autohide", False, True)],
+            downloads_change=DownloadsConfig(preset="fan"),
+            stack_changes=[StackChange("update", "file:///Users/me/Documents/", docs)],
+            stacks=[docs],
+            downloads_in_place=True,
+        )
+        executor = DockExecutor(Mock(spec=DockutilCommand), Mock(spec=PlistManager))
+
+        steps = ExecutionPlan.generate_plan(diff, [])
+
+        assert [step.action for step in executor.build_steps(diff)] == [
+            "patch_tiles",
+            "set_settings",
+        ]
+        assert [step.description for step in steps] == [
+            "Patch 2 tiles in place",
+            "Set autohide to True",
+            "Restart Dock to apply changes",
+        ]
+        assert steps[0].command.startswith("patch tiles '~/Documents' ")
+        assert ", '~/Downloads' " in steps[0].command
+
+    def test_readded_downloads_follow_settings(self) -> None:
+        """Test a re-added Downloads tile is planned after settings, as it runs."""
+        diff = DockDiff(
+            app_changes=[],
+            setting_changes=[SettingChange("autohide", False, True)],
+            downloads_change=DownloadsConfig(section="apps-left"),
+        )
+
+        steps = ExecutionPlan.generate_plan(diff, [])
+
+        assert [step.action for step in steps] == ["set_plist", "add_app", "restart"]
+
+    def test_removing_all_apps_restores_stacks(self) -> None:
+        """Test rebuilding the apps plans the stack rewrite it needs."""
+        docs = StackConfig(path="~/Documents", section="apps")
+        diff = make_diff(
+            app_changes=[
+                AppChange("reorder", "Mail"),
+                AppChange("reorder", "Safari"),
+                AppChange("add", "Safari", 1),
+                AppChange("add", "Mail", 2),
+            ],
+            stacks=[docs],
+        )
+
+        steps = ExecutionPlan.generate_plan(diff, ["Safari", "Mail"])
+
+        assert steps[0].command == "dockutil --remove all --no-restart"
+        assert steps[-2].command == (
+            "write persistent-apps: restore stacks cleared by removing all apps"
+        )
+
+
+class TestAppSteps:
+    """Tests for how app changes are planned."""
+
+    def test_moves_are_labelled_by_operation(self) -> None:
+        """Test each dockutil operation of a --move reorder keeps its own action."""
+        diff = make_diff(
+            app_changes=[AppChange("reorder", "Mail"), AppChange("add", "Xcode", 2)],
+            app_moves=[("remove", "Notes", None), ("move", "Mail", 2), ("add", "Xcode", 3)],
+        )
+
+        steps = ExecutionPlan.generate_plan(diff, ["Safari", "Mail", "Xcode"], moves=True)
+
+        assert [step.action for step in steps] == [
+            "remove_app",
+            "move_app",
+            "add_app",
+            "restart",
+        ]
+        assert steps[1].command == "dockutil --move 'Mail' --position 2 --no-restart"
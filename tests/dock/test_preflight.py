@@ -0,0 +1,42 @@
+"""Tests for preflight checks."""
+
+from pathlib import Path
+from unittest.mock import Mock
+
+from dock.adapters.apps import ApplicationIndex
+from dock.dock.diff import AppChange, DockDiff
+from dock.dock.preflight import Preflight
+
+
+def _diff(*changes: AppChange) -> DockDiff:
+    """Build a diff containing only app changes."""
+    return DockDiff(app_changes=list(changes), setting_changes=[], downloads_change=None)
+
+
+class TestPreflight:
+    """Tests for Preflight."""
+
+    def test_check_reports_missing_apps(self, tmp_path: Path) -> None:
+        """Test apps that would be added but aren't installed are reported."""
+        (tmp_path / "Safari.app").mkdir()
+        index = ApplicationIndex([tmp_path], cache_path=tmp_path / "cache.json")
+
+        result = Preflight(index).check(
+            _diff(
+                AppChange(action="add", app_name="Safari", position=1),
+                AppChange(action="add", app_name="Missing", position=2),
+                AppChange(action="remove", app_name="Gone"),
+            )
+        )
+
+        assert result.ok() is False
+        assert result.missing_apps == ["Missing"]
+
+    def test_check_skips_index_without_additions(self) -> None:
+        """Test the index is not consulted when nothing is added."""
+        index = Mock(spec=ApplicationIndex)
+
+        result = Preflight(index).check(_diff(AppChange(action="remove", app_name="Mail")))
+
+        assert result.ok() is True
+        index.resolve.assert_not_called()
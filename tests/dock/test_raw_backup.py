@@ -0,0 +1,60 @@
+"""Tests for raw Dock plist backups."""
+
+import plistlib
+
+import pytest
+
+from dock.dock.raw_backup import RawBackup, is_raw_backup
+
+APP_TILE = {
+    "GUID": 1234567,
+    "tile-data": {
+        "file-label": "Safari",
+        "file-data": {"_CFURLString": "file:///Applications/Safari.app/"},
+        "book": b"\x00bookmark\xff",
+    },
+    "tile-type": "file-tile",
+}
+
+
+class TestRawBackup:
+    """Tests for RawBackup."""
+
+    def test_capture_keeps_tiles_verbatim(self) -> None:
+        """Test tiles survive a round trip with GUIDs and bookmarks intact."""
+        plist = {"persistent-apps": [APP_TILE], "tilesize": 40, "mod-count": 12}
+
+        backup = RawBackup.from_bytes(RawBackup.capture(plist).to_bytes())
+
+        assert backup.values == {"persistent-apps": [APP_TILE], "tilesize": 40}
+
+    def test_to_bytes_is_stable(self) -> None:
+        """Test an unchanged Dock serializes to identical bytes."""
+        first = RawBackup.capture({"tilesize": 40, "autohide": True}).to_bytes()
+        second = RawBackup.capture({"autohide": True, "tilesize": 40}).to_bytes()
+
+        assert first == second
+        assert is_raw_backup(first)
+        assert not is_raw_backup(b"apps:\n- Safari\n")
+
+    def test_apply_to_replaces_and_removes_managed_keys(self) -> None:
+        """Test restore resets keys absent from the backup and keeps others."""
+        backup = RawBackup(values={"persistent-apps": [APP_TILE]})
+        current = {"persistent-apps": [], "tilesize": 64, "mod-count": 3}
+
+        assert backup.changed_keys(current) == ["persistent-apps", "tilesize"]
+        assert backup.apply_to(current) == {"persistent-apps": [APP_TILE], "mod-count": 3}
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"not a plist",
+            plistlib.dumps({"kind": "something-else", "version": 1, "values": {}}),
+            plistlib.dumps({"kind": "dock-raw-backup", "version": 99, "values": {}}),
+            plistlib.dumps({"kind": "dock-raw-backup", "version": 1, "values": {"x": 1}}),
+        ],
+    )
+    def test_from_bytes_rejects_invalid_backups(self, data: bytes) -> None:
+        """Test foreign plists, future formats and unexpected keys are rejected."""
+        with pytest.raises(ValueError):
+            RawBackup.from_bytes(data)
@@ -0,0 +1,140 @@
+"""Tests for the fleet drift report."""
+
+from pathlib import Path
+
+import pytest
+
+from dock.config.models import DockConfig, SettingsConfig, StackConfig
+from dock.dock import report as report_module
+from dock.dock.report import AppInterner, Drift, build_report, compare_apps
+
+BASELINE = DockConfig(
+    apps=["Safari", "Mail", "Notes"], settings=SettingsConfig(tilesize=48), downloads=None
+)
+
+
+@pytest.fixture
+def fleet(tmp_path: Path) -> Path:
+    """Write backups of five machines in three distinct states."""
+    standard = "apps: [Safari, Mail, Notes]\nsettings:\n  tilesize: 48\n"
+    backups = {
+        "mac-1.yml": standard,
+        "mac-2.yml": standard,
+        "team/mac-3.yml": standard,
+        "mac-4.yml": "apps: [Mail, Safari, Slack]\nsettings:\n  tilesize: 64\n",
+        "mac-5.yml": "apps: [Mail, Safari, Slack]\nsettings:\n  tilesize: 64\n",
+        "broken.yml": "apps: [unterminated\n",
+    }
+    for name, content in backups.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+class TestBuildReport:
+    """Tests for build_report."""
+
+    def test_groups_machines_by_state(self, fleet: Path) -> None:
+        """Test identical backups share one group and drifts are listed."""
+        report = build_report(fleet, "team.yml", BASELINE)
+
+        assert report.machine_count() == 5
+        assert report.matching_count() == 3
+        assert [name for name, _ in report.unreadable] == ["broken"]
+        assert report.groups[0].machines == ["mac-1", "mac-2", "team/mac-3"]
+
+        drifting = report.drifting_groups()
+        assert len(drifting) == 1
+        assert drifting[0].machines == ["mac-4", "mac-5"]
+        assert drifting[0].drifts == [
+            Drift("missing_app", "Notes"),
+            Drift("extra_app", "Slack"),
+            Drift("app_order"),
+            Drift("setting", "tilesize", "64 (baseline 48)"),
+        ]
+        assert report.drift_counts()[0] == (Drift("missing_app", "Notes"), 2)
+
+    def test_unmanaged_parts_are_not_drift(self, tmp_path: Path) -> None:
+        """Test settings and stacks the baseline doesn't manage are ignored."""
+        (tmp_path / "mac.yml").write_text(
+            "apps: [Safari]\nsettings:\n  magnification: true\nstacks:\n- path: ~/Documents\n"
+        )
+
+        report = build_report(tmp_path, "base.yml", DockConfig(apps=["Safari"], downloads=None))
+
+        assert report.matching_count() == 1
+
+    def test_downloads_are_compared_with_defaults(self, tmp_path: Path) -> None:
+        """Test a missing Downloads tile drifts and default settings match."""
+        (tmp_path / "full.yml").write_text("apps: []\ndownloads:\n  preset: classic\n")
+        (tmp_path / "none.yml").write_text("apps: []\n")
+
+        report = build_report(tmp_path, "base.yml", DockConfig(apps=[]))
+
+        assert [group.machines for group in report.drifting_groups()] == [["none"]]
+        assert report.drifting_groups()[0].drifts == [Drift("downloads")]
+
+    def test_managed_stacks_are_compared(self, tmp_path: Path) -> None:
+        """Test stacks are compared by path when the baseline manages them."""
+        (tmp_path / "mac.yml").write_text("apps: []\nstacks:\n- path: ~/Documents\n")
+        config = DockConfig(apps=[], stacks=[StackConfig(path="~/Projects")], downloads=None)
+
+        report = build_report(tmp_path, "base.yml", config)
+
+        assert report.groups[0].drifts == [
+            Drift("missing_stack", "~/Projects"),
+            Drift("extra_stack", "~/Documents"),
+        ]
+
+
+    @pytest.mark.parametrize(
+        "baseline_path",
+        ["~/Projects/", str(Path.home() / "Projects"), Path.home().joinpath("Projects").as_uri()],
+    )
+    def test_stacks_match_the_way_reset_does(self, tmp_path: Path, baseline_path: str) -> None:
+        """Test a trailing slash, absolute path or file URL is the same stack as ~/Projects."""
+        (tmp_path / "mac.yml").write_text("apps: []\nstacks:\n- path: ~/Projects\n")
+        config = DockConfig(apps=[], stacks=[StackConfig(path=baseline_path)], downloads=None)
+
+        report = build_report(tmp_path, "base.yml", config)
+
+        assert report.groups[0].drifts == []
+
+
+class TestCompareApps:
+    """Tests for compare_apps."""
+
+    STATES = [(0, 1, 2), (1, 0), (3, 0, 4, 2, 1), (), (2, 2), (0, 2, 5, 1)]
+
+    def test_pure_python(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test missing, extra and reordered apps without NumPy."""
+        monkeypatch.setattr(report_module, "HAVE_NUMPY", False)
+
+        result = compare_apps(self.STATES, (0, 1, 2), vocabulary=6)
+
+        assert result == [
+            ([], [], False),
+            ([2], [], True),
+            ([], [3, 4], True),
+            ([0, 1, 2], [], False),
+            ([0, 1], [], True),
+            ([], [5], True),
+        ]
+
+    def test_numpy_matches_pure_python(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test the vectorized comparison gives the same result."""
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(report_module, "HAVE_NUMPY", False)
+        expected = compare_apps(self.STATES, (0, 1, 2), vocabulary=6)
+        monkeypatch.setattr(report_module, "HAVE_NUMPY", True)
+
+        assert compare_apps(self.STATES, (0, 1, 2), vocabulary=6) == expected
+
+    def test_interner_reuses_ids(self) -> None:
+        """Test the same name always gets the same id."""
+        interner = AppInterner()
+
+        assert interner.intern(["Safari", "Mail"]) == (0, 1)
+        assert interner.intern(["Mail", "Notes"]) == (1, 2)
+        assert len(interner) == 3
@@ -0,0 +1,108 @@
+"""Tests for captured Dock state."""
+
+import plistlib
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from dock.adapters import CommandExecutor
+from dock.adapters.apps import AppEntry, ApplicationIndex
+from dock.adapters.plist import PlistManager
+from dock.config.models import DockConfig
+from dock.dock.snapshot import DockSnapshot
+from dock.dock.state import DockStateReader
+
+DOCKUTIL_LIST = (
+    "Safari\tfile:///Applications/Safari.app/\tpersistentApps\t"
+    "/Users/me/Library/Preferences/com.apple.dock.plist\tcom.apple.Safari\n"
+    "Mail\tfile:///System/Applications/Mail.app/\tpersistentApps\t"
+    "/Users/me/Library/Preferences/com.apple.dock.plist\tcom.apple.mail\n"
+)
+PLIST = plistlib.dumps(
+    {"autohide": True, "tilesize": 40, "persistent-apps": [], "persistent-others": []},
+    fmt=plistlib.FMT_BINARY,
+)
+APPS = [
+    AppEntry(name="Safari", path="/Applications/Safari.app", bundle_id="com.apple.Safari"),
+    AppEntry(name="Mail", path="/System/Applications/Mail.app", bundle_id="com.apple.mail"),
+]
+
+
+@pytest.fixture
+def snapshot() -> DockSnapshot:
+    """Create a snapshot of a Dock with Safari and Mail."""
+    return DockSnapshot(
+        dockutil_list=DOCKUTIL_LIST,
+        plist=PLIST,
+        apps=APPS,
+        last_applied={"apps": ["Safari"]},
+        hostname="mac-01",
+    )
+
+
+class TestDockSnapshot:
+    """Tests for DockSnapshot."""
+
+    def test_capture_reads_listing_plist_and_apps(self) -> None:
+        """Test capture records the raw listing, plist bytes and apps."""
+        executor = Mock(spec=CommandExecutor)
+        executor.execute.return_value = DOCKUTIL_LIST
+        plist_mgr = Mock(spec=PlistManager)
+        plist_mgr.read_bytes.return_value = PLIST
+        app_index = Mock(spec=ApplicationIndex)
+        app_index.entries.return_value = APPS
+
+        snapshot = DockSnapshot.capture(
+            executor, plist_mgr, app_index, last_applied=DockConfig(apps=["Safari"])
+        )
+
+        executor.execute.assert_called_once_with(["dockutil", "--list"])
+        assert snapshot.plist == PLIST
+        assert snapshot.apps == APPS
+        assert snapshot.base().apps == ["Safari"]
+
+    def test_round_trip(self, snapshot: DockSnapshot, tmp_path: Path) -> None:
+        """Test a saved snapshot loads back unchanged."""
+        path = tmp_path / "state.json"
+        snapshot.save(path)
+
+        assert DockSnapshot.load(path) == snapshot
+
+    def test_load_rejects_invalid_files(self, tmp_path: Path) -> None:
+        """Test malformed or foreign files are reported as invalid."""
+        path = tmp_path / "state.json"
+        path.write_text("{not json")
+        with pytest.raises(ValueError, match="Invalid state file"):
+            DockSnapshot.load(path)
+
+        path.write_text('{"version": 99}')
+        with pytest.raises(ValueError, match="Unsupported state file format"):
+            DockSnapshot.load(path)
+
+        with pytest.raises(FileNotFoundError):
+            DockSnapshot.load(tmp_path / "missing.json")
+
+    def test_state_reader_reads_captured_state(self, snapshot: DockSnapshot) -> None:
+        """Test the normal state reader works unchanged on a snapshot."""
+        reader = DockStateReader(snapshot.dockutil(), snapshot.plist_manager())
+
+        state = reader.read_full_state()
+
+        assert state.apps == ["Safari", "Mail"]
+        assert state.settings.autohide is True
+        assert state.settings.tilesize == 40
+
+    def test_snapshot_refuses_changes(self, snapshot: DockSnapshot) -> None:
+        """Test commands and writes that would change the Dock fail."""
+        with pytest.raises(RuntimeError):
+            snapshot.dockutil().remove_all()
+        with pytest.raises(RuntimeError):
+            snapshot.plist_manager().write_values({"autohide": False})
+
+    def test_app_index_uses_captured_apps(self, snapshot: DockSnapshot) -> None:
+        """Test apps resolve against the captured machine, not this one."""
+        app_index = snapshot.app_index()
+
+        assert app_index.path_for("com.apple.mail") == "/System/Applications/Mail.app"
+        assert app_index.resolve("Notes") is None
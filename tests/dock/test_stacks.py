@@ -0,0 +1,157 @@
+"""Tests for folder and URL stack tiles."""
+
+from pathlib import Path
+from typing import Any
+
+from dock.config.models import StackConfig
+from dock.dock.stacks import (
+    arrange_stacks,
+    build_tile,
+    downloads_preset,
+    patch_tiles,
+    read_stack,
+    stack_key,
+    tile_key,
+)
+
+
+def folder_tile(path: Path, label: str, guid: int, showas: int = 0) -> dict[str, Any]:
+    """Create a directory tile as found in the Dock plist."""
+    return {
+        "GUID": guid,
+        "tile-data": {
+            "file-data": {"_CFURLString": path.as_uri() + "/", "_CFURLStringType": 15},
+            "file-label": label,
+            "displayas": 0,
+            "showas": showas,
+            "arrangement": 1,
+        },
+        "tile-type": "directory-tile",
+    }
+
+
+class TestStackKeys:
+    """Tests for stack key resolution."""
+
+    def test_paths_and_file_urls_share_a_key(self) -> None:
+        """Test ~, absolute paths and plist file URLs resolve to one key."""
+        home = Path.home()
+        key = stack_key("~/Documents")
+
+        assert stack_key(str(home / "Documents") + "/") == key
+        assert stack_key((home / "Documents").as_uri() + "/") == key
+
+    def test_web_urls_are_used_as_is(self) -> None:
+        """Test web URLs are keyed by the URL itself."""
+        assert stack_key("https://example.com/wiki") == "https://example.com/wiki"
+
+    def test_tile_key_ignores_app_tiles(self) -> None:
+        """Test app tiles have no stack key."""
+        assert tile_key({"tile-type": "file-tile", "tile-data": {}}) is None
+
+
+class TestReadStack:
+    """Tests for reading stacks from plist tiles."""
+
+    def test_reads_folder_attributes(self, tmp_path: Path) -> None:
+        """Test view, display, sort and label are decoded."""
+        tile = folder_tile(tmp_path / "Projects", "Projects", 1, showas=2)
+        tile["tile-data"]["arrangement"] = 2
+
+        stack = read_stack(tile, "others")
+
+        assert stack is not None
+        assert stack.path == str(tmp_path / "Projects")
+        assert stack.view == "grid"
+        assert stack.sort == "dateadded"
+        assert stack.label == "Projects"
+
+    def test_reads_url_tile(self) -> None:
+        """Test URL tiles are read with their label."""
+        tile = {
+            "tile-data": {"url": {"_CFURLString": "https://example.com/"}, "label": "Wiki"},
+            "tile-type": "url-tile",
+        }
+
+        stack = read_stack(tile, "others")
+
+        assert stack == StackConfig(path="https://example.com/", label="Wiki")
+
+
+class TestArrangeStacks:
+    """Tests for computing the tile arrays."""
+
+    def test_patches_existing_tiles_and_orders_stacks(self, tmp_path: Path) -> None:
+        """Test existing tiles keep their GUID and follow configuration order."""
+        docs = folder_tile(tmp_path / "Docs", "Docs", 1)
+        projects = folder_tile(tmp_path / "Projects", "Projects", 2)
+        downloads = folder_tile(tmp_path / "Downloads", "Downloads", 3)
+        plist = {"persistent-apps": [], "persistent-others": [docs, projects, downloads]}
+
+        result = arrange_stacks(
+            plist,
+            [
+                StackConfig(path=str(tmp_path / "Projects"), view="list"),
+                StackConfig(path=str(tmp_path / "Docs")),
+            ],
+            remove=[],
+        )
+
+        others = result["persistent-others"]
+        assert [tile["GUID"] for tile in others] == [2, 1, 3]
+        assert others[0]["tile-data"]["showas"] == 3
+        assert plist["persistent-others"][1]["tile-data"]["showas"] == 0
+
+    def test_adds_removes_and_places_apps_section_stacks(self, tmp_path: Path) -> None:
+        """Test new tiles are built and removed tiles dropped."""
+        app = {"tile-type": "file-tile", "tile-data": {"file-label": "Safari"}}
+        old = folder_tile(tmp_path / "Old", "Old", 1)
+        plist = {"persistent-apps": [app], "persistent-others": [old]}
+        new = StackConfig(path=str(tmp_path / "New"), section="apps", label="New")
+
+        result = arrange_stacks(plist, [new], remove=[stack_key(str(tmp_path / "Old"))])
+
+        assert result["persistent-others"] == []
+        assert result["persistent-apps"][0] == app
+        assert tile_key(result["persistent-apps"][1]) == stack_key(str(tmp_path / "New"))
+
+    def test_is_idempotent(self, tmp_path: Path) -> None:
+        """Test applying the result again changes nothing."""
+        stacks = [StackConfig(path=str(tmp_path / "A")), StackConfig(path="https://x.test/")]
+        first = arrange_stacks({}, stacks, remove=[])
+        second = arrange_stacks(dict(first), stacks, remove=[])
+
+        assert second == first
+        assert build_tile(stacks[1])["tile-type"] == "url-tile"
+
+
+class TestPatchTiles:
+    """Tests for in-place tile patches."""
+
+    def test_patches_by_key_and_label_and_skips_missing(self, tmp_path: Path) -> None:
+        """Test tiles are found by key, then label; missing tiles are skipped."""
+        docs = folder_tile(tmp_path / "Docs", "Docs", 1)
+        downloads = folder_tile(Path("/Users/other/Downloads"), "Downloads", 2)
+        plist = {"persistent-others": [docs, downloads]}
+
+        result = patch_tiles(
+            plist,
+            [
+                {"key": stack_key(str(tmp_path / "Docs")), "attributes": {"arrangement": 3}},
+                {"key": "file:///nowhere", "label": "Downloads", "attributes": {"showas": 1}},
+                {"key": "file:///missing", "attributes": {"showas": 2}},
+            ],
+        )
+
+        assert list(result) == ["persistent-others"]
+        others = result["persistent-others"]
+        assert [tile["GUID"] for tile in others] == [1, 2]
+        assert others[0]["tile-data"]["arrangement"] == 3
+        assert others[1]["tile-data"]["showas"] == 1
+        assert docs["tile-data"]["arrangement"] == 1
+
+    def test_downloads_preset_reads_showas(self) -> None:
+        """Test presets are decoded from the codes written by patches."""
+        assert downloads_preset({"showas": 1, "displayas": 0}) == "fan"
+        assert downloads_preset({"showas": 2, "displayas": 1}) == "list"
+        assert downloads_preset({"showas": 0, "displayas": 0}) == "classic"
@@ -48,8 +48,13 @@ class TestDockStateReader:
         dockutil = DockutilCommand(executor=mock_executor)
 
         plist_mgr = Mock(spec=PlistManager)
-        plist_mgr.read_autohide.return_value = True
-        plist_mgr.read_autohide_delay.return_value = 0.5
+        plist_mgr.read_plist.return_value = {
+            "autohide": True,
+            "autohide-delay": 0.5,
+            "tilesize": 36,
+            "orientation": "left",
+            "show-recents": False,
+        }
 
         reader = DockStateReader(dockutil, plist_mgr)
         settings = reader.read_current_settings()
@@ -57,6 +62,10 @@ class TestDockStateReader:
         assert isinstance(settings, SettingsConfig)
         assert settings.autohide is True
         assert settings.autohide_delay == 0.5
+        assert settings.tilesize == 36
+        assert settings.orientation == "left"
+        assert settings.show_recents is False
+        plist_mgr.read_plist.assert_called_once_with()
 
     def test_read_current_settings_with_defaults(self) -> None:
         """Test read_current_settings returns defaults when not set."""
@@ -64,8 +73,7 @@ class TestDockStateReader:
         dockutil = DockutilCommand(executor=mock_executor)
 
         plist_mgr = Mock(spec=PlistManager)
-        plist_mgr.read_autohide.return_value = False
-        plist_mgr.read_autohide_delay.return_value = 0.0
+        plist_mgr.read_plist.return_value = {}
 
         reader = DockStateReader(dockutil, plist_mgr)
         settings = reader.read_current_settings()
@@ -73,6 +81,8 @@ class TestDockStateReader:
         assert isinstance(settings, SettingsConfig)
         assert settings.autohide is False
         assert settings.autohide_delay == 0.0
+        assert settings.tilesize == 48
+        assert settings.orientation == "bottom"
 
     def test_read_current_downloads_with_mocked_plist(self) -> None:
         """Test read_current_downloads returns DownloadsConfig from plist."""
@@ -175,8 +185,7 @@ class TestDockStateReader:
         dockutil = DockutilCommand(executor=mock_executor)
 
         plist_mgr = Mock(spec=PlistManager)
-        plist_mgr.read_autohide.return_value = True
-        plist_mgr.read_autohide_delay.return_value = 0.25
+        plist_mgr.read_plist.return_value = {"autohide": True, "autohide-delay": 0.25}
         plist_mgr.read_value.side_effect = lambda key, default=None: {
             "persistent-others": [
                 {
@@ -210,8 +219,7 @@ class TestDockStateReader:
         dockutil = DockutilCommand(executor=mock_executor)
 
         plist_mgr = Mock(spec=PlistManager)
-        plist_mgr.read_autohide.return_value = False
-        plist_mgr.read_autohide_delay.return_value = 0.0
+        plist_mgr.read_plist.return_value = {}
         plist_mgr.read_value.return_value = []
 
         reader = DockStateReader(dockutil, plist_mgr)
@@ -221,3 +229,45 @@ class TestDockStateReader:
         assert config.apps == ["Safari"]
         assert config.settings.autohide is False
         assert config.downloads is None
+
+    def test_read_current_stacks_skips_downloads_and_apps(self) -> None:
+        """Test folder and URL stacks are read, except the Downloads tile."""
+        mock_executor = Mock(spec=CommandExecutor)
+        dockutil = DockutilCommand(executor=mock_executor)
+
+        plist_mgr = Mock(spec=PlistManager)
+        plist_mgr.read_value.side_effect = lambda key, default=None: {
+            "persistent-apps": [
+                {"tile-data": {"file-label": "Safari"}, "tile-type": "file-tile"},
+                {
+                    "tile-data": {
+                        "file-data": {"_CFURLString": "file:///Volumes/Shared/Projects/"},
+                        "file-label": "Projects",
+                        "showas": 3,
+                    },
+                    "tile-type": "directory-tile",
+                },
+            ],
+            "persistent-others": [
+                {
+                    "tile-data": {
+                        "file-data": {"_CFURLString": "file:///Users/test/Downloads/"},
+                        "file-label": "Downloads",
+                    },
+                    "tile-type": "directory-tile",
+                },
+                {
+                    "tile-data": {"url": {"_CFURLString": "https://example.com/"}},
+                    "tile-type": "url-tile",
+                },
+            ],
+        }.get(key, default)
+
+        reader = DockStateReader(dockutil, plist_mgr)
+        stacks = reader.read_current_stacks()
+
+        assert [(s.path, s.section) for s in stacks] == [
+            ("/Volumes/Shared/Projects", "apps"),
+            ("https://example.com/", "others"),
+        ]
+        assert stacks[0].view == "list"
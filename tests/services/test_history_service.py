@@ -0,0 +1,64 @@
+"""Tests for HistoryService."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from dock.dock.history import HistoryStore, RunRecord
+from dock.services.history_service import HistoryService, parse_time
+
+
+class TestParseTime:
+    """Tests for parse_time."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("30m", 10_000 - 1800), ("12h", 10_000 - 43_200), ("1d", 10_000 - 86_400)],
+    )
+    def test_ages(self, value: str, expected: float) -> None:
+        """Test ages are counted back from now."""
+        assert parse_time(value, now=10_000) == expected
+
+    def test_iso_date(self) -> None:
+        """Test ISO dates are parsed as local time."""
+        assert parse_time("2026-01-31", now=0) == datetime(2026, 1, 31).timestamp()
+
+    def test_invalid(self) -> None:
+        """Test anything else is rejected."""
+        with pytest.raises(ValueError, match="Invalid time"):
+            parse_time("yesterday", now=0)
+
+
+class TestHistoryService:
+    """Tests for HistoryService."""
+
+    def test_execute_lists_runs(self, tmp_path, capsys) -> None:
+        """Test matching runs are printed as a table."""
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        store.add(
+            RunRecord(
+                started_at=1000.0,
+                duration=2.0,
+                profile="work",
+                config_hash="c",
+                state_fingerprint="s",
+                outcome="applied",
+                changes={"app_add": 3},
+            )
+        )
+        with patch("dock.services.history_service.HistoryStore", return_value=store):
+            HistoryService().execute(profile="work")
+
+        output = capsys.readouterr().out
+        assert "OUTCOME" in output
+        assert "applied" in output
+        assert "2.00s" in output
+
+    def test_execute_without_runs(self, tmp_path, capsys) -> None:
+        """Test an empty history says so."""
+        store = HistoryStore(tmp_path / "history.sqlite3")
+        with patch("dock.services.history_service.HistoryStore", return_value=store):
+            HistoryService().execute()
+
+        assert "No runs recorded." in capsys.readouterr().out
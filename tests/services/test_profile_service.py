@@ -0,0 +1,144 @@
+"""Tests for ProfileService."""
+
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dock.adapters.apps import AppEntry
+from dock.config.models import DockConfig
+from dock.dock.compiled import CompiledProfileStore
+from dock.services.profile_service import ProfileService
+
+SAFARI = AppEntry(name="Safari", path="/Applications/Safari.app", bundle_id="com.apple.Safari")
+
+
+@pytest.fixture
+def profiles(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Create a profiles directory under a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    root = tmp_path / ".config" / "dock" / "profiles"
+    root.mkdir(parents=True)
+    (root / "work.yml").write_text("apps: [Safari]\nsettings: {tilesize: 40}\n")
+    (root / "talk.yml").write_text("apps: [Safari]\ndownloads: 'off'\n")
+    return root
+
+
+@pytest.fixture
+def mocks(profiles: Path):
+    """Mock the platform, application index and Dock side effects."""
+    app_index = Mock()
+    app_index.resolve.side_effect = lambda ref: SAFARI if ref == "Safari" else None
+    app_index.canonical_name.side_effect = lambda ref: ref
+    app_index.fingerprint.return_value = "apps-1"
+    with patch("dock.services.profile_service.require_macos"), \
+         patch("dock.services.profile_service.PROFILES_DIR", profiles), \
+         patch("dock.services.profile_service.ApplicationIndex", return_value=app_index), \
+         patch("dock.services.profile_service.ConfigValidator") as mock_validator, \
+         patch("dock.services.profile_service.DockExecutor") as mock_executor, \
+         patch("dock.services.profile_service.DockutilCommand"), \
+         patch("dock.services.profile_service.PlistManager"), \
+         patch("dock.services.profile_service.JournalStore"), \
+         patch("dock.services.profile_service.LastAppliedStore") as mock_applied, \
+         patch("dock.services.profile_service.print_success"), \
+         patch("dock.services.profile_service.print_info"):
+        mock_validator.return_value.validate_config.return_value = []
+        mock_applied.return_value.load.return_value = None
+        yield {
+            "app_index": app_index,
+            "executor": mock_executor.return_value,
+            "applied": mock_applied.return_value,
+        }
+
+
+class TestProfileService:
+    """Tests for compiling and switching profiles."""
+
+    def test_compile_all_profiles(self, mocks: dict, tmp_path: Path) -> None:
+        """Test every profile in the profiles directory is compiled."""
+        store = CompiledProfileStore(tmp_path / "compiled")
+
+        ProfileService(store).compile(names=[])
+
+        work = store.load("work")
+        talk = store.load("talk")
+        assert work is not None and talk is not None
+        assert work.values["tilesize"] == 40
+        assert len(work.values["persistent-others"]) == 1
+        assert talk.values["persistent-others"] == []
+
+    def test_switch_swaps_compiled_values_without_reparsing(
+        self, mocks: dict, tmp_path: Path
+    ) -> None:
+        """Test a current compiled profile is swapped in without compiling."""
+        store = CompiledProfileStore(tmp_path / "compiled")
+        service = ProfileService(store)
+        service.compile(names=["work"])
+
+        with patch("dock.services.profile_service.ConfigLoader.load_config") as mock_load:
+            service.switch("work")
+
+        mock_load.assert_not_called()
+        mocks["executor"].swap_profile.assert_called_once()
+        values = mocks["executor"].swap_profile.call_args.args[0]
+        assert values["tilesize"] == 40
+        assert mocks["applied"].save.call_args.args[0].apps == ["Safari"]
+
+    def test_switch_recompiles_stale_profile(
+        self, mocks: dict, profiles: Path, tmp_path: Path
+    ) -> None:
+        """Test editing the profile invalidates the compiled values."""
+        store = CompiledProfileStore(tmp_path / "compiled")
+        service = ProfileService(store)
+        service.compile(names=["work"])
+        (profiles / "work.yml").write_text("apps: [Safari]\nsettings: {tilesize: 64}\n")
+
+        service.switch("work")
+
+        values = mocks["executor"].swap_profile.call_args.args[0]
+        assert values["tilesize"] == 64
+
+    def test_switch_recompiles_when_apps_change(self, mocks: dict, tmp_path: Path) -> None:
+        """Test a changed application index invalidates the compiled values."""
+        store = CompiledProfileStore(tmp_path / "compiled")
+        service = ProfileService(store)
+        service.compile(names=["work"])
+        mocks["app_index"].fingerprint.return_value = "apps-2"
+
+        service.switch("work")
+
+        assert store.load("work").app_fingerprint == "apps-2"
+
+    def test_switch_owns_profile_and_last_applied_apps(
+        self, mocks: dict, tmp_path: Path
+    ) -> None:
+        """Test an owned-mode switch only replaces apps the profile or last reset owns."""
+        mocks["applied"].load.return_value = DockConfig(apps=["Safari"])
+        service = ProfileService(CompiledProfileStore(tmp_path / "compiled"))
+
+        service.switch("work")
+
+        owned = mocks["executor"].swap_profile.call_args.kwargs["owned"]
+        assert "bundle:com.apple.safari" in owned
+
+    def test_switch_replaces_all_apps_when_strict_or_first_applied(
+        self, mocks: dict, profiles: Path, tmp_path: Path
+    ) -> None:
+        """Test strict profiles, or switching before any reset, replace every app."""
+        service = ProfileService(CompiledProfileStore(tmp_path / "compiled"))
+        service.switch("work")
+        assert mocks["executor"].swap_profile.call_args.kwargs["owned"] is None
+
+        (profiles / "work.yml").write_text("apps: [Safari]\nmanaged: strict\n")
+        mocks["applied"].load.return_value = DockConfig(apps=["Safari"])
+        service.switch("work")
+        assert mocks["executor"].swap_profile.call_args.kwargs["owned"] is None
+
+    def test_switch_unknown_profile_raises(self, mocks: dict, tmp_path: Path) -> None:
+        """Test switching to a profile that doesn't exist fails before any change."""
+        service = ProfileService(CompiledProfileStore(tmp_path / "compiled"))
+
+        with pytest.raises(FileNotFoundError):
+            service.switch("missing")
+
+        mocks["executor"].swap_profile.assert_not_called()
@@ -1,5 +1,7 @@
 """Tests for ResetService."""
 
+import plistlib
+import sqlite3
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -8,9 +10,20 @@ import yaml
 
 from dock.config.models import DockConfig
 from dock.dock.diff import DockDiff
+from dock.dock.history import StepTiming
+from dock.dock.journal import compute_config_hash
+from dock.dock.preflight import PreflightResult
 from dock.services.reset_service import ResetService
 
 
+@pytest.fixture(autouse=True)
+def mock_toolchain():
+    """Don't probe the dockutil installed on this machine."""
+    with patch("dock.services.reset_service.ToolchainProbe") as mock_probe:
+        mock_probe.return_value.probe.return_value = None
+        yield mock_probe
+
+
 class TestResetService:
     """Tests for ResetService business logic."""
 
@@ -26,6 +39,12 @@ class TestResetService:
             yaml.dump(config_data, f)
         return config_file
 
+    @pytest.fixture(autouse=True)
+    def mock_history(self):
+        """Keep runs out of the real run history."""
+        with patch("dock.services.reset_service.HistoryStore") as mock_history:
+            yield mock_history
+
     @pytest.fixture
     def mock_dependencies(self):
         """Mock all external dependencies."""
@@ -39,6 +58,11 @@ class TestResetService:
              patch("dock.services.reset_service.ExecutionPlan") as mock_plan, \
              patch("dock.services.reset_service.DockutilCommand") as mock_dockutil, \
              patch("dock.services.reset_service.PlistManager") as mock_plist, \
+             patch("dock.services.reset_service.JournalStore") as mock_journal, \
+             patch("dock.services.reset_service.Preflight") as mock_preflight, \
+             patch("dock.services.reset_service.ApplicationIndex") as mock_app_index, \
+             patch("dock.services.reset_service.LastAppliedStore") as mock_applied, \
+             patch("dock.services.reset_service.AppIdentity") as mock_identity, \
              patch("dock.services.reset_service.print_success") as mock_print_success, \
              patch("dock.services.reset_service.print_error") as mock_print_error, \
              patch("dock.services.reset_service.print_warning") as mock_print_warning, \
@@ -54,9 +78,7 @@ class TestResetService:
                 "settings": {"autohide": True},
             }
 
-            mock_config_instance = Mock(spec=DockConfig)
-            mock_config_instance.apps = ["Safari", "Mail"]
-            mock_converter.structure.return_value = mock_config_instance
+            mock_converter.structure.return_value = DockConfig(apps=["Safari", "Mail"])
 
             mock_validator_instance = Mock()
             mock_validator.return_value = mock_validator_instance
@@ -73,11 +95,15 @@ class TestResetService:
             mock_diff_result.app_changes = []
             mock_diff_result.setting_changes = []
             mock_diff_result.downloads_change = None
+            mock_diff_result.stack_changes = []
 
             mock_diff_calc_instance = Mock()
             mock_diff_calc.return_value = mock_diff_calc_instance
             mock_diff_calc_instance.calculate_diff.return_value = mock_diff_result
 
+            mock_preflight.return_value.check.return_value = PreflightResult()
+            mock_app_index.return_value.canonical_name.side_effect = lambda app: app
+
             mock_executor_instance = Mock()
             mock_executor.return_value = mock_executor_instance
             mock_executor_instance.apply_diff.return_value = True
@@ -95,6 +121,11 @@ class TestResetService:
                 "executor": mock_executor,
                 "dockutil": mock_dockutil,
                 "plist": mock_plist,
+                "journal": mock_journal,
+                "preflight": mock_preflight,
+                "app_index": mock_app_index,
+                "applied": mock_applied,
+                "identity": mock_identity,
                 "print_success": mock_print_success,
                 "print_error": mock_print_error,
                 "print_warning": mock_print_warning,
@@ -163,6 +194,101 @@ class TestResetService:
         assert exc_info.value.code == 0
         mock_dependencies["print_success"].assert_called()
 
+    def test_execute_writes_metrics_file(self, temp_config_file, mock_dependencies, tmp_path):
+        """Test a reset writes its metrics and records the apply."""
+        metrics_file = tmp_path / "dock.prom"
+
+        service = ResetService()
+        service.execute(
+            file_path=str(temp_config_file), profile=None, dry_run=False,
+            metrics_file=str(metrics_file),
+        )
+
+        metrics = mock_dependencies["executor"].call_args.kwargs["metrics"]
+        text = metrics_file.read_text()
+        assert metrics.applied is True
+        assert "dock_last_run_failed 0\n" in text
+        assert "dock_drift_detected 1\n" in text
+        assert "dock_last_apply_timestamp_seconds " in text
+        assert 'dock_phase_duration_seconds{phase="load_config"}' in text
+
+    def test_execute_writes_metrics_file_on_failure(self, mock_dependencies, tmp_path):
+        """Test a failed reset still writes metrics that record the failure."""
+        (
+            mock_dependencies["loader"]
+            .return_value.discover_config_path.side_effect
+        ) = FileNotFoundError("No configuration file found")
+        metrics_file = tmp_path / "dock.prom"
+
+        service = ResetService()
+        with pytest.raises(FileNotFoundError):
+            service.execute(
+                file_path=None, profile=None, dry_run=False, metrics_file=str(metrics_file)
+            )
+
+        assert "dock_last_run_failed 1\n" in metrics_file.read_text()
+
+    def test_execute_records_history(
+        self, temp_config_file, mock_dependencies, mock_history
+    ):
+        """Test a reset appends its outcome, hashes and step timings to the history."""
+        def apply_diff(diff, config_hash):
+            metrics.record_step("add_app", 0.25)
+            return True
+
+        metrics = None
+
+        def make_executor(*args, **kwargs):
+            nonlocal metrics
+            metrics = kwargs["metrics"]
+            executor = Mock()
+            executor.apply_diff.side_effect = apply_diff
+            return executor
+
+        mock_dependencies["executor"].side_effect = make_executor
+
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile="work", dry_run=False)
+
+        record = mock_history.return_value.add.call_args.args[0]
+        assert record.outcome == "applied"
+        assert record.profile == "work"
+        assert record.config_hash == compute_config_hash(
+            {"apps": ["Safari", "Mail"], "settings": {"autohide": True}}
+        )
+        assert record.state_fingerprint
+        assert record.steps == (StepTiming("add_app", 0.25),)
+
+    def test_execute_records_failed_run(
+        self, temp_config_file, mock_dependencies, mock_history
+    ):
+        """Test a reset that fails after loading its configuration is recorded."""
+        mock_dependencies["state_reader"].return_value.read_full_state.side_effect = (
+            RuntimeError("boom")
+        )
+
+        service = ResetService()
+        with pytest.raises(RuntimeError):
+            service.execute(file_path=str(temp_config_file), profile=None, dry_run=False)
+
+        record = mock_history.return_value.add.call_args.args[0]
+        assert record.outcome == "failed"
+
+    def test_execute_history_errors_do_not_fail_reset(
+        self, temp_config_file, mock_dependencies, mock_history
+    ):
+        """Test an unwritable history only warns."""
+        mock_history.return_value.add.side_effect = sqlite3.OperationalError(
+            "database is locked"
+        )
+
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile=None, dry_run=True)
+
+        mock_dependencies["print_warning"].assert_any_call(
+            "Could not record run history: database is locked"
+        )
+
     def test_execute_on_non_macos_platform(self, temp_config_file):
         """Test execute fails on non-macOS platform."""
         with patch("dock.services.reset_service.require_macos") as mock_require:
@@ -196,3 +322,244 @@ class TestResetService:
         service = ResetService()
         with pytest.raises(yaml.YAMLError):
             service.execute(file_path=str(invalid_config), profile=None, dry_run=False)
+
+    def test_execute_resume_continues_interrupted_reset(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test --resume continues from the journal without reading state."""
+        journal = Mock()
+        journal.is_resumable.return_value = True
+        journal.config_hash = compute_config_hash(
+            mock_dependencies["loader"].return_value.load_config.return_value
+        )
+        journal.completed = 3
+        journal.steps = [Mock()] * 5
+        mock_dependencies["journal"].return_value.load.return_value = journal
+
+        service = ResetService()
+        service.execute(
+            file_path=str(temp_config_file), profile=None, dry_run=False, resume=True
+        )
+
+        mock_dependencies["executor"].return_value.resume.assert_called_once_with(journal)
+        mock_dependencies["state_reader"].return_value.read_full_state.assert_not_called()
+
+    def test_execute_resume_rejects_different_config(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test --resume refuses a journal recorded for another config."""
+        journal = Mock()
+        journal.is_resumable.return_value = True
+        journal.config_hash = "other"
+        mock_dependencies["journal"].return_value.load.return_value = journal
+
+        service = ResetService()
+        with pytest.raises(SystemExit) as exc_info:
+            service.execute(
+                file_path=str(temp_config_file), profile=None, dry_run=False, resume=True
+            )
+
+        assert exc_info.value.code == 1
+        mock_dependencies["executor"].return_value.resume.assert_not_called()
+
+    def test_execute_resume_without_journal_runs_full_reset(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test --resume falls back to a normal reset when nothing was interrupted."""
+        mock_dependencies["journal"].return_value.load.return_value = None
+
+        service = ResetService()
+        service.execute(
+            file_path=str(temp_config_file), profile=None, dry_run=False, resume=True
+        )
+
+        mock_dependencies["executor"].return_value.apply_diff.assert_called_once()
+
+    def test_execute_skips_missing_apps(self, temp_config_file, mock_dependencies):
+        """Test apps that are not installed are dropped before diffing again."""
+        mock_dependencies["converter"].structure.return_value = DockConfig(
+            apps=["Safari", "Missing", "Mail"]
+        )
+        mock_dependencies["preflight"].return_value.check.return_value = PreflightResult(
+            missing_apps=["Missing"]
+        )
+
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile=None, dry_run=False)
+
+        diff_calls = mock_dependencies["diff_calc"].return_value.calculate_diff.call_args_list
+        assert len(diff_calls) == 2
+        assert diff_calls[1].args[0].apps == ["Safari", "Mail"]
+        mock_dependencies["print_warning"].assert_any_call("Application not found: Missing")
+
+    def test_execute_fails_on_missing_apps_before_changes(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test --missing-apps fail aborts before the executor runs."""
+        mock_dependencies["preflight"].return_value.check.return_value = PreflightResult(
+            missing_apps=["Missing"]
+        )
+
+        service = ResetService()
+        with pytest.raises(SystemExit) as exc_info:
+            service.execute(
+                file_path=str(temp_config_file),
+                profile=None,
+                dry_run=False,
+                missing_apps="fail",
+            )
+
+        assert exc_info.value.code == 1
+        mock_dependencies["executor"].assert_not_called()
+
+    def test_execute_diffs_against_last_applied_config(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test the last applied config is the base of a three-way diff."""
+        base = DockConfig(apps=["Safari"])
+        mock_dependencies["applied"].return_value.load.return_value = base
+
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile=None, dry_run=False)
+
+        calculate_diff = mock_dependencies["diff_calc"].return_value.calculate_diff
+        assert calculate_diff.call_args.kwargs["base"] is base
+        mock_dependencies["applied"].return_value.save.assert_called_once()
+
+    def test_execute_diffs_apps_by_identity(self, temp_config_file, mock_dependencies):
+        """Test apps are compared through identities built from the Dock tiles."""
+        reader = mock_dependencies["state_reader"].return_value
+
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile=None, dry_run=False)
+
+        mock_dependencies["identity"].assert_called_once_with(
+            reader.read_current_tiles.return_value,
+            mock_dependencies["app_index"].return_value,
+        )
+        calculate_diff = mock_dependencies["diff_calc"].return_value.calculate_diff
+        assert (
+            calculate_diff.call_args.kwargs["identity"]
+            is mock_dependencies["identity"].return_value
+        )
+
+    def test_execute_dry_run_does_not_record_applied_config(
+        self, temp_config_file, mock_dependencies
+    ):
+        """Test dry runs leave the last applied config untouched."""
+        service = ResetService()
+        service.execute(file_path=str(temp_config_file), profile=None, dry_run=True)
+
+        mock_dependencies["applied"].return_value.save.assert_not_called()
+
+
+class TestPlanProfiles:
+    """Tests for dry-running several profiles against one Dock reading."""
+
+    @pytest.fixture
+    def profiles(self, tmp_path, monkeypatch):
+        """Create profiles under a temporary home."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        root = tmp_path / ".config" / "dock" / "profiles"
+        root.mkdir(parents=True)
+        (root / "same.yml").write_text("apps: [Safari, Mail]\n")
+        (root / "more.yml").write_text(
+            "apps: [Safari, Mail, Notes]\nsettings: {tilesize: 40}\n"
+        )
+        (root / "broken.yml").write_text("settings: {tilesize: 500}\n")
+        return root
+
+    @pytest.fixture
+    def state(self):
+        """Mock the Dock state and side effects, with real diffing."""
+        current = DockConfig(apps=["Safari", "Mail"], stacks=[])
+        with patch("dock.services.reset_service.require_macos"), \
+             patch("dock.services.reset_service.ApplicationIndex") as mock_app_index, \
+             patch("dock.services.reset_service.DockutilCommand") as mock_dockutil, \
+             patch("dock.services.reset_service.PlistManager"), \
+             patch("dock.services.reset_service.DockStateReader") as mock_state_reader, \
+             patch("dock.services.reset_service.AppIdentity", return_value=None), \
+             patch("dock.services.reset_service.LastAppliedStore") as mock_applied:
+            mock_app_index.return_value.canonical_name.side_effect = lambda app: app
+            mock_dockutil.return_value.check_installed.return_value = True
+            mock_state_reader.return_value.read_full_state.return_value = current
+            mock_applied.return_value.load.return_value = None
+            yield mock_state_reader.return_value
+
+    def test_plans_every_profile_from_one_state_read(self, profiles, state, capsys):
+        """Test the Dock is read once and each profile gets a table row."""
+        ResetService().plan_profiles(profiles=[])
+
+        state.read_full_state.assert_called_once()
+        lines = capsys.readouterr().out.splitlines()
+        rows = {line.split()[0]: line.split() for line in lines if line.split()}
+        assert rows["same"][1:3] == ["0", "0"]
+        assert rows["same"][-1] == "0.0s"
+        assert rows["more"][1] == "1"
+        assert rows["more"][4] == "1"
+        assert rows["broken"][1] == "error:"
+        assert "Dry run complete. No changes were made." in lines
+
+    def test_plans_only_named_profiles(self, profiles, state, capsys):
+        """Test repeated --profile limits planning to the given names."""
+        ResetService().plan_profiles(profiles=["more", "same"])
+
+        output = capsys.readouterr().out
+        assert "Planning 2 profiles" in output
+        assert "broken" not in output
+
+
+class TestResetFromState:
+    """Tests for planning against a captured state file."""
+
+    @pytest.fixture
+    def state_file(self, tmp_path):
+        """Capture a Dock with Safari and Mail to a state file."""
+        from dock.adapters.apps import AppEntry
+        from dock.dock.snapshot import DockSnapshot
+
+        listing = "".join(
+            f"{name}\tfile://{path}/\tpersistentApps\t/x.plist\t{bundle}\n"
+            for name, path, bundle in (
+                ("Safari", "/Applications/Safari.app", "com.apple.Safari"),
+                ("Mail", "/System/Applications/Mail.app", "com.apple.mail"),
+            )
+        )
+        snapshot = DockSnapshot(
+            dockutil_list=listing,
+            plist=plistlib.dumps({"persistent-apps": [], "persistent-others": []}),
+            apps=[
+                AppEntry("Safari", "/Applications/Safari.app", "com.apple.Safari"),
+                AppEntry("Mail", "/System/Applications/Mail.app", "com.apple.mail"),
+                AppEntry("Notes", "/System/Applications/Notes.app", "com.apple.Notes"),
+            ],
+        )
+        path = tmp_path / "state.json"
+        snapshot.save(path)
+        return path
+
+    def test_dry_run_plans_against_state_on_any_os(self, state_file, tmp_path, capsys):
+        """Test a dry run needs neither macOS nor dockutil with a state file."""
+        config = tmp_path / "config.yml"
+        config.write_text("apps: [Safari, Notes]\ndownloads: 'off'\n")
+
+        with patch("dock.services.reset_service.SubprocessExecutor") as mock_executor:
+            ResetService().execute(
+                file_path=str(config), profile=None, dry_run=True, state_from=str(state_file)
+            )
+
+        mock_executor.assert_not_called()
+        output = capsys.readouterr().out
+        assert "dockutil --remove 'Mail' --no-restart" in output
+        assert "dockutil --add '/System/Applications/Notes.app'" in output
+        assert "Dry run complete. No changes were made." in output
+
+    def test_state_requires_dry_run(self, state_file, tmp_path):
+        """Test a captured state can't be applied."""
+        config = tmp_path / "config.yml"
+        config.write_text("apps: [Safari]\n")
+
+        with pytest.raises(ValueError, match="--dry-run"):
+            ResetService().execute(
+                file_path=str(config), profile=None, dry_run=False, state_from=str(state_file)
+            )
@@ -0,0 +1,83 @@
+"""Tests for RestoreService."""
+
+import plistlib
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from dock.adapters.plist import PlistManager
+from dock.dock.backups import BackupStore
+from dock.dock.journal import JournalStore
+from dock.dock.raw_backup import RawBackup
+from dock.services.restore_service import RestoreService
+
+BACKED_UP = {"persistent-apps": [{"GUID": 7, "tile-data": {"book": b"\x01"}}], "tilesize": 40}
+
+
+@pytest.fixture
+def dock_plist(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Point the plist manager at a temporary plist and stub the platform."""
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    path = tmp_path / "com.apple.dock.plist"
+    path.write_bytes(plistlib.dumps({"persistent-apps": [], "tilesize": 64, "mod-count": 2}))
+    with patch.object(PlistManager, "DOCK_PLIST", path), \
+         patch("dock.services.restore_service.require_macos"), \
+         patch("dock.dock.executor.DockExecutor._restart_dock") as mock_restart, \
+         patch("dock.services.restore_service.print_success"):
+        yield path, mock_restart
+
+
+class TestRestoreService:
+    """Tests for restoring raw backups."""
+
+    def test_restore_file_writes_once_and_can_be_rolled_back(
+        self, dock_plist, tmp_path: Path
+    ) -> None:
+        """Test a raw backup file is restored and the old plist snapshotted."""
+        path, mock_restart = dock_plist
+        before = path.read_bytes()
+        backup_file = tmp_path / "dock.plist"
+        backup_file.write_bytes(RawBackup(values=BACKED_UP).to_bytes())
+
+        RestoreService().execute(file_path=str(backup_file))
+
+        assert plistlib.loads(path.read_bytes()) == {**BACKED_UP, "mod-count": 2}
+        mock_restart.assert_called_once()
+        assert JournalStore().read_snapshot() == before
+
+    def test_restore_newest_raw_backup_from_store(self, dock_plist, tmp_path: Path) -> None:
+        """Test the newest raw backup of this host and user is restored."""
+        path, _ = dock_plist
+        store = BackupStore(tmp_path / "store")
+        now = datetime(2026, 3, 2, tzinfo=UTC)
+        store.add(RawBackup(values={"tilesize": 30}).to_bytes(), now, "mac", "me", kind="raw")
+        store.add(RawBackup(values=BACKED_UP).to_bytes(), now, "mac", "me", kind="raw")
+        store.add(b"apps: []\n", now, "mac", "me")
+
+        with patch("dock.services.restore_service.platform.node", return_value="mac"), \
+             patch("dock.services.restore_service.getpass.getuser", return_value="me"):
+            RestoreService().execute(store_dir=str(store.root))
+
+        assert plistlib.loads(path.read_bytes())["tilesize"] == 40
+
+    def test_dry_run_leaves_plist_untouched(self, dock_plist, tmp_path: Path) -> None:
+        """Test dry run reports without writing."""
+        path, mock_restart = dock_plist
+        before = path.read_bytes()
+        backup_file = tmp_path / "dock.plist"
+        backup_file.write_bytes(RawBackup(values=BACKED_UP).to_bytes())
+
+        RestoreService().execute(file_path=str(backup_file), dry_run=True)
+
+        assert path.read_bytes() == before
+        mock_restart.assert_not_called()
+
+    def test_yaml_backup_is_rejected(self, dock_plist, tmp_path: Path) -> None:
+        """Test configuration backups point to dock reset instead."""
+        backup_file = tmp_path / "dock.yml"
+        backup_file.write_text("apps: [Safari]\n")
+
+        with pytest.raises(ValueError, match="dock reset"):
+            RestoreService().execute(file_path=str(backup_file))
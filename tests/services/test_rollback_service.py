@@ -0,0 +1,58 @@
+"""Tests for RollbackService."""
+
+import plistlib
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from dock.adapters.plist import PlistManager
+from dock.config.models import DockConfig
+from dock.dock.applied import LastAppliedStore
+from dock.dock.journal import JournalStore
+from dock.services.rollback_service import RollbackService
+
+
+@pytest.fixture
+def dock_plist(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Point the plist manager at a temporary plist and stub the platform."""
+    monkeypatch.setenv("XDG_STATE_HOME", str(tmp_path / "state"))
+    path = tmp_path / "com.apple.dock.plist"
+    path.write_bytes(plistlib.dumps({"persistent-apps": [], "tilesize": 64}))
+    with patch.object(PlistManager, "DOCK_PLIST", path), \
+         patch("dock.services.rollback_service.require_macos"), \
+         patch("dock.dock.executor.DockExecutor._restart_dock") as mock_restart, \
+         patch("dock.services.rollback_service.print_success"):
+        yield path, mock_restart
+
+
+class TestRollbackService:
+    """Tests for rolling back the last reset."""
+
+    def test_rollback_restores_snapshot_and_forgets_last_applied(self, dock_plist) -> None:
+        """Test the snapshot is written back and the undone configuration forgotten."""
+        path, mock_restart = dock_plist
+        before = plistlib.dumps({"persistent-apps": [], "tilesize": 36})
+        store = JournalStore()
+        store.save_snapshot(before)
+        LastAppliedStore().save(DockConfig(apps=["Safari"]))
+
+        RollbackService().execute()
+
+        assert path.read_bytes() == before
+        mock_restart.assert_called_once()
+        assert store.read_snapshot() is None
+        assert LastAppliedStore().load() is None
+
+    def test_rollback_without_snapshot_exits(self, dock_plist) -> None:
+        """Test rollback fails when no reset recorded a snapshot."""
+        path, mock_restart = dock_plist
+        before = path.read_bytes()
+
+        with patch("dock.services.rollback_service.print_error"), \
+             patch("dock.services.rollback_service.print_info"), \
+             pytest.raises(SystemExit):
+            RollbackService().execute()
+
+        assert path.read_bytes() == before
+        mock_restart.assert_not_called()
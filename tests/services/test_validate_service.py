@@ -0,0 +1,142 @@
+"""Tests for ValidateService."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from dock.services.validate_service import ValidateService, discover_profiles, validate_file
+
+
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep the validation cache out of the real cache directory."""
+    cache = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache))
+    return cache
+
+
+@pytest.fixture
+def profiles(tmp_path: Path) -> Path:
+    """Create a profiles tree with valid and invalid files."""
+    root = tmp_path / "profiles"
+    (root / "team").mkdir(parents=True)
+    (root / "home.yml").write_text("apps: [Safari]\n")
+    (root / "team" / "dev.yaml").write_text("apps: [Terminal]\nsettings: {tilesize: 36}\n")
+    (root / "team" / "broken.yml").write_text("settings: {tilesize: 500}\n")
+    (root / "notes.txt").write_text("not a profile")
+    return root
+
+
+class TestValidateAll:
+    """Tests for bulk validation of a profiles tree."""
+
+    def test_discover_profiles_finds_yaml_recursively(self, profiles: Path) -> None:
+        """Test .yml and .yaml files are found in subdirectories."""
+        names = [path.name for path in discover_profiles(profiles)]
+
+        assert names == ["home.yml", "broken.yml", "dev.yaml"]
+
+    def test_validate_file_collects_errors(self, profiles: Path, tmp_path: Path) -> None:
+        """Test errors are returned instead of exiting."""
+        bad_yaml = tmp_path / "bad.yml"
+        bad_yaml.write_text("apps: [unclosed\n")
+
+        assert validate_file(str(profiles / "home.yml")).ok()
+        broken = validate_file(str(profiles / "team" / "broken.yml"))
+        assert not broken.ok()
+        assert "tilesize must be at most 128" in broken.errors[0]
+        assert not validate_file(str(bad_yaml)).ok()
+
+    def test_execute_all_reports_failures_and_exits(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test every file is validated in a pool and failures exit non-zero."""
+        with pytest.raises(SystemExit) as exc_info:
+            ValidateService().execute_all(str(profiles), jobs=2)
+
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert str(profiles / "home.yml") in captured.out
+        assert str(profiles / "team" / "dev.yaml") in captured.out
+        assert "1 of 3 files failed validation (2 valid)" in captured.err
+
+    def test_execute_all_succeeds_when_all_valid(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a clean tree prints a summary without exiting."""
+        (profiles / "team" / "broken.yml").unlink()
+
+        ValidateService().execute_all(str(profiles), jobs=1)
+
+        assert "All 2 configuration files are valid!" in capsys.readouterr().out
+
+
+class TestValidationCaching:
+    """Tests for reusing cached validation results."""
+
+    def test_unchanged_files_are_not_revalidated(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a second run reports every file from the cache."""
+        (profiles / "team" / "broken.yml").unlink()
+        ValidateService().execute_all(str(profiles), jobs=1)
+
+        with patch("dock.services.validate_service.validate_file") as mock_validate:
+            ValidateService().execute_all(str(profiles), jobs=1)
+
+        mock_validate.assert_not_called()
+        assert "All 2 configuration files are valid!" in capsys.readouterr().out
+
+    def test_modified_file_is_revalidated(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test only files whose content changed are validated again."""
+        with pytest.raises(SystemExit):
+            ValidateService().execute_all(str(profiles), jobs=1)
+        (profiles / "team" / "broken.yml").write_text("settings: {tilesize: 64}\n")
+
+        with patch(
+            "dock.services.validate_service.validate_file", wraps=validate_file
+        ) as mock_validate:
+            ValidateService().execute_all(str(profiles), jobs=1)
+
+        mock_validate.assert_called_once()
+        assert mock_validate.call_args.args[0].endswith("broken.yml")
+        assert "All 3 configuration files are valid!" in capsys.readouterr().out
+
+    def test_cached_errors_still_fail(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test a cached invalid result still exits non-zero."""
+        broken = str(profiles / "team" / "broken.yml")
+        with pytest.raises(SystemExit):
+            ValidateService().execute(broken, None)
+
+        with pytest.raises(SystemExit) as exc_info:
+            ValidateService().execute(broken, None)
+
+        assert exc_info.value.code == 1
+        assert "tilesize must be at most 128" in capsys.readouterr().out
+
+    def test_no_cache_writes_nothing(self, profiles: Path, cache_home: Path) -> None:
+        """Test use_cache=False neither reads nor writes the cache."""
+        (profiles / "team" / "broken.yml").unlink()
+
+        ValidateService().execute_all(str(profiles), jobs=1, use_cache=False)
+
+        assert not (cache_home / "dock" / "validate.json").exists()
+
+    def test_changed_since_validates_only_git_changes(
+        self, profiles: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test --changed-since limits validation to files git reports."""
+        with patch("dock.services.validate_service.GitCommand") as mock_git_class:
+            mock_git_class.return_value.changed_files.return_value = [profiles / "home.yml"]
+
+            ValidateService().execute_all(str(profiles), changed_since="main")
+
+        mock_git_class.return_value.changed_files.assert_called_once_with(
+            profiles, "main", ["*.yml", "*.yaml"]
+        )
+        assert "All 1 configuration files are valid!" in capsys.readouterr().out
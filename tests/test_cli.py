@@ -1,11 +1,15 @@
 """Minimal CLI tests - just argument parsing and service invocation."""
 
+import json
 from unittest.mock import Mock, patch
 
 import pytest
 from click.testing import CliRunner
 
+from dock.adapters import CommandTimeoutError
 from dock.cli import cli
+from dock.dock.backups import RetentionPolicy
+from dock.utils import profiling
 
 
 class TestCLI:
@@ -51,7 +55,14 @@ class TestResetCLI:
             # Verify service was instantiated and execute was called
             mock_service_class.assert_called_once()
             mock_service.execute.assert_called_once_with(
-                file_path=str(config_file), profile=None, dry_run=False
+                file_path=str(config_file),
+                profile=None,
+                dry_run=False,
+                deadline=None,
+                resume=False,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=None,
             )
 
     def test_reset_with_profile_option(self, runner):
@@ -63,7 +74,14 @@ class TestResetCLI:
             runner.invoke(cli, ["reset", "--profile", "work"])
 
             mock_service.execute.assert_called_once_with(
-                file_path=None, profile="work", dry_run=False
+                file_path=None,
+                profile="work",
+                dry_run=False,
+                deadline=None,
+                resume=False,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=None,
             )
 
     def test_reset_with_dry_run_flag(self, runner):
@@ -75,9 +93,105 @@ class TestResetCLI:
             runner.invoke(cli, ["reset", "--dry-run"])
 
             mock_service.execute.assert_called_once_with(
-                file_path=None, profile=None, dry_run=True
+                file_path=None,
+                profile=None,
+                dry_run=True,
+                deadline=None,
+                resume=False,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=None,
             )
 
+    def test_reset_with_deadline(self, runner):
+        """Test reset command passes --deadline to the service."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["reset", "--deadline", "30"])
+
+            mock_service.execute.assert_called_once_with(
+                file_path=None,
+                profile=None,
+                dry_run=False,
+                deadline=30.0,
+                resume=False,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=None,
+            )
+
+    def test_reset_with_resume_flag(self, runner):
+        """Test reset command passes --resume to the service."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["reset", "--resume"])
+
+            mock_service.execute.assert_called_once_with(
+                file_path=None,
+                profile=None,
+                dry_run=False,
+                deadline=None,
+                resume=True,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=None,
+            )
+
+    def test_reset_with_missing_apps_fail(self, runner):
+        """Test reset command passes --missing-apps to the service."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["reset", "--missing-apps", "fail"])
+
+            mock_service.execute.assert_called_once_with(
+                file_path=None,
+                profile=None,
+                dry_run=False,
+                deadline=None,
+                resume=False,
+                missing_apps="fail",
+                state_from=None,
+                metrics_file=None,
+            )
+
+    def test_reset_with_metrics_file(self, runner, tmp_path):
+        """Test reset command passes --metrics-file to the service."""
+        metrics_file = str(tmp_path / "dock.prom")
+        with patch("dock.cli.ResetService") as mock_service_class:
+            runner.invoke(cli, ["reset", "--metrics-file", metrics_file])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                file_path=None,
+                profile=None,
+                dry_run=False,
+                deadline=None,
+                resume=False,
+                missing_apps="skip",
+                state_from=None,
+                metrics_file=metrics_file,
+            )
+
+    def test_reset_reports_command_errors(self, runner):
+        """Test reset command prints structured details for command errors."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+            mock_service.execute.side_effect = CommandTimeoutError(
+                ["dockutil", "--list"], "list", 10.0, 3, 31.2
+            )
+
+            result = runner.invoke(cli, ["reset"])
+
+            assert result.exit_code == 1
+            assert "attempts: 3" in result.output
+            assert "kind: list" in result.output
+
     def test_reset_handles_service_exception(self, runner):
         """Test reset command handles service exceptions."""
         with patch("dock.cli.ResetService") as mock_service_class:
@@ -91,6 +205,26 @@ class TestResetCLI:
             assert "Error" in result.output
 
 
+class TestRollbackCLI:
+    """Test rollback command CLI."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_rollback_invokes_service(self, runner):
+        """Test that rollback command invokes RollbackService."""
+        with patch("dock.cli.RollbackService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            result = runner.invoke(cli, ["rollback"])
+
+            assert result.exit_code == 0
+            mock_service.execute.assert_called_once_with()
+
+
 class TestBackupCLI:
     """Test backup command CLI."""
 
@@ -108,7 +242,7 @@ class TestBackupCLI:
             runner.invoke(cli, ["backup", "--file", "/fake/output.yml"])
 
             mock_service_class.assert_called_once()
-            mock_service.execute.assert_called_once_with(file_path="/fake/output.yml")
+            mock_service.execute.assert_called_once_with(file_path="/fake/output.yml", raw=False)
 
     def test_backup_requires_file_option(self, runner):
         """Test backup command requires --file option."""
@@ -117,6 +251,216 @@ class TestBackupCLI:
         assert result.exit_code != 0
         assert "Missing option" in result.output or "required" in result.output.lower()
 
+    def test_backup_store_with_retention(self, runner, tmp_path):
+        """Test --store backs up into the store with the retention policy."""
+        with patch("dock.cli.BackupService") as mock_service_class:
+            runner.invoke(
+                cli, ["backup", "--store", str(tmp_path), "--keep-last", "5", "--keep-daily", "7"]
+            )
+
+            mock_service_class.return_value.execute_store.assert_called_once_with(
+                store_dir=str(tmp_path),
+                policy=RetentionPolicy(keep_last=5, keep_daily=7),
+                raw=False,
+            )
+
+    def test_backup_raw(self, runner, tmp_path):
+        """Test --raw is passed to the store backup."""
+        with patch("dock.cli.BackupService") as mock_service_class:
+            runner.invoke(cli, ["backup", "--store", str(tmp_path), "--raw"])
+
+            mock_service_class.return_value.execute_store.assert_called_once_with(
+                store_dir=str(tmp_path), policy=RetentionPolicy(), raw=True
+            )
+
+    def test_backup_store_list(self, runner, tmp_path):
+        """Test --store --list lists the store instead of backing up."""
+        with patch("dock.cli.BackupService") as mock_service_class:
+            runner.invoke(cli, ["backup", "--store", str(tmp_path), "--list"])
+
+            mock_service_class.return_value.list_store.assert_called_once_with(
+                store_dir=str(tmp_path)
+            )
+            mock_service_class.return_value.execute_store.assert_not_called()
+
+    def test_backup_retention_requires_store(self, runner):
+        """Test retention options without --store are a usage error."""
+        result = runner.invoke(cli, ["backup", "-f", "out.yml", "--keep-last", "3"])
+
+        assert result.exit_code == 2
+
+
+class TestRestoreCLI:
+    """Test restore command CLI."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_restore_file(self, runner):
+        """Test restore passes a backup file to RestoreService."""
+        with patch("dock.cli.RestoreService") as mock_service_class:
+            runner.invoke(cli, ["restore", "dock.plist", "--dry-run"])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                file_path="dock.plist", store_dir=None, ref=None, dry_run=True
+            )
+
+    def test_restore_store_ref(self, runner, tmp_path):
+        """Test restore passes a store and reference to RestoreService."""
+        with patch("dock.cli.RestoreService") as mock_service_class:
+            runner.invoke(cli, ["restore", "--store", str(tmp_path), "--ref", "ab12"])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                file_path=None, store_dir=str(tmp_path), ref="ab12", dry_run=False
+            )
+
+    def test_restore_requires_one_source(self, runner, tmp_path):
+        """Test restore needs exactly one of FILE and --store."""
+        assert runner.invoke(cli, ["restore"]).exit_code == 2
+        assert runner.invoke(cli, ["restore", "x.plist", "--store", str(tmp_path)]).exit_code == 2
+        assert runner.invoke(cli, ["restore", "x.plist", "--ref", "ab"]).exit_code == 2
+
+
+class TestOutputCLI:
+    """Test the --output option."""
+
+    def test_ndjson_output_is_json_lines_ending_in_result(self):
+        """Test every line is a JSON event and the stream ends with a result."""
+        from dock.utils.output import print_warning
+
+        runner = CliRunner()
+        with patch("dock.cli.ShowService") as mock_service_class:
+            mock_service_class.return_value.execute.side_effect = (
+                lambda state_from: print_warning("dockutil is slow")
+            )
+            result = runner.invoke(cli, ["--output", "ndjson", "show"])
+
+        lines = [json.loads(line) for line in result.output.splitlines()]
+        assert [line["event"] for line in lines] == ["warning", "result"]
+        assert lines[-1]["ok"] is True
+
+    def test_ndjson_result_reports_failure(self):
+        """Test a failing command ends with a result carrying its exit code."""
+        runner = CliRunner()
+        with patch("dock.cli.ShowService") as mock_service_class:
+            mock_service_class.return_value.execute.side_effect = RuntimeError("no Dock")
+            result = runner.invoke(cli, ["--output", "ndjson", "show"])
+
+        lines = [json.loads(line) for line in result.output.splitlines()]
+        assert [line["event"] for line in lines] == ["error", "result"]
+        assert lines[0]["message"] == "Error: no Dock"
+        assert lines[-1]["ok"] is False
+        assert lines[-1]["exit_code"] == 1
+
+
+class TestReportCLI:
+    """Test report command CLI."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_report_invokes_service(self, runner, tmp_path):
+        """Test report passes the directory, baseline and top to ReportService."""
+        baseline = tmp_path / "team.yml"
+        baseline.write_text("apps: []\n")
+        with patch("dock.cli.ReportService") as mock_service_class:
+            runner.invoke(cli, ["report", str(tmp_path), "--baseline", str(baseline)])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                directory=str(tmp_path), baseline_path=str(baseline), top=10
+            )
+
+    def test_report_requires_baseline(self, runner, tmp_path):
+        """Test report needs --baseline."""
+        result = runner.invoke(cli, ["report", str(tmp_path)])
+
+        assert result.exit_code == 2
+
+
+class TestProfileOutCLI:
+    """Test the --profile-out group option."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_profile_out_writes_profile(self, runner, tmp_path):
+        """Test the command runs under the profiler and the profile is written."""
+        path = tmp_path / "dock.speedscope.json"
+        with patch("dock.cli.HistoryService"):
+            result = runner.invoke(
+                cli,
+                ["--profile-out", str(path), "--profile-format", "speedscope", "history"],
+            )
+
+        assert result.exit_code == 0
+        frames = json.loads(path.read_text())["shared"]["frames"]
+        assert "history" in {frame["name"] for frame in frames}
+
+    def test_profile_format_is_validated(self, runner, tmp_path):
+        """Test an unknown profile format is a usage error."""
+        result = runner.invoke(
+            cli, ["--profile-out", str(tmp_path / "p"), "--profile-format", "svg", "history"]
+        )
+
+        assert result.exit_code == 2
+
+
+class TestMemReportCLI:
+    """Test the --mem-report group option."""
+
+    def test_mem_report_prints_phases(self, tmp_path):
+        """Test the memory report lists the phases of the command on stderr."""
+        runner = CliRunner()
+        with patch("dock.cli.HistoryService") as mock_service_class:
+            def execute(**kwargs):
+                with profiling.phase("read_state"):
+                    pass
+
+            mock_service_class.return_value.execute.side_effect = execute
+            result = runner.invoke(cli, ["--mem-report", "history"])
+
+        assert result.exit_code == 0
+        assert "Memory report" in result.stderr
+        assert "read_state: peak" in result.stderr
+        assert "total: peak" in result.stderr
+        assert "Memory report" not in result.stdout
+
+
+class TestHistoryCLI:
+    """Test history command CLI."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_history_invokes_service(self, runner):
+        """Test history passes its filters to HistoryService."""
+        with patch("dock.cli.HistoryService") as mock_service_class:
+            runner.invoke(
+                cli, ["history", "--since", "7d", "--profile", "work", "--outcome", "failed"]
+            )
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                since="7d", until=None, profile="work", outcome="failed", limit=20
+            )
+
+    def test_history_reports_invalid_time(self, runner):
+        """Test an unparseable time is reported as an error."""
+        with patch("dock.cli.HistoryService") as mock_service_class:
+            mock_service_class.return_value.execute.side_effect = ValueError("Invalid time")
+
+            result = runner.invoke(cli, ["history", "--since", "yesterday"])
+
+            assert result.exit_code == 1
+            assert "Invalid time" in result.output
+
 
 class TestShowCLI:
     """Test show command CLI."""
@@ -160,9 +504,43 @@ class TestValidateCLI:
 
             mock_service_class.assert_called_once()
             mock_service.execute.assert_called_once_with(
-                file_path=str(config_file), profile=None
+                file_path=str(config_file), profile=None, use_cache=True
             )
 
+    def test_validate_all_invokes_bulk_validation(self, runner, tmp_path):
+        """Test validate --all passes the directory and job count."""
+        with patch("dock.cli.ValidateService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["validate", "--all", str(tmp_path), "--jobs", "4"])
+
+            mock_service.execute_all.assert_called_once_with(
+                directory=str(tmp_path), jobs=4, changed_since=None, use_cache=True
+            )
+            mock_service.execute.assert_not_called()
+
+    def test_validate_changed_since_implies_all(self, runner, tmp_path):
+        """Test --changed-since validates the tree without the cache when asked."""
+        with patch("dock.cli.ValidateService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(
+                cli, ["validate", "--changed-since", "main", "--no-cache", str(tmp_path)]
+            )
+
+            mock_service.execute_all.assert_called_once_with(
+                directory=str(tmp_path), jobs=None, changed_since="main", use_cache=False
+            )
+
+    def test_validate_directory_requires_all(self, runner, tmp_path):
+        """Test a directory without --all is a usage error."""
+        with patch("dock.cli.ValidateService"):
+            result = runner.invoke(cli, ["validate", str(tmp_path)])
+
+            assert result.exit_code == 2
+
     def test_validate_with_profile_option(self, runner):
         """Test validate command with --profile option."""
         with patch("dock.cli.ValidateService") as mock_service_class:
@@ -172,5 +550,123 @@ class TestValidateCLI:
             runner.invoke(cli, ["validate", "--profile", "work"])
 
             mock_service.execute.assert_called_once_with(
-                file_path=None, profile="work"
+                file_path=None, profile="work", use_cache=True
+            )
+
+
+class TestProfileCLI:
+    """Tests for profile commands."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_profile_compile_invokes_service(self, runner):
+        """Test profile compile passes the profile names."""
+        with patch("dock.cli.ProfileService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["profile", "compile", "work", "talk"])
+
+            mock_service.compile.assert_called_once_with(names=["work", "talk"])
+
+    def test_profile_switch_invokes_service(self, runner):
+        """Test profile switch passes the name and dry-run flag."""
+        with patch("dock.cli.ProfileService") as mock_service_class:
+            mock_service = Mock()
+            mock_service_class.return_value = mock_service
+
+            runner.invoke(cli, ["profile", "switch", "work", "--dry-run"])
+
+            mock_service.switch.assert_called_once_with(name="work", dry_run=True)
+
+
+class TestResetProfilesCLI:
+    """Tests for multi-profile dry runs."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_all_profiles_dry_run_plans_every_profile(self, runner):
+        """Test --all-profiles --dry-run plans all profiles."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            runner.invoke(cli, ["reset", "--all-profiles", "--dry-run"])
+
+            mock_service_class.return_value.plan_profiles.assert_called_once_with(
+                profiles=[], missing_apps="skip", state_from=None
+            )
+            mock_service_class.return_value.execute.assert_not_called()
+
+    def test_repeated_profile_dry_run_plans_named_profiles(self, runner):
+        """Test repeated --profile plans the named profiles."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            runner.invoke(
+                cli, ["reset", "--profile", "work", "--profile", "talk", "--dry-run"]
             )
+
+            mock_service_class.return_value.plan_profiles.assert_called_once_with(
+                profiles=["work", "talk"], missing_apps="skip", state_from=None
+            )
+
+    def test_multiple_profiles_require_dry_run(self, runner):
+        """Test applying several profiles at once is a usage error."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            result = runner.invoke(cli, ["reset", "--all-profiles"])
+
+            assert result.exit_code == 2
+            mock_service_class.return_value.plan_profiles.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "option", [["--deadline", "60"], ["--metrics-file", "dock.prom"]]
+    )
+    def test_multiple_profiles_reject_apply_options(self, runner, option):
+        """Test options that only affect an apply are rejected instead of ignored."""
+        with patch("dock.cli.ResetService") as mock_service_class:
+            result = runner.invoke(cli, ["reset", "--all-profiles", "--dry-run", *option])
+
+            assert result.exit_code == 2
+            assert "--deadline or --metrics-file" in result.output
+            mock_service_class.return_value.plan_profiles.assert_not_called()
+
+
+class TestSnapshotCLI:
+    """Tests for snapshot and --state-from."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create Click test runner."""
+        return CliRunner()
+
+    def test_snapshot_invokes_service(self, runner, tmp_path):
+        """Test snapshot passes the output path."""
+        with patch("dock.cli.SnapshotService") as mock_service_class:
+            runner.invoke(cli, ["snapshot", "-o", str(tmp_path / "state.json")])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                output=str(tmp_path / "state.json")
+            )
+
+    def test_show_state_from(self, runner, tmp_path):
+        """Test show passes the state file."""
+        state = tmp_path / "state.json"
+        state.write_text("{}")
+        with patch("dock.cli.ShowService") as mock_service_class:
+            runner.invoke(cli, ["show", "--state-from", str(state)])
+
+            mock_service_class.return_value.execute.assert_called_once_with(
+                state_from=str(state)
+            )
+
+    def test_reset_state_from_requires_dry_run(self, runner, tmp_path):
+        """Test --state-from without --dry-run is a usage error."""
+        state = tmp_path / "state.json"
+        state.write_text("{}")
+        with patch("dock.cli.ResetService") as mock_service_class:
+            result = runner.invoke(cli, ["reset", "--state-from", str(state)])
+
+            assert result.exit_code == 2
+            mock_service_class.return_value.execute.assert_not_called()
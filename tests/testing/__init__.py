@@ -0,0 +1 @@
+"""Tests for test and benchmark helpers."""
@@ -0,0 +1,211 @@
+"""Tests for the dockutil stand-in."""
+
+import json
+import plistlib
+from pathlib import Path
+
+import pytest
+
+from dock.adapters import SubprocessExecutor
+from dock.adapters.dockutil import DockutilCommand
+from dock.dock import stacks
+from dock.testing import fake_dockutil
+from dock.testing.fake_dockutil import parse_rates, run, write_shim
+from dock.testing.synth import SynthSpec, generate
+
+
+@pytest.fixture
+def plist_path(tmp_path: Path) -> Path:
+    """Write a synthetic Dock plist."""
+    path = tmp_path / "com.apple.dock.plist"
+    path.write_bytes(generate(SynthSpec(apps=6, others=2, recents=1, seed=3)).plist_bytes())
+    return path
+
+
+def _env(plist_path: Path, **settings: str) -> dict[str, str]:
+    """Build the stand-in's environment."""
+    return {"FAKE_DOCKUTIL_PLIST": str(plist_path), **settings}
+
+
+def _labels(plist_path: Path, array: str = "persistent-apps") -> list[str]:
+    """Read the labels of a plist array, skipping spacers."""
+    tiles = plistlib.loads(plist_path.read_bytes())[array]
+    return [tile["tile-data"]["file-label"] for tile in tiles if "book" in tile["tile-data"]]
+
+
+class TestParseRates:
+    """Tests for parse_rates."""
+
+    def test_single_value_is_default(self) -> None:
+        """Test one number applies to every kind."""
+        assert parse_rates("0.2") == {"default": 0.2}
+
+    def test_per_kind_values(self) -> None:
+        """Test kind=number pairs are parsed."""
+        assert parse_rates("list=0.05, add=0.4") == {"list": 0.05, "add": 0.4}
+
+    def test_malformed_value(self) -> None:
+        """Test a pair without a number is rejected."""
+        with pytest.raises(ValueError, match="kind=number"):
+            parse_rates("list=0.05,add")
+
+
+class TestRun:
+    """Tests for dockutil calls against a plist."""
+
+    def test_list_matches_dockutil_format(
+        self, plist_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test --list prints the tiles dockutil would, in order."""
+        dock = generate(SynthSpec(apps=6, others=2, recents=1, seed=3))
+
+        assert run(["--list"], _env(plist_path)) == 0
+
+        listed = [line.split("\t") for line in capsys.readouterr().out.splitlines()]
+        expected = [line.split("\t") for line in dock.dockutil_list.splitlines()]
+        assert [row[:3] + row[4:] for row in listed] == [row[:3] + row[4:] for row in expected]
+        assert {row[3] for row in listed} == {str(plist_path)}
+
+    def test_add_app_at_position(self, plist_path: Path) -> None:
+        """Test --add inserts an app tile at a 1-indexed position."""
+        status = run(
+            ["--add", "/Applications/Zed.app", "--position", "1", "--no-restart"],
+            _env(plist_path),
+        )
+
+        assert status == 0
+        tile = plistlib.loads(plist_path.read_bytes())["persistent-apps"][0]
+        assert tile["tile-type"] == "file-tile"
+        assert tile["tile-data"]["file-label"] == "Zed"
+        assert tile["tile-data"]["file-data"]["_CFURLString"] == "file:///Applications/Zed.app/"
+
+    def test_add_existing_is_left_alone(self, plist_path: Path) -> None:
+        """Test adding a tile already in the Dock changes nothing."""
+        before = plist_path.read_bytes()
+        app = plistlib.loads(before)["persistent-apps"][0]["tile-data"]
+        path = app["file-data"]["_CFURLString"].removeprefix("file://").replace("%20", " ")
+
+        assert run(["--add", path.rstrip("/")], _env(plist_path)) == 0
+        assert plist_path.read_bytes() == before
+
+    def test_add_folder(self, plist_path: Path, tmp_path: Path) -> None:
+        """Test --add with a folder adds a directory tile with its view and display."""
+        folder = tmp_path / "Reports"
+        folder.mkdir()
+
+        status = run(
+            ["--add", str(folder), "--view", "grid", "--display", "folder", "--sort", "kind"],
+            _env(plist_path),
+        )
+
+        assert status == 0
+        tile = plistlib.loads(plist_path.read_bytes())["persistent-others"][-1]
+        assert tile["tile-type"] == "directory-tile"
+        assert tile["tile-data"]["file-data"]["_CFURLString"] == f"file://{folder}/"
+        assert tile["tile-data"]["showas"] == stacks.VIEW_CODES["grid"]
+        assert tile["tile-data"]["displayas"] == stacks.DISPLAY_CODES["folder"]
+        assert tile["tile-data"]["arrangement"] == stacks.SORT_CODES["kind"]
+
+    def test_remove_by_label(self, plist_path: Path) -> None:
+        """Test --remove drops the tile with that label."""
+        label = _labels(plist_path)[2]
+
+        assert run(["--remove", label, "--no-restart"], _env(plist_path)) == 0
+        assert label not in _labels(plist_path)
+
+    def test_remove_missing_fails(
+        self, plist_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test removing a tile that isn't in the Dock exits with status 1."""
+        assert run(["--remove", "Nope"], _env(plist_path)) == 1
+        assert "Nope was not found" in capsys.readouterr().err
+
+    def test_remove_all(self, plist_path: Path) -> None:
+        """Test --remove all empties both persistent sections."""
+        assert run(["--remove", "all"], _env(plist_path)) == 0
+
+        plist = plistlib.loads(plist_path.read_bytes())
+        assert plist["persistent-apps"] == []
+        assert plist["persistent-others"] == []
+        assert len(plist["recent-apps"]) == 1
+
+    def test_move(self, plist_path: Path) -> None:
+        """Test --move puts a tile at a new position in its section."""
+        label = _labels(plist_path)[-1]
+
+        assert run(["--move", label, "--position", "beginning"], _env(plist_path)) == 0
+        assert _labels(plist_path)[0] == label
+
+    def test_codes_match_stacks(self) -> None:
+        """Test the tile codes agree with dock.dock.stacks."""
+        assert fake_dockutil.VIEW_CODES == stacks.VIEW_CODES
+        assert fake_dockutil.DISPLAY_CODES == stacks.DISPLAY_CODES
+        assert fake_dockutil.SORT_CODES == stacks.SORT_CODES
+        assert fake_dockutil.SECTION_ARRAYS == stacks.SECTION_ARRAYS
+
+
+class TestInjection:
+    """Tests for injected failures and the call log."""
+
+    def test_failure_leaves_plist_unchanged(self, plist_path: Path, tmp_path: Path) -> None:
+        """Test an injected failure exits 1 before editing and is logged."""
+        before = plist_path.read_bytes()
+        log = tmp_path / "calls.jsonl"
+        env = _env(plist_path, FAKE_DOCKUTIL_FAILURES="add=1", FAKE_DOCKUTIL_LOG=str(log))
+
+        assert run(["--add", "/Applications/Zed.app"], env) == 1
+        assert run(["--list"], env) == 0
+
+        assert plist_path.read_bytes() == before
+        entries = [json.loads(line) for line in log.read_text().splitlines()]
+        assert [(entry["kind"], entry["status"]) for entry in entries] == [
+            ("add", 1),
+            ("list", 0),
+        ]
+
+    def test_seeded_failures_are_reproducible(self, plist_path: Path, tmp_path: Path) -> None:
+        """Test the same seed fails the same calls."""
+        outcomes = []
+        for attempt in range(2):
+            env = _env(
+                plist_path,
+                FAKE_DOCKUTIL_FAILURES="0.5",
+                FAKE_DOCKUTIL_SEED="11",
+                FAKE_DOCKUTIL_LOG=str(tmp_path / f"calls-{attempt}.jsonl"),
+            )
+            outcomes.append([run(["--version"], env) for _ in range(12)])
+
+        assert outcomes[0] == outcomes[1]
+        assert set(outcomes[0]) == {0, 1}
+
+
+class TestSubprocessPath:
+    """Tests for running the stand-in through SubprocessExecutor."""
+
+    def test_dock_dockutil_override(
+        self, plist_path: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test DockutilCommand edits the plist through DOCK_DOCKUTIL."""
+        shim = write_shim(tmp_path / "bin")
+        monkeypatch.setenv("DOCK_DOCKUTIL", str(shim))
+        monkeypatch.setenv("FAKE_DOCKUTIL_PLIST", str(plist_path))
+        dockutil = DockutilCommand(SubprocessExecutor())
+        apps = dockutil.list_apps()
+
+        dockutil.remove_app(apps[0])
+        dockutil.add_app("Zed", position=2)
+
+        assert dockutil.list_apps() == [apps[1], "Zed", *apps[2:]]
+
+    def test_shim_on_path(
+        self, plist_path: Path, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test a shim first on PATH is found as dockutil."""
+        shim = write_shim(tmp_path / "bin")
+        monkeypatch.delenv("DOCK_DOCKUTIL", raising=False)
+        monkeypatch.setenv("PATH", f"{shim.parent}:/usr/bin:/bin")
+        monkeypatch.setenv("FAKE_DOCKUTIL_PLIST", str(plist_path))
+        dockutil = DockutilCommand(SubprocessExecutor())
+
+        assert dockutil.check_installed()
+        assert len(dockutil.list_apps()) == 6
@@ -0,0 +1,135 @@
+"""Tests for the synthetic Dock generator."""
+
+import plistlib
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dock.config.converter import converter
+from dock.config.models import DockConfig
+from dock.dock.diff import DiffCalculator
+from dock.dock.snapshot import DockSnapshot
+from dock.testing.synth import SynthSpec, generate, main
+
+
+def _diff(state: dict, config: dict):
+    """Diff a generated config against the generated Dock."""
+    return DiffCalculator().calculate_diff(
+        converter.structure(config, DockConfig), converter.structure(state, DockConfig)
+    )
+
+
+class TestGenerate:
+    """Tests for generate."""
+
+    def test_generates_requested_tiles(self) -> None:
+        """Test each section has the requested number of tiles."""
+        dock = generate(SynthSpec(apps=40, others=5, recents=2, spacers=3, bookmark_size=300))
+
+        persistent_apps = dock.plist["persistent-apps"]
+        tile_types = [tile["tile-type"] for tile in persistent_apps]
+        assert tile_types.count("file-tile") == 40
+        assert len(tile_types) == 43
+        assert len(dock.plist["persistent-others"]) == 6
+        assert len(dock.plist["recent-apps"]) == 2
+        assert len(dock.dockutil_list.splitlines()) == 40 + 6 + 2
+
+        tiles = persistent_apps + dock.plist["persistent-others"] + dock.plist["recent-apps"]
+        guids = [tile["GUID"] for tile in tiles]
+        assert len(set(guids)) == len(guids)
+        app_data = persistent_apps[tile_types.index("file-tile")]["tile-data"]
+        assert len(app_data["book"]) == 300
+        assert app_data["book"].startswith(b"book")
+        assert app_data["file-data"]["_CFURLString"].endswith(".app/")
+
+    def test_same_seed_gives_same_dock(self) -> None:
+        """Test output is reproducible for a seed."""
+        spec = SynthSpec(apps=10, seed=7)
+
+        assert generate(spec).plist_bytes() == generate(spec).plist_bytes()
+        assert generate(spec).plist != generate(SynthSpec(apps=10, seed=8)).plist
+
+    @pytest.mark.parametrize("fmt", ["binary", "xml"])
+    def test_plist_formats(self, fmt: str) -> None:
+        """Test both plist formats load back to the same data."""
+        dock = generate(SynthSpec(apps=5))
+
+        data = dock.plist_bytes(fmt)  # type: ignore[arg-type]
+
+        assert data.startswith(b"bplist00" if fmt == "binary" else b"<?xml")
+        assert plistlib.loads(data) == dock.plist
+
+    def test_state_reads_back_docked_apps(self) -> None:
+        """Test the state has the docked apps and stacks in Dock order."""
+        dock = generate(SynthSpec(apps=12, others=4))
+
+        state = dock.state()
+
+        docked = [tile["tile-data"] for tile in dock.plist["persistent-apps"]]
+        assert state["apps"] == [data["file-label"] for data in docked if "book" in data]
+        assert len(state["stacks"]) == 4
+        assert state["settings"]["show_recents"] is True
+
+
+class TestConfig:
+    """Tests for SynthDock.config."""
+
+    def test_distance_zero_matches_dock(self) -> None:
+        """Test a config with no edits has no changes."""
+        dock = generate(SynthSpec(apps=25))
+
+        assert not _diff(dock.state(), dock.config(0)).has_changes()
+
+    @pytest.mark.parametrize("edits", [1, 3, 10])
+    def test_edits_make_changes(self, edits: int) -> None:
+        """Test every edit touches a different app or setting."""
+        dock = generate(SynthSpec(apps=25))
+        state = dock.state()
+
+        config = dock.config(edits)
+
+        diff = _diff(state, config)
+        assert diff.has_changes()
+        changed_apps = set(config["apps"]) ^ set(state["apps"])
+        changed_settings = {
+            name for name, value in config["settings"].items() if state["settings"][name] != value
+        }
+        moved = sum(
+            1
+            for app in set(config["apps"]) & set(state["apps"])
+            if config["apps"].index(app) != state["apps"].index(app)
+        )
+        assert len(changed_apps) + len(changed_settings) <= edits
+        assert len(changed_apps) + len(changed_settings) + moved >= min(edits, 1)
+
+    def test_too_many_edits(self) -> None:
+        """Test asking for more edits than the Dock allows fails."""
+        dock = generate(SynthSpec(apps=1, recents=0, spare_apps=0))
+
+        with pytest.raises(ValueError, match="distinct edits"):
+            dock.config(100)
+
+
+class TestSynthCLI:
+    """Tests for python -m dock.testing.synth."""
+
+    def test_writes_plist_state_and_configs(self, tmp_path: Path) -> None:
+        """Test the command writes every file."""
+        result = CliRunner().invoke(
+            main, [str(tmp_path), "--apps", "8", "--format", "xml", "--distances", "0,2"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert (tmp_path / "com.apple.dock.plist").read_bytes().startswith(b"<?xml")
+        assert (tmp_path / "config-d0.yml").exists()
+        assert (tmp_path / "config-d2.yml").exists()
+        snapshot = DockSnapshot.load(tmp_path / "state.json")
+        assert len(snapshot.apps) == 8 + 3 + 20
+
+    def test_rejects_bad_distances(self, tmp_path: Path) -> None:
+        """Test a malformed distance list is a usage error."""
+        result = CliRunner().invoke(main, [str(tmp_path), "--distances", "1,x"])
+
+        assert result.exit_code == 2
+        assert "comma-separated" in result.output
@@ -0,0 +1,102 @@
+"""Tests for the NDJSON event stream."""
+
+import io
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from dock.utils import events
+from dock.utils.events import EventWriter
+
+
+@pytest.fixture(autouse=True)
+def reset_events():
+    """Make sure no test leaves the event stream enabled."""
+    yield
+    events.finish()
+
+
+def _lines(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestEventWriter:
+    """Tests for EventWriter."""
+
+    def test_buffers_events_into_one_write(self) -> None:
+        """Test events are held until flushed and then written together."""
+        stream = Mock(wraps=io.StringIO())
+        writer = EventWriter(stream, flush_interval=60)
+
+        for index in range(100):
+            writer.emit("plan_step", index=index, command="dockutil --add x")
+        stream.write.assert_not_called()
+        writer.flush()
+
+        stream.write.assert_called_once()
+        assert len(stream.getvalue().splitlines()) == 100
+
+    def test_flushes_when_buffer_is_full(self) -> None:
+        """Test a full buffer is written without waiting for flush."""
+        stream = io.StringIO()
+        writer = EventWriter(stream, buffer_size=100, flush_interval=60)
+
+        writer.emit("message", message="x" * 120)
+
+        assert _lines(stream)[0]["message"] == "x" * 120
+
+    def test_events_are_typed_json_lines(self) -> None:
+        """Test each event has its type, a timestamp and its fields."""
+        stream = io.StringIO()
+        writer = EventWriter(stream)
+
+        writer.emit("step_done", index=0, action="add_app", duration=0.25)
+        writer.flush()
+
+        [event] = _lines(stream)
+        assert event["event"] == "step_done"
+        assert event["action"] == "add_app"
+        assert "ts" in event
+
+
+class TestEventStream:
+    """Tests for the module-level event stream."""
+
+    def test_finish_emits_result_and_disables(self) -> None:
+        """Test the closing result reports errors and stops the stream."""
+        stream = io.StringIO()
+        events.enable(stream)
+        events.emit("warning", message="careful")
+        events.emit("error", message="failed")
+
+        events.finish()
+
+        result = _lines(stream)[-1]
+        assert result["event"] == "result"
+        assert result["ok"] is False
+        assert result["errors"] == 1
+        assert not events.enabled()
+
+    def test_emit_without_stream_does_nothing(self) -> None:
+        """Test emitting is a no-op in text mode."""
+        events.emit("warning", message="ignored")
+
+        assert not events.enabled()
+
+    def test_output_helpers_emit_events(self, mocker) -> None:
+        """Test output helpers emit events instead of printing text."""
+        from dock.utils.output import print_newline, print_warning
+
+        mock_echo = mocker.patch("click.echo")
+        mock_secho = mocker.patch("click.secho")
+        stream = io.StringIO()
+        events.enable(stream)
+
+        print_warning("Application not found: Foo")
+        print_newline()
+        events.finish()
+
+        mock_echo.assert_not_called()
+        mock_secho.assert_not_called()
+        assert [event["event"] for event in _lines(stream)] == ["warning", "result"]
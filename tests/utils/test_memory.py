@@ -0,0 +1,67 @@
+"""Tests for per-phase memory accounting."""
+
+import pytest
+
+from dock.utils import memory, profiling
+
+
+@pytest.fixture(autouse=True)
+def stop_memory():
+    """Make sure no test leaves allocations traced."""
+    yield
+    memory.stop()
+
+
+def _allocate() -> list[bytes]:
+    """Allocate about 1 MiB and keep it."""
+    return [bytes(1024) for _ in range(1024)]
+
+
+class TestMemoryTracker:
+    """Tests for memory accounting."""
+
+    def test_reports_phase_peak_net_and_sites(self) -> None:
+        """Test a phase reports memory it allocated and the line that did it."""
+        memory.start(top=3)
+        with memory.phase("structure"):
+            kept = _allocate()
+
+        structure, total = memory.stop()
+
+        assert structure.name == "structure"
+        assert structure.net >= 1024 * 1024
+        assert structure.peak - structure.start >= 1024 * 1024
+        assert len(structure.sites) <= 3
+        assert "test_memory.py:" in structure.sites[0].location
+        assert total.name == "total"
+        assert len(kept) == 1024
+
+    def test_nested_phases_keep_outer_peak(self) -> None:
+        """Test an inner phase doesn't hide a peak reached before it from the outer one."""
+        memory.start()
+        with memory.phase("load_config"):
+            temporary = _allocate()
+            del temporary
+            with memory.phase("structure"):
+                pass
+
+        structure, load_config, _ = memory.stop()
+
+        assert load_config.peak - load_config.start >= 1024 * 1024
+        assert structure.peak - structure.start < 1024 * 1024
+
+    def test_phase_markers_are_measured(self) -> None:
+        """Test profiling phase markers feed the memory report."""
+        memory.start()
+        with profiling.phase("serialize"):
+            pass
+
+        assert [phase.name for phase in memory.stop()] == ["serialize", "total"]
+
+    def test_inactive(self) -> None:
+        """Test phases are no-ops and stop reports nothing when accounting is off."""
+        with memory.phase("diff"):
+            pass
+
+        assert not memory.active()
+        assert memory.stop() == []
@@ -0,0 +1,122 @@
+"""Tests for the --profile-out profiler."""
+
+import json
+import pstats
+from pathlib import Path
+
+import pytest
+
+from dock.utils import profiling
+
+
+@pytest.fixture(autouse=True)
+def stop_profiling():
+    """Make sure no test leaves the profiler running."""
+    yield
+    profiling.stop()
+
+
+def _work() -> int:
+    """Do something worth profiling."""
+    with profiling.phase("diff"):
+        return sum(len(str(i)) for i in range(100))
+
+
+def _profile(path: Path, fmt: str) -> None:
+    """Profile _work into path."""
+    profiling.start(path, fmt)
+    _work()
+    profiling.stop()
+
+
+class TestProfiler:
+    """Tests for the profile formats."""
+
+    def test_pstats_includes_phases(self, tmp_path: Path) -> None:
+        """Test pstats output holds the profiled calls and a pseudo function per phase."""
+        path = tmp_path / "dock.pstats"
+
+        _profile(path, "pstats")
+
+        stats = pstats.Stats(str(path)).stats  # type: ignore[attr-defined]
+        assert any(name == "_work" for _, _, name in stats)
+        assert stats[(profiling.PHASE_FILE, 0, "diff")][0] == 1
+
+    def test_speedscope_events_are_balanced(self, tmp_path: Path) -> None:
+        """Test the speedscope call timeline opens and closes frames in order."""
+        path = tmp_path / "dock.speedscope.json"
+
+        _profile(path, "speedscope")
+
+        data = json.loads(path.read_text())
+        calls, phases = data["profiles"]
+        frames = data["shared"]["frames"]
+        stack = []
+        for event in calls["events"]:
+            if event["type"] == "O":
+                stack.append(event["frame"])
+            else:
+                assert stack.pop() == event["frame"]
+        assert not stack
+        assert "_work" in {frame["name"] for frame in frames}
+        assert [frames[e["frame"]]["name"] for e in phases["events"]] == [
+            "phase: diff",
+            "phase: diff",
+        ]
+
+    def test_chrome_trace_has_phase_track(self, tmp_path: Path) -> None:
+        """Test the Chrome trace has call events and a complete event per phase."""
+        path = tmp_path / "dock.trace.json"
+
+        _profile(path, "chrome-trace")
+
+        trace = json.loads(path.read_text())["traceEvents"]
+        assert any(e["ph"] == "B" and e["name"] == "_work" for e in trace)
+        [diff] = [e for e in trace if e.get("cat") == "phase"]
+        assert diff["name"] == "diff"
+        assert diff["dur"] >= 0
+
+    def test_unknown_format(self, tmp_path: Path) -> None:
+        """Test an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unknown profile format"):
+            profiling.Profiler(tmp_path / "out", "flamegraph")
+
+    def test_phase_without_profiler(self) -> None:
+        """Test phases are no-ops when nothing is being profiled."""
+        assert _work() > 0
+        assert not profiling.active()
+
+
+class TestStartFromArgv:
+    """Tests for start_from_argv."""
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["--profile-out", "{path}", "reset"],
+            ["--output", "ndjson", "--profile-out={path}", "--profile-format", "speedscope"],
+        ],
+    )
+    def test_starts_from_group_options(self, tmp_path: Path, argv: list[str]) -> None:
+        """Test the group options start the profiler before the CLI is imported."""
+        path = tmp_path / "dock.prof"
+
+        profiling.start_from_argv([arg.format(path=path) for arg in argv])
+
+        assert profiling.active()
+        profiling.stop()
+        assert path.exists()
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["reset", "--profile-out", "x"],
+            ["--profile-out", "x", "--profile-format", "flamegraph"],
+            ["--output", "ndjson", "validate"],
+        ],
+    )
+    def test_ignores_other_arguments(self, argv: list[str]) -> None:
+        """Test subcommand options and invalid formats don't start the profiler."""
+        profiling.start_from_argv(argv)
+
+        assert not profiling.active()